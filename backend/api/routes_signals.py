@@ -3,8 +3,12 @@ API Routes untuk Signal Management.
 Endpoint untuk generate, track, dan manage trading signals.
 """
 
+import asyncio
+import math
 from datetime import datetime
 from typing import List, Optional
+
+import pandas as pd
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
@@ -14,9 +18,15 @@ from ..models import (
     FavoritePair, SignalStatistics
 )
 from ..services.auto_signal import auto_signal_service
+from ..services.binance_realtime import binance_fetcher
+from ..services.indikator_panel import hitung_indikator_banyak
+from ..services.waktu_epoch import FORMAT_MS, normalisasi_waktu
 
 router = APIRouter(prefix="/signals", tags=["Signals"])
 
+# Indikator bar terakhir yang dikembalikan untuk setiap pair favorit
+KOLOM_INDIKATOR_FAVORIT = ["rsi_6", "rsi_14", "ema_9", "ema_20", "ema_50", "ema_200", "atr_14"]
+
 
 # ============================================================================
 # PYDANTIC SCHEMAS
@@ -306,6 +316,60 @@ async def get_favorites(db: Session = Depends(get_db)):
     }
 
 
+@router.get("/favorites/indikator")
+async def get_favorites_indikator(
+    interval: str = Query("1h", description="Interval: 1m, 5m, 15m, 1h, 4h, 1d"),
+    limit: int = Query(250, ge=50, le=1000, description="Jumlah candle per pair"),
+    db: Session = Depends(get_db),
+):
+    """
+    Indikator bar terakhir untuk semua pair favorit aktif.
+
+    Klines semua pair diambil bersamaan, lalu indikatornya dihitung sekali
+    dalam mode panel (`indikator_panel`), bukan satu pipeline pandas per pair.
+    Pair yang gagal diambil dari Binance dicantumkan di "gagal".
+    """
+    favorites = db.query(FavoritePair).filter(
+        FavoritePair.is_active == True
+    ).all()
+    daftar_symbol = [f.symbol for f in favorites]
+
+    hasil_klines = await asyncio.gather(
+        *(binance_fetcher.get_klines(symbol, interval, limit) for symbol in daftar_symbol),
+        return_exceptions=True,
+    )
+    frame_per_symbol = {}
+    gagal = {}
+    for symbol, klines in zip(daftar_symbol, hasil_klines):
+        if isinstance(klines, Exception):
+            gagal[symbol] = str(klines)
+        elif not klines:
+            gagal[symbol] = "Tidak ada data dari Binance"
+        else:
+            df = pd.DataFrame(klines)
+            df["open_time"] = normalisasi_waktu(df["open_time"], FORMAT_MS)
+            frame_per_symbol[symbol] = df
+
+    indikator = {}
+    for symbol, df in hitung_indikator_banyak(frame_per_symbol).items():
+        terakhir = df.iloc[-1]
+        indikator[symbol] = {
+            "open_time": terakhir["open_time"].isoformat(),
+            "close": float(terakhir["close"]),
+            **{
+                nama: None if math.isnan(terakhir[nama]) else round(float(terakhir[nama]), 2)
+                for nama in KOLOM_INDIKATOR_FAVORIT
+            },
+        }
+
+    return {
+        "interval": interval,
+        "jumlah": len(indikator),
+        "indikator": indikator,
+        "gagal": gagal,
+    }
+
+
 # ============================================================================
 # AUTO SIGNAL & TRACKING ENDPOINTS
 # ============================================================================
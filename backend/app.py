@@ -3,26 +3,32 @@ Backend Leon Liquidity Engine v3.0
 Support untuk Spot & Futures trading dengan AI prediction.
 """
 
-from io import BytesIO
 from pathlib import Path
 from typing import List, Optional
 from datetime import datetime
+import asyncio
+import os
 import shutil
+import tempfile
 
 import pandas as pd
 from fastapi import FastAPI, UploadFile, File, HTTPException, Query
 from fastapi.responses import HTMLResponse, FileResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, Field
+from starlette.background import BackgroundTask
 
 # Import dari modules yang sudah di-refactor
-from .core.config import UPLOADS_DIR, PROCESSED_DIR, TRADING_MODES
+from .core.config import UPLOADS_DIR, PROCESSED_DIR, TRADING_MODES, UKURAN_POTONGAN_UNGGAH, MAKS_KOMBINASI_SWEEP
 from .models import init_db
 from .api import signals_router, binance_router
 
 from .services.praproses_data import (
-    simpan_hasil_preprocess,
-    tambah_indikator_ke_df,
+    ekspor_hasil_ke_csv,
+    muat_timeframe,
+    periksa_kualitas_folder,
+    ringkas_csv_bertahap,
+    ringkas_frame,
     PERIODE_RSI_AKTIF,
     PERIODE_RSI_INTRADAY_1,
     PERIODE_RSI_INTRADAY_2,
@@ -33,7 +39,19 @@ from .services.praproses_data import (
     PERIODE_EMA_200,
     PERIODE_ATR,
 )
-from .services.generator_sinyal_unified import generate_sinyal_dari_folder_honest
+from .services.penyimpanan_kolom import (
+    DAFTAR_FORMAT,
+    DatasetProcessed,
+    baca_hasil_preprocess,
+    cari_hasil_preprocess,
+    daftar_hasil_preprocess,
+    ukuran_hasil,
+)
+from .services.kualitas_data import baca_laporan_kualitas, simpan_laporan_kualitas
+from .services.pipeline_praproses import manajer_praproses
+from .services.waktu_epoch import FORMAT_MS, normalisasi_waktu
+from .services.pipeline_sinyal import STATUS_SELESAI, manajer_sinyal
+from .services.resample_timeframe import TIMEFRAME_MS
 from .services.binance_realtime import (
     binance_fetcher,
     SUPPORTED_SYMBOLS,
@@ -44,20 +62,10 @@ from .services.lstm_predictor import lstm_predictor, get_prediction_for_symbol
 FOLDER_DATA_BASE = UPLOADS_DIR
 FOLDER_HASIL_BASE = PROCESSED_DIR
 
-# Daftar kolom minimal agar data bisa dipakai untuk analisis OHLCV.
-KOLOM_WAJIB: List[str] = ["open_time", "open", "high", "low", "close", "volume"]
-
 # Periode indikator yang FIXED (tidak bisa diubah user)
 # Untuk kompatibilitas lama, pakai RSI swing sebagai default.
 PERIODE_RSI_DEFAULT = PERIODE_RSI_SWING
 
-# Header standar untuk data Binance Vision (tanpa header)
-HEADER_BINANCE_VISION: List[str] = [
-    "open_time", "open", "high", "low", "close", "volume",
-    "close_time", "quote_volume", "count", "taker_buy_volume",
-    "taker_buy_quote_volume", "ignore"
-]
-
 aplikasi = FastAPI(
     title="Leon Liquidity Engine API",
     description="Trading Signal Generator dengan AI Prediction untuk Spot & Futures",
@@ -82,6 +90,13 @@ async def startup_event():
     print("Auto Signal Tracking Service started!")
 
 
+@aplikasi.on_event("shutdown")
+async def shutdown_event():
+    """Matikan process pool pra-proses dan generate sinyal saat server berhenti"""
+    manajer_praproses.shutdown()
+    manajer_sinyal.shutdown()
+
+
 @aplikasi.get("/cek-kesehatan")
 async def cek_kesehatan():
     """
@@ -234,15 +249,16 @@ async def detail_folder(nama_folder: str):
             "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
         })
     
-    # Ambil file processed
+    # Ambil file processed (CSV atau folder format kolom)
     files_processed = []
     if path_processed.exists():
-        for f in sorted(path_processed.glob("*.csv")):
+        for f in daftar_hasil_preprocess(path_processed):
             stat = f.stat()
+            ukuran = ukuran_hasil(f)
             files_processed.append({
                 "nama": f.name,
-                "ukuran": stat.st_size,
-                "ukuran_format": f"{stat.st_size / 1024:.1f} KB" if stat.st_size < 1024*1024 else f"{stat.st_size / (1024*1024):.2f} MB",
+                "ukuran": ukuran,
+                "ukuran_format": f"{ukuran / 1024:.1f} KB" if ukuran < 1024*1024 else f"{ukuran / (1024*1024):.2f} MB",
                 "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
             })
     
@@ -273,60 +289,6 @@ async def halaman_utama():
     return FileResponse(path_html, media_type="text/html")
 
 
-def _normalisasi_csv_binance(df: pd.DataFrame) -> pd.DataFrame:
-    """
-    Normalisasi CSV dari Binance Vision yang mungkin tidak punya header.
-    Auto-detect dan assign header jika diperlukan.
-    
-    Format Binance Vision (tanpa header):
-    open_time,open,high,low,close,volume,close_time,quote_volume,count,taker_buy_volume,taker_buy_quote_volume,ignore
-    """
-    # Cek apakah kolom pertama adalah angka (kemungkinan open_time dalam format timestamp)
-    # Jika iya, berarti CSV tidak punya header
-    if len(df.columns) == len(HEADER_BINANCE_VISION):
-        kolom_pertama = df.columns[0]
-        # Cek apakah kolom pertama adalah angka (timestamp) atau string yang mirip header
-        try:
-            # Coba convert kolom pertama ke float/int
-            pd.to_numeric(df.iloc[0, 0], errors='raise')
-            # Jika berhasil, berarti ini data tanpa header
-            # Assign header sesuai format Binance Vision
-            df.columns = HEADER_BINANCE_VISION
-        except (ValueError, TypeError):
-            # Kolom pertama bukan angka, kemungkinan sudah ada header
-            # Tapi cek apakah header sesuai dengan format Binance
-            if kolom_pertama.lower() not in ['open_time', 'open', 'high', 'low', 'close', 'volume']:
-                # Header tidak sesuai, coba assign ulang
-                df.columns = HEADER_BINANCE_VISION[:len(df.columns)]
-    
-    return df
-
-
-def _pastikan_kolom_wajib(df: pd.DataFrame) -> None:
-    """
-    Pastikan kolom wajib tersedia di DataFrame.
-    """
-    kolom_tidak_ada = [kol for kol in KOLOM_WAJIB if kol not in df.columns]
-    if kolom_tidak_ada:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Kolom wajib hilang: {', '.join(kolom_tidak_ada)}. Format CSV harus sesuai Binance: {', '.join(HEADER_BINANCE_VISION)}",
-        )
-
-
-def _konversi_waktu(series_waktu: pd.Series) -> pd.Series:
-    """
-    Konversi kolom open_time ke datetime.
-    Otomatis mendeteksi apakah nilai berupa detik atau milidetik.
-    """
-    # Coba asumsikan milidetik (umum di Binance)
-    waktu_dt = pd.to_datetime(series_waktu, unit="ms", errors="coerce")
-    if waktu_dt.isna().all():
-        # Jika gagal semua, coba parse otomatis (string ISO atau detik)
-        waktu_dt = pd.to_datetime(series_waktu, errors="coerce", utc=True)
-    return waktu_dt
-
-
 @aplikasi.post("/unggah-csv/")
 async def unggah_csv(
     berkas: UploadFile = File(...),
@@ -334,7 +296,8 @@ async def unggah_csv(
 ):
     """
     Endpoint untuk menerima berkas CSV dari pengguna.
-    Data disimpan ke folder `data/uploads/<folder>/` dan dikembalikan ringkasan statistiknya.
+    Data disimpan ke folder `data/uploads/<folder>/` dan dikembalikan ringkasan statistiknya
+    beserta laporan kualitas data (juga dicatat di `_kualitas.json` folder).
     """
     if not berkas.filename.endswith(".csv"):
         raise HTTPException(status_code=400, detail="Hanya berkas CSV yang diizinkan.")
@@ -349,44 +312,42 @@ async def unggah_csv(
     if not path_folder.exists():
         raise HTTPException(status_code=404, detail=f"Folder '{nama_folder_bersih}' tidak ditemukan. Buat folder terlebih dahulu.")
 
-    isi_berkas = await berkas.read()
-    if not isi_berkas:
-        raise HTTPException(status_code=400, detail="Berkas kosong.")
-
+    # Tulis body upload ke berkas sementara per potongan (memori tetap kecil),
+    # baru di-rename ke nama asli setelah ringkasan CSV valid
+    path_simpan = path_folder / berkas.filename
+    path_sementara = path_folder / f".{berkas.filename}.unggah"
     try:
-        # Baca CSV, coba dengan header dulu
-        df = pd.read_csv(BytesIO(isi_berkas))
-        # Normalisasi untuk handle CSV tanpa header (format Binance Vision)
-        df = _normalisasi_csv_binance(df)
-    except Exception as err:  # pragma: no cover - FastAPI run-time
-        raise HTTPException(status_code=400, detail=f"Gagal membaca CSV: {err}") from err
-
-    _pastikan_kolom_wajib(df)
+        ukuran = 0
+        with open(path_sementara, "wb") as tujuan:
+            while potongan := await berkas.read(UKURAN_POTONGAN_UNGGAH):
+                tujuan.write(potongan)
+                ukuran += len(potongan)
+        if ukuran == 0:
+            raise HTTPException(status_code=400, detail="Berkas kosong.")
 
-    df["open_time"] = _konversi_waktu(df["open_time"])
-    if df["open_time"].isna().all():
-        raise HTTPException(
-            status_code=400,
-            detail="Kolom open_time tidak bisa dikonversi ke datetime.",
-        )
+        try:
+            ringkasan = await asyncio.to_thread(ringkas_csv_bertahap, path_sementara)
+        except ValueError as err:
+            raise HTTPException(status_code=400, detail=str(err)) from err
 
-    jumlah_baris = len(df)
-    waktu_mulai = df["open_time"].min()
-    waktu_selesai = df["open_time"].max()
+        os.replace(path_sementara, path_simpan)
+    finally:
+        path_sementara.unlink(missing_ok=True)
+    await asyncio.to_thread(simpan_laporan_kualitas, path_folder, {berkas.filename: ringkasan["kualitas"]})
 
-    # Simpan berkas asli ke folder yang dipilih
-    path_simpan = path_folder / berkas.filename
-    with open(path_simpan, "wb") as tujuan:
-        tujuan.write(isi_berkas)
+    jumlah_baris = ringkasan["jumlah_baris"]
+    waktu_mulai = ringkasan["waktu_mulai"]
+    waktu_selesai = ringkasan["waktu_selesai"]
 
     return {
         "nama_berkas": berkas.filename,
         "folder": nama_folder_bersih,
         "jumlah_baris": jumlah_baris,
-        "kolom": list(df.columns),
+        "kolom": ringkasan["kolom"],
         "waktu_mulai": waktu_mulai.isoformat(),
         "waktu_selesai": waktu_selesai.isoformat(),
         "lokasi_simpan": str(path_simpan),
+        "kualitas": ringkasan["kualitas"],
         "pesan": f"Berkas CSV berhasil disimpan ke folder '{nama_folder_bersih}'.",
     }
 
@@ -398,6 +359,30 @@ class PermintaanPraProsesSemua(BaseModel):
     """
 
     folder: str = Field(..., description="Nama folder yang akan diproses.")
+    format_simpan: str = Field(
+        "csv",
+        description="Format hasil: 'csv' atau 'kolom' (per-kolom .npy, bisa di-memory-map, jauh lebih cepat dibaca).",
+    )
+    kontinu: bool = Field(
+        False,
+        description="True: berkas satu seri (misal BTCUSDT-1h-<tanggal>.csv) diproses sebagai satu deret kontinu; state indikator diteruskan antar berkas.",
+    )
+    paksa: bool = Field(
+        False,
+        description="True: abaikan cache manifest dan hitung ulang semua berkas.",
+    )
+    tunggu: bool = Field(
+        True,
+        description="True: tunggu sampai semua berkas selesai. False: langsung kembalikan job_id, pantau lewat /pra-proses/status/{job_id}.",
+    )
+    isi_gap: bool = Field(
+        False,
+        description="True: urutkan, buang open_time duplikat, dan isi candle yang hilang (OHLC = close sebelumnya, volume 0) sebelum indikator dihitung.",
+    )
+    timeframe: Optional[str] = Field(
+        None,
+        description="Resample sumber ke timeframe ini (5m, 15m, 30m, 1h, 4h, 1d) sebelum indikator dihitung, juga untuk berkas besar yang diproses per chunk.",
+    )
 
 
 @aplikasi.post("/pra-proses/indikator/")
@@ -405,6 +390,9 @@ async def pra_proses_indikator(perintah: PermintaanPraProsesSemua):
     """
     Proses semua berkas CSV di folder uploads/<folder> dan tambahkan indikator RSI & EMA.
     Hasil disimpan ke data/processed/<folder>/.
+
+    Berkas diproses paralel di process pool (PRAPROSES_MAX_WORKERS), event loop
+    tetap bebas sehingga tracking live tidak terhenti.
     """
     nama_folder_bersih = perintah.folder.strip()
     path_folder = FOLDER_DATA_BASE / nama_folder_bersih
@@ -412,6 +400,18 @@ async def pra_proses_indikator(perintah: PermintaanPraProsesSemua):
     if not path_folder.exists():
         raise HTTPException(status_code=404, detail=f"Folder '{nama_folder_bersih}' tidak ditemukan.")
 
+    if perintah.format_simpan not in DAFTAR_FORMAT:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Format simpan harus salah satu dari: {', '.join(DAFTAR_FORMAT)}.",
+        )
+
+    if perintah.timeframe is not None and perintah.timeframe not in TIMEFRAME_MS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Timeframe '{perintah.timeframe}' tidak dikenal. Pilihan: {', '.join(TIMEFRAME_MS)}.",
+        )
+
     daftar = sorted(path_folder.glob("*.csv"))
     if not daftar:
         raise HTTPException(
@@ -419,51 +419,26 @@ async def pra_proses_indikator(perintah: PermintaanPraProsesSemua):
             detail=f"Belum ada berkas CSV di folder '{nama_folder_bersih}'.",
         )
 
-    # Pastikan folder processed ada
     path_folder_processed = FOLDER_HASIL_BASE / nama_folder_bersih
-    path_folder_processed.mkdir(parents=True, exist_ok=True)
-
-    hasil_ringkas = []
-
-    for path_sumber in daftar:
-        try:
-            df = pd.read_csv(path_sumber)
-            # Normalisasi untuk handle CSV tanpa header
-            df = _normalisasi_csv_binance(df)
-            _pastikan_kolom_wajib(df)
-            
-            # Pastikan open_time adalah datetime dengan benar
-            df["open_time"] = _konversi_waktu(df["open_time"])
-            if df["open_time"].isna().all():
-                raise ValueError("open_time tidak valid")
-            
-            # Pastikan close_time adalah integer (timestamp milidetik) jika ada
-            if "close_time" in df.columns:
-                try:
-                    df["close_time"] = pd.to_numeric(df["close_time"], errors="coerce").fillna(0).astype(int)
-                except:
-                    pass
+    try:
+        job = manajer_praproses.mulai_job(
+            nama_folder_bersih,
+            daftar,
+            path_folder_processed,
+            perintah.format_simpan,
+            perintah.kontinu,
+            perintah.paksa,
+            perintah.isi_gap,
+            perintah.timeframe,
+        )
+    except ValueError as err:
+        # Job lain masih menulis manifest & hasil di folder yang sama
+        raise HTTPException(status_code=409, detail=str(err)) from err
+    if not perintah.tunggu:
+        return job.ke_dict()
 
-            # Gunakan periode FIXED (RSI 6/8/10/14, EMA 9/20/50/200, ATR 14)
-            df_indikator = tambah_indikator_ke_df(df)
-            path_hasil = simpan_hasil_preprocess(
-                df_indikator, path_sumber.name, path_folder_processed
-            )
-
-            hasil_ringkas.append(
-                {
-                    "nama_berkas": path_sumber.name,
-                    "jumlah_baris": len(df_indikator),
-                    "lokasi_hasil": str(path_hasil),
-                }
-            )
-        except Exception as err:  # pragma: no cover
-            hasil_ringkas.append(
-                {
-                    "nama_berkas": path_sumber.name,
-                    "error": str(err),
-                }
-            )
+    job = await manajer_praproses.tunggu(job.job_id)
+    hasil_ringkas = job.ringkasan()
 
     return {
         "folder": nama_folder_bersih,
@@ -480,11 +455,28 @@ async def pra_proses_indikator(perintah: PermintaanPraProsesSemua):
             "ema_200": PERIODE_EMA_200,
         },
         "periode_atr": PERIODE_ATR,
+        "format_simpan": perintah.format_simpan,
+        "kontinu": perintah.kontinu,
+        "isi_gap": perintah.isi_gap,
+        "timeframe": perintah.timeframe,
+        "job_id": job.job_id,
         "jumlah_berkas": len(daftar),
+        "jumlah_cache": sum(1 for h in hasil_ringkas if h.get("cache")),
         "ringkasan": hasil_ringkas,
     }
 
 
+@aplikasi.get("/pra-proses/status/{job_id}")
+async def status_pra_proses(job_id: str):
+    """
+    Status job pra-proses: progress per berkas dan ringkasan berkas yang sudah selesai.
+    """
+    job = manajer_praproses.ambil_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job pra-proses '{job_id}' tidak ditemukan.")
+    return job.ke_dict()
+
+
 @aplikasi.delete("/unggah-csv/hapus")
 async def hapus_file(
     nama_berkas: str = Query(..., description="Nama file yang akan dihapus."),
@@ -504,6 +496,7 @@ async def hapus_file(
         raise HTTPException(status_code=404, detail=f"File '{nama_berkas}' tidak ditemukan di folder '{nama_folder_bersih}'.")
     
     path_file.unlink()
+    await asyncio.to_thread(simpan_laporan_kualitas, path_folder, {nama_berkas: None})
     
     return {
         "nama_berkas": nama_berkas,
@@ -512,6 +505,38 @@ async def hapus_file(
     }
 
 
+@aplikasi.get("/unggah-csv/kualitas")
+async def kualitas_berkas_unggahan(
+    folder: str = Query(..., description="Nama folder upload."),
+    pindai_ulang: bool = Query(False, description="True: periksa ulang semua CSV di folder."),
+):
+    """
+    Laporan kualitas data per berkas CSV di folder uploads/<folder>: gap, open_time
+    duplikat / tidak urut, OHLC tidak konsisten, dan rentetan volume nol.
+
+    Laporan dicatat saat upload; berkas yang belum punya laporan (atau
+    `pindai_ulang=true`) diperiksa ulang, seluruh folder sekali jalan.
+    """
+    nama_folder_bersih = folder.strip()
+    path_folder = FOLDER_DATA_BASE / nama_folder_bersih
+
+    if not path_folder.exists():
+        raise HTTPException(status_code=404, detail=f"Folder '{nama_folder_bersih}' tidak ditemukan.")
+
+    nama_csv = [path.name for path in sorted(path_folder.glob("*.csv"))]
+    laporan = await asyncio.to_thread(baca_laporan_kualitas, path_folder)
+    if pindai_ulang or any(nama not in laporan for nama in nama_csv):
+        laporan = await asyncio.to_thread(periksa_kualitas_folder, path_folder)
+
+    berkas = {nama: laporan[nama] for nama in nama_csv if nama in laporan}
+    return {
+        "folder": nama_folder_bersih,
+        "jumlah": len(berkas),
+        "jumlah_bermasalah": sum(1 for isi in berkas.values() if not isi.get("bersih", False)),
+        "berkas": berkas,
+    }
+
+
 @aplikasi.get("/unggah-csv/daftar")
 async def daftar_berkas_unggahan(
     folder: str = Query(..., description="Nama folder yang akan dilihat daftar filenya.")
@@ -538,7 +563,7 @@ async def daftar_berkas_processed(
     folder: str = Query(..., description="Nama folder yang akan dilihat daftar file processed-nya.")
 ):
     """
-    Mengembalikan daftar berkas CSV processed yang tersedia di folder processed/<folder>.
+    Mengembalikan daftar berkas processed (CSV atau format kolom) yang tersedia di folder processed/<folder>.
     """
     nama_folder_bersih = folder.strip()
     path_folder = FOLDER_HASIL_BASE / nama_folder_bersih
@@ -550,7 +575,7 @@ async def daftar_berkas_processed(
             "berkas": [],
         }
     
-    daftar = sorted(path_folder.glob("*.csv"))
+    daftar = daftar_hasil_preprocess(path_folder)
     return {
         "folder": nama_folder_bersih,
         "jumlah": len(daftar),
@@ -564,12 +589,17 @@ async def preview_berkas(
     folder: str = Query(..., description="Nama folder tempat file berada."),
     jenis: str = "processed",
     limit: int = 10,
+    timeframe: Optional[str] = Query(
+        None,
+        description="Resample hasil processed ke timeframe ini (5m, 15m, 30m, 1h, 4h, 1d) beserta indikatornya.",
+    ),
 ):
     """
     Mengambil beberapa baris contoh dari berkas tertentu agar bisa dilihat di UI.
 
     - `jenis='processed'`  -> ambil dari folder data/processed/<folder>/ jika ada, kalau tidak fallback ke uploads
     - `jenis='upload'`     -> paksa ambil dari uploads/<folder>/
+    - `timeframe`          -> hanya untuk sumber processed; hasil resample di-cache per (berkas, timeframe)
     """
     nama_folder_bersih = folder.strip()
     path_folder_upload = FOLDER_DATA_BASE / nama_folder_bersih
@@ -581,8 +611,14 @@ async def preview_berkas(
     if jenis not in {"processed", "upload"}:
         raise HTTPException(status_code=400, detail="Parameter 'jenis' harus 'processed' atau 'upload'.")
 
+    if timeframe is not None and timeframe not in TIMEFRAME_MS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Timeframe '{timeframe}' tidak dikenal. Pilihan: {', '.join(TIMEFRAME_MS)}.",
+        )
+
     path_upload = path_folder_upload / nama_berkas
-    path_processed = path_folder_processed / (Path(nama_berkas).with_suffix(".processed.csv").name)
+    path_processed = cari_hasil_preprocess(path_folder_processed, nama_berkas)
 
     path_sumber = None
     sumber = ""
@@ -591,7 +627,7 @@ async def preview_berkas(
         path_sumber = path_upload
         sumber = "upload"
     else:
-        if path_processed.exists():
+        if path_processed is not None:
             path_sumber = path_processed
             sumber = "processed"
         else:
@@ -601,13 +637,16 @@ async def preview_berkas(
     if not path_sumber.exists():
         raise HTTPException(status_code=404, detail="Berkas tidak ditemukan di uploads maupun processed.")
 
+    if timeframe is not None and sumber != "processed":
+        raise HTTPException(status_code=400, detail="Resample timeframe hanya untuk berkas yang sudah di-preprocess.")
+
     try:
-        df = pd.read_csv(path_sumber)
+        if timeframe is not None:
+            df = muat_timeframe(path_sumber, timeframe)
+        else:
+            df = baca_hasil_preprocess(path_sumber)
     except Exception as err:  # pragma: no cover
-        raise HTTPException(status_code=400, detail=f"Gagal membaca CSV: {err}") from err
-
-    if "open_time" in df.columns:
-        df["open_time"] = pd.to_datetime(df["open_time"], errors="coerce")
+        raise HTTPException(status_code=400, detail=f"Gagal membaca berkas: {err}") from err
 
     total_baris = len(df)
     contoh = df.head(limit).copy()
@@ -627,6 +666,7 @@ async def preview_berkas(
     return {
         "nama_berkas": nama_berkas,
         "sumber": sumber,
+        "timeframe": timeframe,
         "jumlah_baris": total_baris,
         "kolom": list(df.columns),
         "contoh": contoh.to_dict(orient="records"),
@@ -634,6 +674,38 @@ async def preview_berkas(
     }
 
 
+@aplikasi.get("/processed-csv/ekspor")
+async def ekspor_berkas_processed(
+    nama_berkas: str = Query(..., description="Nama berkas upload asal (misal BTCUSDT-1h-2024-01-01.csv)."),
+    folder: str = Query(..., description="Nama folder tempat file berada."),
+):
+    """
+    Ekspor hasil preprocessing sebagai CSV (juga untuk hasil berformat kolom).
+    """
+    nama_folder_bersih = folder.strip()
+    path_processed = cari_hasil_preprocess(FOLDER_HASIL_BASE / nama_folder_bersih, nama_berkas)
+    if path_processed is None:
+        raise HTTPException(status_code=404, detail="Berkas processed tidak ditemukan.")
+
+    nama_csv = Path(nama_berkas).with_suffix(".processed.csv").name
+    if path_processed.is_file():
+        return FileResponse(path_processed, media_type="text/csv", filename=nama_csv)
+
+    deskriptor, path_sementara = tempfile.mkstemp(suffix=".csv")
+    os.close(deskriptor)
+    try:
+        ekspor_hasil_ke_csv(path_processed, Path(path_sementara))
+    except Exception as err:  # pragma: no cover
+        os.remove(path_sementara)
+        raise HTTPException(status_code=500, detail=f"Gagal ekspor CSV: {err}") from err
+    return FileResponse(
+        path_sementara,
+        media_type="text/csv",
+        filename=nama_csv,
+        background=BackgroundTask(os.remove, path_sementara),
+    )
+
+
 # ============================================================================
 # ENDPOINT SINYAL TRADING
 # ============================================================================
@@ -642,13 +714,110 @@ class PermintaanGenerateSinyal(BaseModel):
     """Model request body untuk generate sinyal trading."""
     folder: str = Field(..., description="Nama folder yang akan dianalisis.")
     mode_trading: str = Field("santai", description="Mode trading: 'aktif', 'santai', atau 'pasif' (default: 'santai').")
+    daftar_mode: Optional[List[str]] = Field(
+        None,
+        description="Beberapa mode trading sekaligus (setiap berkas dibaca sekali). Jika diisi, mode_trading diabaikan.",
+    )
     rsi_oversold: Optional[float] = Field(None, ge=0, le=50, description="Override RSI oversold (jika None, pakai dari mode trading).")
     rsi_overbought: Optional[float] = Field(None, ge=50, le=100, description="Override RSI overbought (jika None, pakai dari mode trading).")
     rasio_risk_reward: Optional[float] = Field(None, ge=0.5, le=10.0, description="Override rasio RR (jika None, pakai dari mode trading).")
     confidence_minimum: float = Field(0.50, ge=0.0, le=1.0, description="Confidence minimum untuk generate sinyal (default: 0.50 = 50%). Range: 0.0-1.0")
+    tunggu: bool = Field(
+        True,
+        description="True: tunggu sampai semua berkas selesai. False: langsung kembalikan job_id, pantau lewat /sinyal/status/{job_id}.",
+    )
     # Removed gunakan_delta - now using unified honest system only
 
 
+VERSI_SISTEM_SINYAL = "UNIFIED HONEST (Kejujuran & Akurasi)"
+
+
+def _respons_sinyal(folder: str, parameter: dict, daftar_sinyal: List[dict]) -> dict:
+    """Susun respons generate sinyal: statistik confidence + statistik backtest + daftar sinyal."""
+    # Hitung statistik confidence
+    if daftar_sinyal:
+        confidences = [s["confidence"] for s in daftar_sinyal]
+        rata_rata_confidence = sum(confidences) / len(confidences)
+        confidence_terendah = min(confidences)
+        confidence_tertinggi = max(confidences)
+        
+        # Hitung berdasarkan range confidence
+        jumlah_confidence_tinggi = len([c for c in confidences if c >= 0.70])
+        jumlah_confidence_sedang = len([c for c in confidences if 0.60 <= c < 0.70])
+        jumlah_confidence_rendah = len([c for c in confidences if c < 0.60])
+        
+        # BACKTEST STATISTICS - REAL PERFORMANCE
+        backtest_results = [s.get("backtest_result", "UNKNOWN") for s in daftar_sinyal]
+        pnl_values = [s.get("pnl_percent", 0) for s in daftar_sinyal if s.get("backtest_result") in ["HIT_TP", "HIT_SL"]]
+        duration_values = [s.get("duration_hours", 0) for s in daftar_sinyal if s.get("backtest_result") in ["HIT_TP", "HIT_SL"]]
+        
+        # Win/Loss counts
+        hit_tp_count = backtest_results.count("HIT_TP")
+        hit_sl_count = backtest_results.count("HIT_SL")
+        timeout_count = backtest_results.count("TIMEOUT")
+        total_closed = hit_tp_count + hit_sl_count
+        
+        # Calculate statistics
+        win_rate = (hit_tp_count / total_closed * 100) if total_closed > 0 else 0
+        avg_pnl = sum(pnl_values) / len(pnl_values) if pnl_values else 0
+        avg_duration = sum(duration_values) / len(duration_values) if duration_values else 0
+        
+        # Profit/Loss breakdown
+        profitable_trades = [pnl for pnl in pnl_values if pnl > 0]
+        losing_trades = [pnl for pnl in pnl_values if pnl < 0]
+        avg_profit = sum(profitable_trades) / len(profitable_trades) if profitable_trades else 0
+        avg_loss = sum(losing_trades) / len(losing_trades) if losing_trades else 0
+        
+        backtest_stats = {
+            "total_signals": len(daftar_sinyal),
+            "hit_tp": hit_tp_count,
+            "hit_sl": hit_sl_count,
+            "timeout": timeout_count,
+            "win_rate": round(win_rate, 1),
+            "avg_pnl": round(avg_pnl, 2),
+            "avg_duration_hours": round(avg_duration, 1),
+            "avg_profit": round(avg_profit, 2),
+            "avg_loss": round(avg_loss, 2),
+            "total_closed": total_closed
+        }
+    else:
+        rata_rata_confidence = 0
+        confidence_terendah = 0
+        confidence_tertinggi = 0
+        jumlah_confidence_tinggi = 0
+        jumlah_confidence_sedang = 0
+        jumlah_confidence_rendah = 0
+        backtest_stats = {
+            "total_signals": 0,
+            "hit_tp": 0,
+            "hit_sl": 0,
+            "timeout": 0,
+            "win_rate": 0,
+            "avg_pnl": 0,
+            "avg_duration_hours": 0,
+            "avg_profit": 0,
+            "avg_loss": 0,
+            "total_closed": 0
+        }
+    
+    return {
+        "folder": folder,
+        "sistem": VERSI_SISTEM_SINYAL,
+        "jumlah_sinyal": len(daftar_sinyal),
+        "parameter": parameter,
+        "statistik_confidence": {
+            "rata_rata": round(rata_rata_confidence, 4),
+            "terendah": round(confidence_terendah, 4),
+            "tertinggi": round(confidence_tertinggi, 4),
+            "jumlah_tinggi": jumlah_confidence_tinggi,  # >= 70%
+            "jumlah_sedang": jumlah_confidence_sedang,  # 60-70%
+            "jumlah_rendah": jumlah_confidence_rendah,  # < 60%
+        },
+        "backtest_statistics": backtest_stats,  # REAL PERFORMANCE DATA
+        "sinyal": daftar_sinyal,
+    }
+
+
 @aplikasi.post("/sinyal/generate")
 async def generate_sinyal(perintah: PermintaanGenerateSinyal):
     """
@@ -662,6 +831,10 @@ async def generate_sinyal(perintah: PermintaanGenerateSinyal):
     - Divergence opsional (bonus confidence)
     - S/R requirements realistis (<2%)
     
+    Berkas dipindai paralel di process pool (SINYAL_MAX_WORKERS), event loop
+    tetap bebas. Sinyal digabung urut timestamp. Dengan `daftar_mode`, hasil
+    per mode ada di `hasil_per_mode`.
+    
     Returns: Sinyal dengan confidence >= confidence_minimum
     """
     nama_folder_bersih = perintah.folder.strip()
@@ -670,114 +843,165 @@ async def generate_sinyal(perintah: PermintaanGenerateSinyal):
     if not path_folder_processed.exists():
         raise HTTPException(status_code=404, detail=f"Folder processed '{nama_folder_bersih}' tidak ditemukan. Jalankan pra-proses indikator terlebih dahulu.")
 
+    from .services.generator_sinyal_unified import TRADING_STYLES
+
+    daftar_mode = list(dict.fromkeys(perintah.daftar_mode or [perintah.mode_trading]))
+    mode_salah = [mode for mode in daftar_mode if mode not in TRADING_STYLES]
+    if mode_salah:
+        raise HTTPException(status_code=400, detail=f"Mode trading tidak valid. Pilih dari: {list(TRADING_STYLES.keys())}")
+
     try:
         # Confidence minimum EXPERT LEVEL untuk kejujuran semua mode
         confidence_min = max(perintah.confidence_minimum, 0.60)  # Minimum 60% untuk expert mode
         
-        # Gunakan sistem UNIFIED HONEST
-        daftar_sinyal = generate_sinyal_dari_folder_honest(
-            str(path_folder_processed),
-            pair="",
-            mode_trading=perintah.mode_trading,
+        # Gunakan sistem UNIFIED HONEST, satu task pool per berkas
+        job = manajer_sinyal.mulai_job(
+            nama_folder_bersih,
+            daftar_hasil_preprocess(path_folder_processed),
+            daftar_mode,
             confidence_minimum=confidence_min,
             rsi_oversold=perintah.rsi_oversold,
             rsi_overbought=perintah.rsi_overbought,
             rasio_risk_reward=perintah.rasio_risk_reward,
         )
-        versi_sistem = "UNIFIED HONEST (Kejujuran & Akurasi)"
-        
-        # Hitung statistik confidence
-        if daftar_sinyal:
-            confidences = [s["confidence"] for s in daftar_sinyal]
-            rata_rata_confidence = sum(confidences) / len(confidences)
-            confidence_terendah = min(confidences)
-            confidence_tertinggi = max(confidences)
-            
-            # Hitung berdasarkan range confidence
-            jumlah_confidence_tinggi = len([c for c in confidences if c >= 0.70])
-            jumlah_confidence_sedang = len([c for c in confidences if 0.60 <= c < 0.70])
-            jumlah_confidence_rendah = len([c for c in confidences if c < 0.60])
-            
-            # BACKTEST STATISTICS - REAL PERFORMANCE
-            backtest_results = [s.get("backtest_result", "UNKNOWN") for s in daftar_sinyal]
-            pnl_values = [s.get("pnl_percent", 0) for s in daftar_sinyal if s.get("backtest_result") in ["HIT_TP", "HIT_SL"]]
-            duration_values = [s.get("duration_hours", 0) for s in daftar_sinyal if s.get("backtest_result") in ["HIT_TP", "HIT_SL"]]
-            
-            # Win/Loss counts
-            hit_tp_count = backtest_results.count("HIT_TP")
-            hit_sl_count = backtest_results.count("HIT_SL")
-            timeout_count = backtest_results.count("TIMEOUT")
-            total_closed = hit_tp_count + hit_sl_count
-            
-            # Calculate statistics
-            win_rate = (hit_tp_count / total_closed * 100) if total_closed > 0 else 0
-            avg_pnl = sum(pnl_values) / len(pnl_values) if pnl_values else 0
-            avg_duration = sum(duration_values) / len(duration_values) if duration_values else 0
-            
-            # Profit/Loss breakdown
-            profitable_trades = [pnl for pnl in pnl_values if pnl > 0]
-            losing_trades = [pnl for pnl in pnl_values if pnl < 0]
-            avg_profit = sum(profitable_trades) / len(profitable_trades) if profitable_trades else 0
-            avg_loss = sum(losing_trades) / len(losing_trades) if losing_trades else 0
-            
-            backtest_stats = {
-                "total_signals": len(daftar_sinyal),
-                "hit_tp": hit_tp_count,
-                "hit_sl": hit_sl_count,
-                "timeout": timeout_count,
-                "win_rate": round(win_rate, 1),
-                "avg_pnl": round(avg_pnl, 2),
-                "avg_duration_hours": round(avg_duration, 1),
-                "avg_profit": round(avg_profit, 2),
-                "avg_loss": round(avg_loss, 2),
-                "total_closed": total_closed
-            }
-        else:
-            rata_rata_confidence = 0
-            confidence_terendah = 0
-            confidence_tertinggi = 0
-            jumlah_confidence_tinggi = 0
-            jumlah_confidence_sedang = 0
-            jumlah_confidence_rendah = 0
-            backtest_stats = {
-                "total_signals": 0,
-                "hit_tp": 0,
-                "hit_sl": 0,
-                "timeout": 0,
-                "win_rate": 0,
-                "avg_pnl": 0,
-                "avg_duration_hours": 0,
-                "avg_profit": 0,
-                "avg_loss": 0,
-                "total_closed": 0
-            }
-        
+        if not perintah.tunggu:
+            return job.ke_dict()
+
+        job = await manajer_sinyal.tunggu(job.job_id)
+        if job.error:
+            raise RuntimeError(job.error)
+
+        hasil_per_mode = {
+            mode: _respons_sinyal(
+                nama_folder_bersih,
+                {
+                    "mode_trading": mode,
+                    "rsi_oversold": perintah.rsi_oversold,
+                    "rsi_overbought": perintah.rsi_overbought,
+                    "rasio_risk_reward": perintah.rasio_risk_reward,
+                    "confidence_minimum": perintah.confidence_minimum,
+                },
+                job.sinyal[mode],
+            )
+            for mode in daftar_mode
+        }
+        if perintah.daftar_mode is None:
+            return {**hasil_per_mode[perintah.mode_trading], "job_id": job.job_id}
         return {
             "folder": nama_folder_bersih,
-            "sistem": versi_sistem,
-            "jumlah_sinyal": len(daftar_sinyal),
-            "parameter": {
-                "mode_trading": perintah.mode_trading,
-                "rsi_oversold": perintah.rsi_oversold,
-                "rsi_overbought": perintah.rsi_overbought,
-                "rasio_risk_reward": perintah.rasio_risk_reward,
-                "confidence_minimum": perintah.confidence_minimum,
-            },
-            "statistik_confidence": {
-                "rata_rata": round(rata_rata_confidence, 4),
-                "terendah": round(confidence_terendah, 4),
-                "tertinggi": round(confidence_tertinggi, 4),
-                "jumlah_tinggi": jumlah_confidence_tinggi,  # >= 70%
-                "jumlah_sedang": jumlah_confidence_sedang,  # 60-70%
-                "jumlah_rendah": jumlah_confidence_rendah,  # < 60%
-            },
-            "backtest_statistics": backtest_stats,  # REAL PERFORMANCE DATA
-            "sinyal": daftar_sinyal,
+            "sistem": VERSI_SISTEM_SINYAL,
+            "job_id": job.job_id,
+            "jumlah_sinyal": {mode: hasil["jumlah_sinyal"] for mode, hasil in hasil_per_mode.items()},
+            "hasil_per_mode": hasil_per_mode,
         }
     except Exception as err:  # pragma: no cover
         raise HTTPException(status_code=500, detail=f"Gagal generate sinyal: {err}") from err
 
 
+@aplikasi.get("/sinyal/status/{job_id}")
+async def status_generate_sinyal(job_id: str):
+    """
+    Status job generate sinyal: progress per berkas; setelah selesai juga
+    statistik dan sinyal per mode (`hasil_per_mode`).
+    """
+    job = manajer_sinyal.ambil_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job generate sinyal '{job_id}' tidak ditemukan.")
+    status = job.ke_dict()
+    if job.status == STATUS_SELESAI:
+        status["hasil_per_mode"] = {
+            mode: _respons_sinyal(job.folder, {"mode_trading": mode, **job.parameter}, job.sinyal[mode])
+            for mode in job.daftar_mode
+        }
+    return status
+
+
+class PermintaanSweepSinyal(BaseModel):
+    """Model request body untuk sweep parameter sinyal."""
+    folder: str = Field(..., description="Nama folder processed yang akan dianalisis.")
+    mode_trading: str = Field("santai", description="Mode trading: 'aktif', 'santai', atau 'pasif' (default: 'santai').")
+    rsi_oversold: Optional[List[float]] = Field(None, description="Grid RSI oversold (0-50). Kosong: nilai mode trading.")
+    rsi_overbought: Optional[List[float]] = Field(None, description="Grid RSI overbought (50-100). Kosong: nilai mode trading.")
+    rasio_risk_reward: Optional[List[float]] = Field(None, description="Grid rasio RR (0.5-10). Kosong: nilai mode trading.")
+    confidence_minimum: Optional[List[float]] = Field(None, description="Grid confidence minimum (0-1, minimal efektif 0.60 seperti /sinyal/generate).")
+    urut_berdasarkan: str = Field("total_pnl", description="Kriteria peringkat: 'total_pnl', 'avg_pnl', 'win_rate', atau 'jumlah_sinyal'.")
+    minimal_sinyal: int = Field(1, ge=0, description="Kombinasi dengan sinyal lebih sedikit dari ini diletakkan di bawah tabel.")
+    batas: Optional[int] = Field(None, ge=1, description="Jumlah baris teratas yang dikembalikan (default: semua).")
+
+
+@aplikasi.post("/sinyal/sweep")
+async def sweep_sinyal(perintah: PermintaanSweepSinyal):
+    """
+    Uji semua kombinasi grid threshold untuk satu mode trading dan kembalikan
+    tabel peringkat.
+
+    Fitur per berkas (filter, S/R, divergence, confluence non-RSI) dihitung
+    sekali dan dipakai ulang oleh semua kombinasi; berkas dipindai paralel di
+    process pool. Sinyal tiap kombinasi sama dengan /sinyal/generate dengan
+    parameter yang sama; statistik memakai backtest bar sesudah sinyal
+    (aturan `backtest_signal`).
+    """
+    from .services.generator_sinyal_unified import TRADING_STYLES
+    from .services.sweep_sinyal import KRITERIA_SWEEP, daftar_kombinasi
+
+    nama_folder_bersih = perintah.folder.strip()
+    path_folder_processed = FOLDER_HASIL_BASE / nama_folder_bersih
+    if not path_folder_processed.exists():
+        raise HTTPException(status_code=404, detail=f"Folder processed '{nama_folder_bersih}' tidak ditemukan. Jalankan pra-proses indikator terlebih dahulu.")
+    if perintah.mode_trading not in TRADING_STYLES:
+        raise HTTPException(status_code=400, detail=f"Mode trading tidak valid. Pilih dari: {list(TRADING_STYLES.keys())}")
+    if perintah.urut_berdasarkan not in KRITERIA_SWEEP:
+        raise HTTPException(status_code=400, detail=f"Kriteria urut harus salah satu dari: {', '.join(KRITERIA_SWEEP)}.")
+
+    for nama, grid, bawah, atas in (
+        ("rsi_oversold", perintah.rsi_oversold, 0, 50),
+        ("rsi_overbought", perintah.rsi_overbought, 50, 100),
+        ("rasio_risk_reward", perintah.rasio_risk_reward, 0.5, 10.0),
+        ("confidence_minimum", perintah.confidence_minimum, 0.0, 1.0),
+    ):
+        if any(not bawah <= nilai <= atas for nilai in grid or []):
+            raise HTTPException(status_code=400, detail=f"Nilai {nama} harus di rentang {bawah}-{atas}.")
+
+    # Confidence minimum EXPERT LEVEL, sama dengan /sinyal/generate
+    grid_confidence = [max(nilai, 0.60) for nilai in perintah.confidence_minimum or []]
+    kombinasi = daftar_kombinasi(
+        perintah.mode_trading,
+        perintah.rsi_oversold,
+        perintah.rsi_overbought,
+        perintah.rasio_risk_reward,
+        grid_confidence,
+    )
+    if len(kombinasi) > MAKS_KOMBINASI_SWEEP:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Jumlah kombinasi {len(kombinasi)} melebihi batas {MAKS_KOMBINASI_SWEEP}.",
+        )
+
+    daftar_berkas = daftar_hasil_preprocess(path_folder_processed)
+    try:
+        hasil = await manajer_sinyal.sweep(
+            daftar_berkas,
+            perintah.mode_trading,
+            kombinasi,
+            urut_berdasarkan=perintah.urut_berdasarkan,
+            minimal_sinyal=perintah.minimal_sinyal,
+        )
+    except Exception as err:  # pragma: no cover
+        raise HTTPException(status_code=500, detail=f"Gagal sweep sinyal: {err}") from err
+
+    tabel = hasil["tabel"]
+    return {
+        "folder": nama_folder_bersih,
+        "sistem": VERSI_SISTEM_SINYAL,
+        "mode_trading": perintah.mode_trading,
+        "urut_berdasarkan": perintah.urut_berdasarkan,
+        "jumlah_berkas": len(daftar_berkas),
+        "jumlah_kombinasi": len(kombinasi),
+        "berkas_error": hasil["berkas_error"],
+        "tabel": tabel[: perintah.batas] if perintah.batas else tabel,
+    }
+
+
 # ============================================================================
 # ENDPOINT BINANCE REAL-TIME DATA
 # ============================================================================
@@ -880,12 +1104,18 @@ async def ambil_klines(
         raise HTTPException(status_code=500, detail=f"Gagal mengambil klines: {err}")
 
 
+# Indikator yang dikembalikan di "indikator_terkini" analisis real-time
+KOLOM_INDIKATOR_TERKINI = ["rsi_6", "rsi_14", "ema_9", "ema_20", "ema_50", "ema_200"]
+
+
 @aplikasi.post("/binance/analyze/{symbol}")
 async def analisis_realtime(
     symbol: str,
     mode_trading: str = Query("santai", description="Mode: aktif, santai, pasif"),
     interval: str = Query("1h", description="Interval: 1h, 4h"),
-    limit: int = Query(100, ge=50, le=500, description="Jumlah candle untuk analisis")
+    limit: int = Query(100, ge=50, le=500, description="Jumlah candle untuk analisis"),
+    bar_terakhir: Optional[int] = Query(None, ge=1, description="Hanya sinyal di N bar terakhir (analisis per kline close)"),
+    lookback_overlap: Optional[int] = Query(None, ge=0, description="Dengan bar_terakhir: filter overlap hanya melihat K bar ke belakang (lebih cepat, bisa berbeda dari scan penuh)")
 ):
     """
     Analisis real-time: Ambil data dari Binance, proses indikator, dan generate sinyal.
@@ -896,9 +1126,16 @@ async def analisis_realtime(
     mode_trading: str - Mode trading (aktif, santai, pasif)
     interval: str - Timeframe untuk analisis
     limit: int - Jumlah candle untuk analisis
+    bar_terakhir: int - Opsional, hanya sinyal yang jatuh di N bar terakhir
+    lookback_overlap: int - Opsional (dengan bar_terakhir), jumlah bar ke belakang untuk filter overlap
     """
-    from .services.praproses_data import tambah_indikator_ke_df
-    from .services.generator_sinyal_unified import scan_sinyal_honest, TRADING_STYLES
+    from .services.indikator_inkremental import cache_indikator_live
+    from .services.generator_sinyal_unified import (
+        scan_sinyal_honest,
+        scan_sinyal_terakhir,
+        kolom_indikator_mode,
+        TRADING_STYLES,
+    )
     
     if mode_trading not in TRADING_STYLES:
         raise HTTPException(status_code=400, detail=f"Mode trading tidak valid. Pilih dari: {list(TRADING_STYLES.keys())}")
@@ -912,18 +1149,30 @@ async def analisis_realtime(
         
         # 2. Convert ke DataFrame
         df = pd.DataFrame(klines)
-        df['open_time'] = pd.to_datetime(df['open_time'], unit='ms')
+        df['open_time'] = normalisasi_waktu(df['open_time'], FORMAT_MS)
         
-        # 3. Tambah indikator
-        df_dengan_indikator = tambah_indikator_ke_df(df)
+        # 3. Tambah indikator (inkremental: hanya bar baru yang dihitung,
+        #    hanya kolom yang dibaca sinyal + indikator_terkini yang disusun)
+        kolom = kolom_indikator_mode(mode_trading) + KOLOM_INDIKATOR_TERKINI
+        df_dengan_indikator = cache_indikator_live.perbarui(symbol.upper(), interval, df, kolom)
         
-        # 4. Generate sinyal
-        sinyal_list = scan_sinyal_honest(
-            df=df_dengan_indikator,
-            pair=symbol.upper(),
-            mode_trading=mode_trading,
-            confidence_minimum=0.60
-        )
+        # 4. Generate sinyal (semua bar, atau hanya N bar terakhir)
+        if bar_terakhir is None:
+            sinyal_list = scan_sinyal_honest(
+                df=df_dengan_indikator,
+                pair=symbol.upper(),
+                mode_trading=mode_trading,
+                confidence_minimum=0.60
+            )
+        else:
+            sinyal_list = scan_sinyal_terakhir(
+                df=df_dengan_indikator,
+                pair=symbol.upper(),
+                mode_trading=mode_trading,
+                jumlah_bar=bar_terakhir,
+                lookback_overlap=lookback_overlap,
+                confidence_minimum=0.60
+            )
         
         # 5. Ambil harga terkini
         harga_terkini = await binance_fetcher.get_ticker_price(symbol.upper())
@@ -973,7 +1222,7 @@ async def prediksi_lstm(
     interval: str - Timeframe untuk analisis
     limit: int - Jumlah candle untuk analisis
     """
-    from .services.praproses_data import tambah_indikator_ke_df
+    from .services.indikator_inkremental import cache_indikator_live
     
     try:
         # 1. Ambil data dari Binance
@@ -984,10 +1233,13 @@ async def prediksi_lstm(
         
         # 2. Convert ke DataFrame
         df = pd.DataFrame(klines)
-        df['open_time'] = pd.to_datetime(df['open_time'], unit='ms')
+        df['open_time'] = normalisasi_waktu(df['open_time'], FORMAT_MS)
         
-        # 3. Tambah indikator
-        df_dengan_indikator = tambah_indikator_ke_df(df)
+        # 3. Tambah indikator (inkremental: hanya bar baru yang dihitung,
+        #    hanya fitur yang dipakai model)
+        df_dengan_indikator = cache_indikator_live.perbarui(
+            symbol.upper(), interval, df, lstm_predictor.config["features"]
+        )
         
         # 4. Get prediction
         prediction = get_prediction_for_symbol(df_dengan_indikator, symbol.upper())
@@ -1071,6 +1323,8 @@ class MLTrainingRequest(BaseModel):
     epochs: int = Field(50, ge=10, le=500)
     batch_size: int = Field(32, ge=8, le=128)
     sequence_length: int = Field(60, ge=10, le=200)
+    mulai: Optional[str] = Field(None, description="Batas awal open_time data training (ISO), opsional")
+    selesai: Optional[str] = Field(None, description="Batas akhir open_time data training (ISO), opsional")
 
 
 @aplikasi.post("/lstm/train")
@@ -1088,19 +1342,19 @@ async def train_lstm_model(request: MLTrainingRequest):
     if not folder_path.exists():
         raise HTTPException(status_code=404, detail=f"Folder '{request.folder}' tidak ditemukan")
     
-    # Get CSV files
-    csv_files = list(folder_path.glob("*.csv"))
-    if not csv_files:
-        raise HTTPException(status_code=404, detail="Tidak ada file CSV di folder")
+    # Get processed files (CSV atau format kolom)
+    dataset = DatasetProcessed(folder_path)
+    if not dataset.berkas:
+        raise HTTPException(status_code=404, detail="Tidak ada file processed di folder")
     
     try:
-        # Load and combine data
-        dfs = []
-        for csv_file in csv_files:
-            df = pd.read_csv(csv_file)
-            dfs.append(df)
-        
-        combined_df = pd.concat(dfs, ignore_index=True)
+        # Load and combine data: hanya kolom fitur LSTM dalam rentang waktu yang diminta
+        kolom_training = list(dict.fromkeys(["open_time", "close", *lstm_predictor.config["features"]]))
+        combined_df = dataset.baca(
+            kolom=kolom_training, mulai=request.mulai, selesai=request.selesai, per_berkas=ringkas_frame
+        )
+        if combined_df.empty:
+            raise ValueError("Tidak ada data dalam rentang waktu yang diminta")
         combined_df = combined_df.sort_values('open_time').reset_index(drop=True)
         
         # Update training status
@@ -1224,7 +1478,9 @@ async def analisis_hybrid(
     mode_trading: str = Query("santai", description="Mode: aktif, santai, pasif"),
     interval: str = Query("1h", description="Interval: 1h, 4h, 1d"),
     limit: int = Query(100, ge=50, le=500, description="Jumlah candle untuk analisis"),
-    market_type: str = Query("FUTURES", description="Market type: SPOT atau FUTURES")
+    market_type: str = Query("FUTURES", description="Market type: SPOT atau FUTURES"),
+    bar_terakhir: Optional[int] = Query(None, ge=1, description="Hanya sinyal teknikal di N bar terakhir (analisis per kline close)"),
+    lookback_overlap: Optional[int] = Query(None, ge=0, description="Dengan bar_terakhir: filter overlap hanya melihat K bar ke belakang (lebih cepat, bisa berbeda dari scan penuh)")
 ):
     """
     HYBRID SIGNAL: Gabungan analisis Technical Indicators + LSTM AI Prediction.
@@ -1244,9 +1500,16 @@ async def analisis_hybrid(
     interval: str - Timeframe untuk analisis
     limit: int - Jumlah candle untuk analisis
     market_type: str - SPOT atau FUTURES
+    bar_terakhir: int - Opsional, hanya sinyal teknikal yang jatuh di N bar terakhir
+    lookback_overlap: int - Opsional (dengan bar_terakhir), jumlah bar ke belakang untuk filter overlap
     """
-    from .services.praproses_data import tambah_indikator_ke_df
-    from .services.generator_sinyal_unified import scan_sinyal_honest, TRADING_STYLES
+    from .services.indikator_inkremental import cache_indikator_live
+    from .services.generator_sinyal_unified import (
+        scan_sinyal_honest,
+        scan_sinyal_terakhir,
+        kolom_indikator_mode,
+        TRADING_STYLES,
+    )
     
     if mode_trading not in TRADING_STYLES:
         raise HTTPException(status_code=400, detail=f"Mode trading tidak valid. Pilih dari: {list(TRADING_STYLES.keys())}")
@@ -1260,18 +1523,30 @@ async def analisis_hybrid(
         
         # 2. Convert ke DataFrame
         df = pd.DataFrame(klines)
-        df['open_time'] = pd.to_datetime(df['open_time'], unit='ms')
+        df['open_time'] = normalisasi_waktu(df['open_time'], FORMAT_MS)
         
-        # 3. Tambah indikator
-        df_dengan_indikator = tambah_indikator_ke_df(df)
+        # 3. Tambah indikator (inkremental: hanya bar baru yang dihitung,
+        #    hanya kolom sinyal teknikal + fitur LSTM)
+        kolom = kolom_indikator_mode(mode_trading) + list(lstm_predictor.config["features"])
+        df_dengan_indikator = cache_indikator_live.perbarui(symbol.upper(), interval, df, kolom)
         
-        # 4. Get Technical Signal
-        sinyal_teknikal = scan_sinyal_honest(
-            df=df_dengan_indikator,
-            pair=symbol.upper(),
-            mode_trading=mode_trading,
-            confidence_minimum=0.50  # Lower threshold untuk hybrid
-        )
+        # 4. Get Technical Signal (semua bar, atau hanya N bar terakhir)
+        if bar_terakhir is None:
+            sinyal_teknikal = scan_sinyal_honest(
+                df=df_dengan_indikator,
+                pair=symbol.upper(),
+                mode_trading=mode_trading,
+                confidence_minimum=0.50  # Lower threshold untuk hybrid
+            )
+        else:
+            sinyal_teknikal = scan_sinyal_terakhir(
+                df=df_dengan_indikator,
+                pair=symbol.upper(),
+                mode_trading=mode_trading,
+                jumlah_bar=bar_terakhir,
+                lookback_overlap=lookback_overlap,
+                confidence_minimum=0.50
+            )
         
         # 5. Get LSTM Prediction
         lstm_prediction = get_prediction_for_symbol(df_dengan_indikator, symbol.upper())
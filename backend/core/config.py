@@ -3,6 +3,7 @@ Konfigurasi aplikasi Leon Liquidity Engine.
 Semua settings dan constants ada di sini.
 """
 
+import os
 from pathlib import Path
 from typing import List
 
@@ -83,6 +84,22 @@ TRADING_MODES = {
 # ============================================================================
 MIN_CONFIDENCE = 0.60  # Minimum confidence untuk generate sinyal
 AUTO_SIGNAL_INTERVAL = 300  # Interval auto signal dalam detik (5 menit)
+# Jumlah worker process untuk generate sinyal folder (default: semua core CPU)
+SINYAL_MAX_WORKERS = int(os.environ.get("LEON_SINYAL_WORKERS", os.cpu_count() or 1))
+MAKS_JOB_SINYAL_TERSIMPAN = 50  # Jumlah job generate sinyal terakhir yang statusnya disimpan
+MAKS_KOMBINASI_SWEEP = 5000  # Batas jumlah kombinasi parameter per request sweep sinyal
+
+# ============================================================================
+# PREPROCESSING CONFIGURATION
+# ============================================================================
+# Jumlah worker process untuk pra-proses folder (default: semua core CPU)
+PRAPROSES_MAX_WORKERS = int(os.environ.get("LEON_PRAPROSES_WORKERS", os.cpu_count() or 1))
+MAKS_JOB_PRAPROSES_TERSIMPAN = 50  # Jumlah job terakhir yang statusnya disimpan
+UKURAN_POTONGAN_UNGGAH = 1024 * 1024  # Byte per potongan saat menulis upload ke disk
+UKURAN_CHUNK_CSV = 200_000  # Baris per chunk saat meringkas CSV upload
+UKURAN_CHUNK_PRAPROSES = 250_000  # Baris per chunk pra-proses out-of-core
+BATAS_BERKAS_BERTAHAP = 256 * 1024 * 1024  # Berkas upload lebih besar dari ini dipra-proses per chunk
+MAKS_CACHE_TIMEFRAME = 32  # Jumlah DataFrame timeframe turunan (resample + indikator) yang di-cache
 
 # ============================================================================
 # LSTM MODEL CONFIGURATION
@@ -14,6 +14,9 @@ import pandas as pd
 from dataclasses import dataclass
 from pathlib import Path
 
+from .penyimpanan_kolom import DatasetProcessed, WaktuFilter
+from .praproses_data import ringkas_frame
+
 @dataclass
 class HasilBacktest:
     """Hasil backtesting untuk satu sinyal."""
@@ -215,21 +218,38 @@ def simulasi_trade_historis(
         alasan_exit="timeout"
     )
 
-def load_data_historis_untuk_backtest(folder_path: str) -> pd.DataFrame:
+def load_data_historis_untuk_backtest(
+    folder_path: str,
+    kolom: Optional[List[str]] = None,
+    mulai: WaktuFilter = None,
+    selesai: WaktuFilter = None,
+    ringkas: bool = False,
+) -> pd.DataFrame:
     """
     Load data historis H1 untuk backtesting.
-    Gabungkan semua file CSV dalam folder menjadi satu DataFrame.
+    Gabungkan semua file processed (CSV atau format kolom) dalam folder menjadi satu DataFrame.
+
+    `kolom` membatasi kolom yang dibaca (open_time selalu ikut), `mulai`/`selesai`
+    membatasi rentang open_time. Berkas format kolom dibaca lewat memory-map.
+    Secara default berkas dimuat apa adanya. `ringkas=True` (untuk riwayat
+    panjang) memakai `ringkas_frame` per berkas: kolom harga/EMA/RSI/ATR tetap
+    float64 sehingga hasil backtest tidak berubah, kolom turunan lain float32.
     """
     folder = Path(folder_path)
     if not folder.exists():
         return pd.DataFrame()
     
+    if kolom is not None:
+        kolom = list(dict.fromkeys(["open_time", *kolom]))
+    dataset = DatasetProcessed(folder)
     all_data = []
     
-    for csv_file in folder.glob("*.csv"):
+    for csv_file in dataset.berkas:
         try:
-            df = pd.read_csv(csv_file)
-            if 'open_time' in df.columns:
+            df = dataset.baca_berkas(csv_file, kolom=kolom, mulai=mulai, selesai=selesai)
+            if ringkas:
+                df = ringkas_frame(df)
+            if 'open_time' in df.columns and not df.empty:
                 df['open_time'] = pd.to_datetime(df['open_time'], errors='coerce')
                 all_data.append(df)
         except Exception as e:
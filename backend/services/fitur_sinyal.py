@@ -0,0 +1,295 @@
+"""
+Fitur sinyal per seri untuk generator sinyal Leon Liquidity Engine.
+
+`scan_sinyal_honest` mengevaluasi ratusan sampai ribuan bar dari deret yang
+sama. Struktur di modul ini dibangun SEKALI per deret (vektor NumPy) lalu
+di-query per bar, sehingga biaya per bar tidak lagi sebanding dengan panjang
+jendela lookback.
+
+IndeksSupportResistance:
+    Untuk setiap bar i, level pivot low / pivot high di jendela [i - W, i)
+    disimpan terurut (baris matriks (n, k), k = jumlah pivot terbanyak dalam
+    satu jendela, padding +inf). Support terdekat = pivot low terbesar di
+    bawah harga, resistance terdekat = pivot high terkecil di atas harga;
+    keduanya satu `searchsorted` (O(log k)) untuk harga berapa pun;
+    `kueri_semua` menjalankan pencarian biner yang sama untuk semua bar
+    serentak (O(n log k)). Membangun indeks: O(n k log k), k <= W.
+
+Filter per bar (doji / market regime, ATR) juga dihitung sekali sebagai
+array lewat `topeng_doji`, `jumlah_jendela`, dan `rata_jendela`.
+
+divergence_np:
+    Indeks swing (posisi pivot terurut) dibangun sekali; untuk setiap bar,
+    dua swing terakhir di jendela lookback adalah dua posisi sebelum
+    `searchsorted(posisi, i)`. Syarat divergence cukup dievaluasi sekali per
+    pasangan swing berurutan, lalu dibaca per bar.
+
+IndeksOverlap:
+    Filter anti-tabrakan: harga entry baru ditolak jika jatuh di rentang
+    entry -> TP sinyal yang sudah diterima. Yang menentukan hanya gabungan
+    rentang tersebut, jadi disimpan sebagai interval lepas terurut; query
+    satu `bisect` (O(log S)), tambah menggabungkan interval yang beririsan.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import List, Literal, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def _level_jendela(nilai: np.ndarray, topeng: np.ndarray, jendela: int) -> np.ndarray:
+    """
+    Matriks (n, k): nilai bar bertopeng True di jendela [i - jendela, i) untuk
+    setiap bar i, terurut naik per baris, sisa baris diisi +inf.
+    """
+    n = nilai.shape[0]
+    posisi = np.flatnonzero(topeng)
+    level = nilai[posisi]
+    bar = np.arange(n)
+    awal = np.searchsorted(posisi, bar - jendela, side="left")
+    akhir = np.searchsorted(posisi, bar, side="left")
+    jumlah = akhir - awal
+    k = int(jumlah.max()) if n else 0
+    if k == 0:
+        return np.full((n, 0), np.inf)
+    kolom = np.arange(k)
+    ambil = np.minimum(awal[:, None] + kolom, posisi.shape[0] - 1)
+    matriks = np.where(kolom < jumlah[:, None], level[ambil], np.inf)
+    matriks.sort(axis=1)
+    return matriks
+
+
+def _cari_per_baris(matriks: np.ndarray, nilai: np.ndarray, side: Literal["left", "right"]) -> np.ndarray:
+    """
+    `np.searchsorted(matriks[i], nilai[i], side)` untuk setiap baris i dari
+    matriks (n, k) yang terurut per baris (nilai tidak NaN): pencarian biner
+    serentak di semua baris, floor(log2 k) + 1 langkah O(n).
+    """
+    n, k = matriks.shape
+    posisi = np.zeros(n, dtype=np.intp)
+    if k == 0:
+        return posisi
+    datar = matriks.ravel()
+    awal_baris = np.arange(n) * k
+    langkah = 1 << (k.bit_length() - 1)
+    while langkah:
+        calon = posisi + langkah
+        level = datar.take(awal_baris + np.minimum(calon, k) - 1)
+        with np.errstate(invalid="ignore"):
+            lolos = (level < nilai) if side == "left" else (level <= nilai)
+        posisi = np.where((calon <= k) & lolos, calon, posisi)
+        langkah >>= 1
+    return posisi
+
+
+def topeng_doji(
+    buka: np.ndarray, tinggi: np.ndarray, rendah: np.ndarray, tutup: np.ndarray, ambang: float
+) -> np.ndarray:
+    """Bool per bar: |close - open| / max(high - low, 1e-9) <= ambang (NaN -> False)."""
+    with np.errstate(invalid="ignore"):
+        return (np.abs(tutup - buka) / np.maximum(tinggi - rendah, 1e-9)) <= ambang
+
+
+def jumlah_jendela(topeng: np.ndarray, jendela: int) -> np.ndarray:
+    """Jumlah True di [i - jendela + 1, i] per bar (jendela awal deret lebih pendek)."""
+    kumulatif = np.cumsum(topeng, dtype=np.int64)
+    hasil = kumulatif.copy()
+    hasil[jendela:] -= kumulatif[:-jendela]
+    return hasil
+
+
+def rata_jendela(nilai: np.ndarray, jendela: int) -> np.ndarray:
+    """
+    Rata-rata `nilai` di [i - jendela + 1, i] per bar, mengabaikan NaN (NaN jika
+    semua NaN); jendela awal deret lebih pendek. Setara dengan
+    `series.iloc[max(0, i - jendela + 1) : i + 1].mean()` sampai bit terakhir:
+    jumlah tiap jendela memakai reduksi NumPy yang sama dengan pandas.
+    """
+    n = nilai.shape[0]
+    terisi = ~np.isnan(nilai)
+    nol = np.where(terisi, nilai, 0.0)
+    jumlah = np.empty(n)
+    awal = min(jendela - 1, n)
+    for i in range(awal):
+        jumlah[i] = nol[: i + 1].sum()
+    if n >= jendela:
+        jumlah[awal:] = sliding_window_view(nol, jendela).sum(axis=1)
+    cacah = jumlah_jendela(terisi, jendela)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(cacah > 0, jumlah / cacah, np.nan)
+
+
+def divergence_np(
+    harga: np.ndarray,
+    rsi: np.ndarray,
+    topeng_pivot: np.ndarray,
+    jendela: int,
+    jenis: Literal["bullish", "bearish"],
+) -> np.ndarray:
+    """
+    Flag divergence untuk semua bar sekaligus.
+
+    Bar i bernilai True jika ada minimal dua swing (topeng_pivot True) di
+    [i - jendela, i) dan dua swing terakhirnya membentuk divergence:
+    bullish = low lebih rendah dengan RSI lebih tinggi, bearish = high lebih
+    tinggi dengan RSI lebih rendah. Perbandingan dengan NaN bernilai False.
+
+    Parameters
+    ----------
+    harga : np.ndarray
+        low (bullish) atau high (bearish) float64.
+    rsi : np.ndarray
+        Kolom RSI float64.
+    topeng_pivot : np.ndarray
+        Topeng bool pivot_low / pivot_high.
+    jendela : int
+        Jumlah bar lookback.
+    jenis : {"bullish", "bearish"}
+    """
+    n = harga.shape[0]
+    posisi = np.flatnonzero(topeng_pivot)
+    hasil = np.zeros(n, dtype=bool)
+    if posisi.shape[0] < 2:
+        return hasil
+
+    # Syarat per pasangan swing berurutan (posisi[j - 1], posisi[j])
+    sebelum, sekarang = posisi[:-1], posisi[1:]
+    with np.errstate(invalid="ignore"):
+        if jenis == "bullish":
+            pasangan = (harga[sekarang] < harga[sebelum]) & (rsi[sekarang] > rsi[sebelum])
+        else:
+            pasangan = (harga[sekarang] > harga[sebelum]) & (rsi[sekarang] < rsi[sebelum])
+
+    bar = np.arange(n)
+    jumlah = np.searchsorted(posisi, bar, side="left")  # swing di [0, i)
+    ada = jumlah >= 2
+    ke = jumlah[ada]
+    hasil[ada] = (posisi[ke - 2] >= bar[ada] - jendela) & pasangan[ke - 2]
+    return hasil
+
+
+@dataclass
+class IndeksSupportResistance:
+    """
+    Level pivot terurut per bar untuk query support/resistance terdekat.
+
+    Bangun dengan `bangun`; `kueri(i, harga)` setara memindai pivot di
+    `jendela` bar sebelum bar i (bar i sendiri tidak ikut).
+    """
+    level_support: np.ndarray
+    level_resistance: np.ndarray
+    jendela: int
+    lebar_pivot: Tuple[int, int]
+
+    @classmethod
+    def bangun(
+        cls,
+        rendah: np.ndarray,
+        tinggi: np.ndarray,
+        pivot_low: np.ndarray,
+        pivot_high: np.ndarray,
+        jendela: int = 50,
+        lebar_pivot: Tuple[int, int] = (3, 3),
+    ) -> "IndeksSupportResistance":
+        """
+        Parameters
+        ----------
+        rendah, tinggi : np.ndarray
+            low / high float64 deret (urut waktu).
+        pivot_low, pivot_high : np.ndarray
+            Topeng bool pivot (kolom pivot_low_<k>_<k> / pivot_high_<k>_<k>).
+        jendela : int
+            Jumlah bar lookback.
+        lebar_pivot : Tuple[int, int]
+            Lebar (kiri, kanan) pivot yang dipakai, untuk dicocokkan pemanggil.
+        """
+        return cls(
+            level_support=_level_jendela(rendah, pivot_low, jendela),
+            level_resistance=_level_jendela(tinggi, pivot_high, jendela),
+            jendela=jendela,
+            lebar_pivot=tuple(lebar_pivot),
+        )
+
+    def __len__(self) -> int:
+        return self.level_support.shape[0]
+
+    def kueri(self, idx: int, harga: float) -> Tuple[Optional[float], Optional[float]]:
+        """(support, resistance) terdekat untuk bar `idx` pada `harga`; None jika tidak ada."""
+        if harga != harga:  # NaN: tidak ada level yang di bawah / di atas
+            return None, None
+        baris_support = self.level_support[idx]
+        posisi = int(np.searchsorted(baris_support, harga, side="left"))
+        support = float(baris_support[posisi - 1]) if posisi > 0 else None
+
+        baris_resistance = self.level_resistance[idx]
+        posisi = int(np.searchsorted(baris_resistance, harga, side="right"))
+        resistance = None
+        if posisi < baris_resistance.shape[0] and baris_resistance[posisi] != np.inf:
+            resistance = float(baris_resistance[posisi])
+        return support, resistance
+
+    def kueri_semua(self, harga: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Support / resistance semua bar sekaligus untuk harga per bar (NaN jika
+        tidak ada), sama dengan `kueri` per bar. Posisi harga di baris masing-
+        masing dicari dengan `_cari_per_baris` (O(n log k)).
+        """
+        n = harga.shape[0]
+        support = np.full(n, np.nan)
+        resistance = np.full(n, np.nan)
+        valid = ~np.isnan(harga)
+        baris = np.arange(n)
+
+        posisi = _cari_per_baris(self.level_support, harga, side="left")
+        ada = valid & (posisi > 0)
+        support[ada] = self.level_support[baris[ada], posisi[ada] - 1]
+
+        posisi = _cari_per_baris(self.level_resistance, harga, side="right")
+        ada = valid & (posisi < self.level_resistance.shape[1])
+        level = np.full(n, np.inf)
+        level[ada] = self.level_resistance[baris[ada], posisi[ada]]
+        ada &= level != np.inf
+        resistance[ada] = level[ada]
+        return support, resistance
+
+
+class IndeksOverlap:
+    """
+    Gabungan rentang harga tertutup [bawah, atas] sebagai interval lepas terurut.
+
+    `kena(harga)` sama dengan memeriksa `bawah <= harga <= atas` ke setiap
+    rentang yang pernah ditambahkan (`check_signal_overlap`), tetapi O(log S).
+    Rentang kosong (bawah > atas) atau NaN tidak pernah memuat harga dan tidak
+    disimpan.
+    """
+
+    def __init__(self) -> None:
+        self._awal: List[float] = []
+        self._akhir: List[float] = []
+
+    def __len__(self) -> int:
+        return len(self._awal)
+
+    def kena(self, harga: float) -> bool:
+        """True jika `harga` berada di salah satu rentang."""
+        if harga != harga:  # NaN
+            return False
+        i = bisect_right(self._awal, harga) - 1
+        return i >= 0 and harga <= self._akhir[i]
+
+    def tambah(self, bawah: float, atas: float) -> None:
+        """Tambah rentang [bawah, atas], digabung dengan interval yang beririsan."""
+        if not bawah <= atas:
+            return
+        # Interval yang beririsan: akhir >= bawah dan awal <= atas (keduanya terurut)
+        kiri = bisect_left(self._akhir, bawah)
+        kanan = bisect_right(self._awal, atas)
+        if kiri < kanan:
+            bawah = min(bawah, self._awal[kiri])
+            atas = max(atas, self._akhir[kanan - 1])
+        self._awal[kiri:kanan] = [bawah]
+        self._akhir[kiri:kanan] = [atas]
@@ -19,11 +19,24 @@ HONEST CONFIDENCE SYSTEM:
 - NO ARTIFICIAL INFLATION!
 """
 
-from typing import Dict, List, Optional, Literal, Tuple
+from typing import Dict, List, Optional, Literal, Sequence, Tuple
 from dataclasses import dataclass
+import numpy as np
 import pandas as pd
 from pathlib import Path
 
+from .fitur_sinyal import (
+    IndeksOverlap,
+    IndeksSupportResistance,
+    divergence_np,
+    jumlah_jendela,
+    rata_jendela,
+    topeng_doji,
+)
+from .penyimpanan_kolom import baca_hasil_preprocess, daftar_hasil_preprocess
+from .praproses_data import PIVOT_DIVERGENCE, PIVOT_SR, kolom_pivot
+from .registri_indikator import KOLOM_DASAR, hitung_kolom
+
 # Periode indikator yang FIXED
 PERIODE_RSI_6: int = 6
 PERIODE_RSI_8: int = 8
@@ -40,6 +53,20 @@ PERIODE_EMA_200: int = 200
 DOJI_THRESHOLD = 0.2
 DOJI_WINDOW = 10
 ATR_MEAN_WINDOW = 20
+ATR_SINYAL_WINDOW = 14
+DIVERGENCE_WINDOW = 30
+SR_WINDOW = 50
+
+# Baris sebelum bar yang dievaluasi agar semua jendela fitur (S/R + pivot,
+# divergence + pivot, ATR, doji) sama dengan evaluasi di frame penuh
+MARGIN_FITUR_SINYAL = max(
+    SR_WINDOW + PIVOT_SR[0], DIVERGENCE_WINDOW + PIVOT_DIVERGENCE[0], ATR_MEAN_WINDOW, ATR_SINYAL_WINDOW, DOJI_WINDOW
+)
+
+# Nama array filter per bar, dihitung sekali per frame oleh `_hitung_fitur_filter`
+KOLOM_JUMLAH_DOJI = f"doji_count_{DOJI_WINDOW}"
+KOLOM_ATR_MEAN = f"atr_14_ma{ATR_MEAN_WINDOW}"
+KOLOM_ATR_SINYAL = f"atr_14_ma{ATR_SINYAL_WINDOW}"
 
 @dataclass
 class TradingStyleConfig:
@@ -122,6 +149,31 @@ TRADING_STYLES: Dict[str, TradingStyleConfig] = {
     ),
 }
 
+
+# Kolom pivot bool hasil preprocessing yang dipakai S/R dan divergence
+KOLOM_PIVOT_GENERATOR: List[str] = [
+    kolom_pivot(jenis, kiri, kanan)
+    for kiri, kanan in (PIVOT_SR, PIVOT_DIVERGENCE)
+    for jenis in ("low", "high")
+]
+
+
+def kolom_indikator_mode(mode_trading: str) -> List[str]:
+    """
+    Kolom indikator yang dibaca `scan_sinyal_honest` untuk satu mode.
+    Dipakai bersama `registri_indikator.hitung_kolom` agar hanya kolom ini yang dihitung.
+    """
+    config = TRADING_STYLES[mode_trading]
+    return list(dict.fromkeys([
+        f"rsi_{config.rsi_period}",
+        f"ema_{config.ema_fast}",
+        f"ema_{config.ema_mid}",
+        f"ema_{config.ema_slow}",
+        f"ema_{PERIODE_EMA_200}",
+        "atr_14",
+    ] + KOLOM_PIVOT_GENERATOR))
+
+
 class SinyalTrading:
     """Class untuk menyimpan informasi sinyal trading."""
     
@@ -158,91 +210,157 @@ class SinyalTrading:
             "pair": self.pair,
         }
 
-def _is_doji(baris: pd.Series) -> bool:
-    """Cek apakah candle termasuk doji (body kecil dibanding range)."""
-    body = abs(baris["close"] - baris["open"])
-    range_candle = max(baris["high"] - baris["low"], 1e-9)
-    return (body / range_candle) <= DOJI_THRESHOLD
+def _hitung_fitur_filter(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    Array filter per bar untuk seluruh `df` (nama -> array), selalu dihitung
+    dari OHLC / atr_14 frame ini dan tidak disisipkan ke `df`:
+    - doji_count_10: jumlah candle doji (body/range <= DOJI_THRESHOLD) di 10 bar terakhir
+    - atr_14_ma20 / atr_14_ma14: rata-rata atr_14 di 20 / 14 bar terakhir (hanya jika ada atr_14)
+    Jendela di awal frame lebih pendek, sama dengan slice `iloc[max(0, i - w + 1) : i + 1]`.
+    """
+    ohlc = [df[nama].to_numpy(dtype=np.float64) for nama in ("open", "high", "low", "close")]
+    hasil = {KOLOM_JUMLAH_DOJI: jumlah_jendela(topeng_doji(*ohlc, DOJI_THRESHOLD), DOJI_WINDOW)}
+    if "atr_14" in df.columns:
+        atr_14 = df["atr_14"].to_numpy(dtype=np.float64)
+        for nama, jendela in ((KOLOM_ATR_MEAN, ATR_MEAN_WINDOW), (KOLOM_ATR_SINYAL, ATR_SINYAL_WINDOW)):
+            hasil[nama] = rata_jendela(atr_14, jendela)
+    return hasil
 
-def _cek_market_regime(df: pd.DataFrame, index_baris: int) -> bool:
+def _cek_market_regime(fitur: Dict[str, np.ndarray], index_baris: int) -> bool:
     """Filter Market Regime: hindari choppy (banyak doji)."""
-    start = max(0, index_baris - DOJI_WINDOW + 1)
-    window = df.iloc[start : index_baris + 1]
-    if window.empty:
-        return True
-    jumlah_doji = window.apply(_is_doji, axis=1).sum()
-    return jumlah_doji < (DOJI_WINDOW * 0.4)
+    return fitur[KOLOM_JUMLAH_DOJI][index_baris] < (DOJI_WINDOW * 0.4)
 
-def _cek_atr_filter(df: pd.DataFrame, index_baris: int) -> bool:
+def _cek_atr_filter(baris: pd.Series, fitur: Dict[str, np.ndarray], index_baris: int) -> bool:
     """ATR filter: hindari volatilitas ekstrem."""
-    if "atr_14" not in df.columns:
+    if "atr_14" not in baris.index:
         return True
-    atr_now = df["atr_14"].iloc[index_baris]
+    atr_now = baris["atr_14"]
     if pd.isna(atr_now) or atr_now == 0:
         return True
-    start = max(0, index_baris - ATR_MEAN_WINDOW + 1)
-    atr_mean = df["atr_14"].iloc[start : index_baris + 1].mean()
+    atr_mean = fitur[KOLOM_ATR_MEAN][index_baris]
     if pd.isna(atr_mean) or atr_mean == 0:
         return True
     return atr_now <= 3 * atr_mean
 
-def _is_pivot_low(df: pd.DataFrame, idx: int, left: int = 2, right: int = 2) -> bool:
-    """Deteksi pivot low untuk support."""
-    if idx - left < 0 or idx + right >= len(df):
-        return False
-    low = df["low"].iloc[idx]
-    return low <= df["low"].iloc[idx - left : idx + right + 1].min()
-
-def _is_pivot_high(df: pd.DataFrame, idx: int, left: int = 2, right: int = 2) -> bool:
-    """Deteksi pivot high untuk resistance."""
-    if idx - left < 0 or idx + right >= len(df):
-        return False
-    high = df["high"].iloc[idx]
-    return high >= df["high"].iloc[idx - left : idx + right + 1].max()
+def _topeng_pivot(
+    df: pd.DataFrame,
+    mode: Literal["low", "high"],
+    left: int,
+    right: int,
+    memo: Optional[Dict[str, np.ndarray]] = None,
+) -> np.ndarray:
+    """
+    Kolom pivot_<mode>_<left>_<right> sebagai array bool. Diambil dari hasil
+    preprocessing (kolom bool); frame tanpa kolom itu (data live) atau dengan
+    kolom tidak lengkap (bar baru disambung tanpa pivot) dihitung lewat registri
+    di salinan kolom OHLCV, `df` tidak diubah. `memo` (dict per frame) menyimpan
+    hasilnya untuk pemanggilan berikutnya.
+    """
+    nama = kolom_pivot(mode, left, right)
+    if memo is not None and nama in memo:
+        return memo[nama]
+    if nama in df.columns and pd.api.types.is_bool_dtype(df[nama]):
+        topeng = df[nama].to_numpy(dtype=bool)
+    else:
+        dasar = df[[kolom for kolom in KOLOM_DASAR if kolom in df.columns]]
+        topeng = hitung_kolom(dasar, [nama])[nama].to_numpy(dtype=bool)
+    if memo is not None:
+        memo[nama] = topeng
+    return topeng
 
 def _deteksi_support_resistance(
     df: pd.DataFrame,
     index_baris: int,
-    window: int = 50,
-    left: int = 3,
-    right: int = 3,
+    window: int = SR_WINDOW,
+    left: int = PIVOT_SR[0],
+    right: int = PIVOT_SR[1],
+    indeks: Optional[IndeksSupportResistance] = None,
+    memo: Optional[Dict[str, np.ndarray]] = None,
 ) -> Dict[str, Optional[float]]:
-    """Deteksi Support dan Resistance terdekat berdasarkan pivot points."""
+    """
+    Deteksi Support dan Resistance terdekat berdasarkan pivot points.
+    `indeks` (dibangun sekali per deret oleh `scan_sinyal_honest`) menjawab
+    dengan satu searchsorted; tanpa indeks, jendela dipindai langsung.
+    """
     start = max(0, index_baris - window)
     current_price = float(df["close"].iloc[index_baris])
     
-    supports = []
-    resistances = []
+    if indeks is not None and indeks.jendela == window and indeks.lebar_pivot == (left, right):
+        support, resistance = indeks.kueri(index_baris, current_price)
+        return {"support": support, "resistance": resistance}
     
-    for i in range(start, index_baris):
-        if _is_pivot_low(df, i, left=left, right=right):
-            low_price = float(df["low"].iloc[i])
-            if low_price < current_price:
-                supports.append(low_price)
-        
-        if _is_pivot_high(df, i, left=left, right=right):
-            high_price = float(df["high"].iloc[i])
-            if high_price > current_price:
-                resistances.append(high_price)
+    lows = df["low"].to_numpy(dtype=np.float64)[start:index_baris]
+    highs = df["high"].to_numpy(dtype=np.float64)[start:index_baris]
+    supports = lows[_topeng_pivot(df, "low", left, right, memo)[start:index_baris]]
+    resistances = highs[_topeng_pivot(df, "high", left, right, memo)[start:index_baris]]
+    supports = supports[supports < current_price]
+    resistances = resistances[resistances > current_price]
     
-    support = max(supports) if supports else None
-    resistance = min(resistances) if resistances else None
+    support = float(supports.max()) if supports.size else None
+    resistance = float(resistances.min()) if resistances.size else None
     
     return {"support": support, "resistance": resistance}
 
+def bangun_indeks_sr(
+    df: pd.DataFrame,
+    window: int = SR_WINDOW,
+    left: int = PIVOT_SR[0],
+    right: int = PIVOT_SR[1],
+    memo: Optional[Dict[str, np.ndarray]] = None,
+) -> IndeksSupportResistance:
+    """Indeks S/R untuk seluruh `df` (dipakai ulang untuk semua bar yang di-scan)."""
+    return IndeksSupportResistance.bangun(
+        df["low"].to_numpy(dtype=np.float64),
+        df["high"].to_numpy(dtype=np.float64),
+        _topeng_pivot(df, "low", left, right, memo),
+        _topeng_pivot(df, "high", left, right, memo),
+        jendela=window,
+        lebar_pivot=(left, right),
+    )
+
+def _flag_divergence(
+    df: pd.DataFrame,
+    kolom_rsi: str,
+    jenis: Literal["bullish", "bearish"],
+    memo: Optional[Dict[str, np.ndarray]] = None,
+) -> np.ndarray:
+    """
+    Flag divergence `jenis` untuk `kolom_rsi` (jendela DIVERGENCE_WINDOW) seluruh
+    frame. Disimpan di `memo` dengan nama divergence_<jenis>_<kolom_rsi>; `df`
+    tidak diubah.
+    """
+    nama = f"divergence_{jenis}_{kolom_rsi}"
+    if memo is not None and nama in memo:
+        return memo[nama]
+    mode = "low" if jenis == "bullish" else "high"
+    flag = divergence_np(
+        df[mode].to_numpy(dtype=np.float64),
+        df[kolom_rsi].to_numpy(dtype=np.float64),
+        _topeng_pivot(df, mode, *PIVOT_DIVERGENCE, memo),
+        DIVERGENCE_WINDOW,
+        jenis,
+    )
+    if memo is not None:
+        memo[nama] = flag
+    return flag
+
 def _deteksi_divergence(
     df: pd.DataFrame,
     index_baris: int,
     kolom_rsi: str,
     jenis: Literal["bullish", "bearish"],
     window: int = 40,
+    memo: Optional[Dict[str, np.ndarray]] = None,
 ) -> bool:
     """Deteksi divergence sederhana berdasarkan swing terakhir."""
     if index_baris < 5:
         return False
     
+    if window == DIVERGENCE_WINDOW:
+        return bool(_flag_divergence(df, kolom_rsi, jenis, memo)[index_baris])
+    
     mode = "low" if jenis == "bullish" else "high"
-    pivots = _cari_pivot(df, index_baris, mode=mode, search_window=window)
+    pivots = _cari_pivot(df, index_baris, mode=mode, search_window=window, memo=memo)
     if len(pivots) < 2:
         return False
     
@@ -265,20 +383,17 @@ def _cari_pivot(
     idx: int,
     mode: Literal["low", "high"],
     search_window: int = 40,
-    left: int = 2,
-    right: int = 2,
+    left: int = PIVOT_DIVERGENCE[0],
+    right: int = PIVOT_DIVERGENCE[1],
+    memo: Optional[Dict[str, np.ndarray]] = None,
 ) -> List[int]:
     """Cari pivot points untuk divergence detection."""
     start = max(0, idx - search_window)
-    kandidat: List[int] = []
     
     step = 1 if search_window <= 40 else 2
     
-    for j in range(start, idx, step):
-        if mode == "low" and _is_pivot_low(df, j, left=left, right=right):
-            kandidat.append(j)
-        elif mode == "high" and _is_pivot_high(df, j, left=left, right=right):
-            kandidat.append(j)
+    topeng = _topeng_pivot(df, mode, left, right, memo)[start:idx:step]
+    kandidat = (start + step * np.flatnonzero(topeng)).tolist()
     
     return kandidat[-2:] if len(kandidat) >= 2 else kandidat
 
@@ -347,6 +462,57 @@ def hitung_confidence_jujur(
     
     return confidence
 
+def hitung_confidence_jujur_np(
+    jumlah_confluence: np.ndarray,
+    total_kondisi: int,
+    ada_divergence: np.ndarray,
+    jarak_sr_persen: np.ndarray,
+) -> np.ndarray:
+    """
+    `hitung_confidence_jujur` untuk banyak bar sekaligus (urutan penjumlahan
+    sama, hasil identik). `jarak_sr_persen` adalah jarak ke support (BELI)
+    atau resistance (JUAL); NaN = tidak ada level (tanpa bonus S/R).
+    """
+    rasio_confluence = jumlah_confluence / total_kondisi
+    bonus_confluence = np.select(
+        [rasio_confluence >= 1.0, rasio_confluence >= 0.83, rasio_confluence >= 0.67, rasio_confluence >= 0.50],
+        [0.20, 0.15, 0.12, 0.08],
+        0.0,
+    )
+    confidence = 0.35 + bonus_confluence
+    confidence = confidence + np.where(ada_divergence, 0.12, 0.0)
+    bonus_sr = np.select(
+        [jarak_sr_persen < 0.5, jarak_sr_persen < 1.0, jarak_sr_persen < 2.0],
+        [0.15, 0.10, 0.08],
+        0.0,
+    )
+    return np.minimum(0.80, confidence + bonus_sr)
+
+def _susun_alasan(
+    config: TradingStyleConfig,
+    tipe: str,
+    jumlah_confluence: int,
+    rsi: float,
+    kondisi_rsi: bool,
+    kondisi_ema_alignment: bool,
+    dekat_sr: bool,
+    jarak_sr_persen: Optional[float],
+    ada_divergence: bool,
+) -> str:
+    """Teks alasan sinyal BELI / JUAL."""
+    beli = tipe == "BELI"
+    alasan_parts = [f"[{config.nama}] Sinyal {tipe}"]
+    alasan_parts.append(f"Konfluensi: {jumlah_confluence}/6")
+    if kondisi_rsi:
+        alasan_parts.append(f"RSI jenuh {'jual' if beli else 'beli'} ({rsi:.1f})")
+    if kondisi_ema_alignment:
+        alasan_parts.append("EMA sejajar naik" if beli else "EMA sejajar turun")
+    if dekat_sr:
+        alasan_parts.append(f"dekat {'Support' if beli else 'Resistance'} ({jarak_sr_persen:.1f}%)")
+    if ada_divergence:
+        alasan_parts.append("divergensi naik" if beli else "divergensi turun")
+    return ", ".join(alasan_parts) + "."
+
 def _build_signal(
     tipe: str,
     entry: float,
@@ -452,6 +618,68 @@ def _build_signal(
         pair=pair,
     )
 
+def _sl_tp_np(
+    beli: np.ndarray,
+    entry: np.ndarray,
+    low: np.ndarray,
+    high: np.ndarray,
+    atr: np.ndarray,
+    config: TradingStyleConfig,
+    rr_ratio: float,
+    support: np.ndarray,
+    resistance: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    SL/TP `_build_signal` untuk banyak bar sekaligus: `beli` True = BELI,
+    False = JUAL; support/resistance NaN = tidak ada level.
+    """
+    with np.errstate(invalid="ignore"):
+        jarak_atr = atr * config.atr_multiplier
+        
+        # BELI: SL di bawah Support, atau fallback ke ATR
+        sl_sr = support * 0.999
+        risk_sr = entry - sl_sr
+        sl_atr = low - jarak_atr
+        risk_atr = entry - sl_atr
+        pakai_sr = (support < entry) & ~(risk_sr <= 0)
+        sl_beli = np.where(pakai_sr, sl_sr, sl_atr)
+        risk_beli = np.where(pakai_sr, risk_sr, np.where(risk_atr <= 0, jarak_atr, risk_atr))
+        tp_atr = entry + (risk_beli * rr_ratio)
+        tp_atr = np.where(tp_atr <= entry, entry + (jarak_atr * rr_ratio), tp_atr)
+        pakai_resistance = (resistance > entry) & (resistance >= entry + risk_beli) & (resistance < tp_atr)
+        tp_beli = np.where(pakai_resistance, resistance * 0.999, tp_atr)
+        tp_beli = np.where(tp_beli <= entry, entry * 1.01, tp_beli)
+        
+        # JUAL: SL di atas Resistance, atau fallback ke ATR
+        sl_sr = resistance * 1.001
+        risk_sr = sl_sr - entry
+        sl_atr = high + jarak_atr
+        risk_atr = sl_atr - entry
+        pakai_sr = (resistance > entry) & ~(risk_sr <= 0)
+        sl_jual = np.where(pakai_sr, sl_sr, sl_atr)
+        risk_jual = np.where(pakai_sr, risk_sr, np.where(risk_atr <= 0, jarak_atr, risk_atr))
+        tp_atr = entry - (risk_jual * rr_ratio)
+        tp_atr = np.where(tp_atr >= entry, entry - (jarak_atr * rr_ratio), tp_atr)
+        pakai_support = (support < entry) & (support <= entry - risk_jual) & (support > tp_atr)
+        tp_jual = np.where(pakai_support, support * 1.001, tp_atr)
+        tp_jual = np.where(tp_jual >= entry, entry * 0.99, tp_jual)
+    
+    return np.where(beli, sl_beli, sl_jual), np.where(beli, tp_beli, tp_jual)
+
+def _timestamp_sinyal(nilai) -> pd.Timestamp:
+    """Timestamp sinyal dari nilai open_time (None / tidak valid -> sekarang)."""
+    if nilai is None:
+        return pd.Timestamp.now()
+    timestamp = nilai
+    if not isinstance(timestamp, pd.Timestamp):
+        try:
+            timestamp = pd.to_datetime(timestamp, errors="coerce", utc=True)
+        except:
+            timestamp = pd.Timestamp.now()
+    if pd.isna(timestamp):
+        timestamp = pd.Timestamp.now()
+    return timestamp
+
 def generate_sinyal_honest(
     df: pd.DataFrame,
     index_baris: int,
@@ -461,6 +689,8 @@ def generate_sinyal_honest(
     threshold_rsi_overbought: float,
     rasio_rr: float,
     confidence_minimum: float = 0.30,
+    indeks_sr: Optional[IndeksSupportResistance] = None,
+    memo: Optional[Dict[str, np.ndarray]] = None,
 ) -> Optional[SinyalTrading]:
     """
     Generate sinyal trading dengan sistem HONEST & UNIFIED.
@@ -471,10 +701,18 @@ def generate_sinyal_honest(
     - S/R requirements realistis (<2%)
     - Confidence JUJUR (30-70%)
     - No artificial inflation
+
+    `indeks_sr` (opsional) adalah `bangun_indeks_sr(df)` yang dipakai ulang antar bar.
+    `memo` (opsional) adalah dict yang sama untuk semua bar satu frame: array
+    per frame (pivot, filter doji/ATR) disimpan di sana, `df` tidak pernah diubah.
     """
     if index_baris < 0 or index_baris >= len(df):
         return None
     
+    if memo is None:
+        memo = {}
+    if KOLOM_JUMLAH_DOJI not in memo:
+        memo.update(_hitung_fitur_filter(df))
     baris = df.iloc[index_baris]
     
     # Tentukan kolom indikator berdasarkan konfigurasi
@@ -500,15 +738,15 @@ def generate_sinyal_honest(
     ema_slow = float(baris[kolom_ema_slow]) if pd.notna(baris[kolom_ema_slow]) else close
     
     # Filter volatilitas dan market regime
-    if not _cek_market_regime(df, index_baris):
+    if not _cek_market_regime(memo, index_baris):
         return None
-    if not _cek_atr_filter(df, index_baris):
+    if not _cek_atr_filter(baris, memo, index_baris):
         return None
     
     # Ambil ATR
-    start_idx = max(0, index_baris - 13)
+    start_idx = max(0, index_baris - ATR_SINYAL_WINDOW + 1)
     if "atr_14" in df.columns:
-        atr = float(df["atr_14"].iloc[start_idx:index_baris + 1].mean())
+        atr = float(memo[KOLOM_ATR_SINYAL][index_baris])
     else:
         atr = df.iloc[start_idx : index_baris + 1][["high", "low"]].apply(
             lambda x: x["high"] - x["low"], axis=1
@@ -517,24 +755,14 @@ def generate_sinyal_honest(
         atr = high - low
     
     # Ambil timestamp
-    if "open_time" in df.columns:
-        timestamp = baris["open_time"]
-        if not isinstance(timestamp, pd.Timestamp):
-            try:
-                timestamp = pd.to_datetime(timestamp, errors="coerce", utc=True)
-            except:
-                timestamp = pd.Timestamp.now()
-        if pd.isna(timestamp):
-            timestamp = pd.Timestamp.now()
-    else:
-        timestamp = pd.Timestamp.now()
+    timestamp = _timestamp_sinyal(baris["open_time"] if "open_time" in df.columns else None)
     
     # EMA 200 filter
     kolom_ema_200 = f"ema_{PERIODE_EMA_200}"
     ema_200_value = float(baris[kolom_ema_200]) if kolom_ema_200 in df.columns else ema_slow
     
     # Deteksi Support/Resistance
-    sr_levels = _deteksi_support_resistance(df, index_baris, window=50)
+    sr_levels = _deteksi_support_resistance(df, index_baris, window=SR_WINDOW, indeks=indeks_sr, memo=memo)
     support = sr_levels.get("support")
     resistance = sr_levels.get("resistance")
     
@@ -576,7 +804,7 @@ def generate_sinyal_honest(
     jumlah_confluence_buy = sum(confluence_conditions_buy)
     
     # Divergence (opsional)
-    ada_divergence_buy = _deteksi_divergence(df, index_baris, kolom_rsi, "bullish", window=30)
+    ada_divergence_buy = _deteksi_divergence(df, index_baris, kolom_rsi, "bullish", window=DIVERGENCE_WINDOW, memo=memo)
     
     # Generate BUY signal jika confluence >= 4 (BALANCED for H1 daily files)
     if jumlah_confluence_buy >= 4:
@@ -593,17 +821,10 @@ def generate_sinyal_honest(
         # Filter berdasarkan confidence minimum
         if confidence >= confidence_minimum:
             # Build alasan
-            alasan_parts = [f"[{config.nama}] Sinyal BELI"]
-            alasan_parts.append(f"Konfluensi: {jumlah_confluence_buy}/6")
-            if kondisi_buy_rsi:
-                alasan_parts.append(f"RSI jenuh jual ({rsi:.1f})")
-            if kondisi_buy_ema_alignment:
-                alasan_parts.append("EMA sejajar naik")
-            if kondisi_buy_near_support and support is not None:
-                alasan_parts.append(f"dekat Support ({jarak_support_persen:.1f}%)")
-            if ada_divergence_buy:
-                alasan_parts.append("divergensi naik")
-            alasan = ", ".join(alasan_parts) + "."
+            alasan = _susun_alasan(
+                config, "BELI", jumlah_confluence_buy, rsi, kondisi_buy_rsi,
+                kondisi_buy_ema_alignment, kondisi_buy_near_support, jarak_support_persen, ada_divergence_buy,
+            )
             
             return _build_signal(
                 "BELI",
@@ -659,7 +880,7 @@ def generate_sinyal_honest(
     jumlah_confluence_sell = sum(confluence_conditions_sell)
     
     # Divergence (opsional)
-    ada_divergence_sell = _deteksi_divergence(df, index_baris, kolom_rsi, "bearish", window=30)
+    ada_divergence_sell = _deteksi_divergence(df, index_baris, kolom_rsi, "bearish", window=DIVERGENCE_WINDOW, memo=memo)
     
     # Generate SELL signal jika confluence >= 4 (BALANCED for H1 daily files)
     if jumlah_confluence_sell >= 4:
@@ -676,17 +897,10 @@ def generate_sinyal_honest(
         # Filter berdasarkan confidence minimum
         if confidence >= confidence_minimum:
             # Build alasan
-            alasan_parts = [f"[{config.nama}] Sinyal JUAL"]
-            alasan_parts.append(f"Konfluensi: {jumlah_confluence_sell}/6")
-            if kondisi_sell_rsi:
-                alasan_parts.append(f"RSI jenuh beli ({rsi:.1f})")
-            if kondisi_sell_ema_alignment:
-                alasan_parts.append("EMA sejajar turun")
-            if kondisi_sell_near_resistance and resistance is not None:
-                alasan_parts.append(f"dekat Resistance ({jarak_resistance_persen:.1f}%)")
-            if ada_divergence_sell:
-                alasan_parts.append("divergensi turun")
-            alasan = ", ".join(alasan_parts) + "."
+            alasan = _susun_alasan(
+                config, "JUAL", jumlah_confluence_sell, rsi, kondisi_sell_rsi,
+                kondisi_sell_ema_alignment, kondisi_sell_near_resistance, jarak_resistance_persen, ada_divergence_sell,
+            )
             
             return _build_signal(
                 "JUAL",
@@ -706,6 +920,267 @@ def generate_sinyal_honest(
     
     return None
 
+@dataclass
+class _KandidatSinyal:
+    """
+    Bar yang lolos `_evaluasi_sinyal_np` (urut bar) dalam bentuk array;
+    SinyalTrading dibuat lewat `sinyal(k)` hanya untuk kandidat yang dipakai.
+    """
+    config: TradingStyleConfig
+    pair: str
+    baris: np.ndarray
+    beli: np.ndarray
+    entry: np.ndarray
+    stop_loss: np.ndarray
+    take_profit: np.ndarray
+    confidence: np.ndarray
+    jumlah_confluence: np.ndarray
+    rsi: np.ndarray
+    kondisi_rsi: np.ndarray
+    kondisi_ema_alignment: np.ndarray
+    dekat_sr: np.ndarray
+    jarak_sr_persen: np.ndarray
+    ada_divergence: np.ndarray
+    waktu: Optional[pd.Series]
+
+    def __len__(self) -> int:
+        return self.baris.shape[0]
+
+    def sinyal(self, k: int) -> SinyalTrading:
+        tipe = "BELI" if self.beli[k] else "JUAL"
+        alasan = _susun_alasan(
+            self.config, tipe, int(self.jumlah_confluence[k]), float(self.rsi[k]), bool(self.kondisi_rsi[k]),
+            bool(self.kondisi_ema_alignment[k]), bool(self.dekat_sr[k]), float(self.jarak_sr_persen[k]),
+            bool(self.ada_divergence[k]),
+        )
+        return SinyalTrading(
+            tipe=tipe,
+            entry=float(self.entry[k]),
+            stop_loss=float(self.stop_loss[k]),
+            take_profit=float(self.take_profit[k]),
+            confidence=float(self.confidence[k]),
+            alasan=alasan,
+            timestamp=_timestamp_sinyal(self.waktu.iloc[k] if self.waktu is not None else None),
+            pair=self.pair,
+        )
+
+@dataclass
+class _FiturEvaluasi:
+    """
+    Array per bar `_evaluasi_sinyal_np` yang tidak bergantung pada threshold
+    RSI, rasio RR, atau confidence minimum: filter, S/R, divergence, dan lima
+    kondisi confluence non-RSI. Dibangun sekali per deret lalu dipakai ulang
+    untuk banyak kombinasi parameter (lihat `sweep_sinyal`).
+    """
+    config: TradingStyleConfig
+    pair: str
+    offset_baris: int
+    buka: np.ndarray
+    tinggi: np.ndarray
+    rendah: np.ndarray
+    tutup: np.ndarray
+    atr: np.ndarray
+    rsi: np.ndarray
+    support: np.ndarray
+    resistance: np.ndarray
+    jarak_support: np.ndarray
+    jarak_resistance: np.ndarray
+    lolos: np.ndarray
+    divergence_buy: np.ndarray
+    divergence_sell: np.ndarray
+    kondisi_buy_ema: np.ndarray
+    kondisi_sell_ema: np.ndarray
+    kondisi_buy_near: np.ndarray
+    kondisi_sell_near: np.ndarray
+    jumlah_buy_lain: np.ndarray
+    jumlah_sell_lain: np.ndarray
+    waktu: Optional[pd.Series]
+
+def _fitur_evaluasi(
+    df: pd.DataFrame,
+    config: TradingStyleConfig,
+    pair: str = "",
+    offset_baris: int = 0,
+) -> Optional[_FiturEvaluasi]:
+    """
+    Bagian `_evaluasi_sinyal_np` yang tidak bergantung threshold.
+    None jika kolom indikator mode tidak ada; kolom yang tidak bisa diproses
+    sebagai float memunculkan KeyError / TypeError / ValueError.
+    """
+    kolom_rsi = f"rsi_{config.rsi_period}"
+    kolom_ema = [f"ema_{config.ema_fast}", f"ema_{config.ema_mid}", f"ema_{config.ema_slow}"]
+    if any(kolom not in df.columns for kolom in [kolom_rsi] + kolom_ema):
+        return None
+    
+    # Kolom filter dipakai sebagai array saja, tanpa disisipkan ke `df`
+    fitur = _hitung_fitur_filter(df)
+    
+    def _kolom(nama: str) -> np.ndarray:
+        if nama not in fitur:
+            fitur[nama] = df[nama].to_numpy(dtype=np.float64)
+        return fitur[nama]
+    
+    buka, tinggi, rendah, tutup = (_kolom(nama) for nama in ("open", "high", "low", "close"))
+    rsi = np.where(np.isnan(_kolom(kolom_rsi)), 50.0, _kolom(kolom_rsi))
+    ema_fast, ema_mid, ema_slow = (np.where(np.isnan(_kolom(nama)), tutup, _kolom(nama)) for nama in kolom_ema)
+    kolom_ema_200 = f"ema_{PERIODE_EMA_200}"
+    ema_200 = _kolom(kolom_ema_200) if kolom_ema_200 in df.columns else ema_slow
+    
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # Filter volatilitas dan market regime
+        lolos = _kolom(KOLOM_JUMLAH_DOJI) < (DOJI_WINDOW * 0.4)
+        if "atr_14" in df.columns:
+            atr_now = _kolom("atr_14")
+            atr_mean = _kolom(KOLOM_ATR_MEAN)
+            lolos &= (
+                np.isnan(atr_now) | (atr_now == 0) | np.isnan(atr_mean) | (atr_mean == 0)
+                | (atr_now <= 3 * atr_mean)
+            )
+            atr = _kolom(KOLOM_ATR_SINYAL)
+        else:
+            atr = rata_jendela(tinggi - rendah, ATR_SINYAL_WINDOW)
+        atr = np.where(np.isnan(atr) | (atr == 0), tinggi - rendah, atr)
+        
+        support, resistance = bangun_indeks_sr(df, window=SR_WINDOW, memo=fitur).kueri_semua(tutup)
+        jarak_support = np.abs(tutup - support) / tutup * 100
+        jarak_resistance = np.abs(tutup - resistance) / tutup * 100
+        
+        bar = np.arange(tutup.shape[0]) + offset_baris
+        divergence_buy = _flag_divergence(df, kolom_rsi, "bullish", fitur) & (bar >= 5)
+        divergence_sell = _flag_divergence(df, kolom_rsi, "bearish", fitur) & (bar >= 5)
+        
+        # 5 kondisi BELI / JUAL selain RSI
+        kondisi_buy_ema = ema_fast > ema_mid
+        kondisi_buy_near = jarak_support < 2.0
+        kondisi_buy_lain = [
+            kondisi_buy_ema,
+            tutup > ema_fast,
+            tutup > ema_200 if config.butuh_trend_filter_ema200 else np.ones_like(lolos),
+            kondisi_buy_near,
+            tutup > buka,
+        ]
+        kondisi_sell_ema = ema_fast < ema_mid
+        kondisi_sell_near = jarak_resistance < 2.0
+        kondisi_sell_lain = [
+            kondisi_sell_ema,
+            tutup < ema_fast,
+            tutup < ema_200 if config.butuh_trend_filter_ema200 else np.ones_like(lolos),
+            kondisi_sell_near,
+            tutup < buka,
+        ]
+    return _FiturEvaluasi(
+        config=config,
+        pair=pair,
+        offset_baris=offset_baris,
+        buka=buka,
+        tinggi=tinggi,
+        rendah=rendah,
+        tutup=tutup,
+        atr=atr,
+        rsi=rsi,
+        support=support,
+        resistance=resistance,
+        jarak_support=jarak_support,
+        jarak_resistance=jarak_resistance,
+        lolos=lolos,
+        divergence_buy=divergence_buy,
+        divergence_sell=divergence_sell,
+        kondisi_buy_ema=kondisi_buy_ema,
+        kondisi_sell_ema=kondisi_sell_ema,
+        kondisi_buy_near=kondisi_buy_near,
+        kondisi_sell_near=kondisi_sell_near,
+        jumlah_buy_lain=np.sum(kondisi_buy_lain, axis=0),
+        jumlah_sell_lain=np.sum(kondisi_sell_lain, axis=0),
+        waktu=df["open_time"] if "open_time" in df.columns else None,
+    )
+
+def _skor_confluence(
+    fitur: _FiturEvaluasi,
+    threshold_rsi_oversold: float,
+    threshold_rsi_overbought: float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (kondisi RSI BELI, kondisi RSI JUAL, jumlah confluence BELI / JUAL dari
+    6 kondisi, confidence BELI / JUAL) untuk sepasang threshold RSI.
+    """
+    kondisi_buy_rsi = fitur.rsi <= threshold_rsi_oversold
+    kondisi_sell_rsi = fitur.rsi >= threshold_rsi_overbought
+    jumlah_buy = fitur.jumlah_buy_lain + kondisi_buy_rsi
+    jumlah_sell = fitur.jumlah_sell_lain + kondisi_sell_rsi
+    confidence_buy = hitung_confidence_jujur_np(jumlah_buy, 6, fitur.divergence_buy, fitur.jarak_support)
+    confidence_sell = hitung_confidence_jujur_np(jumlah_sell, 6, fitur.divergence_sell, fitur.jarak_resistance)
+    return kondisi_buy_rsi, kondisi_sell_rsi, jumlah_buy, jumlah_sell, confidence_buy, confidence_sell
+
+def _kandidat_dari_fitur(
+    fitur: _FiturEvaluasi,
+    skor: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+    baris_scan: np.ndarray,
+    rasio_rr: float,
+    confidence_minimum: float,
+) -> _KandidatSinyal:
+    """Kandidat sinyal bar `baris_scan` (posisi lokal) dari fitur + skor `_skor_confluence`."""
+    kondisi_buy_rsi, kondisi_sell_rsi, jumlah_buy, jumlah_sell, confidence_buy, confidence_sell = skor
+    tutup = fitur.tutup
+    beli = fitur.lolos & (jumlah_buy >= 4) & (confidence_buy >= confidence_minimum)
+    jual = fitur.lolos & ~beli & (jumlah_sell >= 4) & (confidence_sell >= confidence_minimum)
+    # Jalur per bar membagi dengan close saat ada level S/R (ZeroDivisionError -> bar dilewati)
+    galat = fitur.lolos & (tutup == 0) & (
+        ~np.isnan(fitur.support) | (~np.isnan(fitur.resistance) & ~beli)
+    )
+    pilih = baris_scan[(beli | jual)[baris_scan] & ~galat[baris_scan]]
+    
+    b = beli[pilih]
+    stop_loss, take_profit = _sl_tp_np(
+        b, tutup[pilih], fitur.rendah[pilih], fitur.tinggi[pilih], fitur.atr[pilih],
+        fitur.config, rasio_rr, fitur.support[pilih], fitur.resistance[pilih],
+    )
+    return _KandidatSinyal(
+        config=fitur.config,
+        pair=fitur.pair,
+        baris=pilih + fitur.offset_baris,
+        beli=b,
+        entry=tutup[pilih],
+        stop_loss=stop_loss,
+        take_profit=take_profit,
+        confidence=np.where(b, confidence_buy[pilih], confidence_sell[pilih]),
+        jumlah_confluence=np.where(b, jumlah_buy[pilih], jumlah_sell[pilih]),
+        rsi=fitur.rsi[pilih],
+        kondisi_rsi=np.where(b, kondisi_buy_rsi[pilih], kondisi_sell_rsi[pilih]),
+        kondisi_ema_alignment=np.where(b, fitur.kondisi_buy_ema[pilih], fitur.kondisi_sell_ema[pilih]),
+        dekat_sr=np.where(b, fitur.kondisi_buy_near[pilih], fitur.kondisi_sell_near[pilih]),
+        jarak_sr_persen=np.where(b, fitur.jarak_support[pilih], fitur.jarak_resistance[pilih]),
+        ada_divergence=np.where(b, fitur.divergence_buy[pilih], fitur.divergence_sell[pilih]),
+        waktu=fitur.waktu.iloc[pilih] if fitur.waktu is not None else None,
+    )
+
+def _evaluasi_sinyal_np(
+    df: pd.DataFrame,
+    baris_scan: np.ndarray,
+    pair: str,
+    config: TradingStyleConfig,
+    threshold_rsi_oversold: float,
+    threshold_rsi_overbought: float,
+    rasio_rr: float,
+    confidence_minimum: float,
+    offset_baris: int = 0,
+) -> Optional[_KandidatSinyal]:
+    """
+    `generate_sinyal_honest` untuk semua bar `baris_scan` sekaligus.
+
+    Filter, 6 kondisi BELI / JUAL, confidence, dan SL/TP dihitung sebagai
+    operasi array di seluruh bar. Bar yang di jalur per bar memicu exception
+    (ZeroDivisionError saat close = 0) dilewati seperti di `scan_sinyal_honest`.
+    `df` boleh potongan ekor frame; `offset_baris` adalah posisi baris
+    pertamanya di frame asli (posisi di hasil memakai posisi asli).
+    None jika kolom indikator mode tidak ada. Kolom / nilai yang tidak bisa
+    diproses sebagai float memunculkan KeyError / TypeError / ValueError.
+    """
+    fitur = _fitur_evaluasi(df, config, pair, offset_baris)
+    if fitur is None:
+        return None
+    skor = _skor_confluence(fitur, threshold_rsi_oversold, threshold_rsi_overbought)
+    return _kandidat_dari_fitur(fitur, skor, baris_scan, rasio_rr, confidence_minimum)
+
 def check_signal_overlap(new_signal: Dict, existing_signals: List[Dict]) -> bool:
     """
     Check if new signal overlaps with existing signals (anti-tabrakan).
@@ -735,26 +1210,36 @@ def check_signal_overlap(new_signal: Dict, existing_signals: List[Dict]) -> bool
     
     return True
 
-def scan_sinyal_honest(
-    df: pd.DataFrame,
-    pair: str,
+def _saring_overlap(beli: np.ndarray, entry: np.ndarray, take_profit: np.ndarray) -> List[int]:
+    """
+    `check_signal_overlap` berurutan untuk kandidat array: indeks kandidat
+    yang diterima. Nilai dibulatkan seperti `SinyalTrading.to_dict` sebelum
+    dibandingkan; rentang sinyal yang diterima disimpan di `IndeksOverlap`.
+    """
+    diterima: List[int] = []
+    indeks = IndeksOverlap()
+    for k, (tipe_beli, nilai_entry, nilai_tp) in enumerate(zip(beli.tolist(), entry.tolist(), take_profit.tolist())):
+        nilai_entry = round(nilai_entry, 4)
+        nilai_tp = round(nilai_tp, 4)
+        if indeks.kena(nilai_entry):
+            continue
+        diterima.append(k)
+        if tipe_beli:
+            indeks.tambah(nilai_entry, nilai_tp)
+        else:
+            indeks.tambah(nilai_tp, nilai_entry)
+    return diterima
+
+def _parameter_scan(
     mode_trading: str,
-    confidence_minimum: float = 0.30,
-    rsi_oversold: Optional[float] = None,
-    rsi_overbought: Optional[float] = None,
-    rasio_risk_reward: Optional[float] = None,
-) -> List[Dict]:
+    rsi_oversold: Optional[float],
+    rsi_overbought: Optional[float],
+    rasio_risk_reward: Optional[float],
+) -> Tuple[TradingStyleConfig, float, float, float, int, int, int]:
     """
-    Scan semua sinyal dalam DataFrame dengan sistem HONEST & UNIFIED.
-    
-    Returns:
-    --------
-    List[Dict]: List sinyal dalam format dictionary
+    (config, threshold oversold, threshold overbought, rasio RR, minimal baris,
+    bar awal scan, langkah scan) untuk `mode_trading`.
     """
-    # Validasi input
-    if df.empty or mode_trading not in TRADING_STYLES:
-        return []
-    
     config = TRADING_STYLES[mode_trading]
     
     # Override parameters jika disediakan
@@ -770,9 +1255,6 @@ def scan_sinyal_honest(
     else:  # pasif
         min_required = 6    # Lowered for daily H1 files
     
-    if len(df) < min_required:
-        return []
-    
     # Tentukan starting point (LOWERED for H1 daily files)
     if mode_trading == "aktif":
         min_bars = 8    # Lowered for daily H1 files
@@ -786,9 +1268,61 @@ def scan_sinyal_honest(
     # Scan dengan step (optimasi kecepatan)
     skip_step = 1 if mode_trading == "aktif" else (2 if mode_trading == "santai" else 3)
     
+    return (
+        config, threshold_rsi_oversold, threshold_rsi_overbought, rasio_rr,
+        min_required, start_idx, skip_step,
+    )
+
+def _scan_baris(
+    df: pd.DataFrame,
+    baris_scan: np.ndarray,
+    pair: str,
+    config: TradingStyleConfig,
+    threshold_rsi_oversold: float,
+    threshold_rsi_overbought: float,
+    rasio_rr: float,
+    confidence_minimum: float,
+    awal_frame: int = 0,
+    baris_minimal: int = 0,
+) -> List[Dict]:
+    """
+    Sinyal (dict, sudah disaring overlap) untuk bar `baris_scan` yang posisinya
+    >= `baris_minimal`; bar sebelumnya hanya ikut mengisi filter overlap.
+    Jalur array menghitung dari `df.iloc[awal_frame:]`; frame yang tidak bisa
+    diproses sebagai float dievaluasi per bar dengan `generate_sinyal_honest`.
+    """
+    try:
+        kandidat = _evaluasi_sinyal_np(
+            df.iloc[awal_frame:] if awal_frame else df,
+            baris_scan - awal_frame,
+            pair,
+            config,
+            threshold_rsi_oversold,
+            threshold_rsi_overbought,
+            rasio_rr,
+            confidence_minimum,
+            offset_baris=awal_frame,
+        )
+    except (KeyError, TypeError, ValueError):
+        pass
+    else:
+        if kandidat is None:
+            return []
+        # Semua bar dievaluasi sekaligus; hanya filter overlap yang berurutan,
+        # dan dict sinyal hanya dibuat untuk kandidat yang diterima
+        diterima = _saring_overlap(kandidat.beli, kandidat.entry, kandidat.take_profit)
+        return [kandidat.sinyal(k).to_dict() for k in diterima if kandidat.baris[k] >= baris_minimal]
+    
+    # Fallback per bar (frame dengan kolom yang tidak bisa dikonversi ke float)
     sinyal_list = []
+    terpakai = IndeksOverlap()
+    memo: Dict[str, np.ndarray] = {}
+    try:
+        indeks_sr = bangun_indeks_sr(df, window=SR_WINDOW, memo=memo)
+    except (KeyError, TypeError, ValueError):
+        indeks_sr = None
     
-    for i in range(start_idx, len(df), skip_step):
+    for i in baris_scan.tolist():
         try:
             sinyal = generate_sinyal_honest(
                 df=df,
@@ -799,13 +1333,20 @@ def scan_sinyal_honest(
                 threshold_rsi_overbought=threshold_rsi_overbought,
                 rasio_rr=rasio_rr,
                 confidence_minimum=confidence_minimum,
+                indeks_sr=indeks_sr,
+                memo=memo,
             )
             
             if sinyal:
                 # Check for overlap before adding (anti-tabrakan)
                 signal_dict = sinyal.to_dict()
-                if check_signal_overlap(signal_dict, sinyal_list):
-                    sinyal_list.append(signal_dict)
+                if not terpakai.kena(signal_dict["entry"]):
+                    if signal_dict["tipe"] == "BELI":
+                        terpakai.tambah(signal_dict["entry"], signal_dict["take_profit"])
+                    else:
+                        terpakai.tambah(signal_dict["take_profit"], signal_dict["entry"])
+                    if i >= baris_minimal:
+                        sinyal_list.append(signal_dict)
                 
         except Exception as e:
             # Skip error dan lanjut
@@ -813,6 +1354,102 @@ def scan_sinyal_honest(
     
     return sinyal_list
 
+def scan_sinyal_honest(
+    df: pd.DataFrame,
+    pair: str,
+    mode_trading: str,
+    confidence_minimum: float = 0.30,
+    rsi_oversold: Optional[float] = None,
+    rsi_overbought: Optional[float] = None,
+    rasio_risk_reward: Optional[float] = None,
+) -> List[Dict]:
+    """
+    Scan semua sinyal dalam DataFrame dengan sistem HONEST & UNIFIED.
+    
+    Returns:
+    --------
+    List[Dict]: List sinyal dalam format dictionary
+    """
+    # Validasi input
+    if df.empty or mode_trading not in TRADING_STYLES:
+        return []
+    
+    config, oversold, overbought, rasio_rr, min_required, start_idx, skip_step = _parameter_scan(
+        mode_trading, rsi_oversold, rsi_overbought, rasio_risk_reward
+    )
+    if len(df) < min_required:
+        return []
+    
+    return _scan_baris(
+        df,
+        np.arange(start_idx, len(df), skip_step),
+        pair,
+        config,
+        oversold,
+        overbought,
+        rasio_rr,
+        confidence_minimum,
+    )
+
+def scan_sinyal_terakhir(
+    df: pd.DataFrame,
+    pair: str,
+    mode_trading: str,
+    jumlah_bar: int = 1,
+    lookback_overlap: Optional[int] = None,
+    confidence_minimum: float = 0.30,
+    rsi_oversold: Optional[float] = None,
+    rsi_overbought: Optional[float] = None,
+    rasio_risk_reward: Optional[float] = None,
+) -> List[Dict]:
+    """
+    Sinyal pada `jumlah_bar` bar terakhir saja (analisis live per kline close).
+
+    Bar yang dievaluasi sama dengan `scan_sinyal_honest` (bar awal dan
+    langkah per mode), dan dengan `lookback_overlap=None` hasilnya identik
+    dengan sinyal `scan_sinyal_honest(df, ...)` yang jatuh di `jumlah_bar`
+    bar terakhir: bar sebelumnya tetap dievaluasi sebagai array untuk
+    mengisi filter overlap, tetapi dict sinyal hanya dibuat untuk bar target.
+
+    Dengan `lookback_overlap=k`, hanya ekor frame yang dihitung: bar target,
+    k bar sebelumnya (pengisi filter overlap), dan MARGIN_FITUR_SINYAL baris
+    untuk jendela S/R, divergence, doji, dan ATR. Fitur tiap bar tetap sama
+    dengan frame penuh, tetapi sinyal yang lebih tua dari k bar tidak lagi
+    memblokir entry baru, sehingga hasilnya bisa berbeda dari scan penuh.
+
+    Parameters
+    ----------
+    jumlah_bar : int
+        Jumlah bar terakhir yang sinyalnya dikembalikan.
+    lookback_overlap : Optional[int]
+        Jumlah bar sebelum bar target untuk filter overlap; None = seluruh frame.
+    """
+    if df.empty or mode_trading not in TRADING_STYLES or jumlah_bar <= 0:
+        return []
+    
+    config, oversold, overbought, rasio_rr, min_required, start_idx, skip_step = _parameter_scan(
+        mode_trading, rsi_oversold, rsi_overbought, rasio_risk_reward
+    )
+    n = len(df)
+    if n < min_required:
+        return []
+    
+    baris_minimal = max(0, n - jumlah_bar)
+    awal_scan = 0 if lookback_overlap is None else max(0, baris_minimal - lookback_overlap)
+    baris_scan = np.arange(start_idx, n, skip_step)
+    return _scan_baris(
+        df,
+        baris_scan[baris_scan >= awal_scan],
+        pair,
+        config,
+        oversold,
+        overbought,
+        rasio_rr,
+        confidence_minimum,
+        awal_frame=max(0, awal_scan - MARGIN_FITUR_SINYAL),
+        baris_minimal=baris_minimal,
+    )
+
 def backtest_signal(
     entry_price: float,
     stop_loss: float,
@@ -925,6 +1562,65 @@ def backtest_signals_in_file(df: pd.DataFrame, signals: List[Dict]) -> List[Dict
     
     return backtested_signals
 
+def baca_frame_sinyal(path: Path) -> Optional[pd.DataFrame]:
+    """
+    Baca satu hasil preprocess dan bersihkan untuk scan sinyal: open_time
+    datetime urut naik, OHLCV numerik tanpa NaN. None jika kolom kurang atau
+    kurang dari 10 baris (minimum untuk file H1 harian).
+    """
+    df = baca_hasil_preprocess(path)
+    if 'open_time' not in df.columns or len(df) < 10:
+        return None
+    
+    # Convert time and clean data
+    df['open_time'] = pd.to_datetime(df['open_time'], errors='coerce')
+    df = df.dropna(subset=['open_time'])
+    df = df.sort_values('open_time').reset_index(drop=True)
+    
+    # Ensure required columns exist and are numeric
+    required_cols = ['open', 'high', 'low', 'close', 'volume']
+    if not all(col in df.columns for col in required_cols):
+        return None
+    for col in required_cols:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    df = df.dropna(subset=required_cols)
+    
+    return df if len(df) >= 10 else None
+
+def generate_sinyal_berkas_honest(
+    path: Path,
+    daftar_mode: Sequence[str],
+    confidence_minimum: float = 0.30,
+    rsi_oversold: Optional[float] = None,
+    rsi_overbought: Optional[float] = None,
+    rasio_risk_reward: Optional[float] = None,
+) -> Dict[str, List[Dict]]:
+    """
+    Sinyal + hasil backtest sederhana untuk satu file processed, per mode.
+
+    File dibaca sekali untuk semua mode di `daftar_mode`; nama file (stem)
+    dipakai sebagai pair. Dipanggil per file oleh
+    `generate_sinyal_dari_folder_honest` dan oleh worker `pipeline_sinyal`.
+    """
+    df = baca_frame_sinyal(Path(path))
+    hasil: Dict[str, List[Dict]] = {mode: [] for mode in daftar_mode}
+    if df is None:
+        return hasil
+    
+    for mode in daftar_mode:
+        signals = scan_sinyal_honest(
+            df=df,
+            pair=Path(path).stem,  # Use filename as pair name
+            mode_trading=mode,
+            confidence_minimum=confidence_minimum,
+            rsi_oversold=rsi_oversold,
+            rsi_overbought=rsi_overbought,
+            rasio_risk_reward=rasio_risk_reward,
+        )
+        # Add simple backtest results to each signal
+        hasil[mode] = [add_simple_backtest_result(signal, df) for signal in signals]
+    return hasil
+
 def generate_sinyal_dari_folder_honest(
     folder_path: str,
     pair: str,
@@ -935,57 +1631,36 @@ def generate_sinyal_dari_folder_honest(
     rasio_risk_reward: Optional[float] = None,
 ) -> List[Dict]:
     """
-    Generate sinyal dari semua file CSV dalam folder dengan sistem HONEST.
+    Generate sinyal dari semua file processed (CSV atau format kolom) dalam folder dengan sistem HONEST.
     SIMPLIFIED VERSION - Generate signals and add simple backtest results.
+
+    Berurutan dalam satu proses; untuk folder besar / banyak mode gunakan
+    `pipeline_sinyal.manajer_sinyal` (process pool + job yang bisa dipantau).
     """
     folder = Path(folder_path)
     if not folder.exists():
         return []
     
-    all_files = sorted(folder.glob("*.csv"))
+    all_files = daftar_hasil_preprocess(folder)
     if not all_files:
         return []
     
     all_signals = []
     
-    print(f"Processing {len(all_files)} CSV files...")
+    print(f"Processing {len(all_files)} processed files...")
     
     for csv_file in all_files:
         try:
-            df = pd.read_csv(csv_file)
-            print(f"Processing file: {csv_file.name}, rows: {len(df)}")
-            
-            if 'open_time' in df.columns and len(df) >= 10:  # Minimum 10 rows (lowered for H1 daily files)
-                # Convert time and clean data
-                df['open_time'] = pd.to_datetime(df['open_time'], errors='coerce')
-                df = df.dropna(subset=['open_time'])
-                df = df.sort_values('open_time').reset_index(drop=True)
-                
-                # Ensure required columns exist and are numeric
-                required_cols = ['open', 'high', 'low', 'close', 'volume']
-                if all(col in df.columns for col in required_cols):
-                    for col in required_cols:
-                        df[col] = pd.to_numeric(df[col], errors='coerce')
-                    df = df.dropna(subset=required_cols)
-                    
-                    if len(df) >= 10:  # Minimum 10 rows for H1 daily files (24 rows per day)
-                        # Generate signals for this file
-                        signals = scan_sinyal_honest(
-                            df=df,
-                            pair=csv_file.stem,  # Use filename as pair name
-                            mode_trading=mode_trading,
-                            confidence_minimum=confidence_minimum,
-                            rsi_oversold=rsi_oversold,
-                            rsi_overbought=rsi_overbought,
-                            rasio_risk_reward=rasio_risk_reward,
-                        )
-                        
-                        print(f"Generated {len(signals)} signals from {csv_file.name}")
-                        
-                        # Add simple backtest results to each signal
-                        for signal in signals:
-                            enhanced_signal = add_simple_backtest_result(signal, df)
-                            all_signals.append(enhanced_signal)
+            signals = generate_sinyal_berkas_honest(
+                csv_file,
+                [mode_trading],
+                confidence_minimum=confidence_minimum,
+                rsi_oversold=rsi_oversold,
+                rsi_overbought=rsi_overbought,
+                rasio_risk_reward=rasio_risk_reward,
+            )[mode_trading]
+            print(f"Generated {len(signals)} signals from {csv_file.name}")
+            all_signals.extend(signals)
                 
         except Exception as e:
             print(f"Error processing {csv_file.name}: {e}")
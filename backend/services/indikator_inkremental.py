@@ -0,0 +1,314 @@
+"""
+Indikator inkremental untuk Leon Liquidity Engine.
+
+`tambah_indikator_ke_df` selalu menghitung ulang seluruh frame. Untuk data live
+(kline Binance yang dipoll tiap menit) hampir semua baris sudah pernah dihitung,
+jadi di sini state EWM/rolling disimpan dan setiap bar baru cukup diperbarui
+dalam O(1). Nilai yang dihasilkan sama dengan jalur batch untuk riwayat yang
+sama (sampai pembulatan floating point).
+
+KOLOM YANG DIPERBARUI:
+- RSI 6, 8, 10, 14 (+ MA 3 untuk RSI 8 dan 10)
+- EMA 9, 20, 50, 200
+- ATR 14
+- Candle structure, return, volatility_5, distance to EMA, volume_anomaly
+"""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from .kernel_indikator import alpha_dari_alpha, alpha_dari_span
+from .praproses_data import (
+    DAFTAR_PERIODE_EMA,
+    DAFTAR_PERIODE_RSI,
+    DAFTAR_PERIODE_RSI_MA3,
+    PERIODE_RSI_SWING,
+    PERIODE_EMA_20,
+    PERIODE_EMA_50,
+    PERIODE_ATR,
+    WINDOW_RETURN,
+    WINDOW_RSI_MA,
+    StateIndikator,
+    _ke_array_float,
+    hitung_indikator_np,
+)
+from .registri_indikator import hitung_kolom
+
+# Jumlah maksimum baris yang disimpan per symbol di cache live
+MAKS_BARIS_CACHE_LIVE: int = 1000
+
+
+def _update_ewm(nilai_lama: Optional[float], nilai_baru: float, alpha: float) -> float:
+    """
+    Satu langkah EWM `adjust=False`, meniru urutan operasi pandas
+    agar hasilnya identik bit-per-bit dengan `Series.ewm(...).mean()`.
+    """
+    if nilai_lama is None or math.isnan(nilai_lama):
+        return nilai_baru
+    if nilai_lama == nilai_baru:
+        return nilai_lama
+    bobot_lama = 1.0 - alpha
+    return (bobot_lama * nilai_lama + alpha * nilai_baru) / (bobot_lama + alpha)
+
+
+def _std_sampel(nilai: Deque[float]) -> float:
+    """Standar deviasi sampel (ddof=1); 0.0 jika data kurang dari 2."""
+    n = len(nilai)
+    if n < 2:
+        return 0.0
+    rata = sum(nilai) / n
+    return math.sqrt(sum((x - rata) ** 2 for x in nilai) / (n - 1))
+
+
+class IndikatorInkremental:
+    """
+    Menghitung indikator bar demi bar dengan state yang disimpan.
+
+    Contoh:
+        engine = IndikatorInkremental.dari_dataframe(df_historis)
+        baris_baru = engine.tambah_bar(kline_baru)   # O(1)
+    """
+
+    def __init__(self, state: Optional[StateIndikator] = None):
+        self.state = state or StateIndikator()
+        self._alpha_rsi = {p: alpha_dari_alpha(1 / p) for p in DAFTAR_PERIODE_RSI}
+        self._alpha_ema = {p: alpha_dari_span(p) for p in DAFTAR_PERIODE_EMA}
+        self._alpha_atr = alpha_dari_span(PERIODE_ATR)
+
+    @classmethod
+    def dari_dataframe(cls, data_ohlcv: pd.DataFrame) -> "IndikatorInkremental":
+        """Bangun engine dan panaskan state dari seluruh riwayat OHLCV."""
+        engine = cls()
+        engine.panaskan(data_ohlcv)
+        return engine
+
+    def panaskan(self, data_ohlcv: pd.DataFrame) -> List[Dict[str, float]]:
+        """
+        Seperti `tambah_banyak_bar`, tetapi semua bar dihitung sekaligus oleh
+        kernel multi-periode (vectorized) yang melanjutkan state engine.
+        """
+        df = data_ohlcv.sort_values("open_time") if "open_time" in data_ohlcv.columns else data_ohlcv
+        array = {kol: _ke_array_float(df[kol]) for kol in ("open", "high", "low", "close")}
+        volume = _ke_array_float(df["volume"]) if "volume" in df.columns else None
+        if df.empty or any(v is None for v in array.values()) or ("volume" in df.columns and volume is None):
+            return self.tambah_banyak_bar(df)
+
+        kolom = hitung_indikator_np(
+            array["open"], array["high"], array["low"], array["close"], volume, state=self.state
+        )
+        return pd.DataFrame(kolom).to_dict("records")
+
+    def tambah_bar(self, bar: Dict) -> Dict[str, float]:
+        """
+        Masukkan satu bar yang sudah CLOSE dan kembalikan nilai indikatornya.
+        State engine ikut diperbarui.
+        """
+        return self._hitung(self.state, bar)
+
+    def pratinjau_bar(self, bar: Dict) -> Dict[str, float]:
+        """
+        Hitung indikator untuk bar yang belum close (candle berjalan)
+        tanpa mengubah state engine.
+        """
+        return self._hitung(self.state.salin(), bar)
+
+    def tambah_banyak_bar(self, data_ohlcv: pd.DataFrame) -> List[Dict[str, float]]:
+        """Masukkan banyak bar sekaligus (urut berdasarkan open_time)."""
+        df = data_ohlcv.sort_values("open_time") if "open_time" in data_ohlcv.columns else data_ohlcv
+        kolom_volume = df["volume"].tolist() if "volume" in df.columns else [None] * len(df)
+        hasil = []
+        for o, h, l, c, v in zip(
+            df["open"].tolist(), df["high"].tolist(), df["low"].tolist(), df["close"].tolist(), kolom_volume
+        ):
+            hasil.append(self._hitung(self.state, {"open": o, "high": h, "low": l, "close": c, "volume": v}))
+        return hasil
+
+    def _hitung(self, state: StateIndikator, bar: Dict) -> Dict[str, float]:
+        """Update state dengan satu bar dan hasilkan semua kolom indikator."""
+        buka = float(bar["open"])
+        tinggi = float(bar["high"])
+        rendah = float(bar["low"])
+        tutup = float(bar["close"])
+        volume = bar.get("volume")
+
+        tutup_sebelumnya = state.close_terakhir
+        hasil: Dict[str, float] = {}
+
+        # -----------------------------
+        # RSI (EWM alpha = 1/periode atas gain/loss)
+        # -----------------------------
+        for periode in DAFTAR_PERIODE_RSI:
+            if tutup_sebelumnya is None:
+                state.rsi_naik[periode] = None
+                state.rsi_turun[periode] = None
+                rsi = 50.0
+            else:
+                perubahan = tutup - tutup_sebelumnya
+                alpha = self._alpha_rsi[periode]
+                naik = _update_ewm(state.rsi_naik.get(periode), max(perubahan, 0.0), alpha)
+                turun = _update_ewm(state.rsi_turun.get(periode), max(-perubahan, 0.0), alpha)
+                state.rsi_naik[periode] = naik
+                state.rsi_turun[periode] = turun
+                if turun == 0 or math.isnan(turun) or math.isnan(naik):
+                    rsi = 50.0
+                else:
+                    rsi = 100 - (100 / (1 + naik / turun))
+            hasil[f"rsi_{periode}"] = rsi
+
+        for periode in DAFTAR_PERIODE_RSI_MA3:
+            riwayat = state.riwayat_rsi.setdefault(periode, deque(maxlen=WINDOW_RSI_MA))
+            riwayat.append(hasil[f"rsi_{periode}"])
+            hasil[f"rsi_{periode}_ma3"] = sum(riwayat) / len(riwayat)
+
+        # -----------------------------
+        # EMA
+        # -----------------------------
+        for periode in DAFTAR_PERIODE_EMA:
+            state.ema[periode] = _update_ewm(state.ema.get(periode), tutup, self._alpha_ema[periode])
+            hasil[f"ema_{periode}"] = state.ema[periode]
+
+        # -----------------------------
+        # ATR 14
+        # -----------------------------
+        acuan = tutup if tutup_sebelumnya is None else tutup_sebelumnya
+        true_range = max(tinggi - rendah, abs(tinggi - acuan), abs(rendah - acuan))
+        state.atr = _update_ewm(state.atr, true_range, self._alpha_atr)
+        hasil["atr_14"] = state.atr
+
+        # -----------------------------
+        # FITUR CANDLE STRUCTURE
+        # -----------------------------
+        hasil["candle_body"] = tutup - buka
+        hasil["candle_range"] = tinggi - rendah
+        hasil["upper_wick"] = tinggi - max(buka, tutup)
+        hasil["lower_wick"] = min(buka, tutup) - rendah
+
+        return_1 = (tutup / acuan) - 1.0
+        hasil["return_1"] = return_1
+        if len(state.riwayat_close) < WINDOW_RETURN:
+            hasil["return_5"] = (tutup / tutup) - 1.0
+        else:
+            hasil["return_5"] = (tutup / state.riwayat_close[0]) - 1.0
+
+        state.riwayat_return.append(return_1)
+        hasil["volatility_5"] = _std_sampel(state.riwayat_return)
+
+        hasil["distance_to_ema_20"] = tutup - state.ema[PERIODE_EMA_20]
+        hasil["distance_to_ema_50"] = tutup - state.ema[PERIODE_EMA_50]
+        hasil["rsi_position"] = hasil[f"rsi_{PERIODE_RSI_SWING}"] / 100.0
+
+        if volume is None:
+            hasil["volume_anomaly"] = 1.0
+        else:
+            volume = float(volume)
+            state.riwayat_volume.append(volume)
+            rata_volume = sum(state.riwayat_volume) / len(state.riwayat_volume)
+            hasil["volume_anomaly"] = volume / (rata_volume if rata_volume != 0 else 1.0)
+
+        state.riwayat_close.append(tutup)
+        state.close_terakhir = tutup
+        state.jumlah_bar += 1
+        return hasil
+
+
+class CacheIndikatorLive:
+    """
+    Cache indikator per (symbol, interval) untuk endpoint live.
+
+    Kline yang sudah close di-commit ke state engine, candle terakhir (yang
+    masih berjalan) hanya di-pratinjau.
+
+    Hasil harus sama dengan `tambah_indikator_ke_df` pada frame yang di-fetch,
+    dan EWM frame itu dimulai dingin di bar pertamanya. Karena itu cache hanya
+    dipakai ulang jika bar close yang tersimpan adalah awalan dari bar close
+    frame (bar pertama sama, tanpa bar yang berbeda); hanya bar sesudahnya
+    yang dihitung. Poll dengan bar close yang sama (candle berjalan saja yang
+    berubah) cukup mempratinjau satu bar. Jendela yang bergeser (bar baru close
+    pada `limit` tetap), `limit` yang berubah, atau gap membuat state dibangun
+    ulang dari frame itu lewat kernel vektor.
+    """
+
+    def __init__(self, maks_baris: int = MAKS_BARIS_CACHE_LIVE):
+        self.maks_baris = maks_baris
+        self._entri: Dict[Tuple[str, str], Dict] = {}
+
+    def reset(self, symbol: Optional[str] = None) -> None:
+        """Hapus cache untuk satu symbol (atau semuanya)."""
+        if symbol is None:
+            self._entri.clear()
+            return
+        for kunci in [k for k in self._entri if k[0] == symbol]:
+            del self._entri[kunci]
+
+    def perbarui(
+        self,
+        symbol: str,
+        interval: str,
+        df: pd.DataFrame,
+        kolom: Optional[Sequence[str]] = None,
+    ) -> pd.DataFrame:
+        """
+        Tambahkan kolom indikator ke `df` (kline terbaru, urut naik berdasarkan
+        open_time) memakai state yang tersimpan untuk (symbol, interval).
+
+        `kolom` membatasi kolom indikator yang disusun ke DataFrame hasil
+        (misal `kolom_indikator_mode(mode)`); None = semua kolom. Kolom yang
+        tidak diperbarui engine inkremental dihitung lewat `hitung_kolom`.
+        """
+        df = df.sort_values("open_time").reset_index(drop=True)
+        if df.empty:
+            return df
+
+        kunci = (symbol, interval)
+        entri = self._entri.get(kunci)
+        df_close = df.iloc[:-1]
+        waktu_close = df_close["open_time"].tolist()
+
+        # Rebuild jika belum ada cache atau bar close yang tersimpan bukan awalan
+        # bar close df (bar pertama lain, limit berubah, gap, atau bar berbeda)
+        if entri is None or waktu_close[:len(entri["waktu"])] != entri["waktu"]:
+            entri = {"engine": IndikatorInkremental(), "waktu": [], "baris": []}
+        df_baru = df_close.iloc[len(entri["waktu"]):]
+
+        if not df_baru.empty:
+            entri["baris"].extend(entri["engine"].panaskan(df_baru))
+            entri["waktu"].extend(df_baru["open_time"].tolist())
+        if len(entri["waktu"]) <= self.maks_baris:
+            self._entri[kunci] = entri
+        else:
+            # Frame lebih panjang dari batas cache: dihitung tetapi tidak disimpan
+            self._entri.pop(kunci, None)
+
+        bar_berjalan = df.iloc[-1]
+        baris_berjalan = entri["engine"].pratinjau_bar(bar_berjalan.to_dict())
+
+        daftar_baris = entri["baris"][:len(waktu_close)] + [baris_berjalan]
+        if kolom is None:
+            df_indikator = pd.DataFrame(daftar_baris, index=df.index)
+            kolom_lain: List[str] = []
+        else:
+            diminta = [nama for nama in dict.fromkeys(kolom) if nama not in df.columns]
+            df_indikator = pd.DataFrame(
+                {
+                    nama: [baris.get(nama, math.nan) for baris in daftar_baris]
+                    for nama in diminta
+                    if nama in baris_berjalan
+                },
+                index=df.index,
+            )
+            kolom_lain = [nama for nama in diminta if nama not in baris_berjalan]
+        kolom_lama = [kol for kol in df.columns if kol not in df_indikator.columns]
+        hasil = pd.concat([df[kolom_lama], df_indikator], axis=1)
+        if kolom_lain:
+            # Kolom di luar engine inkremental (misal rsi_21) dihitung lewat registri
+            hitung_kolom(hasil, kolom_lain)
+        return hasil
+
+
+# Global instance
+cache_indikator_live = CacheIndikatorLive()
@@ -0,0 +1,196 @@
+"""
+Indikator mode panel (banyak simbol sekaligus) untuk Leon Liquidity Engine.
+
+Watchlist / pair favorit berisi puluhan simbol. Daripada menjalankan
+`tambah_indikator_ke_df` sekali per simbol, OHLCV semua simbol disusun menjadi
+panel 2-D (simbol x waktu) yang disejajarkan pada open_time, lalu semua
+indikator dihitung sekali oleh kernel NumPy di sepanjang sumbu waktu:
+
+    panel = susun_panel({"BTCUSDT": df_btc, "ETHUSDT": df_eth, ...})
+    hasil = hitung_indikator_panel(panel)
+    hasil.kolom_simbol("ETHUSDT")["rsi_14"]   # view baris ETH
+    hasil.frame("ETHUSDT")                     # DataFrame per simbol
+
+Simbol yang tidak punya bar pada suatu open_time (belum listing, bar hilang)
+bernilai NaN di panel. Sebelum dihitung, bar valid tiap simbol dirapatkan ke
+kiri sehingga setiap simbol dihitung seolah-olah deretnya sendiri: nilainya
+sama dengan `tambah_indikator_ke_df` untuk frame simbol tersebut (sampai
+pembulatan floating point). Bar dengan OHLCV NaN diperlakukan sebagai bar hilang.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .praproses_data import DAFTAR_PERIODE_EMA, DAFTAR_PERIODE_RSI, hitung_indikator_np, hitung_pivot_np
+from .waktu_epoch import ke_epoch_ms
+
+KOLOM_HARGA_PANEL = ("open", "high", "low", "close")
+
+
+@dataclass
+class PanelOHLCV:
+    """OHLCV banyak simbol, disejajarkan pada `waktu` (int64 epoch ms, urut naik)."""
+    simbol: List[str]
+    waktu: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: Optional[np.ndarray] = None
+
+    @property
+    def valid(self) -> np.ndarray:
+        """Topeng (simbol, waktu): True jika simbol punya bar lengkap pada open_time itu."""
+        topeng = np.isfinite(self.open) & np.isfinite(self.high) & np.isfinite(self.low) & np.isfinite(self.close)
+        if self.volume is not None:
+            topeng &= np.isfinite(self.volume)
+        return topeng
+
+
+@dataclass
+class HasilPanel:
+    """Kolom indikator panel: nama kolom -> array (simbol, waktu), NaN (pivot: False) di luar bar valid."""
+    simbol: List[str]
+    waktu: np.ndarray
+    valid: np.ndarray
+    kolom: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    def indeks(self, simbol: str) -> int:
+        try:
+            return self.simbol.index(simbol)
+        except ValueError:
+            raise KeyError(f"Simbol '{simbol}' tidak ada di panel.") from None
+
+    def kolom_simbol(self, simbol: str) -> Dict[str, np.ndarray]:
+        """View baris `simbol` untuk setiap kolom (tanpa salinan, sepanjang seluruh waktu panel)."""
+        i = self.indeks(simbol)
+        return {nama: nilai[i] for nama, nilai in self.kolom.items()}
+
+    def frame(self, simbol: str) -> pd.DataFrame:
+        """DataFrame open_time + OHLCV + indikator untuk bar valid `simbol` saja."""
+        i = self.indeks(simbol)
+        baris = self.valid[i]
+        pilih = slice(None) if baris.all() else baris
+        data: Dict[str, np.ndarray] = {"open_time": self.waktu[pilih].view("datetime64[ms]")}
+        for nama, nilai in self.kolom.items():
+            data[nama] = nilai[i, pilih]
+        return pd.DataFrame(data, copy=False)
+
+
+def susun_panel(frame_per_simbol: Mapping[str, pd.DataFrame]) -> PanelOHLCV:
+    """
+    Susun panel dari DataFrame OHLCV per simbol.
+
+    open_time setiap frame dinormalisasi ke epoch ms (`waktu_epoch`) dan panel
+    memakai gabungan semua open_time. Baris duplikat per simbol: yang terakhir dipakai.
+    Kolom volume ikut jika ada di semua frame.
+    """
+    simbol = list(frame_per_simbol)
+    waktu_per_simbol = [ke_epoch_ms(frame_per_simbol[s]["open_time"]) for s in simbol]
+    waktu = np.unique(np.concatenate(waktu_per_simbol)) if simbol else np.empty(0, dtype=np.int64)
+    ada_volume = bool(simbol) and all("volume" in frame_per_simbol[s].columns for s in simbol)
+
+    bentuk = (len(simbol), waktu.shape[0])
+    nilai = {
+        nama: np.full(bentuk, np.nan)
+        for nama in KOLOM_HARGA_PANEL + (("volume",) if ada_volume else ())
+    }
+    for i, (nama_simbol, waktu_simbol) in enumerate(zip(simbol, waktu_per_simbol)):
+        df = frame_per_simbol[nama_simbol]
+        posisi = np.searchsorted(waktu, waktu_simbol)
+        for nama, panel in nilai.items():
+            panel[i, posisi] = pd.to_numeric(df[nama], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    return PanelOHLCV(simbol=simbol, waktu=waktu, **nilai)
+
+
+def _rapatkan(valid: np.ndarray):
+    """
+    Urutan kolom yang memindahkan bar valid tiap simbol ke kiri (urutan waktu
+    tetap) dan array OHLCV hasil perapatan. Sisa di kanan diisi nilai valid
+    terakhir agar kernel tetap bebas NaN; nilainya dibuang setelah dihitung.
+    """
+    urutan = np.argsort(~valid, axis=1, kind="stable")
+    jumlah_valid = valid.sum(axis=1)
+    isi = np.arange(valid.shape[1])[None, :] < jumlah_valid[:, None]
+    terakhir = np.maximum(jumlah_valid - 1, 0)[:, None]
+
+    def _ambil(nilai: np.ndarray) -> np.ndarray:
+        rapat = np.take_along_axis(nilai, urutan, axis=1)
+        pengisi = np.take_along_axis(rapat, terakhir, axis=1)
+        rapat = np.where(isi, rapat, pengisi)
+        return np.where(np.isfinite(rapat), rapat, 1.0)
+
+    return urutan, isi, jumlah_valid, _ambil
+
+
+def hitung_indikator_panel(
+    panel: PanelOHLCV,
+    periode_rsi_tambahan: Sequence[int] = (),
+    periode_ema_tambahan: Sequence[int] = (),
+) -> HasilPanel:
+    """
+    Hitung semua kolom `tambah_indikator_ke_df` untuk semua simbol panel dalam satu pemanggilan kernel.
+
+    Parameters
+    ----------
+    panel : PanelOHLCV
+        Hasil `susun_panel`.
+    periode_rsi_tambahan, periode_ema_tambahan : Sequence[int]
+        Periode RSI / span EMA ekstra, seperti di `tambah_indikator_ke_df`.
+
+    Returns
+    -------
+    HasilPanel
+        Kolom OHLCV + indikator berbentuk (simbol, waktu); NaN di luar bar valid.
+    """
+    valid = panel.valid
+    sumber = {nama: getattr(panel, nama) for nama in KOLOM_HARGA_PANEL}
+    if panel.volume is not None:
+        sumber["volume"] = panel.volume
+
+    rapat = bool(valid.size) and not valid.all()
+    if rapat:
+        urutan, isi, jumlah_valid, ambil = _rapatkan(valid)
+        masukan = {nama: ambil(nilai) for nama, nilai in sumber.items()}
+    else:
+        masukan = sumber
+        jumlah_valid = None
+
+    kolom_indikator = hitung_indikator_np(
+        masukan["open"],
+        masukan["high"],
+        masukan["low"],
+        masukan["close"],
+        masukan.get("volume"),
+        periode_rsi=DAFTAR_PERIODE_RSI + tuple(periode_rsi_tambahan),
+        periode_ema=DAFTAR_PERIODE_EMA + tuple(periode_ema_tambahan),
+    )
+    # Pivot di ujung bar valid tiap simbol tidak boleh melihat isian perapatan
+    kolom_indikator.update(hitung_pivot_np(masukan["low"], masukan["high"], panjang=jumlah_valid))
+
+    kolom: Dict[str, np.ndarray] = {nama: np.where(valid, nilai, np.nan) for nama, nilai in sumber.items()}
+    for nama, nilai in kolom_indikator.items():
+        if rapat and nilai.dtype == bool:
+            hasil = np.zeros(valid.shape, dtype=bool)
+            np.put_along_axis(hasil, urutan, nilai & isi, axis=1)
+            nilai = hasil
+        elif rapat:
+            # Kembalikan ke posisi waktu asli; sisa perapatan jatuh di bar tidak valid
+            hasil = np.full(valid.shape, np.nan)
+            np.put_along_axis(hasil, urutan, np.where(isi, nilai, np.nan), axis=1)
+            nilai = hasil
+        kolom[nama] = nilai
+    return HasilPanel(simbol=list(panel.simbol), waktu=panel.waktu, valid=valid, kolom=kolom)
+
+
+def hitung_indikator_banyak(frame_per_simbol: Mapping[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    """Pintasan: `susun_panel` + `hitung_indikator_panel`, hasil sebagai DataFrame per simbol."""
+    if not frame_per_simbol:
+        return {}
+    hasil = hitung_indikator_panel(susun_panel(frame_per_simbol))
+    return {simbol: hasil.frame(simbol) for simbol in hasil.simbol}
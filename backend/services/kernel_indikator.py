@@ -0,0 +1,321 @@
+"""
+Kernel indikator berbasis NumPy untuk Leon Liquidity Engine.
+
+Semua indikator di `tambah_indikator_ke_df` dihitung langsung dari array
+float64 yang contiguous, tanpa rantai Series pandas (diff/clip/replace/fillna)
+dan tanpa `pd.NA` yang memaksa dtype object.
+
+EWM `adjust=False` adalah rekurensi linear y[t] = r * y[t-1] + u[t].
+Rekurensi ini dihitung per blok dengan perkalian matriks (semua faktor <= 1
+sehingga stabil secara numerik), lalu carry antar blok diselesaikan secara
+rekursif. Hasilnya sama dengan pandas sampai pembulatan floating point.
+
+Semua kernel bekerja sepanjang sumbu terakhir, sehingga input 2-D
+(simbol x waktu) menghitung banyak simbol sekaligus (lihat `indikator_panel`).
+
+CATATAN: kernel mengasumsikan input OHLCV bebas NaN. Untuk data yang masih
+mengandung NaN, `praproses_data` memakai jalur pandas lama.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Ukuran blok untuk rekurensi EWM (trade-off ukuran matmul vs kedalaman rekursi)
+UKURAN_BLOK_EWM: int = 64
+
+
+def alpha_dari_span(span: int) -> float:
+    """Alpha EWM persis seperti pandas `ewm(span=...)` (lewat center of mass)."""
+    com = (span - 1) / 2
+    return 1.0 / (1.0 + com)
+
+
+def alpha_dari_alpha(alpha: float) -> float:
+    """Alpha EWM persis seperti pandas `ewm(alpha=...)` (lewat center of mass)."""
+    com = (1 - alpha) / alpha
+    return 1.0 / (1.0 + com)
+
+
+def _rekursi_linear(u: np.ndarray, r) -> np.ndarray:
+    """
+    Selesaikan y[t] = r * y[t-1] + u[t] dengan y[-1] = 0 sepanjang sumbu terakhir.
+
+    `u` boleh 1-D (n,) atau 2-D (k, n): k deret sekaligus dengan faktor `r`
+    per deret (k,), sehingga banyak EWM dihitung bersamaan dalam satu traversal.
+
+    Array dipecah menjadi blok berukuran `UKURAN_BLOK_EWM`. Di dalam blok,
+    y lokal = L @ u dengan L[t, s] = r^(t-s). Nilai akhir tiap blok membentuk
+    rekurensi yang sama dengan faktor r^B, diselesaikan secara rekursif.
+    """
+    satu_dimensi = u.ndim == 1
+    n = u.shape[-1]
+    u2 = u.reshape(-1, n)
+    k = u2.shape[0]
+    if n == 0:
+        return u.astype(np.float64)
+    faktor = np.broadcast_to(np.asarray(r, dtype=np.float64), (k,))
+
+    b = min(UKURAN_BLOK_EWM, n)
+    pangkat = faktor[:, None] ** np.arange(b + 1, dtype=np.float64)[None, :]  # (k, b+1)
+    indeks = np.arange(b)
+    selisih = indeks[None, :] - indeks[:, None]
+    # Matriks transpos per deret: M[s, t] = r^(t-s) untuk t >= s
+    matriks = np.where(selisih >= 0, pangkat[:, np.clip(selisih, 0, b)], 0.0)  # (k, b, b)
+
+    jumlah_blok = -(-n // b)
+    blok = np.zeros((k, jumlah_blok * b), dtype=np.float64)
+    blok[:, :n] = u2
+    lokal = blok.reshape(k, jumlah_blok, b) @ matriks  # (k, m, b)
+
+    if jumlah_blok > 1:
+        akhir_blok = _rekursi_linear(np.ascontiguousarray(lokal[:, :, -1]), pangkat[:, b])  # (k, m)
+        lokal[:, 1:, :] += akhir_blok[:, :-1, None] * pangkat[:, None, 1:]
+
+    hasil = lokal.reshape(k, -1)[:, :n]
+    return hasil[0] if satu_dimensi else hasil
+
+
+def ewm_np(nilai: np.ndarray, alpha: float, awal: Optional[float] = None) -> np.ndarray:
+    """
+    EWM mean `adjust=False` (setara `Series.ewm(alpha=alpha, adjust=False).mean()`).
+    NaN di awal array dilewati seperti pandas; setelah itu input harus bebas NaN.
+    `awal` adalah nilai EWM terakhir dari deret sebelumnya (melanjutkan deret).
+
+    Input 2-D (k, n) menghitung k deret sekaligus dan harus bebas NaN
+    (`awal` tidak didukung).
+    """
+    if nilai.ndim > 1:
+        if nilai.shape[-1] == 0:
+            return nilai.astype(np.float64)
+        u = alpha * nilai
+        u[..., 0] = nilai[..., 0]
+        return _rekursi_linear(u, 1.0 - alpha)
+    hasil = np.full(nilai.shape[0], np.nan)
+    valid = ~np.isnan(nilai)
+    if not valid.any():
+        return hasil
+    mulai = int(np.argmax(valid))
+    u = alpha * nilai[mulai:]
+    if awal is None or np.isnan(awal):
+        u[0] = nilai[mulai]
+    else:
+        u[0] += (1.0 - alpha) * awal
+    hasil[mulai:] = _rekursi_linear(u, 1.0 - alpha)
+    return hasil
+
+
+def _jendela(nilai: np.ndarray, window: int) -> np.ndarray:
+    """View (..., n, window) berisi nilai rolling, diawali padding nol."""
+    pad = np.concatenate((np.zeros(nilai.shape[:-1] + (window - 1,), dtype=np.float64), nilai), axis=-1)
+    return sliding_window_view(pad, window, axis=-1)
+
+
+def _jumlah_observasi(n: int, window: int) -> np.ndarray:
+    """Jumlah observasi per baris untuk rolling `min_periods=1`."""
+    return np.minimum(np.arange(1, n + 1), window).astype(np.float64)
+
+
+def rolling_mean_np(nilai: np.ndarray, window: int) -> np.ndarray:
+    """Setara `Series.rolling(window, min_periods=1).mean()`."""
+    return _jendela(nilai, window).sum(axis=-1) / _jumlah_observasi(nilai.shape[-1], window)
+
+
+def rolling_std_np(nilai: np.ndarray, window: int) -> np.ndarray:
+    """Setara `Series.rolling(window, min_periods=1).std()` (ddof=1, NaN jika 1 observasi)."""
+    n = nilai.shape[-1]
+    jendela = _jendela(nilai, window)
+    jumlah = _jumlah_observasi(n, window)
+    rata = jendela.sum(axis=-1) / jumlah
+    # Padding nol di awal tidak boleh ikut dihitung sebagai deviasi
+    topeng = np.arange(window)[None, :] >= (window - jumlah)[:, None]
+    deviasi = np.where(topeng, jendela - rata[..., None], 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        varians = (deviasi * deviasi).sum(axis=-1) / (jumlah - 1)
+    varians[..., jumlah < 2] = np.nan
+    return np.sqrt(varians)
+
+
+def geser_np(nilai: np.ndarray, langkah: int) -> np.ndarray:
+    """Setara `Series.shift(langkah).fillna(Series)`: nilai awal diisi nilai baris itu sendiri."""
+    hasil = nilai.copy()
+    if langkah < nilai.shape[-1]:
+        hasil[..., langkah:] = nilai[..., :-langkah]
+    return hasil
+
+
+def pivot_np(nilai: np.ndarray, kiri: int, kanan: int, jenis: str = "low") -> np.ndarray:
+    """
+    Topeng pivot (bool): True jika nilai[i] <= min ("low") / >= max ("high")
+    jendela [i - kiri, i + kanan]. Bar yang jendelanya terpotong di tepi deret
+    bernilai False. NaN di jendela diabaikan (seperti `Series.min()`), bar NaN
+    tidak pernah menjadi pivot.
+    """
+    n = nilai.shape[-1]
+    hasil = np.zeros(nilai.shape, dtype=bool)
+    lebar = kiri + kanan + 1
+    if n < lebar:
+        return hasil
+    jendela = sliding_window_view(nilai, lebar, axis=-1)
+    tengah = nilai[..., kiri : n - kanan]
+    if jenis == "low":
+        hasil[..., kiri : n - kanan] = tengah <= np.fmin.reduce(jendela, axis=-1)
+    else:
+        hasil[..., kiri : n - kanan] = tengah >= np.fmax.reduce(jendela, axis=-1)
+    return hasil
+
+
+def rsi_np(tutup: np.ndarray, periode: int = 14) -> np.ndarray:
+    """RSI dengan smoothing EWM alpha=1/periode (setara `hitung_rsi`)."""
+    n = tutup.shape[0]
+    hasil = np.full(n, 50.0)
+    if n < 2:
+        return hasil
+    perubahan = np.diff(tutup)
+    alpha = alpha_dari_alpha(1 / periode)
+    rata_naik = ewm_np(np.maximum(perubahan, 0.0), alpha)
+    rata_turun = ewm_np(np.maximum(-perubahan, 0.0), alpha)
+    # rata_turun == 0 -> RSI netral 50 (perilaku lama `replace(0, pd.NA)` + fillna)
+    aman = rata_turun != 0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rsi = 100 - (100 / (1 + rata_naik / rata_turun))
+    hasil[1:] = np.where(aman & ~np.isnan(rsi), rsi, 50.0)
+    return hasil
+
+
+def ema_np(tutup: np.ndarray, periode: int = 50) -> np.ndarray:
+    """EMA `adjust=False` dengan span=periode (setara `hitung_ema`)."""
+    return ewm_np(tutup, alpha_dari_span(periode))
+
+
+def hitung_rsi_ema_multi_np(
+    tutup: np.ndarray,
+    periode_rsi: Sequence[int] = (),
+    periode_ema: Sequence[int] = (),
+    sertakan_rata: bool = False,
+    tutup_sebelumnya: Optional[float] = None,
+    awal: Optional[Dict[str, Optional[float]]] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    RSI dan EMA untuk banyak periode sekaligus dalam satu traversal close.
+
+    Selisih close dan pemisahan gain/loss dihitung sekali, lalu semua deret
+    EWM (gain & loss per periode RSI, close per span EMA) disusun menjadi satu
+    matriks (k, n) dan diselesaikan bersama oleh `_rekursi_linear`. Menambah
+    periode baru hanya menambah satu kolom pada matriks tersebut.
+
+    Hasil per kolom sama dengan `rsi_np` / `ema_np`. `tutup` 2-D (simbol x
+    waktu) menghitung semua simbol dalam matriks yang sama; setiap kolom hasil
+    lalu berbentuk (simbol, waktu). Kelanjutan deret (`tutup_sebelumnya`,
+    `awal`) hanya untuk input 1-D.
+
+    Untuk melanjutkan deret yang sudah berjalan (misal file harian berikutnya),
+    berikan `tutup_sebelumnya` dan `awal` berisi nilai EWM terakhir dengan kunci
+    rata_naik_<p>, rata_turun_<p>, ema_<p> (None = deret belum punya observasi).
+
+    Returns
+    -------
+    Dict[str, np.ndarray]
+        rsi_<p> untuk setiap periode RSI, lalu ema_<p> untuk setiap span EMA.
+        Jika `sertakan_rata`, juga rata_naik_<p> / rata_turun_<p> (rata-rata
+        gain/loss RSI, NaN sebelum ada observasi) untuk state inkremental.
+    """
+    periode_rsi = tuple(dict.fromkeys(periode_rsi))
+    periode_ema = tuple(dict.fromkeys(periode_ema))
+    awal = awal or {}
+    n = tutup.shape[-1]
+    bentuk_simbol = tutup.shape[:-1]
+    jumlah_rsi = len(periode_rsi)
+    ada_sebelumnya = tutup_sebelumnya is not None
+    nama_deret = (
+        [f"rata_naik_{p}" for p in periode_rsi]
+        + [f"rata_turun_{p}" for p in periode_rsi]
+        + [f"ema_{p}" for p in periode_ema]
+    )
+
+    alpha = np.array(
+        [alpha_dari_alpha(1 / p) for p in periode_rsi] * 2 + [alpha_dari_span(p) for p in periode_ema],
+        dtype=np.float64,
+    )
+    # Satu baris per deret EWM: [gain RSI..., loss RSI..., close untuk EMA...]
+    # (input 2-D: satu blok baris per deret, masing-masing berisi semua simbol)
+    u = np.empty((alpha.shape[0],) + tutup.shape, dtype=np.float64)
+    if n > 0 and alpha.shape[0] > 0:
+        perubahan = np.empty(tutup.shape, dtype=np.float64)
+        perubahan[..., 0] = tutup[..., 0] - tutup_sebelumnya if ada_sebelumnya else 0.0
+        np.subtract(tutup[..., 1:], tutup[..., :-1], out=perubahan[..., 1:])
+        np.maximum(perubahan, 0.0, out=u[0])
+        u[:jumlah_rsi] = u[0]
+        np.maximum(-perubahan, 0.0, out=u[jumlah_rsi])
+        u[jumlah_rsi:2 * jumlah_rsi] = u[jumlah_rsi]
+        u[2 * jumlah_rsi:] = tutup
+        mentah = u[..., :2].copy()
+        u *= alpha.reshape((-1,) + (1,) * tutup.ndim)
+
+        for i, nama in enumerate(nama_deret):
+            nilai_awal = awal.get(nama)
+            adalah_rsi = i < 2 * jumlah_rsi
+            if nilai_awal is not None and not np.isnan(nilai_awal):
+                # Lanjutkan EWM dari nilai terakhir deret sebelumnya
+                u[i, ..., 0] += (1.0 - alpha[i]) * nilai_awal
+            elif not adalah_rsi or ada_sebelumnya:
+                # Observasi pertama masuk apa adanya (EWM adjust=False)
+                u[i, ..., 0] = mentah[i, ..., 0]
+            else:
+                # Gain/loss baru ada mulai baris 1; baris 0 bernilai 0
+                u[i, ..., 0] = 0.0
+                if n > 1:
+                    u[i, ..., 1] = mentah[i, ..., 1]
+        jumlah_simbol = int(np.prod(bentuk_simbol))
+        y = _rekursi_linear(
+            u.reshape(-1, n), np.repeat(1.0 - alpha, jumlah_simbol)
+        ).reshape(u.shape)
+    else:
+        y = u
+
+    kolom: Dict[str, np.ndarray] = {}
+    rata_naik = y[:jumlah_rsi]
+    rata_turun = y[jumlah_rsi:2 * jumlah_rsi]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rsi = 100 - (100 / (1 + rata_naik / rata_turun))
+    # rata_turun == 0 (termasuk baris pertama deret baru) -> RSI netral 50
+    rsi = np.where((rata_turun != 0) & ~np.isnan(rsi), rsi, 50.0)
+    for i, periode in enumerate(periode_rsi):
+        kolom[f"rsi_{periode}"] = rsi[i]
+    for i, periode in enumerate(periode_ema):
+        kolom[f"ema_{periode}"] = y[2 * jumlah_rsi + i]
+    if sertakan_rata:
+        for i, periode in enumerate(periode_rsi):
+            naik = rata_naik[i].copy()
+            turun = rata_turun[i].copy()
+            if not ada_sebelumnya:
+                naik[..., :1] = np.nan
+                turun[..., :1] = np.nan
+            kolom[f"rata_naik_{periode}"] = naik
+            kolom[f"rata_turun_{periode}"] = turun
+    return kolom
+
+
+def atr_np(
+    tinggi: np.ndarray,
+    rendah: np.ndarray,
+    tutup: np.ndarray,
+    periode: int = 14,
+    tutup_sebelumnya: Optional[float] = None,
+    awal: Optional[float] = None,
+) -> np.ndarray:
+    """
+    ATR dengan true range vs close sebelumnya dan smoothing EMA (setara `hitung_atr`).
+    `tutup_sebelumnya` / `awal` melanjutkan deret dari bar dan ATR terakhir sebelumnya.
+    """
+    acuan = geser_np(tutup, 1)
+    if tutup_sebelumnya is not None and acuan.shape[-1] > 0:
+        acuan[..., 0] = tutup_sebelumnya
+    true_range = np.maximum(
+        tinggi - rendah,
+        np.maximum(np.abs(tinggi - acuan), np.abs(rendah - acuan)),
+    )
+    return ewm_np(true_range, alpha_dari_span(periode), awal=awal)
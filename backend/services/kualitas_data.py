@@ -0,0 +1,301 @@
+"""
+Pemeriksaan kualitas data OHLCV untuk Leon Liquidity Engine.
+
+Candle yang hilang, open_time duplikat, atau rentetan volume nol diam-diam
+merusak EMA/ATR dan logika S/R berbasis pivot. `PemeriksaKualitas` memeriksa
+satu berkas dalam satu pass vektor (per chunk, memakai selisih open_time
+berurutan dalam urutan berkas):
+
+- waktu_tidak_valid : open_time tidak bisa dikonversi
+- duplikat          : open_time sama dengan baris sebelumnya
+- tidak_urut        : open_time mundur dari baris sebelumnya
+- gap               : langkah maju lebih besar dari interval (bar_hilang = jumlah bar yang hilang)
+- ohlc_tidak_konsisten : harga NaN/<= 0, high < max(open, close), low > min(open, close)
+- volume_nol        : jumlah bar volume nol dan rentetan terpanjangnya
+
+Interval dideteksi dari langkah positif paling sering di awal berkas. Laporan
+ringkas per berkas disimpan di `_kualitas.json` folder upload. `isi_bar_hilang`
+(opsional, sebelum indikator) mengurutkan, membuang duplikat, dan mengisi bar
+yang hilang dengan candle datar (OHLC = close sebelumnya, volume 0).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .waktu_epoch import NAT_INT64, ke_epoch_ms
+
+NAMA_LAPORAN_KUALITAS: str = "_kualitas.json"
+VERSI_LAPORAN_KUALITAS: int = 1
+
+# Jumlah langkah waktu pertama yang dipakai untuk mendeteksi interval
+UKURAN_SAMPEL_INTERVAL: int = 10_000
+
+# Kolom volume yang bernilai 0 pada bar isian `isi_bar_hilang`
+KOLOM_VOLUME_GAP: Tuple[str, ...] = (
+    "volume", "quote_volume", "count", "taker_buy_volume", "taker_buy_quote_volume",
+)
+
+# Satu lock untuk semua `_kualitas.json` (upload berbeda bisa menulis bersamaan)
+_kunci_laporan = threading.Lock()
+
+
+def _ke_float(kolom: pd.Series) -> np.ndarray:
+    if pd.api.types.is_float_dtype(kolom) and not isinstance(kolom.dtype, pd.api.extensions.ExtensionDtype):
+        return kolom.to_numpy()
+    return pd.to_numeric(kolom, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def deteksi_interval_ms(langkah: np.ndarray) -> Optional[int]:
+    """Langkah positif paling sering (milidetik) dari sampel awal, None jika tidak ada."""
+    positif = langkah[:UKURAN_SAMPEL_INTERVAL]
+    positif = positif[positif > 0]
+    if positif.size == 0:
+        return None
+    nilai, jumlah = np.unique(positif, return_counts=True)
+    return int(nilai[np.argmax(jumlah)])
+
+
+class PemeriksaKualitas:
+    """
+    Akumulator kualitas data satu berkas, diisi per chunk lewat `tambah`.
+
+    Selisih waktu dihitung terhadap baris terakhir chunk sebelumnya dan
+    rentetan volume nol diteruskan antar chunk, sehingga hasilnya sama dengan
+    memeriksa seluruh berkas sekaligus.
+
+    Parameters
+    ----------
+    interval_ms : int, optional
+        Interval bar; None = dideteksi dari chunk pertama.
+    """
+
+    def __init__(self, interval_ms: Optional[int] = None):
+        self.interval_ms = interval_ms
+        self.jumlah_baris = 0
+        self.waktu_tidak_valid = 0
+        self.duplikat = 0
+        self.tidak_urut = 0
+        self.jumlah_gap = 0
+        self.bar_hilang = 0
+        self.ohlc_tidak_konsisten = 0
+        self.volume_nol = 0
+        self.volume_nol_beruntun_maks = 0
+        self._gap_terbesar: Tuple[int, int] = (0, NAT_INT64)  # (bar_hilang, open_time sebelum gap)
+        self._waktu_terakhir: Optional[int] = None
+        self._nol_beruntun = 0
+
+    def tambah(self, df: pd.DataFrame, format_waktu: Optional[str] = None) -> None:
+        """Periksa satu chunk (urutan baris berkas) berkolom open_time + OHLCV."""
+        self.tambah_np(
+            ke_epoch_ms(df["open_time"], format_waktu),
+            _ke_float(df["open"]),
+            _ke_float(df["high"]),
+            _ke_float(df["low"]),
+            _ke_float(df["close"]),
+            _ke_float(df["volume"]) if "volume" in df.columns else None,
+        )
+
+    def tambah_np(
+        self,
+        waktu_ms: np.ndarray,
+        buka: np.ndarray,
+        tinggi: np.ndarray,
+        rendah: np.ndarray,
+        tutup: np.ndarray,
+        volume: Optional[np.ndarray] = None,
+    ) -> None:
+        """Seperti `tambah`, dengan open_time int64 epoch ms dan harga float64."""
+        self.jumlah_baris += waktu_ms.shape[0]
+
+        valid = waktu_ms != NAT_INT64
+        jumlah_valid = int(np.count_nonzero(valid))
+        self.waktu_tidak_valid += waktu_ms.shape[0] - jumlah_valid
+        waktu = waktu_ms if jumlah_valid == waktu_ms.shape[0] else waktu_ms[valid]
+        if waktu.size:
+            if self._waktu_terakhir is None:
+                langkah = np.diff(waktu)
+            else:
+                langkah = np.diff(waktu, prepend=self._waktu_terakhir)
+            self._waktu_terakhir = int(waktu[-1])
+            if self.interval_ms is None:
+                self.interval_ms = deteksi_interval_ms(langkah)
+            self._periksa_langkah(waktu, langkah)
+
+        salah = ~(np.isfinite(buka) & np.isfinite(tinggi) & np.isfinite(rendah) & np.isfinite(tutup))
+        salah |= rendah <= 0
+        salah |= tinggi < np.maximum(buka, tutup)
+        salah |= rendah > np.minimum(buka, tutup)
+        self.ohlc_tidak_konsisten += int(np.count_nonzero(salah))
+
+        if volume is not None and volume.size:
+            self._periksa_volume_nol(volume == 0)
+
+    def _periksa_langkah(self, waktu: np.ndarray, langkah: np.ndarray) -> None:
+        self.duplikat += int(np.count_nonzero(langkah == 0))
+        self.tidak_urut += int(np.count_nonzero(langkah < 0))
+        if self.interval_ms is None:
+            return
+        posisi_gap = np.flatnonzero(langkah > self.interval_ms)
+        if posisi_gap.size == 0:
+            return
+        # Langkah tidak kelipatan interval dibulatkan ke atas: 1.5 interval = 1 bar hilang
+        hilang = (langkah[posisi_gap] - 1) // self.interval_ms
+        self.jumlah_gap += int(posisi_gap.size)
+        self.bar_hilang += int(hilang.sum())
+        terbesar = int(np.argmax(hilang))
+        if hilang[terbesar] > self._gap_terbesar[0]:
+            # Ujung langkah ke-i adalah waktu[i + geser]; dikurangi langkahnya =
+            # open_time bar sebelum gap (juga lintas chunk)
+            i = posisi_gap[terbesar]
+            geser = waktu.shape[0] - langkah.shape[0]
+            self._gap_terbesar = (int(hilang[terbesar]), int(waktu[i + geser] - langkah[i]))
+
+    def _periksa_volume_nol(self, nol: np.ndarray) -> None:
+        self.volume_nol += int(np.count_nonzero(nol))
+        tepi = np.flatnonzero(np.diff(nol.astype(np.int8), prepend=0, append=0))
+        if tepi.size == 0:
+            self._nol_beruntun = 0
+            return
+        mulai, akhir = tepi[0::2], tepi[1::2]
+        panjang = akhir - mulai
+        if mulai[0] == 0:
+            # Rentetan yang menyambung dari chunk sebelumnya
+            panjang[0] += self._nol_beruntun
+        self.volume_nol_beruntun_maks = max(self.volume_nol_beruntun_maks, int(panjang.max()))
+        self._nol_beruntun = int(panjang[-1]) if akhir[-1] == nol.shape[0] else 0
+
+    @property
+    def bersih(self) -> bool:
+        return not (
+            self.waktu_tidak_valid or self.duplikat or self.tidak_urut
+            or self.bar_hilang or self.ohlc_tidak_konsisten
+        )
+
+    def laporan(self) -> Dict:
+        """Laporan ringkas (bisa di-serialisasi JSON)."""
+        gap_terbesar = None
+        if self._gap_terbesar[0]:
+            gap_terbesar = {
+                "setelah": pd.Timestamp(self._gap_terbesar[1], unit="ms").isoformat(),
+                "bar_hilang": self._gap_terbesar[0],
+            }
+        return {
+            "jumlah_baris": self.jumlah_baris,
+            "interval_ms": self.interval_ms,
+            "waktu_tidak_valid": self.waktu_tidak_valid,
+            "duplikat": self.duplikat,
+            "tidak_urut": self.tidak_urut,
+            "jumlah_gap": self.jumlah_gap,
+            "bar_hilang": self.bar_hilang,
+            "gap_terbesar": gap_terbesar,
+            "ohlc_tidak_konsisten": self.ohlc_tidak_konsisten,
+            "volume_nol": self.volume_nol,
+            "volume_nol_beruntun_maks": self.volume_nol_beruntun_maks,
+            "bersih": self.bersih,
+        }
+
+
+def periksa_kualitas(df: pd.DataFrame, interval_ms: Optional[int] = None) -> Dict:
+    """Laporan kualitas satu DataFrame OHLCV (urutan baris apa adanya)."""
+    pemeriksa = PemeriksaKualitas(interval_ms)
+    pemeriksa.tambah(df)
+    return pemeriksa.laporan()
+
+
+def isi_bar_hilang(df: pd.DataFrame, interval_ms: int) -> Tuple[pd.DataFrame, int]:
+    """
+    Urutkan `df` berdasarkan open_time, buang duplikat (baris terakhir dipakai)
+    dan isi bar yang hilang dengan candle datar.
+
+    Bar isian menyalin baris sebelumnya dengan open/high/low/close = close
+    sebelumnya, kolom volume (`KOLOM_VOLUME_GAP`) = 0, dan close_time (jika ada)
+    = open_time + interval - 1. Baris dengan open_time tidak valid dibuang.
+
+    Returns
+    -------
+    Tuple[pd.DataFrame, int]
+        Frame hasil (index 0..n-1, tipe kolom open_time dipertahankan) dan jumlah bar yang diisi.
+    """
+    waktu = ke_epoch_ms(df["open_time"])
+    valid = waktu != NAT_INT64
+    urutan = np.flatnonzero(valid)
+    urutan = urutan[np.argsort(waktu[urutan], kind="stable")]
+    waktu = waktu[urutan]
+    if waktu.size:
+        # Setelah sort stabil, duplikat berdampingan: ambil kemunculan terakhir
+        terakhir = np.append(waktu[1:] != waktu[:-1], True)
+        urutan, waktu = urutan[terakhir], waktu[terakhir]
+
+    sisip = np.zeros(waktu.shape[0], dtype=np.int64)
+    if waktu.size > 1:
+        sisip[:-1] = (np.diff(waktu) - 1) // interval_ms
+    jumlah_diisi = int(sisip.sum())
+    if jumlah_diisi == 0:
+        return df.iloc[urutan].reset_index(drop=True), 0
+
+    ulang = sisip + 1
+    sumber = np.repeat(np.arange(waktu.shape[0]), ulang)
+    awal_grup = np.repeat(np.cumsum(ulang) - ulang, ulang)
+    ke = np.arange(sumber.shape[0]) - awal_grup  # 0 = baris asli, >0 = bar isian
+    isian = ke > 0
+
+    hasil = df.iloc[urutan[sumber]].reset_index(drop=True)
+    waktu_baru = waktu[sumber] + ke * interval_ms
+    if pd.api.types.is_datetime64_any_dtype(df["open_time"]):
+        hasil["open_time"] = waktu_baru.view("datetime64[ms]")
+    else:
+        hasil["open_time"] = waktu_baru
+    tutup = pd.to_numeric(hasil["close"], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    for nama in ("open", "high", "low", "close"):
+        hasil[nama] = np.where(isian, tutup, pd.to_numeric(hasil[nama], errors="coerce"))
+    for nama in KOLOM_VOLUME_GAP:
+        if nama in hasil.columns:
+            hasil[nama] = np.where(isian, 0, hasil[nama])
+    if "close_time" in hasil.columns and pd.api.types.is_integer_dtype(hasil["close_time"]):
+        hasil["close_time"] = np.where(isian, waktu_baru + interval_ms - 1, hasil["close_time"])
+    return hasil, jumlah_diisi
+
+
+def baca_laporan_kualitas(folder: Path) -> Dict[str, Dict]:
+    """Laporan kualitas per nama berkas dari `_kualitas.json` (kosong jika belum ada / rusak)."""
+    path = Path(folder) / NAMA_LAPORAN_KUALITAS
+    try:
+        with open(path, "r", encoding="utf-8") as berkas:
+            data = json.load(berkas)
+    except (OSError, ValueError):
+        return {}
+    if data.get("versi") != VERSI_LAPORAN_KUALITAS:
+        return {}
+    return data.get("berkas", {})
+
+
+def simpan_laporan_kualitas(
+    folder: Path,
+    laporan: Dict[str, Optional[Dict]],
+    ganti: bool = False,
+) -> Dict[str, Dict]:
+    """
+    Gabungkan `laporan` (nama berkas -> laporan, None = hapus entri) ke
+    `_kualitas.json` dan tulis secara atomik. `ganti=True` membuang entri lama.
+    """
+    path = Path(folder) / NAMA_LAPORAN_KUALITAS
+    with _kunci_laporan:
+        semua = {} if ganti else baca_laporan_kualitas(folder)
+        for nama, isi in laporan.items():
+            if isi is None:
+                semua.pop(nama, None)
+            else:
+                semua[nama] = isi
+        path_sementara = path.with_name(path.name + ".tmp")
+        with open(path_sementara, "w", encoding="utf-8") as berkas:
+            json.dump({"versi": VERSI_LAPORAN_KUALITAS, "berkas": semua}, berkas, indent=1)
+        os.replace(path_sementara, path)
+    return semua
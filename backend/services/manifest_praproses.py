@@ -0,0 +1,204 @@
+"""
+Manifest cache pra-proses untuk Leon Liquidity Engine.
+
+Setiap folder `data/processed/<folder>/` menyimpan `_manifest.json` berisi sidik
+berkas sumber (ukuran, mtime, hash isi) dan versi konfigurasi indikator untuk
+setiap hasil preprocessing. Saat `/pra-proses/indikator/` dijalankan ulang,
+hanya berkas yang baru atau berubah yang dihitung ulang; hasil lain dipakai
+apa adanya. Folder yang setiap hari menerima satu berkas baru cukup memproses
+satu berkas itu saja.
+
+ATURAN VALID:
+- ukuran + mtime sama -> dianggap tidak berubah (tanpa membaca isi berkas)
+- mtime berbeda tetapi hash isi sama (misal upload ulang berkas yang sama)
+  -> tetap valid, mtime di manifest diperbarui
+- versi konfigurasi indikator, format simpan, mode kontinu, isi_gap, atau
+  timeframe resample berbeda, atau berkas hasil hilang -> hitung ulang
+- mode kontinu: berkas hanya dipakai ulang jika SEMUA berkas sebelumnya dalam
+  seri sama dengan saat berkas ini diproses (dicek lewat hash rantai, lihat
+  `gabung_rantai`). State indikator akhir
+  tiap berkas disimpan di manifest sehingga seri bisa dilanjutkan dari
+  berkas terakhir yang valid tanpa menghitung ulang riwayatnya.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .penyimpanan_kolom import path_hasil
+from .praproses_data import VERSI_KONFIG_INDIKATOR, StateIndikator
+
+NAMA_MANIFEST: str = "_manifest.json"
+VERSI_MANIFEST: int = 1
+
+# Ukuran potongan saat menghitung hash isi berkas
+UKURAN_POTONGAN_HASH: int = 1 << 20
+
+
+def hash_berkas(path: Path) -> str:
+    """Hash isi berkas (blake2b), dibaca per potongan agar memori tetap kecil."""
+    hasher = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as berkas:
+        for potongan in iter(lambda: berkas.read(UKURAN_POTONGAN_HASH), b""):
+            hasher.update(potongan)
+    return hasher.hexdigest()
+
+
+def gabung_rantai(rantai_sebelumnya: Optional[str], hash_isi: str) -> str:
+    """
+    Hash rantai seri kontinu: mewakili isi berkas ini dan semua berkas sebelumnya.
+    Mengubah satu berkas membuat rantai semua berkas sesudahnya ikut berubah.
+    """
+    return hashlib.blake2b(f"{rantai_sebelumnya or ''}:{hash_isi}".encode(), digest_size=20).hexdigest()
+
+
+def sidik_berkas(path: Path, dengan_hash: bool = True) -> Dict:
+    """Ukuran, mtime (ns) dan (opsional) hash isi berkas sumber."""
+    info = os.stat(path)
+    sidik = {"ukuran": info.st_size, "mtime_ns": info.st_mtime_ns}
+    if dengan_hash:
+        sidik["hash"] = hash_berkas(path)
+    return sidik
+
+
+class ManifestPraproses:
+    """
+    Isi `_manifest.json` satu folder processed.
+
+    Entri per nama berkas sumber:
+        ukuran, mtime_ns, hash, versi_konfig, format_simpan, kontinu,
+        isi_gap, timeframe, jumlah_baris, kualitas, sebelumnya (hash rantai berkas sebelumnya
+        dalam seri, mode kontinu), state (mode kontinu)
+    """
+
+    def __init__(self, folder_tujuan: Path):
+        self.folder_tujuan = Path(folder_tujuan)
+        self.path = self.folder_tujuan / NAMA_MANIFEST
+        self.entri: Dict[str, Dict] = {}
+        self._muat()
+
+    def _muat(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as berkas:
+                data = json.load(berkas)
+        except (OSError, ValueError):
+            # Manifest rusak diperlakukan seperti belum ada: semua dihitung ulang
+            return
+        if data.get("versi") == VERSI_MANIFEST:
+            self.entri = data.get("berkas", {})
+
+    def simpan(self) -> None:
+        """Tulis manifest secara atomik (tulis ke .tmp lalu replace)."""
+        self.folder_tujuan.mkdir(parents=True, exist_ok=True)
+        path_sementara = self.path.with_name(self.path.name + ".tmp")
+        with open(path_sementara, "w", encoding="utf-8") as berkas:
+            json.dump({"versi": VERSI_MANIFEST, "berkas": self.entri}, berkas, indent=2)
+        os.replace(path_sementara, self.path)
+
+    def periksa(
+        self,
+        path_sumber: Path,
+        format_simpan: str,
+        kontinu: bool = False,
+        rantai_sebelumnya: Optional[str] = None,
+        isi_gap: bool = False,
+        timeframe: Optional[str] = None,
+    ) -> Optional[Dict]:
+        """
+        Kembalikan entri manifest jika hasil untuk `path_sumber` masih valid,
+        None jika berkas harus diproses ulang.
+
+        Parameters
+        ----------
+        rantai_sebelumnya : str, optional
+            Mode kontinu: hash rantai berkas sebelumnya dalam seri (None untuk berkas pertama).
+        """
+        entri = self.entri.get(path_sumber.name)
+        if entri is None:
+            return None
+        if (
+            entri.get("versi_konfig") != VERSI_KONFIG_INDIKATOR
+            or entri.get("format_simpan") != format_simpan
+            or entri.get("kontinu", False) != kontinu
+            or entri.get("isi_gap", False) != isi_gap
+            or entri.get("timeframe") != timeframe
+            or (kontinu and entri.get("sebelumnya") != rantai_sebelumnya)
+            or (kontinu and "state" not in entri)
+        ):
+            return None
+        if not path_hasil(self.folder_tujuan, path_sumber.name, format_simpan).exists():
+            return None
+
+        sidik = sidik_berkas(path_sumber, dengan_hash=False)
+        if sidik["ukuran"] != entri.get("ukuran"):
+            return None
+        if sidik["mtime_ns"] != entri.get("mtime_ns"):
+            if hash_berkas(path_sumber) != entri.get("hash"):
+                return None
+            entri["mtime_ns"] = sidik["mtime_ns"]
+        return entri
+
+    def catat(
+        self,
+        path_sumber: Path,
+        sidik: Dict,
+        hasil: Dict,
+        format_simpan: str,
+        kontinu: bool = False,
+        rantai_sebelumnya: Optional[str] = None,
+        state: Optional[StateIndikator] = None,
+        isi_gap: bool = False,
+        timeframe: Optional[str] = None,
+    ) -> Dict:
+        """
+        Catat hasil preprocessing `path_sumber` yang baru selesai.
+
+        `sidik` diambil SEBELUM berkas diproses, sehingga berkas yang berubah
+        selama diproses tetap terdeteksi berubah pada job berikutnya.
+        """
+        entri = {
+            **sidik,
+            "versi_konfig": VERSI_KONFIG_INDIKATOR,
+            "format_simpan": format_simpan,
+            "kontinu": kontinu,
+            "isi_gap": isi_gap,
+            "timeframe": timeframe,
+            "jumlah_baris": hasil["jumlah_baris"],
+        }
+        if "kualitas" in hasil:
+            entri["kualitas"] = hasil["kualitas"]
+        if kontinu:
+            entri["sebelumnya"] = rantai_sebelumnya
+            if state is not None:
+                entri["state"] = state.ke_dict()
+        self.entri[path_sumber.name] = entri
+        return entri
+
+    def rangkum(self, path_sumber: Path, entri: Dict) -> Dict:
+        """Ringkasan hasil (bentuk sama dengan `praproses_berkas`) untuk berkas yang dipakai ulang."""
+        ringkasan = {
+            "nama_berkas": path_sumber.name,
+            "jumlah_baris": entri["jumlah_baris"],
+            "lokasi_hasil": str(path_hasil(self.folder_tujuan, path_sumber.name, entri["format_simpan"])),
+            "cache": True,
+        }
+        if "kualitas" in entri:
+            ringkasan["kualitas"] = entri["kualitas"]
+        return ringkasan
+
+    def state(self, nama_berkas: str) -> Optional[StateIndikator]:
+        """State indikator akhir berkas (mode kontinu), None jika tidak tercatat."""
+        data = self.entri.get(nama_berkas, {}).get("state")
+        return StateIndikator.dari_dict(data) if data is not None else None
+
+    def pangkas(self, nama_berkas_ada: List[str]) -> None:
+        """Buang entri untuk berkas sumber yang sudah tidak ada di folder upload."""
+        ada = set(nama_berkas_ada)
+        for nama in [nama for nama in self.entri if nama not in ada]:
+            del self.entri[nama]
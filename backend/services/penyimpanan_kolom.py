@@ -0,0 +1,449 @@
+"""
+Penyimpanan kolom (columnar) untuk hasil preprocessing Leon Liquidity Engine.
+
+Format `.processed.kolom` adalah sebuah folder berisi satu berkas `.npy` per
+kolom plus `_meta.json` (nama kolom, dtype, jenis). Timestamp (open_time,
+close_time) disimpan sebagai int64 milidetik, kolom angka disimpan dengan
+dtype aslinya (float32/float64/int64). Saat dibaca, berkas `.npy` di-memory-map
+sehingga tidak ada parsing teks sama sekali.
+
+Semua pembaca hasil preprocessing (generator sinyal, backtest, training LSTM,
+preview) memakai `daftar_hasil_preprocess` + `baca_hasil_preprocess` sehingga
+folder processed boleh berisi CSV, format kolom, atau campuran keduanya.
+CSV tetap didukung sebagai format ekspor.
+
+`DatasetProcessed` membaca satu folder processed dengan proyeksi kolom dan
+filter rentang waktu: hanya kolom yang diminta dan baris dalam rentang yang
+disentuh, sehingga riwayat multi-GB tidak perlu dimuat utuh ke RAM.
+"""
+
+from __future__ import annotations
+
+import json
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .waktu_epoch import ke_epoch_ms, normalisasi_waktu
+
+FORMAT_CSV: str = "csv"
+FORMAT_KOLOM: str = "kolom"
+DAFTAR_FORMAT = (FORMAT_CSV, FORMAT_KOLOM)
+
+SUFFIX_CSV: str = ".processed.csv"
+SUFFIX_KOLOM: str = ".processed.kolom"
+NAMA_META: str = "_meta.json"
+VERSI_FORMAT_KOLOM: int = 1
+
+# Jenis kolom di metadata
+JENIS_ANGKA: str = "angka"
+JENIS_WAKTU: str = "waktu"
+JENIS_TEKS: str = "teks"
+
+
+def path_hasil(folder: Path, nama_berkas: str, format_simpan: str) -> Path:
+    """Path hasil preprocessing untuk berkas upload `nama_berkas` dalam format tertentu."""
+    suffix = SUFFIX_KOLOM if format_simpan == FORMAT_KOLOM else SUFFIX_CSV
+    return folder / Path(nama_berkas).with_suffix(suffix).name
+
+
+def adalah_kolom(path: Path) -> bool:
+    """True jika `path` adalah hasil preprocessing berformat kolom."""
+    return path.name.endswith(SUFFIX_KOLOM) and (path / NAMA_META).exists()
+
+
+def _ke_array(kolom: pd.Series) -> Tuple[np.ndarray, str]:
+    """Pilih representasi on-disk untuk satu kolom: (array, jenis)."""
+    if pd.api.types.is_datetime64_any_dtype(kolom):
+        return ke_epoch_ms(kolom), JENIS_WAKTU
+    if pd.api.types.is_bool_dtype(kolom) or pd.api.types.is_numeric_dtype(kolom):
+        nilai = kolom.to_numpy()
+        if nilai.dtype == object:
+            nilai = kolom.to_numpy(dtype=np.float64, na_value=np.nan)
+        return np.ascontiguousarray(nilai), JENIS_ANGKA
+    return kolom.astype(str).to_numpy(dtype=str), JENIS_TEKS
+
+
+def _buat_folder_sementara(path_tujuan: Path) -> Path:
+    """Folder sementara unik di samping `path_tujuan` (penulis paralel tidak bertabrakan)."""
+    path_tujuan.parent.mkdir(parents=True, exist_ok=True)
+    return Path(tempfile.mkdtemp(prefix=f".{path_tujuan.name}.", suffix=".tmp", dir=path_tujuan.parent))
+
+
+def _pasang_folder(path_sementara: Path, path_tujuan: Path) -> None:
+    """
+    Ganti `path_tujuan` dengan `path_sementara`: hasil lama di-rename ke samping,
+    hasil baru di-rename masuk, baru kemudian hasil lama dihapus.
+    """
+    # mkdtemp membuat folder 0700; hasil akhir dibuat bisa dibaca seperti mkdir biasa
+    path_sementara.chmod(0o755)
+    path_lama: Optional[Path] = None
+    if path_tujuan.exists():
+        path_lama = _buat_folder_sementara(path_tujuan) / path_tujuan.name
+        path_tujuan.rename(path_lama)
+    try:
+        path_sementara.rename(path_tujuan)
+    except BaseException:
+        if path_lama is not None:
+            path_lama.rename(path_tujuan)
+            path_lama.parent.rmdir()
+        raise
+    if path_lama is not None:
+        shutil.rmtree(path_lama.parent, ignore_errors=True)
+
+
+def _tulis_folder_kolom(df: pd.DataFrame, path_sementara: Path) -> None:
+    """Tulis satu `.npy` per kolom plus `_meta.json` ke `path_sementara`."""
+    daftar_kolom: List[Dict] = []
+    for i, nama in enumerate(df.columns):
+        nilai, jenis = _ke_array(df[nama])
+        nama_file = f"kolom_{i:03d}.npy"
+        np.save(path_sementara / nama_file, nilai, allow_pickle=False)
+        daftar_kolom.append({"nama": str(nama), "file": nama_file, "dtype": str(nilai.dtype), "jenis": jenis})
+
+    meta = {"versi": VERSI_FORMAT_KOLOM, "jumlah_baris": len(df), "kolom": daftar_kolom}
+    with open(path_sementara / NAMA_META, "w") as berkas:
+        json.dump(meta, berkas, indent=2)
+
+
+def simpan_kolom(df: pd.DataFrame, path_tujuan: Path) -> Path:
+    """
+    Simpan DataFrame ke format kolom di `path_tujuan` (folder `.processed.kolom`).
+
+    Ditulis ke folder sementara unik lalu di-rename (lihat `_pasang_folder`),
+    sehingga pembaca tidak pernah melihat hasil setengah jadi.
+    """
+    path_sementara = _buat_folder_sementara(path_tujuan)
+    try:
+        _tulis_folder_kolom(df, path_sementara)
+        _pasang_folder(path_sementara, path_tujuan)
+    except BaseException:
+        shutil.rmtree(path_sementara, ignore_errors=True)
+        raise
+    return path_tujuan
+
+
+class PenulisKolomBertahap:
+    """
+    Tulis format kolom potongan demi potongan (mode out-of-core).
+
+    Setiap `tambah(df)` menambahkan byte mentah tiap kolom ke berkas `.part` di
+    folder sementara, sehingga memori hanya sebesar satu potongan. `selesai()`
+    menulis header `.npy` + menyalin isi `.part` secara streaming, menulis
+    `_meta.json`, lalu memasang folder seperti `simpan_kolom`. Jika dtype satu
+    kolom berbeda antar potongan (misal int lalu float, atau panjang teks
+    berbeda), semua segmen dikonversi ke dtype gabungan saat `selesai()`.
+    """
+
+    def __init__(self, path_tujuan: Path):
+        self.path_tujuan = Path(path_tujuan)
+        self.path_sementara = _buat_folder_sementara(self.path_tujuan)
+        self.jumlah_baris = 0
+        self._kolom: List[Dict] = []  # nama, file, jenis, segmen [(dtype, jumlah)]
+
+    def tambah(self, df: pd.DataFrame) -> None:
+        if not self._kolom:
+            self._kolom = [
+                {"nama": str(nama), "file": f"kolom_{i:03d}.npy", "jenis": None, "segmen": []}
+                for i, nama in enumerate(df.columns)
+            ]
+        elif [info["nama"] for info in self._kolom] != [str(nama) for nama in df.columns]:
+            raise ValueError("Susunan kolom potongan berbeda dengan potongan pertama.")
+        if df.empty:
+            return
+        for info, nama in zip(self._kolom, df.columns):
+            nilai, jenis = _ke_array(df[nama])
+            info["jenis"] = info["jenis"] or jenis
+            with open(self.path_sementara / (info["file"] + ".part"), "ab") as berkas:
+                berkas.write(np.ascontiguousarray(nilai).tobytes())
+            info["segmen"].append((nilai.dtype.str, int(nilai.shape[0])))
+        self.jumlah_baris += len(df)
+
+    def _tulis_npy(self, info: Dict) -> str:
+        """Susun `.npy` final satu kolom dari `.part`; kembalikan dtype akhirnya."""
+        path_part = self.path_sementara / (info["file"] + ".part")
+        dtype_segmen = [np.dtype(dtype) for dtype, _ in info["segmen"]] or [np.dtype(np.float64)]
+        dtype_akhir = np.result_type(*dtype_segmen)
+        with open(self.path_sementara / info["file"], "wb") as tujuan:
+            header = {
+                "descr": np.lib.format.dtype_to_descr(dtype_akhir),
+                "fortran_order": False,
+                "shape": (self.jumlah_baris,),
+            }
+            np.lib.format.write_array_header_1_0(tujuan, header)
+            if path_part.exists():
+                with open(path_part, "rb") as sumber:
+                    if all(dtype == dtype_akhir for dtype in dtype_segmen):
+                        shutil.copyfileobj(sumber, tujuan)
+                    else:
+                        for dtype, (_, jumlah) in zip(dtype_segmen, info["segmen"]):
+                            segmen = np.frombuffer(sumber.read(dtype.itemsize * jumlah), dtype=dtype)
+                            tujuan.write(segmen.astype(dtype_akhir).tobytes())
+                path_part.unlink()
+        return str(dtype_akhir)
+
+    def selesai(self) -> Path:
+        daftar_kolom = [
+            {
+                "nama": info["nama"],
+                "file": info["file"],
+                "dtype": self._tulis_npy(info),
+                "jenis": info["jenis"] or JENIS_ANGKA,
+            }
+            for info in self._kolom
+        ]
+        meta = {"versi": VERSI_FORMAT_KOLOM, "jumlah_baris": self.jumlah_baris, "kolom": daftar_kolom}
+        with open(self.path_sementara / NAMA_META, "w") as berkas:
+            json.dump(meta, berkas, indent=2)
+        _pasang_folder(self.path_sementara, self.path_tujuan)
+        return self.path_tujuan
+
+    def batal(self) -> None:
+        """Buang hasil setengah jadi (dipanggil jika pemrosesan gagal)."""
+        shutil.rmtree(self.path_sementara, ignore_errors=True)
+
+
+def baca_meta(path: Path) -> Dict:
+    """Baca `_meta.json` dari folder format kolom."""
+    with open(path / NAMA_META) as berkas:
+        return json.load(berkas)
+
+
+def baca_kolom(path: Path, kolom: Optional[Sequence[str]] = None, mmap: bool = True) -> pd.DataFrame:
+    """
+    Baca folder format kolom menjadi DataFrame.
+
+    Parameters
+    ----------
+    path : Path
+        Folder `.processed.kolom`
+    kolom : Sequence[str], optional
+        Hanya baca kolom ini (kolom yang tidak ada diabaikan)
+    mmap : bool
+        Memory-map berkas `.npy` (default) alih-alih memuat ke RAM
+
+    Returns
+    -------
+    pd.DataFrame
+        Kolom waktu dikembalikan sebagai datetime64[ms]
+    """
+    meta = baca_meta(path)
+    dipilih = None if kolom is None else set(kolom)
+    data: Dict[str, object] = {}
+    for info in meta["kolom"]:
+        if dipilih is not None and info["nama"] not in dipilih:
+            continue
+        nilai = np.load(path / info["file"], mmap_mode="r" if mmap else None, allow_pickle=False)
+        if info["jenis"] == JENIS_WAKTU:
+            nilai = nilai.view("datetime64[ms]")
+        data[info["nama"]] = nilai
+    return pd.DataFrame(data, copy=False)
+
+
+def daftar_hasil_preprocess(folder: Path) -> List[Path]:
+    """
+    Daftar hasil preprocessing di `folder` (CSV dan format kolom), urut nama.
+    Jika satu berkas punya kedua format, format kolom yang dipakai.
+    """
+    if not folder.exists():
+        return []
+    per_nama: Dict[str, Path] = {}
+    for path in folder.iterdir():
+        if path.is_dir() and adalah_kolom(path):
+            per_nama[path.stem] = path
+        elif path.is_file() and path.suffix == ".csv":
+            per_nama.setdefault(path.stem, path)
+    return [per_nama[nama] for nama in sorted(per_nama)]
+
+
+def cari_hasil_preprocess(folder: Path, nama_berkas: str) -> Optional[Path]:
+    """Cari hasil preprocessing untuk berkas upload `nama_berkas` (kolom diutamakan)."""
+    for format_simpan in (FORMAT_KOLOM, FORMAT_CSV):
+        path = path_hasil(folder, nama_berkas, format_simpan)
+        if path.exists():
+            return path
+    return None
+
+
+def baca_hasil_preprocess(path: Path, kolom: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Baca satu hasil preprocessing, CSV maupun format kolom.
+
+    open_time selalu dikembalikan sebagai datetime64[ms] (naive, UTC): format
+    kolom menyimpannya sebagai int64 ms, CSV berisi epoch (s/ms/us) atau teks
+    ISO dari versi lama dan dinormalisasi lewat `waktu_epoch`.
+    """
+    if path.is_dir():
+        return baca_kolom(path, kolom=kolom)
+    if kolom is None:
+        df = pd.read_csv(path)
+    else:
+        dipilih = set(kolom)
+        df = pd.read_csv(path, usecols=lambda nama: nama in dipilih)
+    if "open_time" in df.columns:
+        df["open_time"] = normalisasi_waktu(df["open_time"])
+    return df
+
+
+def ukuran_hasil(path: Path) -> int:
+    """Ukuran total (byte) hasil preprocessing; folder kolom dijumlahkan."""
+    if path.is_dir():
+        return sum(f.stat().st_size for f in path.iterdir() if f.is_file())
+    return path.stat().st_size
+
+
+def hapus_hasil(path: Path) -> None:
+    """Hapus hasil preprocessing (berkas CSV atau folder kolom)."""
+    if path.is_dir():
+        shutil.rmtree(path)
+    elif path.exists():
+        path.unlink()
+
+
+# Tipe waktu yang diterima filter rentang (datetime, Timestamp, string ISO, ms epoch)
+WaktuFilter = Union[str, int, float, pd.Timestamp, np.datetime64, None]
+
+
+def _ke_ms(waktu: WaktuFilter) -> Optional[int]:
+    """Normalisasi batas waktu filter ke int64 milidetik UTC (naive = UTC)."""
+    if waktu is None:
+        return None
+    if isinstance(waktu, (int, float, np.integer, np.floating)):
+        return int(waktu)
+    ts = pd.Timestamp(waktu)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert("UTC").tz_localize(None)
+    return int(ts.value // 1_000_000)
+
+
+def _indeks_rentang(
+    waktu_ms: np.ndarray, mulai_ms: Optional[int], selesai_ms: Optional[int]
+) -> Union[slice, np.ndarray]:
+    """
+    Indeks baris dengan mulai <= open_time <= selesai.
+    Untuk open_time yang sudah urut cukup dua kali `searchsorted` (hasil berupa slice).
+    """
+    if waktu_ms.shape[0] > 1 and bool(np.all(waktu_ms[1:] >= waktu_ms[:-1])):
+        awal = 0 if mulai_ms is None else int(np.searchsorted(waktu_ms, mulai_ms, side="left"))
+        akhir = waktu_ms.shape[0] if selesai_ms is None else int(np.searchsorted(waktu_ms, selesai_ms, side="right"))
+        return slice(awal, max(awal, akhir))
+    topeng = np.ones(waktu_ms.shape[0], dtype=bool)
+    if mulai_ms is not None:
+        topeng &= waktu_ms >= mulai_ms
+    if selesai_ms is not None:
+        topeng &= waktu_ms <= selesai_ms
+    return topeng
+
+
+class DatasetProcessed:
+    """
+    Reader untuk data/processed/<folder>/ dengan proyeksi kolom dan filter waktu.
+
+    Contoh:
+        dataset = DatasetProcessed(PROCESSED_DIR / "BTC")
+        df = dataset.baca(kolom=["open_time", "close", "rsi_14"], mulai="2024-01-01")
+
+    Berkas format kolom di-memory-map: hanya kolom yang diproyeksikan yang
+    dibuka, dan hanya halaman untuk baris dalam rentang yang benar-benar dibaca.
+    Berkas CSV tetap didukung (dibaca dengan `usecols`, lalu difilter).
+    """
+
+    def __init__(self, folder: Path):
+        self.folder = Path(folder)
+        self.berkas: List[Path] = daftar_hasil_preprocess(self.folder)
+
+    def kolom(self) -> List[str]:
+        """Gabungan nama kolom dari semua berkas (urut kemunculan)."""
+        hasil: Dict[str, None] = {}
+        for path in self.berkas:
+            if path.is_dir():
+                nama_kolom = [info["nama"] for info in baca_meta(path)["kolom"]]
+            else:
+                nama_kolom = list(pd.read_csv(path, nrows=0).columns)
+            hasil.update(dict.fromkeys(nama_kolom))
+        return list(hasil)
+
+    def baca_berkas(
+        self,
+        path: Path,
+        kolom: Optional[Sequence[str]] = None,
+        mulai: WaktuFilter = None,
+        selesai: WaktuFilter = None,
+    ) -> pd.DataFrame:
+        """Baca satu berkas dengan proyeksi kolom dan filter rentang open_time."""
+        mulai_ms, selesai_ms = _ke_ms(mulai), _ke_ms(selesai)
+        ada_filter = mulai_ms is not None or selesai_ms is not None
+        if path.is_dir():
+            return self._baca_kolom(path, kolom, mulai_ms, selesai_ms)
+
+        kolom_baca = None if kolom is None else list(dict.fromkeys([*kolom, *(["open_time"] if ada_filter else [])]))
+        df = baca_hasil_preprocess(path, kolom=kolom_baca)
+        if ada_filter and "open_time" in df.columns:
+            waktu_ms = ke_epoch_ms(df["open_time"])
+            df = df.iloc[_indeks_rentang(waktu_ms, mulai_ms, selesai_ms)].reset_index(drop=True)
+            if kolom is not None and "open_time" not in kolom:
+                df = df.drop(columns="open_time")
+        return df
+
+    def _baca_kolom(
+        self,
+        path: Path,
+        kolom: Optional[Sequence[str]],
+        mulai_ms: Optional[int],
+        selesai_ms: Optional[int],
+    ) -> pd.DataFrame:
+        """Proyeksi + filter langsung di atas array memory-map."""
+        info_kolom = {info["nama"]: info for info in baca_meta(path)["kolom"]}
+        indeks: Union[slice, np.ndarray] = slice(None)
+        if (mulai_ms is not None or selesai_ms is not None) and "open_time" in info_kolom:
+            info_waktu = info_kolom["open_time"]
+            waktu_ms = np.load(path / info_waktu["file"], mmap_mode="r", allow_pickle=False)
+            indeks = _indeks_rentang(waktu_ms, mulai_ms, selesai_ms)
+
+        nama_dipilih = list(info_kolom) if kolom is None else [k for k in kolom if k in info_kolom]
+        data: Dict[str, object] = {}
+        for nama in nama_dipilih:
+            info = info_kolom[nama]
+            nilai = np.load(path / info["file"], mmap_mode="r", allow_pickle=False)[indeks]
+            if info["jenis"] == JENIS_WAKTU:
+                nilai = nilai.view("datetime64[ms]")
+            data[nama] = nilai
+        return pd.DataFrame(data, copy=False)
+
+    def iter_berkas(
+        self,
+        kolom: Optional[Sequence[str]] = None,
+        mulai: WaktuFilter = None,
+        selesai: WaktuFilter = None,
+        per_berkas: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+    ) -> Iterator[Tuple[Path, pd.DataFrame]]:
+        """
+        Iterasi (path, DataFrame) per berkas; berkas tanpa baris dalam rentang dilewati.
+
+        `per_berkas` (misal `praproses_data.ringkas_frame`) diterapkan ke setiap
+        berkas sebelum di-yield, sehingga hanya satu berkas berukuran penuh
+        yang ada di memori pada satu waktu.
+        """
+        for path in self.berkas:
+            df = self.baca_berkas(path, kolom=kolom, mulai=mulai, selesai=selesai)
+            if not df.empty:
+                yield path, (per_berkas(df) if per_berkas is not None else df)
+
+    def baca(
+        self,
+        kolom: Optional[Sequence[str]] = None,
+        mulai: WaktuFilter = None,
+        selesai: WaktuFilter = None,
+        per_berkas: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+    ) -> pd.DataFrame:
+        """Gabungkan semua berkas (setelah proyeksi, filter dan `per_berkas`) menjadi satu DataFrame."""
+        bagian = [
+            df for _, df in self.iter_berkas(kolom=kolom, mulai=mulai, selesai=selesai, per_berkas=per_berkas)
+        ]
+        if not bagian:
+            return pd.DataFrame(columns=list(kolom) if kolom is not None else None)
+        return pd.concat(bagian, ignore_index=True)
@@ -0,0 +1,314 @@
+"""
+Pipeline pra-proses folder paralel untuk Leon Liquidity Engine.
+
+Setiap berkas CSV di folder upload dikirim ke worker process
+(`ProcessPoolExecutor`) yang menjalankan `praproses_berkas`. Handler FastAPI
+hanya meng-`await` future-nya, sehingga event loop (tracking sinyal live,
+WebSocket Binance) tetap responsif selama pra-proses berjalan.
+
+Progress per berkas disimpan di `JobPraproses` dan bisa dipantau lewat
+endpoint `/pra-proses/status/{job_id}`.
+
+MODE KONTINU:
+Binance Vision memecah data menjadi satu CSV per hari/bulan. Dengan mode
+kontinu, berkas dengan seri yang sama (nama tanpa tanggal, misal
+BTCUSDT-1h) diproses berurutan dan `StateIndikator` berkas sebelumnya
+diteruskan ke berkas berikutnya, sehingga EMA 200/RSI tidak mulai dingin
+setiap hari. Seri yang berbeda tetap berjalan paralel.
+
+CACHE:
+Berkas yang tidak berubah sejak job sebelumnya (lihat `manifest_praproses`)
+tidak dihitung ulang; ringkasannya ditandai "cache": true. `paksa=True`
+mengabaikan cache.
+
+Satu folder tujuan hanya boleh dipakai satu job pada satu waktu (manifest dan
+berkas hasilnya ditulis ulang oleh job); `mulai_job` menolak job kedua untuk
+folder tujuan yang sama selama job pertama masih berjalan.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ..core.config import MAKS_JOB_PRAPROSES_TERSIMPAN, PRAPROSES_MAX_WORKERS
+from .manifest_praproses import ManifestPraproses, gabung_rantai, sidik_berkas
+from .praproses_data import StateIndikator, praproses_berkas
+
+STATUS_ANTRI = "antri"
+STATUS_BERJALAN = "berjalan"
+STATUS_SELESAI = "selesai"
+STATUS_GAGAL = "gagal"
+
+# Akhiran tanggal nama berkas Binance Vision: -2025-01-01 (harian) / -2025-01 (bulanan)
+POLA_TANGGAL_BERKAS = re.compile(r"[-_]\d{4}-\d{2}(-\d{2})?$")
+
+
+def kunci_seri(nama_berkas: str) -> str:
+    """Nama seri berkas tanpa tanggal, misal BTCUSDT-1h-2025-01-01.csv -> BTCUSDT-1h."""
+    return POLA_TANGGAL_BERKAS.sub("", Path(nama_berkas).stem)
+
+
+def kelompokkan_seri(daftar_berkas: List[Path]) -> Dict[str, List[int]]:
+    """Kelompokkan indeks berkas per seri; urutan dalam seri mengikuti urutan nama (tanggal)."""
+    seri: Dict[str, List[int]] = {}
+    for i, path in sorted(enumerate(daftar_berkas), key=lambda x: x[1].name):
+        seri.setdefault(kunci_seri(path.name), []).append(i)
+    return seri
+
+
+@dataclass
+class JobPraproses:
+    """Status satu job pra-proses folder."""
+    job_id: str
+    folder: str
+    format_simpan: str
+    daftar_berkas: List[str]
+    kontinu: bool = False
+    paksa: bool = False
+    isi_gap: bool = False
+    timeframe: Optional[str] = None
+    status: str = STATUS_ANTRI
+    hasil: Dict[int, Dict] = field(default_factory=dict)
+    dibuat: datetime = field(default_factory=datetime.now)
+    mulai: Optional[datetime] = None
+    selesai: Optional[datetime] = None
+    error: Optional[str] = None
+
+    @property
+    def jumlah_selesai(self) -> int:
+        return len(self.hasil)
+
+    def ringkasan(self) -> List[Dict]:
+        """Ringkasan per berkas yang sudah selesai, urut sesuai daftar berkas."""
+        return [self.hasil[i] for i in sorted(self.hasil)]
+
+    def ke_dict(self) -> Dict:
+        jumlah = len(self.daftar_berkas)
+        return {
+            "job_id": self.job_id,
+            "folder": self.folder,
+            "format_simpan": self.format_simpan,
+            "kontinu": self.kontinu,
+            "paksa": self.paksa,
+            "isi_gap": self.isi_gap,
+            "timeframe": self.timeframe,
+            "status": self.status,
+            "jumlah_berkas": jumlah,
+            "jumlah_selesai": self.jumlah_selesai,
+            "jumlah_error": sum(1 for h in self.hasil.values() if "error" in h),
+            "jumlah_cache": sum(1 for h in self.hasil.values() if h.get("cache")),
+            "progress": round(100 * self.jumlah_selesai / jumlah, 1) if jumlah else 100.0,
+            "dibuat": self.dibuat.isoformat(),
+            "mulai": self.mulai.isoformat() if self.mulai else None,
+            "selesai": self.selesai.isoformat() if self.selesai else None,
+            "error": self.error,
+            "ringkasan": self.ringkasan(),
+        }
+
+
+class ManajerPraproses:
+    """
+    Menjalankan job pra-proses di process pool dan menyimpan statusnya.
+
+    Pool dibuat saat pertama kali dipakai dan dipakai ulang antar job.
+    """
+
+    def __init__(self, max_workers: int = PRAPROSES_MAX_WORKERS, maks_job: int = MAKS_JOB_PRAPROSES_TERSIMPAN):
+        self.max_workers = max(1, max_workers)
+        self.maks_job = maks_job
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._job: "OrderedDict[str, JobPraproses]" = OrderedDict()
+        self._task: Dict[str, asyncio.Task] = {}
+        self._folder_aktif: Dict[Path, JobPraproses] = {}
+
+    def _ambil_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    def mulai_job(
+        self,
+        folder: str,
+        daftar_berkas: List[Path],
+        folder_tujuan: Path,
+        format_simpan: str,
+        kontinu: bool = False,
+        paksa: bool = False,
+        isi_gap: bool = False,
+        timeframe: Optional[str] = None,
+    ) -> JobPraproses:
+        """
+        Daftarkan job baru dan jadwalkan eksekusinya di event loop yang berjalan.
+
+        Raises
+        ------
+        ValueError
+            Jika masih ada job yang berjalan untuk `folder_tujuan` yang sama.
+        """
+        job_aktif = self.job_aktif_untuk(folder_tujuan)
+        if job_aktif is not None:
+            raise ValueError(
+                f"Job pra-proses '{job_aktif.job_id}' masih berjalan untuk folder tujuan yang sama."
+            )
+        job = JobPraproses(
+            job_id=uuid.uuid4().hex[:12],
+            folder=folder,
+            format_simpan=format_simpan,
+            daftar_berkas=[path.name for path in daftar_berkas],
+            kontinu=kontinu,
+            paksa=paksa,
+            isi_gap=isi_gap,
+            timeframe=timeframe,
+        )
+        self._job[job.job_id] = job
+        while len(self._job) > self.maks_job:
+            job_lama, _ = self._job.popitem(last=False)
+            self._task.pop(job_lama, None)
+
+        folder_tujuan.mkdir(parents=True, exist_ok=True)
+        self._folder_aktif[folder_tujuan.resolve()] = job
+        self._task[job.job_id] = asyncio.get_running_loop().create_task(
+            self._jalankan(job, daftar_berkas, folder_tujuan)
+        )
+        return job
+
+    async def tunggu(self, job_id: str) -> JobPraproses:
+        """Tunggu sampai job selesai (event loop tetap bebas selama menunggu)."""
+        task = self._task.get(job_id)
+        if task is not None:
+            await asyncio.shield(task)
+        return self._job[job_id]
+
+    def ambil_job(self, job_id: str) -> Optional[JobPraproses]:
+        return self._job.get(job_id)
+
+    def job_aktif_untuk(self, folder_tujuan: Path) -> Optional[JobPraproses]:
+        """Job yang masih berjalan (atau antri) untuk `folder_tujuan`, jika ada."""
+        return self._folder_aktif.get(folder_tujuan.resolve())
+
+    def daftar_job(self) -> List[JobPraproses]:
+        return list(reversed(self._job.values()))
+
+    async def _jalankan(self, job: JobPraproses, daftar_berkas: List[Path], folder_tujuan: Path) -> None:
+        job.status = STATUS_BERJALAN
+        job.mulai = datetime.now()
+        manifest = await asyncio.to_thread(ManifestPraproses, folder_tujuan)
+        try:
+            pool = self._ambil_pool()
+            if job.kontinu:
+                await asyncio.gather(*(
+                    self._jalankan_seri(job, pool, manifest, [daftar_berkas[i] for i in indeks], indeks, folder_tujuan)
+                    for indeks in kelompokkan_seri(daftar_berkas).values()
+                ))
+            else:
+                await asyncio.gather(*(
+                    self._jalankan_berkas(job, pool, manifest, i, path, folder_tujuan)
+                    for i, path in enumerate(daftar_berkas)
+                ))
+            job.status = STATUS_SELESAI
+        except Exception as err:  # pragma: no cover - pool rusak / dibatalkan
+            job.status = STATUS_GAGAL
+            job.error = str(err)
+        finally:
+            manifest.pangkas([path.name for path in daftar_berkas])
+            await asyncio.to_thread(manifest.simpan)
+            job.selesai = datetime.now()
+            self._task.pop(job.job_id, None)
+            self._folder_aktif.pop(folder_tujuan.resolve(), None)
+
+    async def _jalankan_berkas(
+        self,
+        job: JobPraproses,
+        pool: ProcessPoolExecutor,
+        manifest: ManifestPraproses,
+        i: int,
+        path: Path,
+        folder_tujuan: Path,
+    ) -> None:
+        """Proses satu berkas di pool, kecuali hasilnya masih valid di manifest."""
+        loop = asyncio.get_running_loop()
+        try:
+            entri = None if job.paksa else await asyncio.to_thread(
+                manifest.periksa, path, job.format_simpan, False, None, job.isi_gap, job.timeframe
+            )
+            if entri is not None:
+                job.hasil[i] = manifest.rangkum(path, entri)
+                return
+            sidik = await asyncio.to_thread(sidik_berkas, path)
+            hasil = await loop.run_in_executor(
+                pool, praproses_berkas, path, folder_tujuan, job.format_simpan, None, job.isi_gap, job.timeframe
+            )
+            manifest.catat(path, sidik, hasil, job.format_simpan, isi_gap=job.isi_gap, timeframe=job.timeframe)
+            job.hasil[i] = hasil
+        except Exception as err:
+            manifest.entri.pop(path.name, None)
+            job.hasil[i] = {"nama_berkas": path.name, "error": str(err)}
+
+    async def _jalankan_seri(
+        self,
+        job: JobPraproses,
+        pool: ProcessPoolExecutor,
+        manifest: ManifestPraproses,
+        daftar_berkas: List[Path],
+        indeks: List[int],
+        folder_tujuan: Path,
+    ) -> None:
+        """
+        Proses satu seri berkas berurutan, meneruskan state indikator antar berkas.
+
+        Awal seri yang tidak berubah dipakai dari cache; state akhir berkas cache
+        terakhir diambil dari manifest sehingga berkas baru langsung melanjutkan.
+        """
+        loop = asyncio.get_running_loop()
+        state = StateIndikator()
+        berkas_state: Optional[str] = None  # berkas cache yang state-nya belum dimuat
+        rantai: Optional[str] = None  # hash rantai berkas sebelumnya dalam seri
+        for i, path in zip(indeks, daftar_berkas):
+            try:
+                entri = None
+                if not job.paksa:
+                    entri = await asyncio.to_thread(
+                        manifest.periksa, path, job.format_simpan, True, rantai, job.isi_gap, job.timeframe
+                    )
+                if entri is not None:
+                    job.hasil[i] = manifest.rangkum(path, entri)
+                    berkas_state = path.name
+                    rantai = gabung_rantai(rantai, entri["hash"])
+                    continue
+
+                if berkas_state is not None:
+                    state = manifest.state(berkas_state)
+                    berkas_state = None
+                sidik = await asyncio.to_thread(sidik_berkas, path)
+                rantai_pendahulu, rantai = rantai, gabung_rantai(rantai, sidik["hash"])
+                hasil = await loop.run_in_executor(
+                    pool, praproses_berkas, path, folder_tujuan, job.format_simpan, state, job.isi_gap,
+                    job.timeframe,
+                )
+                state = hasil.pop("state")
+                manifest.catat(
+                    path, sidik, hasil, job.format_simpan, True, rantai_pendahulu, state, job.isi_gap, job.timeframe
+                )
+                job.hasil[i] = hasil
+            except Exception as err:
+                # Berkas rusak dilewati; state (salinan di parent) tetap dipakai berkas berikutnya
+                manifest.entri.pop(path.name, None)
+                job.hasil[i] = {"nama_berkas": path.name, "error": str(err)}
+
+    def shutdown(self) -> None:
+        """Matikan process pool (dipanggil saat aplikasi berhenti)."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+# Global instance
+manajer_praproses = ManajerPraproses()
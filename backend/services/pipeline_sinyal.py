@@ -0,0 +1,272 @@
+"""
+Pipeline generate sinyal folder paralel untuk Leon Liquidity Engine.
+
+`generate_sinyal_dari_folder_honest` membaca dan memindai setiap berkas
+processed berurutan di proses yang sama. Di sini setiap berkas dikirim ke
+worker process (`ProcessPoolExecutor`) yang menjalankan
+`generate_sinyal_berkas_honest` untuk semua mode yang diminta sekaligus
+(berkas dibaca sekali per job, bukan sekali per mode). Handler FastAPI hanya
+meng-`await` future-nya, sehingga event loop tetap melayani request lain.
+
+Berkas processed sudah merupakan potongan waktu deret (satu berkas per
+hari/bulan), jadi unit kerja pool adalah berkas. Setelah semua berkas selesai,
+sinyal per mode digabung urut timestamp; timestamp yang sama diurutkan menurut
+urutan berkas lalu urutan di dalam berkas, sehingga hasilnya deterministik
+berapa pun jumlah worker dan urutan selesainya.
+
+Progress per berkas disimpan di `JobSinyal` dan bisa dipantau lewat endpoint
+`/sinyal/status/{job_id}`.
+
+Pool yang sama menjalankan sweep parameter (`sweep_sinyal`) lewat `sweep`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from ..core.config import MAKS_JOB_SINYAL_TERSIMPAN, SINYAL_MAX_WORKERS
+from .generator_sinyal_unified import generate_sinyal_berkas_honest
+from .sweep_sinyal import Kombinasi, gabung_agregat, sweep_berkas, tabel_sweep
+
+STATUS_ANTRI = "antri"
+STATUS_BERJALAN = "berjalan"
+STATUS_SELESAI = "selesai"
+STATUS_GAGAL = "gagal"
+
+
+def gabung_sinyal(
+    sinyal_per_berkas: Dict[int, Dict[str, List[Dict]]], daftar_mode: Sequence[str]
+) -> Dict[str, List[Dict]]:
+    """
+    Gabungkan sinyal semua berkas per mode, urut timestamp (ISO).
+
+    Sort stabil di atas urutan (indeks berkas, posisi dalam berkas), sehingga
+    timestamp kembar tetap pada urutan berkas.
+    """
+    hasil: Dict[str, List[Dict]] = {}
+    for mode in daftar_mode:
+        gabungan = [
+            sinyal
+            for i in sorted(sinyal_per_berkas)
+            for sinyal in sinyal_per_berkas[i].get(mode, [])
+        ]
+        gabungan.sort(key=lambda sinyal: str(sinyal.get("timestamp", "")))
+        hasil[mode] = gabungan
+    return hasil
+
+
+@dataclass
+class JobSinyal:
+    """Status satu job generate sinyal folder."""
+    job_id: str
+    folder: str
+    daftar_mode: List[str]
+    parameter: Dict
+    daftar_berkas: List[str]
+    status: str = STATUS_ANTRI
+    hasil: Dict[int, Dict] = field(default_factory=dict)
+    sinyal: Dict[str, List[Dict]] = field(default_factory=dict)
+    dibuat: datetime = field(default_factory=datetime.now)
+    mulai: Optional[datetime] = None
+    selesai: Optional[datetime] = None
+    error: Optional[str] = None
+    _sinyal_berkas: Dict[int, Dict[str, List[Dict]]] = field(default_factory=dict, repr=False)
+
+    @property
+    def jumlah_selesai(self) -> int:
+        return len(self.hasil)
+
+    def ringkasan(self) -> List[Dict]:
+        """Ringkasan per berkas yang sudah selesai, urut sesuai daftar berkas."""
+        return [self.hasil[i] for i in sorted(self.hasil)]
+
+    def jumlah_sinyal(self) -> Dict[str, int]:
+        """Jumlah sinyal per mode dari berkas yang sudah selesai."""
+        return {
+            mode: sum(h.get("jumlah_sinyal", {}).get(mode, 0) for h in self.hasil.values())
+            for mode in self.daftar_mode
+        }
+
+    def ke_dict(self) -> Dict:
+        jumlah = len(self.daftar_berkas)
+        return {
+            "job_id": self.job_id,
+            "folder": self.folder,
+            "daftar_mode": self.daftar_mode,
+            "parameter": self.parameter,
+            "status": self.status,
+            "jumlah_berkas": jumlah,
+            "jumlah_selesai": self.jumlah_selesai,
+            "jumlah_error": sum(1 for h in self.hasil.values() if "error" in h),
+            "jumlah_sinyal": self.jumlah_sinyal(),
+            "progress": round(100 * self.jumlah_selesai / jumlah, 1) if jumlah else 100.0,
+            "dibuat": self.dibuat.isoformat(),
+            "mulai": self.mulai.isoformat() if self.mulai else None,
+            "selesai": self.selesai.isoformat() if self.selesai else None,
+            "error": self.error,
+            "ringkasan": self.ringkasan(),
+        }
+
+
+class ManajerSinyal:
+    """
+    Menjalankan job generate sinyal di process pool dan menyimpan statusnya.
+
+    Pool dibuat saat pertama kali dipakai dan dipakai ulang antar job.
+    """
+
+    def __init__(self, max_workers: int = SINYAL_MAX_WORKERS, maks_job: int = MAKS_JOB_SINYAL_TERSIMPAN):
+        self.max_workers = max(1, max_workers)
+        self.maks_job = maks_job
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._job: "OrderedDict[str, JobSinyal]" = OrderedDict()
+        self._task: Dict[str, asyncio.Task] = {}
+
+    def _ambil_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    def mulai_job(
+        self,
+        folder: str,
+        daftar_berkas: List[Path],
+        daftar_mode: Sequence[str],
+        confidence_minimum: float = 0.30,
+        rsi_oversold: Optional[float] = None,
+        rsi_overbought: Optional[float] = None,
+        rasio_risk_reward: Optional[float] = None,
+    ) -> JobSinyal:
+        """Daftarkan job baru dan jadwalkan eksekusinya di event loop yang berjalan."""
+        job = JobSinyal(
+            job_id=uuid.uuid4().hex[:12],
+            folder=folder,
+            daftar_mode=list(daftar_mode),
+            parameter={
+                "confidence_minimum": confidence_minimum,
+                "rsi_oversold": rsi_oversold,
+                "rsi_overbought": rsi_overbought,
+                "rasio_risk_reward": rasio_risk_reward,
+            },
+            daftar_berkas=[path.name for path in daftar_berkas],
+        )
+        self._job[job.job_id] = job
+        while len(self._job) > self.maks_job:
+            job_lama, _ = self._job.popitem(last=False)
+            self._task.pop(job_lama, None)
+
+        self._task[job.job_id] = asyncio.get_running_loop().create_task(self._jalankan(job, daftar_berkas))
+        return job
+
+    async def tunggu(self, job_id: str) -> JobSinyal:
+        """Tunggu sampai job selesai (event loop tetap bebas selama menunggu)."""
+        task = self._task.get(job_id)
+        if task is not None:
+            await asyncio.shield(task)
+        return self._job[job_id]
+
+    def ambil_job(self, job_id: str) -> Optional[JobSinyal]:
+        return self._job.get(job_id)
+
+    def daftar_job(self) -> List[JobSinyal]:
+        return list(reversed(self._job.values()))
+
+    async def _jalankan(self, job: JobSinyal, daftar_berkas: List[Path]) -> None:
+        job.status = STATUS_BERJALAN
+        job.mulai = datetime.now()
+        try:
+            pool = self._ambil_pool()
+            await asyncio.gather(*(
+                self._jalankan_berkas(job, pool, i, path) for i, path in enumerate(daftar_berkas)
+            ))
+            job.sinyal = gabung_sinyal(job._sinyal_berkas, job.daftar_mode)
+            job._sinyal_berkas.clear()
+            job.status = STATUS_SELESAI
+        except Exception as err:  # pragma: no cover - pool rusak / dibatalkan
+            job.status = STATUS_GAGAL
+            job.error = str(err)
+        finally:
+            job.selesai = datetime.now()
+            self._task.pop(job.job_id, None)
+
+    async def _jalankan_berkas(self, job: JobSinyal, pool: ProcessPoolExecutor, i: int, path: Path) -> None:
+        """Scan satu berkas untuk semua mode job di pool."""
+        loop = asyncio.get_running_loop()
+        try:
+            sinyal = await loop.run_in_executor(
+                pool,
+                generate_sinyal_berkas_honest,
+                path,
+                job.daftar_mode,
+                job.parameter["confidence_minimum"],
+                job.parameter["rsi_oversold"],
+                job.parameter["rsi_overbought"],
+                job.parameter["rasio_risk_reward"],
+            )
+            job._sinyal_berkas[i] = sinyal
+            job.hasil[i] = {
+                "nama_berkas": path.name,
+                "jumlah_sinyal": {mode: len(daftar) for mode, daftar in sinyal.items()},
+            }
+        except Exception as err:
+            job.hasil[i] = {"nama_berkas": path.name, "error": str(err)}
+
+    async def sweep(
+        self,
+        daftar_berkas: List[Path],
+        mode_trading: str,
+        kombinasi: Sequence[Kombinasi],
+        urut_berdasarkan: str = "total_pnl",
+        minimal_sinyal: int = 1,
+    ) -> Dict:
+        """
+        Sweep parameter (`sweep_sinyal`) di process pool: satu task per berkas;
+        jika berkas lebih sedikit dari worker, kombinasi juga dibagi ke beberapa
+        task. Agregat satu berkas baru digabung jika semua task berkas itu
+        berhasil; berkas yang gagal dilewati seluruhnya dan dilaporkan di
+        "berkas_error".
+        """
+        loop = asyncio.get_running_loop()
+        pool = self._ambil_pool()
+        jumlah_potongan = max(1, min(len(kombinasi), self.max_workers // max(1, len(daftar_berkas))))
+        potongan = [list(kombinasi[i::jumlah_potongan]) for i in range(jumlah_potongan)]
+        tugas = [(path, bagian) for path in daftar_berkas for bagian in potongan]
+        hasil = await asyncio.gather(
+            *(loop.run_in_executor(pool, sweep_berkas, path, mode_trading, bagian) for path, bagian in tugas),
+            return_exceptions=True,
+        )
+
+        hasil_berkas: Dict[str, List[Dict]] = {}
+        berkas_error: Dict[str, str] = {}
+        for (path, _), isi in zip(tugas, hasil):
+            if isinstance(isi, Exception):
+                berkas_error.setdefault(path.name, str(isi))
+            else:
+                hasil_berkas.setdefault(path.name, []).append(isi)
+
+        agregat: Dict = {}
+        for nama, daftar_isi in hasil_berkas.items():
+            if nama not in berkas_error:
+                for isi in daftar_isi:
+                    gabung_agregat(agregat, isi)
+        return {
+            "tabel": tabel_sweep(agregat, kombinasi, urut_berdasarkan, minimal_sinyal),
+            "berkas_error": [{"nama_berkas": nama, "error": error} for nama, error in berkas_error.items()],
+        }
+
+    def shutdown(self) -> None:
+        """Matikan process pool (dipanggil saat aplikasi berhenti)."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+# Global instance
+manajer_sinyal = ManajerSinyal()
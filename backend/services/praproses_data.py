@@ -7,15 +7,71 @@ PERIODE INDIKATOR YANG DIHITUNG (FIXED):
 - RSI: 6, 8, 10, 14
 - EMA : 9, 20, 50, 200
 - ATR : 14
+
+RSI dan EMA semua periode dihitung bersama dalam satu pass oleh
+`hitung_rsi_ema_multi`; periode tambahan (misal RSI 21, EMA 100) bisa
+diminta lewat `tambah_indikator_ke_df(..., periode_*_tambahan)`.
+
+`ringkas_frame` memberi representasi ringkas (float32 untuk kolom turunan,
+timestamp int64 ms, teks sebagai category) untuk memuat riwayat panjang.
+
+Setiap upload dan pra-proses juga menghasilkan laporan kualitas data (gap,
+duplikat, urutan, OHLC tidak konsisten, volume nol; lihat `kualitas_data`).
+Dengan `isi_gap=True` bar yang hilang diisi sebelum indikator dihitung.
 """
 
 from __future__ import annotations
 
+import os
+from collections import deque
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 
+from ..core.config import BATAS_BERKAS_BERTAHAP, UKURAN_CHUNK_CSV, UKURAN_CHUNK_PRAPROSES
+from .kernel_indikator import (
+    alpha_dari_span,
+    atr_np,
+    ema_np,
+    ewm_np,
+    geser_np,
+    hitung_rsi_ema_multi_np,
+    pivot_np,
+    rolling_mean_np,
+    rolling_std_np,
+    rsi_np,
+)
+from .kualitas_data import PemeriksaKualitas, isi_bar_hilang, simpan_laporan_kualitas
+from .resample_timeframe import (
+    TIMEFRAME_MS,
+    ResamplerBertahap,
+    cache_timeframe,
+    resample_ohlcv,
+    sidik_hasil,
+    sidik_ohlcv,
+)
+from .penyimpanan_kolom import (
+    DAFTAR_FORMAT,
+    FORMAT_CSV,
+    FORMAT_KOLOM,
+    PenulisKolomBertahap,
+    baca_hasil_preprocess,
+    hapus_hasil,
+    path_hasil,
+    simpan_kolom,
+)
+from .waktu_epoch import (
+    FORMAT_ISO,
+    NAT_INT64,
+    deteksi_format_waktu,
+    ke_epoch_ms,
+    ke_kolom_epoch_ms,
+    normalisasi_waktu,
+)
+
 # Periode indikator yang FIXED (tidak bisa diubah)
 PERIODE_RSI_AKTIF: int = 6
 PERIODE_RSI_INTRADAY_1: int = 8
@@ -30,11 +86,135 @@ PERIODE_EMA_200: int = 200  # Macro trend (trend filter)
 
 PERIODE_ATR: int = 14
 
+# Daftar periode yang dihitung bersama oleh kernel multi-periode
+DAFTAR_PERIODE_RSI: Tuple[int, ...] = (
+    PERIODE_RSI_AKTIF,
+    PERIODE_RSI_INTRADAY_1,
+    PERIODE_RSI_INTRADAY_2,
+    PERIODE_RSI_SWING,
+)
+DAFTAR_PERIODE_RSI_MA3: Tuple[int, ...] = (PERIODE_RSI_INTRADAY_1, PERIODE_RSI_INTRADAY_2)
+DAFTAR_PERIODE_EMA: Tuple[int, ...] = (PERIODE_EMA_9, PERIODE_EMA_20, PERIODE_EMA_50, PERIODE_EMA_200)
+
+# Panjang window rolling yang dipakai `tambah_indikator_ke_df`
+WINDOW_RSI_MA: int = 3
+WINDOW_RETURN: int = 5
+WINDOW_VOLATILITAS: int = 5
+WINDOW_VOLUME: int = 20
+
+# Lebar pivot (kiri, kanan) yang dipakai generator sinyal: pivot divergence
+# dan pivot support/resistance. Kolom pivot_low_<k>_<k> / pivot_high_<k>_<k>
+# (bool) butuh `kanan` bar SESUDAHNYA, sehingga dihitung per frame (tidak
+# lewat StateIndikator); bar di tepi frame bernilai False.
+PIVOT_DIVERGENCE: Tuple[int, int] = (2, 2)
+PIVOT_SR: Tuple[int, int] = (3, 3)
+DAFTAR_PIVOT: Tuple[Tuple[int, int], ...] = (PIVOT_DIVERGENCE, PIVOT_SR)
+
+# Identitas konfigurasi indikator; hasil preprocessing lama (manifest) dianggap
+# basi jika nilainya berbeda. Naikkan angka versi jika rumus indikator berubah.
+VERSI_KONFIG_INDIKATOR: str = (
+    f"1;rsi={','.join(map(str, DAFTAR_PERIODE_RSI))}"
+    f";rsi_ma3={','.join(map(str, DAFTAR_PERIODE_RSI_MA3))}"
+    f";ema={','.join(map(str, DAFTAR_PERIODE_EMA))}"
+    f";atr={PERIODE_ATR}"
+    f";window={WINDOW_RSI_MA},{WINDOW_RETURN},{WINDOW_VOLATILITAS},{WINDOW_VOLUME}"
+    f";pivot={','.join(f'{kiri}x{kanan}' for kiri, kanan in DAFTAR_PIVOT)}"
+)
+
+
+@dataclass
+class StateIndikator:
+    """
+    State EWM/rolling yang cukup untuk melanjutkan perhitungan indikator.
+
+    Dipakai engine inkremental (live) dan pra-proses kontinu antar berkas:
+    hasil untuk data yang dipecah sama dengan hasil untuk data utuh.
+    """
+    jumlah_bar: int = 0
+    close_terakhir: Optional[float] = None
+    rsi_naik: Dict[int, Optional[float]] = field(default_factory=dict)
+    rsi_turun: Dict[int, Optional[float]] = field(default_factory=dict)
+    ema: Dict[int, float] = field(default_factory=dict)
+    atr: Optional[float] = None
+    riwayat_rsi: Dict[int, Deque[float]] = field(default_factory=dict)
+    riwayat_close: Deque[float] = field(default_factory=lambda: deque(maxlen=WINDOW_RETURN))
+    riwayat_return: Deque[float] = field(default_factory=lambda: deque(maxlen=WINDOW_VOLATILITAS))
+    riwayat_volume: Deque[float] = field(default_factory=lambda: deque(maxlen=WINDOW_VOLUME))
+
+    def salin(self) -> "StateIndikator":
+        """Salinan independen (dipakai untuk pratinjau candle yang belum close)."""
+        return StateIndikator(
+            jumlah_bar=self.jumlah_bar,
+            close_terakhir=self.close_terakhir,
+            rsi_naik=dict(self.rsi_naik),
+            rsi_turun=dict(self.rsi_turun),
+            ema=dict(self.ema),
+            atr=self.atr,
+            riwayat_rsi={p: deque(v, maxlen=WINDOW_RSI_MA) for p, v in self.riwayat_rsi.items()},
+            riwayat_close=deque(self.riwayat_close, maxlen=WINDOW_RETURN),
+            riwayat_return=deque(self.riwayat_return, maxlen=WINDOW_VOLATILITAS),
+            riwayat_volume=deque(self.riwayat_volume, maxlen=WINDOW_VOLUME),
+        )
+
+    def reset(self) -> None:
+        """Kosongkan state (deret dimulai ulang dari awal)."""
+        self.__dict__.update(StateIndikator().__dict__)
+
+    def ke_dict(self) -> Dict:
+        """Bentuk JSON-able (disimpan di manifest pra-proses kontinu)."""
+        return {
+            "jumlah_bar": self.jumlah_bar,
+            "close_terakhir": self.close_terakhir,
+            "rsi_naik": {str(p): v for p, v in self.rsi_naik.items()},
+            "rsi_turun": {str(p): v for p, v in self.rsi_turun.items()},
+            "ema": {str(p): v for p, v in self.ema.items()},
+            "atr": self.atr,
+            "riwayat_rsi": {str(p): list(v) for p, v in self.riwayat_rsi.items()},
+            "riwayat_close": list(self.riwayat_close),
+            "riwayat_return": list(self.riwayat_return),
+            "riwayat_volume": list(self.riwayat_volume),
+        }
+
+    @classmethod
+    def dari_dict(cls, data: Dict) -> "StateIndikator":
+        """Kebalikan `ke_dict`."""
+        return cls(
+            jumlah_bar=data["jumlah_bar"],
+            close_terakhir=data["close_terakhir"],
+            rsi_naik={int(p): v for p, v in data["rsi_naik"].items()},
+            rsi_turun={int(p): v for p, v in data["rsi_turun"].items()},
+            ema={int(p): v for p, v in data["ema"].items()},
+            atr=data["atr"],
+            riwayat_rsi={int(p): deque(v, maxlen=WINDOW_RSI_MA) for p, v in data["riwayat_rsi"].items()},
+            riwayat_close=deque(data["riwayat_close"], maxlen=WINDOW_RETURN),
+            riwayat_return=deque(data["riwayat_return"], maxlen=WINDOW_VOLATILITAS),
+            riwayat_volume=deque(data["riwayat_volume"], maxlen=WINDOW_VOLUME),
+        )
+
+
+def _ke_array_float(kolom: pd.Series) -> Optional[np.ndarray]:
+    """
+    Ambil isi Series sebagai array float64 contiguous untuk kernel NumPy.
+    Mengembalikan None jika ada NaN/inf (kernel butuh data bersih).
+    """
+    try:
+        nilai = np.ascontiguousarray(kolom.to_numpy(dtype=np.float64))
+    except (TypeError, ValueError):
+        return None
+    if not np.isfinite(nilai).all():
+        return None
+    return nilai
+
 
 def hitung_rsi(kolom_tutup: pd.Series, periode: int = 14) -> pd.Series:
     """
     Hitung indikator Relative Strength Index (RSI) menggunakan EMA.
     """
+    nilai = _ke_array_float(kolom_tutup)
+    if nilai is not None:
+        return pd.Series(rsi_np(nilai, periode), index=kolom_tutup.index)
+
+    # Jalur pandas lama (hanya untuk data yang masih mengandung NaN)
     perubahan = kolom_tutup.diff()
     kenaikan = perubahan.clip(lower=0)
     penurunan = (-perubahan).clip(lower=0)
@@ -55,6 +235,10 @@ def hitung_ema(kolom_tutup: pd.Series, periode: int = 50) -> pd.Series:
     """
     Hitung Exponential Moving Average (EMA).
     """
+    nilai = _ke_array_float(kolom_tutup)
+    if nilai is not None:
+        return pd.Series(ema_np(nilai, periode), index=kolom_tutup.index)
+
     # Handle NaN values
     ema = kolom_tutup.ewm(span=periode, adjust=False).mean()
     # Fill NaN dengan forward fill, lalu backward fill
@@ -75,6 +259,16 @@ def hitung_atr(
     )
     Lalu di-smoothing dengan EMA.
     """
+    nilai_tinggi = _ke_array_float(tinggi)
+    nilai_rendah = _ke_array_float(rendah)
+    nilai_tutup_sebelumnya = _ke_array_float(tutup_sebelumnya)
+    if nilai_tinggi is not None and nilai_rendah is not None and nilai_tutup_sebelumnya is not None:
+        jarak_hl = nilai_tinggi - nilai_rendah
+        jarak_hc = np.abs(nilai_tinggi - nilai_tutup_sebelumnya)
+        jarak_lc = np.abs(nilai_rendah - nilai_tutup_sebelumnya)
+        true_range = np.maximum(jarak_hl, np.maximum(jarak_hc, jarak_lc))
+        return pd.Series(ewm_np(true_range, alpha_dari_span(periode)), index=tinggi.index)
+
     jarak_hl = tinggi - rendah
     jarak_hc = (tinggi - tutup_sebelumnya).abs()
     jarak_lc = (rendah - tutup_sebelumnya).abs()
@@ -83,7 +277,12 @@ def hitung_atr(
     return atr
 
 
-def tambah_indikator_ke_df(data_ohlcv: pd.DataFrame) -> pd.DataFrame:
+def tambah_indikator_ke_df(
+    data_ohlcv: pd.DataFrame,
+    periode_rsi_tambahan: Sequence[int] = (),
+    periode_ema_tambahan: Sequence[int] = (),
+    state: Optional[StateIndikator] = None,
+) -> pd.DataFrame:
     """
     Tambahkan semua indikator yang dibutuhkan ke DataFrame yang sudah terurut berdasarkan waktu.
 
@@ -99,6 +298,15 @@ def tambah_indikator_ke_df(data_ohlcv: pd.DataFrame) -> pd.DataFrame:
     ----------
     data_ohlcv : pd.DataFrame
         DataFrame dengan kolom minimal: open_time, open, high, low, close, volume
+    periode_rsi_tambahan : Sequence[int]
+        Periode RSI ekstra (misal 21) yang ikut dihitung di pass yang sama
+    periode_ema_tambahan : Sequence[int]
+        Span EMA ekstra (misal 100) yang ikut dihitung di pass yang sama
+    state : StateIndikator, optional
+        State dari potongan data sebelumnya (misal file harian kemarin).
+        Perhitungan melanjutkan state ini dan state diperbarui di tempat,
+        sehingga potongan berikutnya bisa melanjutkan lagi. Jika OHLCV masih
+        mengandung NaN (jalur pandas), state di-reset dan deret dimulai ulang.
 
     Returns
     -------
@@ -111,11 +319,256 @@ def tambah_indikator_ke_df(data_ohlcv: pd.DataFrame) -> pd.DataFrame:
         candle_body, candle_range, upper_wick, lower_wick,
         return_1, return_5, volatility_5,
         distance_to_ema_20, distance_to_ema_50,
-        rsi_position, volume_anomaly
+        rsi_position, volume_anomaly,
+        pivot_low_2_2, pivot_high_2_2, pivot_low_3_3, pivot_high_3_3
+        (+ rsi_<p> / ema_<p> untuk periode tambahan)
+
+        Kolom pivot dihitung dari frame ini saja (lihat `DAFTAR_PIVOT`).
     """
     df = data_ohlcv.copy()
     df = df.sort_values("open_time")
 
+    buka = _ke_array_float(df["open"])
+    tinggi = _ke_array_float(df["high"])
+    rendah = _ke_array_float(df["low"])
+    tutup = _ke_array_float(df["close"])
+    volume = _ke_array_float(df["volume"]) if "volume" in df.columns else None
+    data_bersih = all(v is not None for v in (buka, tinggi, rendah, tutup)) and (
+        volume is not None or "volume" not in df.columns
+    )
+    if not data_bersih:
+        if state is not None:
+            state.reset()
+        return tambah_kolom_pivot(_tambah_indikator_pandas(df, periode_rsi_tambahan, periode_ema_tambahan))
+
+    # Semua kolom dihitung dari array float64 oleh kernel NumPy
+    kolom = hitung_indikator_np(
+        buka,
+        tinggi,
+        rendah,
+        tutup,
+        volume,
+        periode_rsi=DAFTAR_PERIODE_RSI + tuple(periode_rsi_tambahan),
+        periode_ema=DAFTAR_PERIODE_EMA + tuple(periode_ema_tambahan),
+        state=state,
+    )
+    kolom.update(hitung_pivot_np(rendah, tinggi))
+    return df.assign(**kolom)
+
+
+def hitung_rsi_ema_multi(
+    kolom_tutup: pd.Series,
+    periode_rsi: Sequence[int] = DAFTAR_PERIODE_RSI,
+    periode_ema: Sequence[int] = DAFTAR_PERIODE_EMA,
+) -> pd.DataFrame:
+    """
+    Hitung RSI dan EMA untuk banyak periode sekaligus (satu pass atas close).
+
+    Parameters
+    ----------
+    kolom_tutup : pd.Series
+        Harga close, terurut berdasarkan waktu
+    periode_rsi : Sequence[int]
+        Daftar periode RSI, misal (6, 8, 10, 14, 21)
+    periode_ema : Sequence[int]
+        Daftar span EMA, misal (9, 20, 50, 100, 200)
+
+    Returns
+    -------
+    pd.DataFrame
+        Kolom rsi_<p> dan ema_<p> dengan index yang sama seperti `kolom_tutup`
+    """
+    tutup = _ke_array_float(kolom_tutup)
+    if tutup is None:
+        kolom = {f"rsi_{p}": hitung_rsi(kolom_tutup, periode=p) for p in dict.fromkeys(periode_rsi)}
+        kolom.update({f"ema_{p}": hitung_ema(kolom_tutup, periode=p) for p in dict.fromkeys(periode_ema)})
+        return pd.DataFrame(kolom, index=kolom_tutup.index)
+    return pd.DataFrame(hitung_rsi_ema_multi_np(tutup, periode_rsi, periode_ema), index=kolom_tutup.index)
+
+
+def hitung_indikator_np(
+    buka: np.ndarray,
+    tinggi: np.ndarray,
+    rendah: np.ndarray,
+    tutup: np.ndarray,
+    volume: Optional[np.ndarray] = None,
+    periode_rsi: Sequence[int] = DAFTAR_PERIODE_RSI,
+    periode_ema: Sequence[int] = DAFTAR_PERIODE_EMA,
+    state: Optional[StateIndikator] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Hitung semua kolom `tambah_indikator_ke_df` dari array float64.
+
+    `periode_rsi` / `periode_ema` harus memuat periode FIXED (RSI 8, 10, 14 dan
+    EMA 20, 50) karena kolom turunan memakainya; periode lain boleh ditambahkan.
+
+    Jika `state` diberikan, perhitungan melanjutkan deret sebelumnya (EWM dari
+    nilai terakhir, window rolling diawali riwayat) dan `state` diperbarui di
+    tempat untuk potongan berikutnya.
+
+    Array 2-D (simbol x waktu, tanpa `state`) menghitung semua simbol sekaligus;
+    setiap kolom hasil berbentuk sama. Lihat `indikator_panel`.
+
+    Returns
+    -------
+    Dict[str, np.ndarray]
+        Nama kolom -> nilai, dengan urutan kolom yang sama seperti jalur pandas.
+    """
+    periode_rsi = tuple(dict.fromkeys(periode_rsi))
+    periode_ema = tuple(dict.fromkeys(periode_ema))
+    state_awal = state if state is not None else StateIndikator()
+    tutup_sebelumnya = state_awal.close_terakhir
+
+    awal: Dict[str, Optional[float]] = {}
+    for periode in periode_rsi:
+        awal[f"rata_naik_{periode}"] = state_awal.rsi_naik.get(periode)
+        awal[f"rata_turun_{periode}"] = state_awal.rsi_turun.get(periode)
+    for periode in periode_ema:
+        awal[f"ema_{periode}"] = state_awal.ema.get(periode)
+    multi = hitung_rsi_ema_multi_np(
+        tutup,
+        periode_rsi,
+        periode_ema,
+        sertakan_rata=state is not None,
+        tutup_sebelumnya=tutup_sebelumnya,
+        awal=awal,
+    )
+
+    def _dengan_riwayat(riwayat, nilai: np.ndarray) -> np.ndarray:
+        # Awali array dengan riwayat potongan sebelumnya agar window rolling kontinu
+        if not riwayat:
+            return nilai
+        return np.concatenate((np.asarray(riwayat, dtype=np.float64), nilai))
+
+    kolom: Dict[str, np.ndarray] = {}
+
+    # RSI
+    for periode in periode_rsi:
+        kolom[f"rsi_{periode}"] = multi[f"rsi_{periode}"]
+    for periode in DAFTAR_PERIODE_RSI_MA3:
+        riwayat = state_awal.riwayat_rsi.get(periode, ())
+        rsi_penuh = _dengan_riwayat(riwayat, kolom[f"rsi_{periode}"])
+        kolom[f"rsi_{periode}_ma3"] = rolling_mean_np(rsi_penuh, WINDOW_RSI_MA)[..., len(riwayat):]
+
+    # EMA
+    for periode in periode_ema:
+        kolom[f"ema_{periode}"] = multi[f"ema_{periode}"]
+
+    # ATR
+    kolom["atr_14"] = atr_np(
+        tinggi, rendah, tutup, PERIODE_ATR, tutup_sebelumnya=tutup_sebelumnya, awal=state_awal.atr
+    )
+
+    # Candle structure
+    kolom["candle_body"] = tutup - buka
+    kolom["candle_range"] = tinggi - rendah
+    kolom["upper_wick"] = tinggi - np.maximum(buka, tutup)
+    kolom["lower_wick"] = np.minimum(buka, tutup) - rendah
+
+    # Return & volatilitas
+    tutup_penuh = _dengan_riwayat(state_awal.riwayat_close, tutup)
+    jumlah_riwayat_close = len(state_awal.riwayat_close)
+    kolom["return_1"] = (tutup / geser_np(tutup_penuh, 1)[..., jumlah_riwayat_close:]) - 1.0
+    kolom["return_5"] = (tutup / geser_np(tutup_penuh, WINDOW_RETURN)[..., jumlah_riwayat_close:]) - 1.0
+    return_penuh = _dengan_riwayat(state_awal.riwayat_return, kolom["return_1"])
+    volatilitas = rolling_std_np(return_penuh, WINDOW_VOLATILITAS)[..., len(state_awal.riwayat_return):]
+    kolom["volatility_5"] = np.where(np.isnan(volatilitas), 0.0, volatilitas)
+
+    # Jarak ke EMA & posisi RSI
+    kolom["distance_to_ema_20"] = tutup - kolom[f"ema_{PERIODE_EMA_20}"]
+    kolom["distance_to_ema_50"] = tutup - kolom[f"ema_{PERIODE_EMA_50}"]
+    kolom["rsi_position"] = kolom[f"rsi_{PERIODE_RSI_SWING}"] / 100.0
+
+    # Volume anomaly
+    if volume is not None:
+        volume_penuh = _dengan_riwayat(state_awal.riwayat_volume, volume)
+        rata_volume = rolling_mean_np(volume_penuh, WINDOW_VOLUME)[..., len(state_awal.riwayat_volume):]
+        kolom["volume_anomaly"] = volume / np.where(rata_volume == 0, 1.0, rata_volume)
+    else:
+        kolom["volume_anomaly"] = np.ones(tutup.shape)
+
+    if state is not None and tutup.shape[0] > 0:
+        _perbarui_state(state, multi, kolom, tutup, volume, periode_rsi, periode_ema)
+    return kolom
+
+
+def _perbarui_state(
+    state: StateIndikator,
+    multi: Dict[str, np.ndarray],
+    kolom: Dict[str, np.ndarray],
+    tutup: np.ndarray,
+    volume: Optional[np.ndarray],
+    periode_rsi: Sequence[int],
+    periode_ema: Sequence[int],
+) -> None:
+    """Simpan nilai terakhir tiap deret ke `state` (setara memproses bar satu per satu)."""
+    for periode in periode_rsi:
+        naik = float(multi[f"rata_naik_{periode}"][-1])
+        turun = float(multi[f"rata_turun_{periode}"][-1])
+        state.rsi_naik[periode] = None if np.isnan(naik) else naik
+        state.rsi_turun[periode] = None if np.isnan(turun) else turun
+    for periode in DAFTAR_PERIODE_RSI_MA3:
+        riwayat = state.riwayat_rsi.setdefault(periode, deque(maxlen=WINDOW_RSI_MA))
+        riwayat.extend(kolom[f"rsi_{periode}"][-WINDOW_RSI_MA:].tolist())
+    for periode in periode_ema:
+        state.ema[periode] = float(kolom[f"ema_{periode}"][-1])
+    state.atr = float(kolom["atr_14"][-1])
+    state.riwayat_close.extend(tutup[-WINDOW_RETURN:].tolist())
+    state.riwayat_return.extend(kolom["return_1"][-WINDOW_VOLATILITAS:].tolist())
+    if volume is not None:
+        state.riwayat_volume.extend(volume[-WINDOW_VOLUME:].tolist())
+    state.close_terakhir = float(tutup[-1])
+    state.jumlah_bar += int(tutup.shape[0])
+
+
+def kolom_pivot(jenis: str, kiri: int, kanan: int) -> str:
+    """Nama kolom pivot, misal kolom_pivot("low", 3, 3) -> "pivot_low_3_3"."""
+    return f"pivot_{jenis}_{kiri}_{kanan}"
+
+
+def hitung_pivot_np(
+    rendah: np.ndarray,
+    tinggi: np.ndarray,
+    daftar_pivot: Sequence[Tuple[int, int]] = DAFTAR_PIVOT,
+    panjang: Optional[np.ndarray] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Kolom pivot_low_<kiri>_<kanan> / pivot_high_<kiri>_<kanan> (bool) untuk
+    setiap lebar di `daftar_pivot`, dengan rolling min/max vektor (`pivot_np`).
+
+    `panjang` (array 2-D rapat, lihat `indikator_panel`): jumlah bar valid per
+    baris; bar yang kurang dari `kanan` bar dari ujung valid bernilai False.
+    """
+    kolom: Dict[str, np.ndarray] = {}
+    for kiri, kanan in daftar_pivot:
+        for jenis, nilai in (("low", rendah), ("high", tinggi)):
+            topeng = pivot_np(nilai, kiri, kanan, jenis)
+            if panjang is not None:
+                topeng &= np.arange(nilai.shape[-1]) < (np.asarray(panjang) - kanan)[:, None]
+            kolom[kolom_pivot(jenis, kiri, kanan)] = topeng
+    return kolom
+
+
+def tambah_kolom_pivot(df: pd.DataFrame) -> pd.DataFrame:
+    """Tambahkan (atau hitung ulang) kolom pivot `DAFTAR_PIVOT` ke `df` yang urut waktu, di tempat."""
+    kolom = hitung_pivot_np(
+        pd.to_numeric(df["low"], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan),
+        pd.to_numeric(df["high"], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan),
+    )
+    for nama, nilai in kolom.items():
+        df[nama] = nilai
+    return df
+
+
+def _tambah_indikator_pandas(
+    df: pd.DataFrame,
+    periode_rsi_tambahan: Sequence[int] = (),
+    periode_ema_tambahan: Sequence[int] = (),
+) -> pd.DataFrame:
+    """
+    Jalur pandas lama untuk `tambah_indikator_ke_df`.
+    Dipakai hanya jika OHLCV masih mengandung NaN (kernel NumPy butuh data bersih).
+    """
     # -----------------------------
     # HITUNG RSI
     # -----------------------------
@@ -123,6 +576,8 @@ def tambah_indikator_ke_df(data_ohlcv: pd.DataFrame) -> pd.DataFrame:
     df["rsi_8"] = hitung_rsi(df["close"], periode=PERIODE_RSI_INTRADAY_1)
     df["rsi_10"] = hitung_rsi(df["close"], periode=PERIODE_RSI_INTRADAY_2)
     df["rsi_14"] = hitung_rsi(df["close"], periode=PERIODE_RSI_SWING)
+    for periode in periode_rsi_tambahan:
+        df[f"rsi_{periode}"] = hitung_rsi(df["close"], periode=periode)
 
     # Smoothing RSI (MA 3) untuk intraday
     df["rsi_8_ma3"] = df["rsi_8"].rolling(window=3, min_periods=1).mean()
@@ -135,6 +590,8 @@ def tambah_indikator_ke_df(data_ohlcv: pd.DataFrame) -> pd.DataFrame:
     df[f"ema_{PERIODE_EMA_20}"] = hitung_ema(df["close"], periode=PERIODE_EMA_20)
     df[f"ema_{PERIODE_EMA_50}"] = hitung_ema(df["close"], periode=PERIODE_EMA_50)
     df[f"ema_{PERIODE_EMA_200}"] = hitung_ema(df["close"], periode=PERIODE_EMA_200)
+    for periode in periode_ema_tambahan:
+        df[f"ema_{periode}"] = hitung_ema(df["close"], periode=periode)
 
     # -----------------------------
     # HITUNG ATR 14
@@ -185,31 +642,468 @@ def tambah_indikator_ke_df(data_ohlcv: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def simpan_hasil_preprocess(df: pd.DataFrame, nama_berkas: str, folder_tujuan: Path) -> Path:
+# Daftar kolom minimal agar data bisa dipakai untuk analisis OHLCV.
+KOLOM_WAJIB: List[str] = ["open_time", "open", "high", "low", "close", "volume"]
+
+# Header standar untuk data Binance Vision (tanpa header)
+HEADER_BINANCE_VISION: List[str] = [
+    "open_time", "open", "high", "low", "close", "volume",
+    "close_time", "quote_volume", "count", "taker_buy_volume",
+    "taker_buy_quote_volume", "ignore"
+]
+
+
+def normalisasi_csv_binance(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalisasi CSV dari Binance Vision yang mungkin tidak punya header.
+    Auto-detect dan assign header jika diperlukan.
+    
+    Format Binance Vision (tanpa header):
+    open_time,open,high,low,close,volume,close_time,quote_volume,count,taker_buy_volume,taker_buy_quote_volume,ignore
     """
-    Simpan DataFrame hasil preprocessing ke folder tujuan (format CSV).
-    Dipilih CSV agar tidak perlu dependency tambahan seperti pyarrow/fastparquet.
+    # Cek apakah kolom pertama adalah angka (kemungkinan open_time dalam format timestamp)
+    # Jika iya, berarti CSV tidak punya header
+    if len(df.columns) == len(HEADER_BINANCE_VISION):
+        kolom_pertama = df.columns[0]
+        # Cek apakah kolom pertama adalah angka (timestamp) atau string yang mirip header
+        try:
+            # Coba convert kolom pertama ke float/int
+            pd.to_numeric(df.iloc[0, 0], errors='raise')
+            # Jika berhasil, berarti ini data tanpa header
+            # Assign header sesuai format Binance Vision
+            df.columns = HEADER_BINANCE_VISION
+        except (ValueError, TypeError):
+            # Kolom pertama bukan angka, kemungkinan sudah ada header
+            # Tapi cek apakah header sesuai dengan format Binance
+            if kolom_pertama.lower() not in ['open_time', 'open', 'high', 'low', 'close', 'volume']:
+                # Header tidak sesuai, coba assign ulang
+                df.columns = HEADER_BINANCE_VISION[:len(df.columns)]
     
-    Pastikan timestamp disimpan dengan benar (ISO format atau timestamp milidetik).
+    return df
+
+
+def pastikan_kolom_wajib(df: pd.DataFrame) -> None:
+    """
+    Pastikan kolom wajib tersedia di DataFrame.
+    Raise ValueError jika ada kolom yang hilang.
+    """
+    kolom_tidak_ada = [kol for kol in KOLOM_WAJIB if kol not in df.columns]
+    if kolom_tidak_ada:
+        raise ValueError(
+            f"Kolom wajib hilang: {', '.join(kolom_tidak_ada)}. Format CSV harus sesuai Binance: {', '.join(HEADER_BINANCE_VISION)}"
+        )
+
+
+def konversi_waktu(series_waktu: pd.Series, format_waktu: Optional[str] = None) -> pd.Series:
+    """
+    Konversi kolom open_time ke datetime64[ms] (naive, UTC).
+    Format (detik/milidetik/mikrodetik/ISO) dideteksi dari sampel, lihat `waktu_epoch`.
+    """
+    return normalisasi_waktu(series_waktu, format_waktu)
+
+
+def ringkas_csv_bertahap(path_sumber: Path, ukuran_chunk: int = UKURAN_CHUNK_CSV) -> Dict:
+    """
+    Ringkasan berkas CSV upload (jumlah baris, kolom, rentang open_time) tanpa
+    memuat seluruh berkas: CSV dibaca per `ukuran_chunk` baris sehingga memori
+    puncak tetap kecil berapapun ukuran berkasnya.
+
+    Deteksi header sama dengan `normalisasi_csv_binance` atas chunk pertama.
+    Pemeriksaan kualitas data (`PemeriksaKualitas`: gap, duplikat, urutan,
+    konsistensi OHLC, volume nol) berjalan di pass yang sama.
+
+    Returns
+    -------
+    Dict
+        jumlah_baris, kolom, waktu_mulai, waktu_selesai (pd.Timestamp), kualitas.
+        ValueError dilempar jika CSV tidak bisa dibaca / kolom wajib hilang /
+        open_time tidak valid.
+    """
+    jumlah_baris = 0
+    kolom: List[str] = []
+    waktu_mulai = waktu_selesai = None
+    format_waktu: Optional[str] = None
+    pemeriksa = PemeriksaKualitas()
+    try:
+        with pd.read_csv(path_sumber, chunksize=ukuran_chunk) as pembaca:
+            for i, chunk in enumerate(pembaca):
+                if i == 0:
+                    chunk = normalisasi_csv_binance(chunk)
+                    pastikan_kolom_wajib(chunk)
+                    kolom = list(chunk.columns)
+                else:
+                    chunk.columns = kolom
+                jumlah_baris += len(chunk)
+                if format_waktu is None:
+                    # Deteksi sekali, chunk berikutnya memakai jalur konversi yang sama
+                    format_waktu = deteksi_format_waktu(chunk["open_time"])
+                waktu_ms = ke_epoch_ms(chunk["open_time"], format_waktu)
+                pemeriksa.tambah_np(
+                    waktu_ms,
+                    *(pd.to_numeric(chunk[nama], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+                      for nama in ("open", "high", "low", "close", "volume")),
+                )
+                waktu = waktu_ms[waktu_ms != NAT_INT64]
+                if waktu.size == 0:
+                    continue
+                awal, akhir = int(waktu.min()), int(waktu.max())
+                waktu_mulai = awal if waktu_mulai is None else min(waktu_mulai, awal)
+                waktu_selesai = akhir if waktu_selesai is None else max(waktu_selesai, akhir)
+    except pd.errors.EmptyDataError as err:
+        raise ValueError("Berkas kosong.") from err
+    except (pd.errors.ParserError, UnicodeDecodeError) as err:
+        raise ValueError(f"Gagal membaca CSV: {err}") from err
+
+    if not kolom:
+        pastikan_kolom_wajib(pd.DataFrame())
+    if waktu_mulai is None:
+        raise ValueError("Kolom open_time tidak bisa dikonversi ke datetime.")
+    return {
+        "jumlah_baris": jumlah_baris,
+        "kolom": kolom,
+        "waktu_mulai": pd.Timestamp(waktu_mulai, unit="ms"),
+        "waktu_selesai": pd.Timestamp(waktu_selesai, unit="ms"),
+        "kualitas": pemeriksa.laporan(),
+    }
+
+
+def periksa_kualitas_folder(path_folder: Path, ukuran_chunk: int = UKURAN_CHUNK_CSV) -> Dict[str, Dict]:
+    """
+    Periksa kualitas semua CSV di folder upload dan tulis ulang `_kualitas.json`.
+
+    Setiap berkas dibaca sekali per chunk (`ringkas_csv_bertahap`); berkas
+    yang tidak bisa dibaca dicatat sebagai {"error": ...}.
+
+    Returns
+    -------
+    Dict[str, Dict]
+        Nama berkas -> laporan kualitas.
+    """
+    laporan: Dict[str, Dict] = {}
+    for path in sorted(Path(path_folder).glob("*.csv")):
+        try:
+            laporan[path.name] = ringkas_csv_bertahap(path, ukuran_chunk)["kualitas"]
+        except ValueError as err:
+            laporan[path.name] = {"error": str(err)}
+    return simpan_laporan_kualitas(path_folder, laporan, ganti=True)
+
+
+def praproses_berkas(
+    path_sumber: Path,
+    folder_tujuan: Path,
+    format_simpan: str = FORMAT_CSV,
+    state: Optional[StateIndikator] = None,
+    isi_gap: bool = False,
+    timeframe: Optional[str] = None,
+) -> Dict:
+    """
+    Pra-proses satu berkas CSV upload: baca, normalisasi, periksa kualitas,
+    hitung indikator, simpan.
+
+    Fungsi ini berdiri sendiri (argumen & hasil bisa di-pickle) sehingga bisa
+    dijalankan di worker process oleh `pipeline_praproses`.
+
+    Jika `state` diberikan (mode kontinu), indikator melanjutkan state dari
+    berkas sebelumnya dan state terbaru dikembalikan di kunci "state".
+
+    `isi_gap=True` mengurutkan data, membuang open_time duplikat, dan mengisi
+    bar yang hilang dengan candle datar sebelum indikator dihitung
+    (`isi_bar_hilang`), sehingga EMA/ATR tidak melompati gap.
+
+    `timeframe` (misal "1h") me-resample data (setelah gap diisi) ke timeframe
+    itu sebelum indikator dihitung; hasil berisi bar timeframe tersebut.
+
+    Berkas lebih besar dari `BATAS_BERKAS_BERTAHAP` diproses per chunk lewat
+    `praproses_berkas_bertahap` (memori terbatas, hasil sama).
+
+    Returns
+    -------
+    Dict
+        nama_berkas, jumlah_baris, lokasi_hasil, kualitas (laporan data
+        sumber), bar_diisi (jika isi_gap), timeframe (jika di-resample) (+ state).
+        Error dilempar ke pemanggil.
     """
+    if timeframe is not None and timeframe not in TIMEFRAME_MS:
+        raise ValueError(f"Timeframe tidak dikenal: {timeframe}")
+    if path_sumber.stat().st_size > BATAS_BERKAS_BERTAHAP:
+        return praproses_berkas_bertahap(
+            path_sumber, folder_tujuan, format_simpan, state, timeframe=timeframe, isi_gap=isi_gap
+        )
+
+    df = pd.read_csv(path_sumber)
+    # Normalisasi untuk handle CSV tanpa header
+    df = normalisasi_csv_binance(df)
+    pastikan_kolom_wajib(df)
+
+    # Pastikan open_time adalah datetime dengan benar (unit dideteksi sekali)
+    format_waktu = deteksi_format_waktu(df["open_time"])
+    df = _normalisasi_kolom_waktu(df, format_waktu)
+    if df["open_time"].isna().all():
+        raise ValueError("open_time tidak valid")
+
+    pemeriksa = PemeriksaKualitas()
+    pemeriksa.tambah(df)
+    bar_diisi = 0
+    if isi_gap and pemeriksa.interval_ms:
+        df, bar_diisi = isi_bar_hilang(df, pemeriksa.interval_ms)
+    if timeframe is not None:
+        df = resample_ohlcv(df, timeframe)
+
+    # Gunakan periode FIXED (RSI 6/8/10/14, EMA 9/20/50/200, ATR 14)
+    df_indikator = tambah_indikator_ke_df(df, state=state)
+    path_hasil_simpan = simpan_hasil_preprocess(df_indikator, path_sumber.name, folder_tujuan, format_simpan)
+    hasil = {
+        "nama_berkas": path_sumber.name,
+        "jumlah_baris": len(df_indikator),
+        "lokasi_hasil": str(path_hasil_simpan),
+        "kualitas": pemeriksa.laporan(),
+    }
+    if isi_gap:
+        hasil["bar_diisi"] = bar_diisi
+    if timeframe is not None:
+        hasil["timeframe"] = timeframe
+    if state is not None:
+        hasil["state"] = state
+    return hasil
+
+
+def _normalisasi_kolom_waktu(df: pd.DataFrame, format_waktu: str) -> pd.DataFrame:
+    """
+    open_time -> datetime64[ms]; close_time -> integer milidetik. Unit close_time
+    sama dengan open_time (mikrodetik di berkas Binance Vision baru).
+    """
+    df["open_time"] = konversi_waktu(df["open_time"], format_waktu)
+    if "close_time" in df.columns:
+        close_ms = ke_epoch_ms(df["close_time"], None if format_waktu == FORMAT_ISO else format_waktu)
+        df["close_time"] = np.where(close_ms == NAT_INT64, 0, close_ms)
+    return df
+
+
+def praproses_berkas_bertahap(
+    path_sumber: Path,
+    folder_tujuan: Path,
+    format_simpan: str = FORMAT_CSV,
+    state: Optional[StateIndikator] = None,
+    ukuran_chunk: int = UKURAN_CHUNK_PRAPROSES,
+    timeframe: Optional[str] = None,
+    isi_gap: bool = False,
+) -> Dict:
+    """
+    Pra-proses berkas CSV yang terlalu besar untuk RAM (misal riwayat 1m
+    bertahun-tahun) per `ukuran_chunk` baris.
+
+    Setiap chunk dinormalisasi, diberi indikator dengan `StateIndikator` yang
+    diteruskan antar chunk (EMA/RSI/ATR/rolling tidak mulai dingin), lalu
+    langsung ditulis ke hasil (CSV di-append, format kolom lewat
+    `PenulisKolomBertahap`). Memori puncak sebanding dengan satu chunk, bukan
+    panjang riwayat. Hasil ditulis ke path sementara dan baru dipindah ke
+    lokasi akhir setelah semua chunk selesai.
+
+    Sumber harus urut open_time (seperti berkas Binance Vision); baris dengan
+    open_time tidak valid dibuang. ValueError jika chunk mundur waktu.
+
+    Parameters
+    ----------
+    ukuran_chunk : int
+        Jumlah baris sumber per chunk.
+    timeframe : str, optional
+        Resample sumber ke timeframe ini (misal "1h") sebelum indikator
+        dihitung, memakai `ResamplerBertahap`.
+    isi_gap : bool
+        Isi bar yang hilang (juga di batas chunk) sebelum resample/indikator,
+        seperti `praproses_berkas`. Duplikat di batas chunk: baris pertama dipakai.
+
+    Returns
+    -------
+    Dict
+        Sama dengan `praproses_berkas`, plus "bertahap": True.
+    """
+    if format_simpan not in DAFTAR_FORMAT:
+        raise ValueError(f"Format simpan tidak dikenal: {format_simpan}")
     folder_tujuan.mkdir(parents=True, exist_ok=True)
-    nama_output = Path(nama_berkas).with_suffix(".processed.csv")
-    path_output = folder_tujuan / nama_output.name
+    path_output = path_hasil(folder_tujuan, path_sumber.name, format_simpan)
+    path_sementara = path_output.with_name(path_output.name + ".tmp")
+    penulis = PenulisKolomBertahap(path_output) if format_simpan == FORMAT_KOLOM else None
+    resampler = ResamplerBertahap(timeframe) if timeframe else None
+    state_kerja = state if state is not None else StateIndikator()
+    pemeriksa = PemeriksaKualitas()
+    jumlah_baris = 0
+    bar_diisi = 0
+    # Kolom pivot butuh bar sesudahnya: ekor chunk (konteks kiri + bar yang
+    # belum final) disambung ke chunk berikutnya dan pivotnya dihitung ulang
+    panjang_ekor = max(kiri + kanan for kiri, kanan in DAFTAR_PIVOT)
+    tunda = max(kanan for _, kanan in DAFTAR_PIVOT)
+    ekor: Optional[pd.DataFrame] = None
+    tertunda = 0
+
+    def _simpan(df_siap: pd.DataFrame) -> None:
+        nonlocal jumlah_baris
+        if df_siap.empty:
+            return
+        if penulis is not None:
+            penulis.tambah(df_siap)
+        else:
+            tulis_csv_preprocess(df_siap, path_sementara, tambahkan=jumlah_baris > 0)
+        jumlah_baris += len(df_siap)
+
+    def _tulis(df_potongan: pd.DataFrame) -> None:
+        nonlocal ekor, tertunda
+        if df_potongan.empty:
+            return
+        df_indikator = tambah_indikator_ke_df(df_potongan, state=state_kerja)
+        if ekor is None:
+            gabung, mulai = df_indikator, 0
+        else:
+            gabung = tambah_kolom_pivot(pd.concat([ekor, df_indikator], ignore_index=True))
+            mulai = len(ekor) - tertunda
+        akhir = max(mulai, len(gabung) - tunda)
+        _simpan(gabung.iloc[mulai:akhir])
+        tertunda = len(gabung) - akhir
+        ekor = gabung.iloc[-panjang_ekor:]
+
+    try:
+        kolom: List[str] = []
+        format_waktu = FORMAT_ISO
+        waktu_terakhir = None
+        baris_terakhir: Optional[pd.DataFrame] = None
+        with pd.read_csv(path_sumber, chunksize=ukuran_chunk) as pembaca:
+            for i, chunk in enumerate(pembaca):
+                if i == 0:
+                    chunk = normalisasi_csv_binance(chunk)
+                    pastikan_kolom_wajib(chunk)
+                    kolom = list(chunk.columns)
+                    format_waktu = deteksi_format_waktu(chunk["open_time"])
+                else:
+                    chunk.columns = kolom
+                chunk = _normalisasi_kolom_waktu(chunk, format_waktu)
+                pemeriksa.tambah(chunk)
+                chunk = chunk.dropna(subset=["open_time"])
+                if chunk.empty:
+                    continue
+                chunk = chunk.sort_values("open_time", kind="stable")
+                if waktu_terakhir is not None and chunk["open_time"].iloc[0] < waktu_terakhir:
+                    raise ValueError(
+                        f"open_time tidak urut antar chunk (chunk {i + 1} dimulai sebelum {waktu_terakhir}); "
+                        "pra-proses bertahap butuh sumber yang urut waktu."
+                    )
+                if isi_gap and pemeriksa.interval_ms:
+                    # Baris terakhir chunk sebelumnya ikut agar gap di batas chunk terisi
+                    if baris_terakhir is not None:
+                        chunk = pd.concat([baris_terakhir, chunk], ignore_index=True)
+                    chunk, diisi = isi_bar_hilang(chunk, pemeriksa.interval_ms)
+                    if baris_terakhir is not None:
+                        chunk = chunk[chunk["open_time"] > waktu_terakhir]
+                    bar_diisi += diisi
+                    if chunk.empty:
+                        continue
+                    baris_terakhir = chunk.iloc[[-1]]
+                waktu_terakhir = chunk["open_time"].iloc[-1]
+                _tulis(resampler.tambah(chunk) if resampler is not None else chunk)
+        if resampler is not None:
+            _tulis(resampler.selesai())
+        if tertunda:
+            # Bar terakhir berkas: pivotnya sudah final (tepi deret)
+            _simpan(ekor.iloc[len(ekor) - tertunda:])
+        if jumlah_baris == 0:
+            raise ValueError("open_time tidak valid")
+
+        if penulis is not None:
+            penulis.selesai()
+        else:
+            os.replace(path_sementara, path_output)
+    except BaseException:
+        if penulis is not None:
+            penulis.batal()
+        elif path_sementara.exists():
+            path_sementara.unlink()
+        raise
+
+    for format_lain in DAFTAR_FORMAT:
+        if format_lain != format_simpan:
+            hapus_hasil(path_hasil(folder_tujuan, path_sumber.name, format_lain))
+    hasil = {
+        "nama_berkas": path_sumber.name,
+        "jumlah_baris": jumlah_baris,
+        "lokasi_hasil": str(path_output),
+        "kualitas": pemeriksa.laporan(),
+        "bertahap": True,
+    }
+    if isi_gap:
+        hasil["bar_diisi"] = bar_diisi
+    if timeframe is not None:
+        hasil["timeframe"] = timeframe
+    if state is not None:
+        hasil["state"] = state
+    return hasil
+
+
+def simpan_hasil_preprocess(
+    df: pd.DataFrame,
+    nama_berkas: str,
+    folder_tujuan: Path,
+    format_simpan: str = FORMAT_CSV,
+) -> Path:
+    """
+    Simpan DataFrame hasil preprocessing ke folder tujuan.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        DataFrame hasil `tambah_indikator_ke_df`
+    nama_berkas : str
+        Nama berkas upload asal (misal BTCUSDT-1h-2024-01-01.csv)
+    folder_tujuan : Path
+        Folder data/processed/<folder>/
+    format_simpan : str
+        'csv' (default, tanpa dependency tambahan) atau 'kolom'
+        (satu .npy per kolom, timestamp int64 ms, bisa di-memory-map)
+
+    Returns
+    -------
+    Path
+        Lokasi hasil. Hasil lama dengan format lain untuk berkas yang sama dihapus
+        agar pembaca tidak memakai data basi.
+    """
+    if format_simpan not in DAFTAR_FORMAT:
+        raise ValueError(f"Format simpan tidak dikenal: {format_simpan}")
+    folder_tujuan.mkdir(parents=True, exist_ok=True)
+    path_output = path_hasil(folder_tujuan, nama_berkas, format_simpan)
+
+    if format_simpan == FORMAT_KOLOM:
+        df_save = df.copy()
+        if "open_time" in df_save.columns and not pd.api.types.is_datetime64_any_dtype(df_save["open_time"]):
+            df_save["open_time"] = normalisasi_waktu(df_save["open_time"])
+        if "close_time" in df_save.columns and not pd.api.types.is_integer_dtype(df_save["close_time"]):
+            df_save["close_time"] = pd.to_numeric(df_save["close_time"], errors="coerce").fillna(0).astype("int64")
+        simpan_kolom(df_save, path_output)
+    else:
+        tulis_csv_preprocess(df, path_output)
+
+    for format_lain in DAFTAR_FORMAT:
+        if format_lain != format_simpan:
+            hapus_hasil(path_hasil(folder_tujuan, nama_berkas, format_lain))
+    return path_output
+
+
+def tulis_csv_preprocess(
+    df: pd.DataFrame, path_output: Path, waktu_teks: bool = False, tambahkan: bool = False
+) -> Path:
+    """
+    Tulis DataFrame hasil preprocessing sebagai CSV (format simpan default
+    sekaligus format ekspor).
     
+    open_time disimpan sebagai epoch milidetik (int64, sama dengan CSV Binance)
+    sehingga pembaca tidak perlu mem-parse teks tanggal. `waktu_teks=True`
+    (ekspor untuk dibaca manusia) menulis "%Y-%m-%d %H:%M:%S" UTC.
+    `tambahkan=True` menambahkan baris ke berkas yang sudah ada (tanpa header).
+    """
     # Pastikan open_time disimpan dengan benar
     df_save = df.copy()
     if "open_time" in df_save.columns:
-        # Jika open_time adalah datetime, simpan sebagai ISO format string
-        if pd.api.types.is_datetime64_any_dtype(df_save["open_time"]):
-            df_save["open_time"] = df_save["open_time"].dt.strftime("%Y-%m-%d %H:%M:%S")
-        # Jika masih string tapi format salah, coba convert dulu
-        elif df_save["open_time"].dtype == "object":
-            try:
-                # Coba parse sebagai datetime dulu
-                df_save["open_time"] = pd.to_datetime(df_save["open_time"], errors="coerce", utc=True)
-                df_save["open_time"] = df_save["open_time"].dt.strftime("%Y-%m-%d %H:%M:%S")
-            except:
-                pass
+        if waktu_teks:
+            df_save["open_time"] = normalisasi_waktu(df_save["open_time"]).dt.strftime("%Y-%m-%d %H:%M:%S")
+        else:
+            df_save["open_time"] = ke_kolom_epoch_ms(df_save["open_time"])
     
     # Simpan close_time sebagai integer (timestamp milidetik) jika ada
     if "close_time" in df_save.columns:
@@ -220,107 +1114,100 @@ def simpan_hasil_preprocess(df: pd.DataFrame, nama_berkas: str, folder_tujuan: P
             except:
                 pass
     
-    df_save.to_csv(path_output, index=False)
+    df_save.to_csv(path_output, index=False, mode="a" if tambahkan else "w", header=not tambahkan)
     return path_output
 
 
-def resample_ohlcv(df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+def ekspor_hasil_ke_csv(path_sumber: Path, path_csv: Path) -> Path:
+    """Ekspor hasil preprocessing (format apa pun) ke CSV dengan open_time berupa teks tanggal UTC."""
+    return tulis_csv_preprocess(baca_hasil_preprocess(path_sumber), path_csv, waktu_teks=True)
+
+
+# -----------------------------
+# MODE RINGKAS (COMPACT)
+# -----------------------------
+# Kontrak presisi: kolom yang dibandingkan langsung oleh logika sinyal/backtest
+# (harga vs EMA, RSI vs threshold & divergence, ATR untuk SL/TP) TETAP float64,
+# sehingga keputusan sinyal identik dengan mode penuh. Kolom turunan lain
+# (candle structure, return, volatility, distance, rsi_*_ma3, volume_anomaly,
+# quote/taker volume) disimpan float32: error relatif <= 6e-8.
+KOLOM_PRESISI_PENUH: Tuple[str, ...] = (
+    "open",
+    "high",
+    "low",
+    "close",
+    "volume",
+    *(f"rsi_{p}" for p in DAFTAR_PERIODE_RSI),
+    *(f"ema_{p}" for p in DAFTAR_PERIODE_EMA),
+    f"atr_{PERIODE_ATR}",
+)
+# Timestamp milidetik yang harus tetap int64
+KOLOM_WAKTU_MS: Tuple[str, ...] = ("close_time",)
+
+
+def _presisi_penuh(nama_kolom: str) -> bool:
+    """True untuk kolom kontrak float64 (termasuk periode RSI/EMA tambahan)."""
+    if nama_kolom in KOLOM_PRESISI_PENUH:
+        return True
+    awalan, _, periode = nama_kolom.rpartition("_")
+    return awalan in ("rsi", "ema") and periode.isdigit()
+
+
+def ringkas_frame(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Resample DataFrame OHLCV ke timeframe yang lebih besar.
-    
+    Representasi ringkas DataFrame hasil preprocessing (sekitar separuh RAM).
+
+    - kolom kontrak (`KOLOM_PRESISI_PENUH`, rsi_<p>, ema_<p>): float64 apa adanya
+    - kolom angka lain: float32; kolom integer: di-downcast (count -> int32, dst)
+    - open_time: datetime64[ms] (int64 epoch ms)
+    - close_time: int64 epoch ms
+    - kolom teks (symbol/pair): category
+
     Parameters
     ----------
     df : pd.DataFrame
-        DataFrame dengan kolom: open_time, open, high, low, close, volume
-        open_time harus sudah dalam format datetime.
-    timeframe : str
-        Timeframe target: "1m", "5m", "15m", "30m", "1h", "4h"
-    
+        Hasil preprocessing (CSV maupun format kolom).
+
     Returns
     -------
     pd.DataFrame
-        DataFrame yang sudah di-resample dengan kolom yang sama.
+        DataFrame baru dengan kolom & urutan yang sama.
     """
-    df_resample = df.copy()
-    
-    # Pastikan open_time adalah datetime
-    if not pd.api.types.is_datetime64_any_dtype(df_resample["open_time"]):
-        df_resample["open_time"] = pd.to_datetime(df_resample["open_time"], errors="coerce", utc=True)
-    
-    # Set open_time sebagai index untuk resample
-    df_resample = df_resample.set_index("open_time")
-    
-    # Mapping timeframe ke pandas frequency
-    timeframe_map = {
-        "1m": "1min",
-        "5m": "5min",
-        "15m": "15min",
-        "30m": "30min",
-        "1h": "1H",
-        "4h": "4H",
-    }
-    
-    if timeframe not in timeframe_map:
-        # Jika timeframe tidak dikenal, return asli
-        return df_resample.reset_index()
-    
-    freq = timeframe_map[timeframe]
-    
-    # Resample OHLCV dengan aturan standar:
-    # - open: ambil open pertama
-    # - high: ambil high maksimum
-    # - low: ambil low minimum
-    # - close: ambil close terakhir
-    # - volume: jumlahkan semua volume
-    df_resampled = df_resample.resample(freq).agg({
-        "open": "first",
-        "high": "max",
-        "low": "min",
-        "close": "last",
-        "volume": "sum",
-    })
-    
-    # Kolom lain (jika ada) diambil yang terakhir
-    kolom_lain = [col for col in df_resample.columns if col not in ["open", "high", "low", "close", "volume"]]
-    if kolom_lain:
-        for col in kolom_lain:
-            if col in df_resample.columns:
-                df_resampled[col] = df_resample[col].resample(freq).last()
-    
-    # Hapus baris yang NaN (karena resample bisa menghasilkan baris kosong)
-    df_resampled = df_resampled.dropna(subset=["open", "high", "low", "close"])
-    
-    # Reset index agar open_time menjadi kolom lagi
-    df_resampled = df_resampled.reset_index()
-    
-    # CRITICAL FIX: Pastikan tidak ada NaT di open_time
-    if "open_time" in df_resampled.columns:
-        df_resampled = df_resampled.dropna(subset=["open_time"])
-        # Convert ke datetime jika belum
-        df_resampled["open_time"] = pd.to_datetime(df_resampled["open_time"], errors="coerce")
-        # Drop lagi jika masih ada NaT setelah convert
-        df_resampled = df_resampled.dropna(subset=["open_time"])
-    
-    # Pastikan semua kolom numeric tidak ada NaN
-    numeric_cols = ["open", "high", "low", "close", "volume"]
-    for col in numeric_cols:
-        if col in df_resampled.columns:
-            df_resampled[col] = df_resampled[col].fillna(method='ffill').fillna(method='bfill').fillna(0)
-    
-    return df_resampled
+    hasil: Dict[str, object] = {}
+    for nama in df.columns:
+        kolom = df[nama]
+        if nama == "open_time":
+            hasil[nama] = normalisasi_waktu(kolom)
+        elif nama in KOLOM_WAKTU_MS and pd.api.types.is_numeric_dtype(kolom):
+            hasil[nama] = kolom if pd.api.types.is_integer_dtype(kolom) else kolom.fillna(0).astype(np.int64)
+        elif pd.api.types.is_bool_dtype(kolom) or pd.api.types.is_datetime64_any_dtype(kolom):
+            hasil[nama] = kolom
+        elif pd.api.types.is_integer_dtype(kolom):
+            hasil[nama] = pd.to_numeric(kolom, downcast="integer")
+        elif pd.api.types.is_float_dtype(kolom):
+            hasil[nama] = kolom if _presisi_penuh(nama) else kolom.astype(np.float32)
+        elif isinstance(kolom.dtype, pd.CategoricalDtype):
+            hasil[nama] = kolom
+        else:
+            hasil[nama] = kolom.astype("category")
+    return pd.DataFrame(hasil, index=df.index)
 
 
 def prepare_data_for_mode(df: pd.DataFrame, trading_mode: str) -> pd.DataFrame:
     """
     Siapkan data untuk trading mode tertentu dengan resample dan hitung indikator ulang.
-    
+
+    Hasil resample + indikator di-cache per (isi data, timeframe) di
+    `cache_timeframe`, sehingga pemanggilan berulang untuk data yang sama
+    tidak menghitung ulang.
+
     Parameters
     ----------
     df : pd.DataFrame
         DataFrame M1 yang sudah di-preprocess (sudah ada indikator dasar).
     trading_mode : str
         Trading mode: "aktif", "santai", atau "pasif"
-    
+
     Returns
     -------
     pd.DataFrame
@@ -332,23 +1219,44 @@ def prepare_data_for_mode(df: pd.DataFrame, trading_mode: str) -> pd.DataFrame:
         "santai": "4h",    # 4H untuk mode santai (4-12H)
         "pasif": "1d",     # Daily untuk mode pasif (12H-3D)
     }
-    
+
     timeframe = mode_timeframe.get(trading_mode, "1m")
-    
+
     # Jika mode aktif, bisa langsung pakai H1 tanpa resample
     if trading_mode == "aktif" and timeframe == "1h":
         # Tidak perlu resample, tapi pastikan indikator sudah dihitung
         if "rsi_6" not in df.columns:
             df = tambah_indikator_ke_df(df)
         return df
-    
-    # Resample ke timeframe yang sesuai
-    df_resampled = resample_ohlcv(df, timeframe)
-    
-    # Setelah resample, hitung ulang semua indikator
-    df_resampled = tambah_indikator_ke_df(df_resampled)
-    
-    return df_resampled
+
+    sidik = sidik_ohlcv(df)
+    return _resample_dengan_indikator(sidik, sidik, df, timeframe)
+
+
+def muat_timeframe(path_hasil_preprocess: Path, timeframe: str) -> pd.DataFrame:
+    """
+    Baca satu hasil preprocessing (CSV / kolom) lalu resample ke `timeframe`
+    beserta indikatornya. Di-cache per (path, timeframe); cache dibuang otomatis
+    jika berkas processed berubah (ukuran/mtime).
+    """
+    sumber = str(Path(path_hasil_preprocess).resolve())
+    sidik = sidik_hasil(Path(path_hasil_preprocess))
+    df = cache_timeframe.ambil(sumber, sidik, timeframe)
+    if df is not None:
+        return df.copy()
+    return _resample_dengan_indikator(
+        sumber, sidik, baca_hasil_preprocess(Path(path_hasil_preprocess)), timeframe
+    )
+
+
+def _resample_dengan_indikator(sumber: str, sidik: str, df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """Resample + hitung ulang indikator, lewat `cache_timeframe`."""
+    df_hasil = cache_timeframe.ambil(sumber, sidik, timeframe)
+    if df_hasil is None:
+        # Setelah resample, hitung ulang semua indikator
+        df_hasil = tambah_indikator_ke_df(resample_ohlcv(df, timeframe))
+        cache_timeframe.simpan(sumber, sidik, timeframe, df_hasil)
+    return df_hasil.copy()
 
 
 def ambil_ringkasan_tail(df: pd.DataFrame, jumlah: int = 5) -> List[Dict]:
@@ -0,0 +1,286 @@
+"""
+Registri indikator untuk Leon Liquidity Engine.
+
+`tambah_indikator_ke_df` selalu menghitung semua kolom. Di sini setiap indikator
+didaftarkan dengan nama kolom dan dependensinya, sehingga pemanggil cukup
+meminta kolom yang dibutuhkan:
+
+    df = hitung_kolom(df, ["rsi_6", "ema_9", "ema_20", "ema_50", "atr_14"])
+
+Hanya kolom yang belum ada di frame (plus dependensinya) yang dihitung, lalu
+disimpan ke frame itu sendiri (memo): permintaan berikutnya untuk kolom yang
+sama tidak menghitung ulang. Nilainya identik dengan `tambah_indikator_ke_df`.
+
+Selain nama yang terdaftar, pola berikut dikenali untuk periode apa pun:
+rsi_<p>, ema_<p>, rsi_<p>_ma3, atr_<p>, pivot_low_<kiri>_<kanan>,
+pivot_high_<kiri>_<kanan>. Semua RSI/EMA yang diminta dihitung
+bersama dalam satu pass kernel multi-periode.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .kernel_indikator import atr_np, geser_np, hitung_rsi_ema_multi_np, pivot_np, rolling_mean_np, rolling_std_np
+from .praproses_data import (
+    PERIODE_EMA_20,
+    PERIODE_EMA_50,
+    PERIODE_RSI_SWING,
+    WINDOW_RETURN,
+    WINDOW_RSI_MA,
+    WINDOW_VOLATILITAS,
+    WINDOW_VOLUME,
+    _ke_array_float,
+    tambah_indikator_ke_df,
+)
+
+# Kolom input (bukan indikator)
+KOLOM_DASAR: Tuple[str, ...] = ("open", "high", "low", "close", "volume")
+
+FungsiIndikator = Callable[[Dict[str, np.ndarray]], np.ndarray]
+
+POLA_RSI = re.compile(r"^rsi_(\d+)$")
+POLA_EMA = re.compile(r"^ema_(\d+)$")
+POLA_RSI_MA = re.compile(rf"^rsi_(\d+)_ma{WINDOW_RSI_MA}$")
+POLA_ATR = re.compile(r"^atr_(\d+)$")
+POLA_PIVOT = re.compile(r"^pivot_(low|high)_(\d+)_(\d+)$")
+
+
+@dataclass(frozen=True)
+class DefinisiIndikator:
+    """Satu kolom indikator: nama, kolom yang dibutuhkan, dan fungsi hitungnya."""
+    nama: str
+    dependensi: Tuple[str, ...]
+    hitung: FungsiIndikator
+    keterangan: str = ""
+
+
+REGISTRI_INDIKATOR: Dict[str, DefinisiIndikator] = {}
+
+
+def daftarkan_indikator(
+    nama: str, dependensi: Sequence[str] = (), keterangan: str = ""
+) -> Callable[[FungsiIndikator], FungsiIndikator]:
+    """
+    Decorator untuk mendaftarkan indikator baru.
+
+    Fungsi menerima dict nama kolom -> array float64 (berisi semua
+    dependensi) dan mengembalikan array kolom baru.
+    """
+    def _daftarkan(fungsi: FungsiIndikator) -> FungsiIndikator:
+        REGISTRI_INDIKATOR[nama] = DefinisiIndikator(nama, tuple(dependensi), fungsi, keterangan)
+        return fungsi
+    return _daftarkan
+
+
+def definisi_indikator(nama: str) -> Optional[DefinisiIndikator]:
+    """Definisi untuk kolom `nama` (terdaftar atau pola rsi_/ema_/atr_/pivot_), None jika tidak dikenal."""
+    if nama in REGISTRI_INDIKATOR:
+        return REGISTRI_INDIKATOR[nama]
+    cocok = POLA_RSI.match(nama)
+    if cocok:
+        periode = int(cocok.group(1))
+        return DefinisiIndikator(
+            nama, ("close",), lambda k: hitung_rsi_ema_multi_np(k["close"], (periode,), ())[nama],
+            f"RSI {periode}",
+        )
+    cocok = POLA_EMA.match(nama)
+    if cocok:
+        periode = int(cocok.group(1))
+        return DefinisiIndikator(
+            nama, ("close",), lambda k: hitung_rsi_ema_multi_np(k["close"], (), (periode,))[nama],
+            f"EMA {periode}",
+        )
+    cocok = POLA_RSI_MA.match(nama)
+    if cocok:
+        kolom_rsi = f"rsi_{cocok.group(1)}"
+        return DefinisiIndikator(
+            nama, (kolom_rsi,), lambda k: rolling_mean_np(k[kolom_rsi], WINDOW_RSI_MA),
+            f"MA {WINDOW_RSI_MA} dari {kolom_rsi}",
+        )
+    cocok = POLA_ATR.match(nama)
+    if cocok:
+        periode = int(cocok.group(1))
+        return DefinisiIndikator(
+            nama, ("high", "low", "close"), lambda k: atr_np(k["high"], k["low"], k["close"], periode),
+            f"ATR {periode}",
+        )
+    cocok = POLA_PIVOT.match(nama)
+    if cocok:
+        jenis, kiri, kanan = cocok.group(1), int(cocok.group(2)), int(cocok.group(3))
+        return DefinisiIndikator(
+            nama, (jenis,), lambda k: pivot_np(k[jenis], kiri, kanan, jenis),
+            f"Pivot {jenis} {kiri}/{kanan}",
+        )
+    return None
+
+
+# -----------------------------
+# INDIKATOR TERDAFTAR
+# (rumus sama persis dengan `hitung_indikator_np`)
+# -----------------------------
+@daftarkan_indikator("candle_body", ("open", "close"))
+def _candle_body(k: Dict[str, np.ndarray]) -> np.ndarray:
+    return k["close"] - k["open"]
+
+
+@daftarkan_indikator("candle_range", ("high", "low"))
+def _candle_range(k: Dict[str, np.ndarray]) -> np.ndarray:
+    return k["high"] - k["low"]
+
+
+@daftarkan_indikator("upper_wick", ("open", "high", "close"))
+def _upper_wick(k: Dict[str, np.ndarray]) -> np.ndarray:
+    return k["high"] - np.maximum(k["open"], k["close"])
+
+
+@daftarkan_indikator("lower_wick", ("open", "low", "close"))
+def _lower_wick(k: Dict[str, np.ndarray]) -> np.ndarray:
+    return np.minimum(k["open"], k["close"]) - k["low"]
+
+
+@daftarkan_indikator("return_1", ("close",))
+def _return_1(k: Dict[str, np.ndarray]) -> np.ndarray:
+    return (k["close"] / geser_np(k["close"], 1)) - 1.0
+
+
+@daftarkan_indikator(f"return_{WINDOW_RETURN}", ("close",))
+def _return_5(k: Dict[str, np.ndarray]) -> np.ndarray:
+    return (k["close"] / geser_np(k["close"], WINDOW_RETURN)) - 1.0
+
+
+@daftarkan_indikator(f"volatility_{WINDOW_VOLATILITAS}", ("return_1",))
+def _volatility_5(k: Dict[str, np.ndarray]) -> np.ndarray:
+    volatilitas = rolling_std_np(k["return_1"], WINDOW_VOLATILITAS)
+    return np.where(np.isnan(volatilitas), 0.0, volatilitas)
+
+
+@daftarkan_indikator(f"distance_to_ema_{PERIODE_EMA_20}", ("close", f"ema_{PERIODE_EMA_20}"))
+def _distance_to_ema_20(k: Dict[str, np.ndarray]) -> np.ndarray:
+    return k["close"] - k[f"ema_{PERIODE_EMA_20}"]
+
+
+@daftarkan_indikator(f"distance_to_ema_{PERIODE_EMA_50}", ("close", f"ema_{PERIODE_EMA_50}"))
+def _distance_to_ema_50(k: Dict[str, np.ndarray]) -> np.ndarray:
+    return k["close"] - k[f"ema_{PERIODE_EMA_50}"]
+
+
+@daftarkan_indikator("rsi_position", (f"rsi_{PERIODE_RSI_SWING}",))
+def _rsi_position(k: Dict[str, np.ndarray]) -> np.ndarray:
+    return k[f"rsi_{PERIODE_RSI_SWING}"] / 100.0
+
+
+@daftarkan_indikator("volume_anomaly", ("close",))
+def _volume_anomaly(k: Dict[str, np.ndarray]) -> np.ndarray:
+    # Volume opsional: tanpa kolom volume nilainya 1.0 (sama dengan jalur batch)
+    volume = k.get("volume")
+    if volume is None:
+        return np.ones(k["close"].shape[0])
+    rata_volume = rolling_mean_np(volume, WINDOW_VOLUME)
+    return volume / np.where(rata_volume == 0, 1.0, rata_volume)
+
+
+def urutan_hitung(kolom: Sequence[str], sudah_ada: Sequence[str] = ()) -> List[str]:
+    """
+    Urutan topologis kolom yang perlu dihitung agar `kolom` tersedia.
+
+    Kolom di `sudah_ada` dan kolom dasar OHLCV tidak dihitung. ValueError
+    untuk nama yang tidak dikenal atau dependensi melingkar.
+    """
+    tersedia = set(sudah_ada) | set(KOLOM_DASAR)
+    urutan: List[str] = []
+    sedang: set = set()
+
+    def _kunjungi(nama: str) -> None:
+        if nama in tersedia:
+            return
+        if nama in sedang:
+            raise ValueError(f"Dependensi indikator melingkar di '{nama}'.")
+        definisi = definisi_indikator(nama)
+        if definisi is None:
+            raise ValueError(f"Indikator '{nama}' tidak dikenal.")
+        sedang.add(nama)
+        for dependensi in definisi.dependensi:
+            _kunjungi(dependensi)
+        sedang.discard(nama)
+        tersedia.add(nama)
+        urutan.append(nama)
+
+    for nama in kolom:
+        _kunjungi(nama)
+    return urutan
+
+
+def hitung_kolom(df: pd.DataFrame, kolom: Sequence[str]) -> pd.DataFrame:
+    """
+    Pastikan `kolom` ada di `df`, menghitung hanya yang belum ada (plus dependensinya).
+
+    Kolom baru ditambahkan ke `df` di tempat (memo) dan `df` dikembalikan.
+    `df` harus sudah urut berdasarkan open_time.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Frame OHLCV (boleh sudah berisi sebagian indikator).
+    kolom : Sequence[str]
+        Nama kolom indikator yang dibutuhkan, misal ["rsi_6", "ema_9", "atr_14"].
+
+    Returns
+    -------
+    pd.DataFrame
+        `df` yang sama, dengan kolom yang diminta tersedia.
+    """
+    urutan = urutan_hitung(kolom, sudah_ada=df.columns)
+    if not urutan:
+        return df
+
+    konteks: Dict[str, np.ndarray] = {}
+    for nama in KOLOM_DASAR:
+        if nama in df.columns:
+            nilai = _ke_array_float(df[nama])
+            if nilai is None:
+                return _hitung_kolom_pandas(df, urutan)
+            konteks[nama] = nilai
+    if "close" not in konteks:
+        raise ValueError("Kolom close wajib ada untuk menghitung indikator.")
+    # Dependensi yang sudah ada di frame (memo) dipakai apa adanya
+    for nama in urutan:
+        for dependensi in definisi_indikator(nama).dependensi:
+            if dependensi not in konteks and dependensi in df.columns:
+                konteks[dependensi] = pd.to_numeric(df[dependensi], errors="coerce").to_numpy(
+                    dtype=np.float64, na_value=np.nan
+                )
+
+    # Semua RSI/EMA yang dibutuhkan dihitung bersama dalam satu pass
+    periode_rsi = [int(POLA_RSI.match(n).group(1)) for n in urutan if POLA_RSI.match(n)]
+    periode_ema = [int(POLA_EMA.match(n).group(1)) for n in urutan if POLA_EMA.match(n)]
+    if periode_rsi or periode_ema:
+        konteks.update(hitung_rsi_ema_multi_np(konteks["close"], periode_rsi, periode_ema))
+
+    for nama in urutan:
+        if nama not in konteks:
+            konteks[nama] = definisi_indikator(nama).hitung(konteks)
+        df[nama] = konteks[nama]
+    return df
+
+
+def _hitung_kolom_pandas(df: pd.DataFrame, urutan: Sequence[str]) -> pd.DataFrame:
+    """OHLCV mengandung NaN: pakai jalur lengkap `tambah_indikator_ke_df` lalu ambil kolom yang diminta."""
+    periode_rsi = [int(POLA_RSI.match(n).group(1)) for n in urutan if POLA_RSI.match(n)]
+    periode_ema = [int(POLA_EMA.match(n).group(1)) for n in urutan if POLA_EMA.match(n)]
+    lengkap = tambah_indikator_ke_df(df, periode_rsi, periode_ema).reindex(df.index)
+    konteks = {
+        nama: lengkap[nama].to_numpy(dtype=bool if pd.api.types.is_bool_dtype(lengkap[nama]) else np.float64)
+        for nama in lengkap.columns
+        if pd.api.types.is_numeric_dtype(lengkap[nama])
+    }
+    for nama in urutan:
+        if nama not in konteks:
+            konteks[nama] = definisi_indikator(nama).hitung(konteks)
+        df[nama] = konteks[nama]
+    return df
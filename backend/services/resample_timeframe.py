@@ -0,0 +1,255 @@
+"""
+Resample OHLCV multi-timeframe untuk Leon Liquidity Engine.
+
+Bar 5m/15m/30m/1h/4h/1d dibangun dari data 1m dalam satu pass ter-grup atas
+ID bucket integer (open_time milidetik // panjang bar), memakai
+`np.*.reduceat` per kolom, bukan `DataFrame.resample` + loop per kolom.
+Bucket disejajarkan ke epoch UTC (sama dengan `resample(origin="start_day")`
+karena semua timeframe membagi habis satu hari).
+
+`ResamplerBertahap` melakukan hal yang sama untuk sumber yang dibaca per
+potongan (riwayat 1m bertahun-tahun yang tidak muat di RAM).
+
+`CacheTimeframe` menyimpan hasil turunan (beserta indikatornya) per
+(sumber, timeframe). Sumber diidentifikasi dengan sidik isi data OHLCV atau
+stat berkas processed; jika sidiknya berubah, semua timeframe turunan dari
+sumber itu dibuang.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..core.config import MAKS_CACHE_TIMEFRAME
+from .penyimpanan_kolom import NAMA_META, ukuran_hasil
+from .waktu_epoch import NAT_INT64, ke_epoch_ms, normalisasi_waktu
+
+# Panjang bar per timeframe dalam milidetik
+TIMEFRAME_MS: Dict[str, int] = {
+    "1m": 60_000,
+    "5m": 5 * 60_000,
+    "15m": 15 * 60_000,
+    "30m": 30 * 60_000,
+    "1h": 60 * 60_000,
+    "4h": 4 * 60 * 60_000,
+    "1d": 24 * 60 * 60_000,
+}
+
+KOLOM_OHLCV: Tuple[str, ...] = ("open", "high", "low", "close", "volume")
+
+
+def _ms_ke_waktu(nilai_ms: np.ndarray, contoh: pd.Series) -> pd.Series:
+    """Kebalikan `ke_epoch_ms`, mengikuti dtype/timezone kolom `contoh`."""
+    waktu = pd.Series(nilai_ms.astype("datetime64[ms]"), name=contoh.name)
+    if isinstance(contoh.dtype, pd.DatetimeTZDtype):
+        return waktu.dt.tz_localize("UTC").dt.tz_convert(contoh.dtype.tz).astype(contoh.dtype)
+    return waktu.astype(contoh.dtype)
+
+
+def _indeks_valid_terakhir(valid: np.ndarray, awal: np.ndarray, akhir: np.ndarray) -> np.ndarray:
+    """Indeks baris valid terakhir per grup (-1 jika grup tidak punya nilai valid)."""
+    posisi = np.where(valid, np.arange(len(valid)), -1)
+    terakhir = np.maximum.accumulate(posisi)[akhir]
+    return np.where(terakhir >= awal, terakhir, -1)
+
+
+def _indeks_valid_pertama(valid: np.ndarray, awal: np.ndarray, akhir: np.ndarray) -> np.ndarray:
+    """Indeks baris valid pertama per grup (-1 jika grup tidak punya nilai valid)."""
+    n = len(valid)
+    posisi = np.where(valid, np.arange(n), n)
+    pertama = np.minimum.accumulate(posisi[::-1])[::-1][awal]
+    return np.where(pertama <= akhir, pertama, -1)
+
+
+def _ambil(kolom: pd.Series, indeks: np.ndarray) -> np.ndarray:
+    """Ambil baris `indeks` dari kolom; indeks -1 menjadi NaN/None."""
+    hasil = kolom.iloc[np.maximum(indeks, 0)].reset_index(drop=True)
+    if (indeks < 0).any():
+        hasil = hasil.where(pd.Series(indeks >= 0))
+    return hasil.to_numpy()
+
+
+def resample_ohlcv(df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """
+    Resample DataFrame OHLCV ke timeframe yang lebih besar.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        DataFrame dengan kolom: open_time, open, high, low, close, volume
+        open_time berupa datetime (epoch/teks dinormalisasi lewat `waktu_epoch`).
+    timeframe : str
+        Timeframe target: salah satu kunci `TIMEFRAME_MS`
+        ("1m", "5m", "15m", "30m", "1h", "4h", "1d").
+
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame yang sudah di-resample dengan kolom yang sama:
+        open pertama, high maksimum, low minimum, close terakhir, volume
+        dijumlah, kolom lain diambil nilai terakhir (non-NaN) dalam bar.
+        Timeframe yang tidak dikenal mengembalikan salinan data asli.
+    """
+    if not pd.api.types.is_datetime64_any_dtype(df["open_time"]):
+        df = df.assign(open_time=normalisasi_waktu(df["open_time"]))
+    if timeframe not in TIMEFRAME_MS:
+        return df.copy()
+
+    if df["open_time"].isna().any():
+        df = df.dropna(subset=["open_time"])
+    if not df["open_time"].is_monotonic_increasing:
+        df = df.sort_values("open_time", kind="stable")
+    if df.empty:
+        return df.reset_index(drop=True)
+
+    langkah = TIMEFRAME_MS[timeframe]
+    bucket = ke_epoch_ms(df["open_time"]) // langkah
+    awal = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    akhir = np.r_[awal[1:], len(bucket)] - 1
+
+    # Default semua kolom: nilai baris terakhir bar (satu take untuk seluruh frame);
+    # kolom yang punya NaN dikoreksi ke nilai valid terakhir seperti `resample().last()`
+    df_resampled = df.iloc[akhir].reset_index(drop=True)
+    df_resampled["open_time"] = _ms_ke_waktu(bucket[awal] * langkah, df["open_time"])
+    ada_nan = df.columns[df.isna().any().to_numpy()]
+    for kolom in df.columns:
+        if kolom == "open_time":
+            continue
+        seri = df[kolom]
+        if kolom in KOLOM_OHLCV and pd.api.types.is_numeric_dtype(seri):
+            if kolom in ("high", "low", "volume"):
+                nilai = seri.to_numpy(dtype=np.float64, na_value=np.nan)
+                if kolom == "high":
+                    df_resampled[kolom] = np.fmax.reduceat(nilai, awal)
+                elif kolom == "low":
+                    df_resampled[kolom] = np.fmin.reduceat(nilai, awal)
+                else:
+                    df_resampled[kolom] = np.add.reduceat(np.nan_to_num(nilai, nan=0.0), awal)
+                continue
+        if kolom == "open":
+            valid = seri.notna().to_numpy()
+            df_resampled[kolom] = _ambil(seri, _indeks_valid_pertama(valid, awal, akhir))
+        elif kolom in ada_nan:
+            valid = seri.notna().to_numpy()
+            df_resampled[kolom] = _ambil(seri, _indeks_valid_terakhir(valid, awal, akhir))
+
+    kolom_harga = [kol for kol in ("open", "high", "low", "close") if kol in df_resampled.columns]
+    return df_resampled.dropna(subset=kolom_harga).reset_index(drop=True)
+
+
+class ResamplerBertahap:
+    """
+    `resample_ohlcv` untuk sumber yang datang per potongan (mode out-of-core).
+
+    Bar terakhir setiap potongan bisa belum lengkap (sisanya ada di potongan
+    berikutnya), jadi baris bucket terakhir ditahan dan digabung ke potongan
+    berikutnya. Untuk sumber yang urut waktu, gabungan hasil `tambah` +
+    `selesai` sama dengan `resample_ohlcv` atas seluruh data.
+    """
+
+    def __init__(self, timeframe: str):
+        if timeframe not in TIMEFRAME_MS:
+            raise ValueError(f"Timeframe tidak dikenal: {timeframe}")
+        self.timeframe = timeframe
+        self._sisa: Optional[pd.DataFrame] = None
+
+    def tambah(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Bar yang sudah lengkap setelah potongan `df` masuk."""
+        if self._sisa is not None:
+            df = pd.concat([self._sisa, df], ignore_index=True)
+        waktu = ke_epoch_ms(df["open_time"]) if not df.empty else np.empty(0, dtype=np.int64)
+        valid = waktu != NAT_INT64
+        if not valid.any():
+            self._sisa = None
+            return resample_ohlcv(df.iloc[:0], self.timeframe)
+        bucket_terakhir = waktu[valid].max() // TIMEFRAME_MS[self.timeframe]
+        ditahan = valid & (waktu // TIMEFRAME_MS[self.timeframe] == bucket_terakhir)
+        self._sisa = df[ditahan].reset_index(drop=True)
+        return resample_ohlcv(df[~ditahan], self.timeframe)
+
+    def selesai(self) -> pd.DataFrame:
+        """Bar terakhir (boleh belum lengkap) dari sisa potongan terakhir."""
+        sisa, self._sisa = self._sisa, None
+        if sisa is None or sisa.empty:
+            return pd.DataFrame()
+        return resample_ohlcv(sisa, self.timeframe)
+
+
+def sidik_ohlcv(df: pd.DataFrame) -> str:
+    """Sidik isi kolom open_time + OHLCV (berubah jika ada satu nilai yang berubah)."""
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(str(len(df)).encode())
+    for kolom in ("open_time",) + KOLOM_OHLCV:
+        if kolom not in df.columns:
+            continue
+        seri = df[kolom]
+        if pd.api.types.is_datetime64_any_dtype(seri):
+            nilai = ke_epoch_ms(seri)
+        else:
+            nilai = seri.to_numpy(dtype=np.float64, na_value=np.nan)
+        hasher.update(kolom.encode())
+        hasher.update(np.ascontiguousarray(nilai).data)
+    return hasher.hexdigest()
+
+
+def sidik_hasil(path: Path) -> str:
+    """Sidik murah berkas/folder processed dari ukuran + mtime (tanpa membaca isi)."""
+    path_stat = path / NAMA_META if path.is_dir() else path
+    return f"{ukuran_hasil(path)}:{path_stat.stat().st_mtime_ns}"
+
+
+class CacheTimeframe:
+    """
+    Cache LRU DataFrame turunan per (sumber, timeframe).
+
+    Setiap sumber menyimpan sidik terakhirnya; `ambil`/`simpan` dengan sidik
+    berbeda membuang semua timeframe turunan lama dari sumber tersebut.
+    """
+
+    def __init__(self, maks_entri: int = MAKS_CACHE_TIMEFRAME):
+        self.maks_entri = maks_entri
+        self._entri: "OrderedDict[Tuple[str, str], pd.DataFrame]" = OrderedDict()
+        self._sidik: Dict[str, str] = {}
+
+    def _periksa_sidik(self, sumber: str, sidik: str) -> None:
+        if self._sidik.get(sumber) not in (None, sidik):
+            self.hapus(sumber)
+
+    def ambil(self, sumber: str, sidik: str, timeframe: str) -> Optional[pd.DataFrame]:
+        """DataFrame tersimpan untuk (sumber, timeframe), None jika belum ada / basi."""
+        self._periksa_sidik(sumber, sidik)
+        kunci = (sumber, timeframe)
+        df = self._entri.get(kunci)
+        if df is not None:
+            self._entri.move_to_end(kunci)
+        return df
+
+    def simpan(self, sumber: str, sidik: str, timeframe: str, df: pd.DataFrame) -> None:
+        self._periksa_sidik(sumber, sidik)
+        self._sidik[sumber] = sidik
+        self._entri[(sumber, timeframe)] = df
+        self._entri.move_to_end((sumber, timeframe))
+        while len(self._entri) > self.maks_entri:
+            (sumber_lama, _), _ = self._entri.popitem(last=False)
+            if not any(kunci[0] == sumber_lama for kunci in self._entri):
+                self._sidik.pop(sumber_lama, None)
+
+    def hapus(self, sumber: Optional[str] = None) -> None:
+        """Buang cache satu sumber (atau semuanya)."""
+        if sumber is None:
+            self._entri.clear()
+            self._sidik.clear()
+            return
+        for kunci in [k for k in self._entri if k[0] == sumber]:
+            del self._entri[kunci]
+        self._sidik.pop(sumber, None)
+
+
+# Global instance
+cache_timeframe = CacheTimeframe()
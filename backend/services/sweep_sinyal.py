@@ -0,0 +1,274 @@
+"""
+Sweep parameter threshold sinyal untuk Leon Liquidity Engine.
+
+Mencoba `rsi_oversold`, `rsi_overbought`, `rasio_risk_reward`, dan
+`confidence_minimum` lewat `/sinyal/generate` berarti satu scan folder penuh
+per kombinasi. Padahal hanya threshold yang berubah: filter, S/R, divergence,
+dan lima kondisi confluence non-RSI (`_FiturEvaluasi`) sama untuk semua
+kombinasi. Di sini fitur itu dibangun SEKALI per berkas, lalu setiap
+kombinasi hanya menjalankan:
+
+    skor confluence   -> sekali per pasangan (oversold, overbought)
+    pilih kandidat    -> operasi array per (confidence_minimum, rasio RR)
+    filter overlap    -> berurutan, hanya di kandidat
+    backtest          -> array (kandidat x BATAS_BAR_BACKTEST) bar berikutnya
+
+Sinyal tiap kombinasi identik dengan `scan_sinyal_honest` dengan parameter
+yang sama. Hasil backtest mengikuti aturan `backtest_signal` (TP dicek dulu,
+timeout setelah 168 bar) pada bar sesudah bar sinyal di berkas yang sama,
+bukan simulasi `add_simple_backtest_result`, sehingga peringkat
+mencerminkan pergerakan harga sebenarnya.
+
+Agregat per kombinasi bisa dijumlahkan antar berkas (`gabung_agregat`),
+sehingga berkas dapat dipindai paralel di process pool (lihat
+`ManajerSinyal.sweep`).
+"""
+
+from __future__ import annotations
+
+from itertools import product
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from ..core.config import MIN_CONFIDENCE
+from .generator_sinyal_unified import (
+    TRADING_STYLES,
+    _fitur_evaluasi,
+    _kandidat_dari_fitur,
+    _parameter_scan,
+    _saring_overlap,
+    _skor_confluence,
+    baca_frame_sinyal,
+)
+
+# (rsi_oversold, rsi_overbought, rasio_risk_reward, confidence_minimum)
+Kombinasi = Tuple[float, float, float, float]
+
+KRITERIA_SWEEP = ("total_pnl", "avg_pnl", "win_rate", "jumlah_sinyal")
+BATAS_BAR_BACKTEST = 168  # Sama dengan timeout `backtest_signal` (1 minggu H1)
+
+KUNCI_AGREGAT = (
+    "jumlah_sinyal", "hit_tp", "hit_sl", "timeout", "jumlah_pnl", "jumlah_profit",
+    "jumlah_trade_profit", "jumlah_loss", "jumlah_trade_loss", "jumlah_durasi", "jumlah_confidence",
+)
+
+
+def daftar_kombinasi(
+    mode_trading: str,
+    grid_oversold: Optional[Sequence[float]] = None,
+    grid_overbought: Optional[Sequence[float]] = None,
+    grid_rasio_rr: Optional[Sequence[float]] = None,
+    grid_confidence: Optional[Sequence[float]] = None,
+) -> List[Kombinasi]:
+    """
+    Semua kombinasi grid (urutan produk kartesius, nilai kembar dibuang).
+    Grid kosong / None memakai nilai mode di `TRADING_STYLES` (confidence:
+    MIN_CONFIDENCE).
+    """
+    config = TRADING_STYLES[mode_trading]
+
+    def _grid(nilai: Optional[Sequence[float]], bawaan: float) -> List[float]:
+        return list(dict.fromkeys(float(x) for x in nilai)) if nilai else [float(bawaan)]
+
+    return list(product(
+        _grid(grid_oversold, config.rsi_oversold),
+        _grid(grid_overbought, config.rsi_overbought),
+        _grid(grid_rasio_rr, config.risk_reward_ratio),
+        _grid(grid_confidence, MIN_CONFIDENCE),
+    ))
+
+
+def agregat_kosong() -> Dict[str, float]:
+    return {kunci: 0 for kunci in KUNCI_AGREGAT}
+
+
+def _bulatkan(nilai: np.ndarray, digit: int) -> np.ndarray:
+    """Pembulatan Python `round` per elemen (sama dengan `SinyalTrading.to_dict`)."""
+    return np.array([round(x, digit) for x in nilai.tolist()], dtype=np.float64)
+
+
+def backtest_np(
+    tinggi: np.ndarray,
+    rendah: np.ndarray,
+    baris: np.ndarray,
+    beli: np.ndarray,
+    entry: np.ndarray,
+    stop_loss: np.ndarray,
+    take_profit: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    `backtest_signal` untuk banyak sinyal sekaligus.
+
+    Untuk sinyal di bar `baris[k]`, bar `baris[k] + 1` sampai
+    `baris[k] + BATAS_BAR_BACKTEST + 1` diperiksa; di setiap bar TP dicek
+    sebelum SL. Returns (hasil, pnl_persen, bars_held) dengan hasil
+    1 = HIT_TP, -1 = HIT_SL, 0 = TIMEOUT; pnl belum dibulatkan.
+    """
+    n = tinggi.shape[0]
+    jendela = BATAS_BAR_BACKTEST + 1
+    if baris.shape[0] == 0:
+        kosong = np.empty(0)
+        return kosong.astype(np.int8), kosong, kosong.astype(np.int64)
+
+    isi = np.full(jendela, np.nan)
+    tinggi_depan = sliding_window_view(np.concatenate([tinggi[1:], isi]), jendela)[baris]
+    rendah_depan = sliding_window_view(np.concatenate([rendah[1:], isi]), jendela)[baris]
+    with np.errstate(invalid="ignore"):
+        kena_tp = np.where(
+            beli[:, None], tinggi_depan >= take_profit[:, None], rendah_depan <= take_profit[:, None]
+        )
+        kena_sl = np.where(
+            beli[:, None], rendah_depan <= stop_loss[:, None], tinggi_depan >= stop_loss[:, None]
+        )
+    kena = kena_tp | kena_sl
+    ada = kena.any(axis=1)
+    pertama = kena.argmax(axis=1)
+    tp_dulu = kena_tp[np.arange(baris.shape[0]), pertama]
+
+    hasil = np.where(ada, np.where(tp_dulu, 1, -1), 0).astype(np.int8)
+    harga_keluar = np.where(tp_dulu, take_profit, stop_loss)
+    pnl = np.where(beli, (harga_keluar - entry) / entry, (entry - harga_keluar) / entry) * 100
+    pnl = np.where(ada, pnl, 0.0)
+    sisa_bar = n - 1 - baris
+    bars_held = np.where(ada, pertama + 1, np.minimum(sisa_bar, BATAS_BAR_BACKTEST))
+    return hasil, pnl, bars_held
+
+
+def sweep_frame(df: pd.DataFrame, mode_trading: str, kombinasi: Sequence[Kombinasi]) -> Dict[Kombinasi, Dict]:
+    """
+    Agregat backtest per kombinasi untuk satu frame (sudah dibersihkan seperti
+    `baca_frame_sinyal`). Fitur dibangun sekali; skor confluence sekali per
+    pasangan threshold RSI.
+    """
+    agregat = {k: agregat_kosong() for k in kombinasi}
+    if df.empty or mode_trading not in TRADING_STYLES:
+        return agregat
+    config, _, _, _, min_required, start_idx, skip_step = _parameter_scan(mode_trading, None, None, None)
+    if len(df) < min_required:
+        return agregat
+
+    fitur = _fitur_evaluasi(df, config)
+    if fitur is None:
+        return agregat
+    baris_scan = np.arange(start_idx, len(df), skip_step)
+
+    cache_skor: Dict[Tuple[float, float], tuple] = {}
+    for kunci in kombinasi:
+        oversold, overbought, rasio_rr, confidence_minimum = kunci
+        skor = cache_skor.get((oversold, overbought))
+        if skor is None:
+            skor = cache_skor[(oversold, overbought)] = _skor_confluence(fitur, oversold, overbought)
+        kandidat = _kandidat_dari_fitur(fitur, skor, baris_scan, rasio_rr, confidence_minimum)
+        diterima = np.array(_saring_overlap(kandidat.beli, kandidat.entry, kandidat.take_profit), dtype=np.int64)
+        if diterima.shape[0] == 0:
+            continue
+
+        # Backtest memakai nilai yang sudah dibulatkan seperti dict sinyal
+        beli = kandidat.beli[diterima]
+        entry = _bulatkan(kandidat.entry[diterima], 4)
+        hasil, pnl, bars_held = backtest_np(
+            fitur.tinggi,
+            fitur.rendah,
+            kandidat.baris[diterima] - fitur.offset_baris,
+            beli,
+            entry,
+            _bulatkan(kandidat.stop_loss[diterima], 4),
+            _bulatkan(kandidat.take_profit[diterima], 4),
+        )
+        tutup = hasil != 0
+        pnl = _bulatkan(pnl[tutup], 2)
+        isi = agregat[kunci]
+        isi["jumlah_sinyal"] += int(diterima.shape[0])
+        isi["hit_tp"] += int((hasil == 1).sum())
+        isi["hit_sl"] += int((hasil == -1).sum())
+        isi["timeout"] += int((hasil == 0).sum())
+        isi["jumlah_pnl"] += float(pnl.sum())
+        isi["jumlah_profit"] += float(pnl[pnl > 0].sum())
+        isi["jumlah_trade_profit"] += int((pnl > 0).sum())
+        isi["jumlah_loss"] += float(pnl[pnl < 0].sum())
+        isi["jumlah_trade_loss"] += int((pnl < 0).sum())
+        isi["jumlah_durasi"] += int(bars_held[tutup].sum())
+        isi["jumlah_confidence"] += float(_bulatkan(kandidat.confidence[diterima], 4).sum())
+    return agregat
+
+
+def sweep_berkas(path: Path, mode_trading: str, kombinasi: Sequence[Kombinasi]) -> Dict[Kombinasi, Dict]:
+    """`sweep_frame` untuk satu berkas processed (dipanggil di worker process)."""
+    df = baca_frame_sinyal(Path(path))
+    if df is None:
+        return {k: agregat_kosong() for k in kombinasi}
+    return sweep_frame(df, mode_trading, kombinasi)
+
+
+def gabung_agregat(target: Dict[Kombinasi, Dict], tambahan: Dict[Kombinasi, Dict]) -> Dict[Kombinasi, Dict]:
+    """Jumlahkan agregat `tambahan` ke `target` (in-place) dan kembalikan `target`."""
+    for kunci, isi in tambahan.items():
+        tujuan = target.setdefault(kunci, agregat_kosong())
+        for nama in KUNCI_AGREGAT:
+            tujuan[nama] += isi[nama]
+    return target
+
+
+def tabel_sweep(
+    agregat: Dict[Kombinasi, Dict],
+    kombinasi: Sequence[Kombinasi],
+    urut_berdasarkan: str = "total_pnl",
+    minimal_sinyal: int = 1,
+) -> List[Dict]:
+    """
+    Tabel peringkat kombinasi, terbaik dulu menurut `urut_berdasarkan`
+    (salah satu KRITERIA_SWEEP). Kombinasi dengan sinyal kurang dari
+    `minimal_sinyal` diletakkan di bawah; nilai kembar mengikuti urutan grid.
+    """
+    if urut_berdasarkan not in KRITERIA_SWEEP:
+        raise ValueError(f"Kriteria urut harus salah satu dari: {', '.join(KRITERIA_SWEEP)}")
+
+    baris = []
+    for urutan, kunci in enumerate(kombinasi):
+        isi = agregat.get(kunci) or agregat_kosong()
+        jumlah = isi["jumlah_sinyal"]
+        total_closed = isi["hit_tp"] + isi["hit_sl"]
+        metrik = {
+            "total_pnl": isi["jumlah_pnl"],
+            "avg_pnl": isi["jumlah_pnl"] / total_closed if total_closed else 0,
+            "win_rate": isi["hit_tp"] / total_closed * 100 if total_closed else 0,
+            "jumlah_sinyal": jumlah,
+        }
+        baris.append((jumlah < minimal_sinyal, -metrik[urut_berdasarkan], urutan, {
+            "rsi_oversold": kunci[0],
+            "rsi_overbought": kunci[1],
+            "rasio_risk_reward": kunci[2],
+            "confidence_minimum": kunci[3],
+            "jumlah_sinyal": jumlah,
+            "hit_tp": isi["hit_tp"],
+            "hit_sl": isi["hit_sl"],
+            "timeout": isi["timeout"],
+            "total_closed": total_closed,
+            "win_rate": round(metrik["win_rate"], 1),
+            "avg_pnl": round(metrik["avg_pnl"], 2),
+            "total_pnl": round(metrik["total_pnl"], 2),
+            "avg_duration_hours": round(isi["jumlah_durasi"] / total_closed, 1) if total_closed else 0,
+            "avg_profit": round(isi["jumlah_profit"] / isi["jumlah_trade_profit"], 2) if isi["jumlah_trade_profit"] else 0,
+            "avg_loss": round(isi["jumlah_loss"] / isi["jumlah_trade_loss"], 2) if isi["jumlah_trade_loss"] else 0,
+            "rata_rata_confidence": round(isi["jumlah_confidence"] / jumlah, 4) if jumlah else 0,
+        }))
+    baris.sort(key=lambda x: x[:3])
+    return [{"peringkat": i + 1, **isi} for i, (_, _, _, isi) in enumerate(baris)]
+
+
+def sweep_parameter_folder(
+    daftar_berkas: Sequence[Path],
+    mode_trading: str,
+    kombinasi: Sequence[Kombinasi],
+    urut_berdasarkan: str = "total_pnl",
+    minimal_sinyal: int = 1,
+) -> List[Dict]:
+    """Sweep berurutan di satu proses (versi paralel: `ManajerSinyal.sweep`)."""
+    agregat: Dict[Kombinasi, Dict] = {}
+    for path in daftar_berkas:
+        gabung_agregat(agregat, sweep_berkas(path, mode_trading, kombinasi))
+    return tabel_sweep(agregat, kombinasi, urut_berdasarkan, minimal_sinyal)
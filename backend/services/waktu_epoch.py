@@ -0,0 +1,150 @@
+"""
+Normalisasi timestamp untuk Leon Liquidity Engine.
+
+Berkas Binance Vision memakai epoch milidetik, berkas baru (spot 2025+) memakai
+mikrodetik, dan CSV hasil ekspor lama berisi teks "%Y-%m-%d %H:%M:%S". Format
+kolom waktu dideteksi SEKALI dari sampel kecil (besaran angka atau teks), lalu
+seluruh kolom dikonversi dengan satu jalur tetap:
+
+- s / ms / us / ns  -> aritmatika int64 (tanpa parsing)
+- iso               -> `pd.to_datetime(format="ISO8601")` (parser cepat format tetap)
+
+Hasilnya int64 epoch milidetik UTC, atau `datetime64[ms]` naive (UTC) yang
+merupakan view dari array int64 yang sama. Semua jalur preprocessing dan
+pembacaan hasil memakai modul ini sehingga timestamp tidak pernah diformat ke
+teks lalu di-parse ulang.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+FORMAT_DETIK: str = "s"
+FORMAT_MS: str = "ms"
+FORMAT_US: str = "us"
+FORMAT_NS: str = "ns"
+FORMAT_ISO: str = "iso"
+
+# (pengali, pembagi) untuk mengubah epoch tiap unit ke milidetik
+KONVERSI_KE_MS: Dict[str, Tuple[int, int]] = {
+    FORMAT_DETIK: (1000, 1),
+    FORMAT_MS: (1, 1),
+    FORMAT_US: (1, 1000),
+    FORMAT_NS: (1, 1_000_000),
+}
+
+# Batas atas besaran epoch per unit. 1e11 detik ~ tahun 5138, 1e11 milidetik
+# ~ tahun 1973: rentang tanggal realistis tiap unit tidak saling tumpang tindih.
+BATAS_FORMAT_EPOCH: Tuple[Tuple[float, str], ...] = (
+    (1e11, FORMAT_DETIK),
+    (1e14, FORMAT_MS),
+    (1e17, FORMAT_US),
+)
+
+# Jumlah nilai yang diperiksa untuk deteksi format
+UKURAN_SAMPEL_WAKTU: int = 64
+
+# Representasi int64 dari NaT
+NAT_INT64: int = int(np.datetime64("NaT").view(np.int64))
+
+
+def _sampel(nilai: pd.Series, ukuran_sampel: int) -> pd.Series:
+    """Beberapa nilai non-null pertama (tanpa memindai seluruh kolom jika bisa)."""
+    sampel = nilai.iloc[:ukuran_sampel].dropna()
+    if sampel.empty:
+        sampel = nilai.dropna().iloc[:ukuran_sampel]
+    return sampel
+
+
+def deteksi_format_waktu(nilai: pd.Series, ukuran_sampel: int = UKURAN_SAMPEL_WAKTU) -> str:
+    """
+    Deteksi format kolom waktu dari sampel: FORMAT_DETIK/MS/US/NS atau FORMAT_ISO.
+
+    Angka (termasuk teks berisi angka) dibedakan dari besarannya; sampel
+    dianggap teks tanggal ISO hanya jika sebagian besar nilainya bukan angka,
+    sehingga satu-dua nilai rusak di kolom epoch cukup menjadi NaT (bukan
+    membuat seluruh kolom gagal di-parse). Kolom kosong dianggap milidetik.
+    """
+    sampel = _sampel(nilai, ukuran_sampel)
+    if sampel.empty:
+        return FORMAT_MS
+    if not pd.api.types.is_numeric_dtype(sampel):
+        sampel = pd.to_numeric(sampel, errors="coerce")
+        if sampel.isna().sum() * 2 > len(sampel):
+            return FORMAT_ISO
+        sampel = sampel.dropna()
+    besaran = float(np.median(np.abs(sampel.to_numpy(dtype=np.float64))))
+    for batas, format_waktu in BATAS_FORMAT_EPOCH:
+        if besaran < batas:
+            return format_waktu
+    return FORMAT_NS
+
+
+def ke_epoch_ms(nilai: pd.Series, format_waktu: Optional[str] = None) -> np.ndarray:
+    """
+    Konversi kolom waktu ke int64 epoch milidetik UTC (nilai tidak valid -> NAT_INT64).
+
+    Parameters
+    ----------
+    nilai : pd.Series
+        Kolom waktu: angka epoch (s/ms/us/ns), teks ISO, atau datetime
+        (naive = UTC, atau tz-aware).
+    format_waktu : str, optional
+        Format hasil `deteksi_format_waktu`; None = deteksi dari sampel. Berguna
+        untuk memakai satu hasil deteksi di semua chunk berkas yang sama.
+
+    Returns
+    -------
+    np.ndarray
+        Array int64; `.view("datetime64[ms]")` memberi timestamp tanpa salinan.
+    """
+    if pd.api.types.is_datetime64_any_dtype(nilai):
+        if isinstance(nilai.dtype, pd.DatetimeTZDtype):
+            nilai = nilai.dt.tz_convert("UTC").dt.tz_localize(None)
+        return nilai.to_numpy(dtype="datetime64[ms]").view(np.int64)
+
+    if format_waktu is None:
+        format_waktu = deteksi_format_waktu(nilai)
+    if format_waktu == FORMAT_ISO:
+        waktu = pd.to_datetime(nilai, format="ISO8601", errors="coerce", utc=True)
+        return waktu.dt.tz_localize(None).to_numpy(dtype="datetime64[ms]").view(np.int64)
+
+    if not pd.api.types.is_numeric_dtype(nilai):
+        nilai = pd.to_numeric(nilai, errors="coerce")
+    pengali, pembagi = KONVERSI_KE_MS[format_waktu]
+    if pd.api.types.is_integer_dtype(nilai) and not nilai.hasnans:
+        hasil = nilai.to_numpy(dtype=np.int64)
+        valid = None
+    else:
+        angka = nilai.to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = np.isfinite(angka)
+        hasil = np.where(valid, angka, 0.0).astype(np.int64)
+    if pengali != 1:
+        hasil = hasil * pengali
+    if pembagi != 1:
+        hasil = hasil // pembagi
+    if valid is not None:
+        hasil[~valid] = NAT_INT64
+    return hasil
+
+
+def normalisasi_waktu(nilai: pd.Series, format_waktu: Optional[str] = None) -> pd.Series:
+    """Kolom waktu -> Series `datetime64[ms]` naive UTC (view dari `ke_epoch_ms`)."""
+    return pd.Series(
+        ke_epoch_ms(nilai, format_waktu).view("datetime64[ms]"),
+        index=nilai.index,
+        name=nilai.name,
+    )
+
+
+def ke_kolom_epoch_ms(nilai: pd.Series) -> pd.Series:
+    """Kolom waktu -> Series Int64 epoch milidetik (NaT menjadi <NA>) untuk ditulis ke CSV."""
+    hasil = ke_epoch_ms(nilai)
+    kosong = hasil == NAT_INT64
+    if not kosong.any():
+        # int64 biasa jauh lebih cepat ditulis `to_csv` daripada Int64 nullable
+        return pd.Series(hasil, index=nilai.index, name=nilai.name)
+    return pd.Series(pd.arrays.IntegerArray(hasil, kosong), index=nilai.index, name=nilai.name)
@@ -0,0 +1,35 @@
+"""
+`load_data_historis_untuk_backtest` memuat berkas apa adanya secara default;
+`ringkas=True` sama dengan `ringkas_frame` dan kolom keputusan tetap identik.
+"""
+
+import numpy as np
+import pandas as pd
+
+from backend.services.backtesting_engine import load_data_historis_untuk_backtest
+from backend.services.penyimpanan_kolom import FORMAT_CSV
+from backend.services.praproses_data import ringkas_frame, simpan_hasil_preprocess, tambah_indikator_ke_df
+
+
+def test_ringkas_hanya_jika_diminta(tmp_path):
+    rng = np.random.default_rng(0)
+    tutup = 100 + np.cumsum(rng.normal(0, 0.1, 300))
+    df = tambah_indikator_ke_df(pd.DataFrame({
+        "open_time": pd.date_range("2024-01-01", periods=300, freq="h").astype("datetime64[ms]"),
+        "open": tutup,
+        "high": tutup + 0.2,
+        "low": tutup - 0.2,
+        "close": tutup,
+        "volume": rng.random(300),
+    }))
+    simpan_hasil_preprocess(df.iloc[:150], "BTCUSDT-1h-a.csv", tmp_path, FORMAT_CSV)
+    simpan_hasil_preprocess(df.iloc[150:], "BTCUSDT-1h-b.csv", tmp_path, FORMAT_CSV)
+
+    apa_adanya = load_data_historis_untuk_backtest(str(tmp_path))
+    diringkas = load_data_historis_untuk_backtest(str(tmp_path), ringkas=True)
+    assert len(apa_adanya) == len(diringkas) == 300
+    assert (apa_adanya.select_dtypes("floating").dtypes == np.float64).all()
+    assert (diringkas.dtypes == np.float32).any()
+    assert list(diringkas.dtypes) == list(ringkas_frame(apa_adanya).dtypes)
+    for nama in ("open", "high", "low", "close", "volume", "rsi_14", "ema_200", "atr_14"):
+        np.testing.assert_array_equal(diringkas[nama].to_numpy(), apa_adanya[nama].to_numpy(), err_msg=nama)
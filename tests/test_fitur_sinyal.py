@@ -0,0 +1,108 @@
+"""
+Struktur indeks di `fitur_sinyal` dibandingkan dengan versi linear di
+`generator_sinyal_unified`.
+"""
+
+import math
+import random
+
+import numpy as np
+import pytest
+
+from backend.services.fitur_sinyal import IndeksOverlap, IndeksSupportResistance
+from backend.services.generator_sinyal_unified import _saring_overlap, check_signal_overlap
+
+
+def _harga_acak(rng: random.Random, grid: int) -> float:
+    # Grid kecil -> banyak harga kembar dan ujung rentang yang bersentuhan
+    if rng.random() < 0.03:
+        return math.nan
+    return rng.randint(0, grid) / 2
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_indeks_overlap_sama_dengan_check_signal_overlap(seed):
+    rng = random.Random(seed)
+    for _ in range(50):
+        grid = rng.choice([4, 20, 1000])
+        indeks = IndeksOverlap()
+        sinyal = []
+        for _ in range(rng.randint(1, 120)):
+            # Rentang BELI dengan TP < entry (atau JUAL dengan TP > entry) terbalik
+            baru = {
+                "tipe": rng.choice(["BELI", "JUAL"]),
+                "entry": _harga_acak(rng, grid),
+                "take_profit": _harga_acak(rng, grid),
+                "stop_loss": 0.0,
+            }
+            aman = check_signal_overlap(baru, sinyal)
+            assert aman == (not indeks.kena(baru["entry"])), (sinyal, baru)
+            if aman:
+                sinyal.append(baru)
+                if baru["tipe"] == "BELI":
+                    indeks.tambah(baru["entry"], baru["take_profit"])
+                else:
+                    indeks.tambah(baru["take_profit"], baru["entry"])
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_indeks_overlap_sama_dengan_pencarian_linear(seed):
+    rng = random.Random(seed)
+    indeks = IndeksOverlap()
+    rentang = []
+    for _ in range(300):
+        bawah, atas = _harga_acak(rng, 60), _harga_acak(rng, 60)
+        indeks.tambah(bawah, atas)
+        rentang.append((bawah, atas))
+        for _ in range(5):
+            harga = _harga_acak(rng, 60)
+            assert indeks.kena(harga) == any(b <= harga <= a for b, a in rentang)
+    # Interval yang disimpan lepas dan terurut
+    assert all(akhir < awal for akhir, awal in zip(indeks._akhir, indeks._awal[1:]))
+
+
+@pytest.mark.parametrize("n", [1, 50, 3000])
+def test_saring_overlap_sama_dengan_check_signal_overlap(n):
+    rng = np.random.default_rng(n)
+    beli = rng.random(n) < 0.5
+    entry = 100 + rng.normal(0, 20, n).cumsum() / 10
+    take_profit = entry * np.where(beli, 1.01, 0.99) * np.where(rng.random(n) < 0.05, 0.97, 1.0)
+    referensi = []
+    sinyal = []
+    for k in range(n):
+        baru = {
+            "tipe": "BELI" if beli[k] else "JUAL",
+            "entry": round(float(entry[k]), 4),
+            "take_profit": round(float(take_profit[k]), 4),
+            "stop_loss": 0.0,
+        }
+        if check_signal_overlap(baru, sinyal):
+            sinyal.append(baru)
+            referensi.append(k)
+    assert _saring_overlap(beli, entry, take_profit) == referensi
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_kueri_semua_sama_dengan_kueri_per_bar(seed):
+    rng = np.random.default_rng(seed)
+    n = 1500
+    # Harga dibulatkan agar level kembar dan harga tepat di level sering muncul
+    rendah = np.round(100 + rng.normal(0, 1, n).cumsum(), 1)
+    tinggi = rendah + np.round(rng.random(n), 1)
+    indeks = IndeksSupportResistance.bangun(
+        rendah, tinggi, rng.random(n) < 0.2, rng.random(n) < 0.2, jendela=int(rng.integers(1, 60))
+    )
+    harga = np.where(rng.random(n) < 0.5, rendah, np.round(rendah + rng.normal(0, 2, n), 1))
+    harga[rng.random(n) < 0.03] = np.nan
+    support, resistance = indeks.kueri_semua(harga)
+    for i in range(n):
+        s, r = indeks.kueri(i, float(harga[i]))
+        assert (np.nan if s is None else s, np.nan if r is None else r) == pytest.approx(
+            (support[i], resistance[i]), nan_ok=True
+        ), i
+
+
+def test_kueri_semua_tanpa_pivot():
+    indeks = IndeksSupportResistance.bangun(np.ones(10), np.ones(10), np.zeros(10, bool), np.zeros(10, bool))
+    support, resistance = indeks.kueri_semua(np.ones(10))
+    assert np.isnan(support).all() and np.isnan(resistance).all()
@@ -0,0 +1,250 @@
+"""
+Scan sinyal vektor (`_evaluasi_sinyal_np`: `_fitur_evaluasi`, `_skor_confluence`,
+`_kandidat_dari_fitur`) dibandingkan dengan jalur per bar
+(`generate_sinyal_honest` di fallback `_scan_baris`), dan `scan_sinyal_terakhir`
+dibandingkan dengan scan penuh pada N bar terakhir. Array filter doji/ATR
+dan flag divergence dibandingkan dengan versi per baris lama.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.services import generator_sinyal_unified as generator
+from backend.services.praproses_data import tambah_indikator_ke_df, tambah_kolom_pivot
+
+DAFTAR_MODE = ["aktif", "santai", "pasif"]
+
+DAFTAR_THRESHOLD = [
+    {},
+    {"rsi_oversold": 40, "rsi_overbought": 60, "confidence_minimum": 0.5},
+    {"rsi_oversold": 55, "rsi_overbought": 45, "rasio_risk_reward": 1.0, "confidence_minimum": 0.0},
+    {"rasio_risk_reward": 0.5, "confidence_minimum": 0.7},
+]
+
+
+def _frame_sintetis(n: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    tutup = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    buka = tutup * np.exp(rng.normal(0, 0.003, n))
+    return tambah_indikator_ke_df(pd.DataFrame({
+        "open_time": pd.date_range("2024-01-01", periods=n, freq="h"),
+        "open": buka,
+        "high": np.maximum(buka, tutup) * np.exp(np.abs(rng.normal(0, 0.004, n))),
+        "low": np.minimum(buka, tutup) * np.exp(-np.abs(rng.normal(0, 0.004, n))),
+        "close": tutup,
+        "volume": rng.random(n),
+    }))
+
+
+@pytest.fixture(scope="module")
+def daftar_frame():
+    bolong = _frame_sintetis(1200, seed=11)
+    rng = np.random.default_rng(2)
+    for kolom in ("rsi_6", "rsi_8", "rsi_14", "ema_9", "ema_20", "ema_50", "ema_200", "atr_14"):
+        bolong.loc[rng.random(len(bolong)) < 0.05, kolom] = np.nan
+    return {
+        "sintetis": _frame_sintetis(1500, seed=0),
+        "indikator_nan": bolong,
+        "tanpa_atr": _frame_sintetis(800, seed=4).drop(columns=["atr_14"]),
+    }
+
+
+def _scan_per_bar(monkeypatch, df, mode, **parameter):
+    """`scan_sinyal_honest` lewat fallback per bar `_scan_baris`."""
+    def _gagal(*args, **kwargs):
+        raise ValueError("paksa fallback per bar")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(generator, "_evaluasi_sinyal_np", _gagal)
+        return generator.scan_sinyal_honest(df, "BTCUSDT", mode, **parameter)
+
+
+@pytest.mark.parametrize("mode", DAFTAR_MODE)
+@pytest.mark.parametrize("parameter", DAFTAR_THRESHOLD)
+def test_scan_vektor_sama_dengan_per_bar(monkeypatch, daftar_frame, mode, parameter):
+    for nama, df in daftar_frame.items():
+        vektor = generator.scan_sinyal_honest(df.copy(), "BTCUSDT", mode, **parameter)
+        per_bar = _scan_per_bar(monkeypatch, df.copy(), mode, **parameter)
+        assert vektor == per_bar, nama
+
+
+@pytest.mark.parametrize("mode", DAFTAR_MODE)
+def test_kandidat_vektor_sama_dengan_generate_per_bar(daftar_frame, mode):
+    # Sebelum filter overlap: setiap bar dibandingkan tanpa pembulatan to_dict
+    df = daftar_frame["sintetis"]
+    config = generator.TRADING_STYLES[mode]
+    for oversold, overbought, rasio_rr, confidence in ((30, 70, 2.0, 0.3), (55, 45, 1.0, 0.0)):
+        memo = {}
+        referensi = []
+        for i in range(len(df)):
+            sinyal = generator.generate_sinyal_honest(
+                df, i, "BTCUSDT", config, oversold, overbought, rasio_rr, confidence, memo=memo
+            )
+            if sinyal is not None:
+                referensi.append((i, sinyal.tipe, sinyal.entry, sinyal.stop_loss, sinyal.take_profit, sinyal.confidence))
+
+        kandidat = generator._evaluasi_sinyal_np(
+            df, np.arange(len(df)), "BTCUSDT", config, oversold, overbought, rasio_rr, confidence
+        )
+        hasil = []
+        for k in range(len(kandidat)):
+            sinyal = kandidat.sinyal(k)
+            hasil.append((int(kandidat.baris[k]), sinyal.tipe, sinyal.entry, sinyal.stop_loss, sinyal.take_profit, sinyal.confidence))
+        assert hasil == referensi
+
+
+@pytest.mark.parametrize("mode", DAFTAR_MODE)
+def test_scan_tidak_mengubah_frame_dan_aman_setelah_bar_disambung(monkeypatch, mode):
+    # Frame live tanpa kolom pivot: scan tidak boleh menulis kolom memo ke frame,
+    # sehingga frame yang disambung bar baru memberi hasil sama dengan frame segar
+    penuh = _frame_sintetis(1500, seed=0)
+    penuh = penuh.drop(columns=[kolom for kolom in penuh.columns if kolom.startswith("pivot_")])
+    lama = penuh.iloc[:1200].copy()
+    kolom_awal = list(lama.columns)
+    generator.scan_sinyal_honest(lama, "BTCUSDT", mode)
+    _scan_per_bar(monkeypatch, lama, mode)
+    generator.scan_sinyal_terakhir(lama, "BTCUSDT", mode)
+    assert list(lama.columns) == kolom_awal
+
+    disambung = pd.concat([lama, penuh.iloc[1200:]], ignore_index=True)
+    segar = penuh.copy()
+    assert generator.scan_sinyal_honest(disambung, "BTCUSDT", mode) == generator.scan_sinyal_honest(segar, "BTCUSDT", mode)
+    assert _scan_per_bar(monkeypatch, disambung, mode) == _scan_per_bar(monkeypatch, segar, mode)
+
+
+def _sinyal_terakhir_referensi(df, mode, jumlah_bar, lookback_overlap, **parameter):
+    """Per bar di frame penuh; filter overlap hanya diisi bar sejak N + k bar terakhir."""
+    config, oversold, overbought, rasio_rr, min_required, start_idx, skip_step = generator._parameter_scan(
+        mode, parameter.get("rsi_oversold"), parameter.get("rsi_overbought"), parameter.get("rasio_risk_reward")
+    )
+    baris_minimal = max(0, len(df) - jumlah_bar)
+    awal_scan = 0 if lookback_overlap is None else max(0, baris_minimal - lookback_overlap)
+    diterima = []
+    for i in range(start_idx, len(df), skip_step):
+        if i < awal_scan:
+            continue
+        sinyal = generator.generate_sinyal_honest(
+            df, i, "BTCUSDT", config, oversold, overbought, rasio_rr, parameter.get("confidence_minimum", 0.30)
+        )
+        if sinyal is not None and generator.check_signal_overlap(sinyal.to_dict(), [s for _, s in diterima]):
+            diterima.append((i, sinyal.to_dict()))
+    return [sinyal for i, sinyal in diterima if i >= baris_minimal]
+
+
+@pytest.mark.parametrize("mode", DAFTAR_MODE)
+@pytest.mark.parametrize("jumlah_bar", [1, 7, 300])
+def test_scan_terakhir_tanpa_lookback_sama_dengan_scan_penuh(daftar_frame, mode, jumlah_bar):
+    for nama, df in daftar_frame.items():
+        for parameter in (DAFTAR_THRESHOLD[0], DAFTAR_THRESHOLD[2]):
+            batas = df["open_time"].iloc[-jumlah_bar].isoformat()
+            penuh = generator.scan_sinyal_honest(df, "BTCUSDT", mode, **parameter)
+            referensi = [sinyal for sinyal in penuh if sinyal["timestamp"] >= batas]
+            hasil = generator.scan_sinyal_terakhir(df, "BTCUSDT", mode, jumlah_bar, **parameter)
+            assert hasil == referensi, (nama, parameter)
+
+
+@pytest.mark.parametrize("parameter", [DAFTAR_THRESHOLD[0], DAFTAR_THRESHOLD[2]])
+@pytest.mark.parametrize("mode", DAFTAR_MODE)
+@pytest.mark.parametrize("jumlah_bar,lookback_overlap", [(1, 0), (5, 3), (40, 25), (300, 100)])
+def test_scan_terakhir_dengan_lookback_sama_dengan_referensi_per_bar(
+    daftar_frame, mode, jumlah_bar, lookback_overlap, parameter
+):
+    df = daftar_frame["sintetis"]
+    hasil = generator.scan_sinyal_terakhir(df, "BTCUSDT", mode, jumlah_bar, lookback_overlap, **parameter)
+    assert hasil == _sinyal_terakhir_referensi(df, mode, jumlah_bar, lookback_overlap, **parameter)
+
+
+@pytest.mark.parametrize("mode", DAFTAR_MODE)
+def test_scan_terakhir_lookback_sepanjang_frame_sama_dengan_scan_penuh(daftar_frame, mode):
+    df = daftar_frame["indikator_nan"]
+    assert generator.scan_sinyal_terakhir(df, "BTCUSDT", mode, 50, lookback_overlap=len(df)) == (
+        generator.scan_sinyal_terakhir(df, "BTCUSDT", mode, 50)
+    )
+
+
+def _is_doji_lama(baris: pd.Series) -> bool:
+    body = abs(baris["close"] - baris["open"])
+    range_candle = max(baris["high"] - baris["low"], 1e-9)
+    return (body / range_candle) <= generator.DOJI_THRESHOLD
+
+
+def _filter_lama(df: pd.DataFrame, i: int):
+    """`_cek_market_regime` / `_cek_atr_filter` / ATR sinyal versi per baris (slice `iloc`)."""
+    window = df.iloc[max(0, i - generator.DOJI_WINDOW + 1): i + 1]
+    jumlah_doji = window.apply(_is_doji_lama, axis=1).sum()
+    atr_mean = df["atr_14"].iloc[max(0, i - generator.ATR_MEAN_WINDOW + 1): i + 1].mean()
+    atr_sinyal = df["atr_14"].iloc[max(0, i - generator.ATR_SINYAL_WINDOW + 1): i + 1].mean()
+    atr_now = df["atr_14"].iloc[i]
+    lolos_atr = pd.isna(atr_now) or atr_now == 0 or pd.isna(atr_mean) or atr_mean == 0 or atr_now <= 3 * atr_mean
+    return jumlah_doji, jumlah_doji < generator.DOJI_WINDOW * 0.4, atr_mean, lolos_atr, atr_sinyal
+
+
+def test_fitur_filter_sama_dengan_filter_per_baris():
+    df = _frame_sintetis(400, seed=11)
+    rng = np.random.default_rng(11)
+    # Rentetan doji (body nol, juga candle tanpa range) agar filter regime benar-benar menolak
+    doji = np.r_[np.arange(100, 112), rng.choice(400, 40, replace=False)]
+    df.loc[doji, "open"] = df.loc[doji, "close"]
+    df.loc[doji[::5], ["high", "low"]] = df.loc[doji[::5], ["close", "close"]].to_numpy()
+    df.loc[[7, 250], "close"] = np.nan
+    # Lonjakan ATR dan nilai 0 / NaN
+    df.loc[300:303, "atr_14"] *= 8
+    df.loc[[5, 320], "atr_14"] = 0.0
+    df.loc[[330, 331], "atr_14"] = np.nan
+
+    fitur = generator._hitung_fitur_filter(df)
+    referensi = [_filter_lama(df, i) for i in range(len(df))]
+    np.testing.assert_array_equal(fitur[generator.KOLOM_JUMLAH_DOJI], [r[0] for r in referensi])
+    np.testing.assert_allclose(fitur[generator.KOLOM_ATR_MEAN], [r[2] for r in referensi], rtol=1e-12)
+    np.testing.assert_allclose(fitur[generator.KOLOM_ATR_SINYAL], [r[4] for r in referensi], rtol=1e-12)
+    regime = [generator._cek_market_regime(fitur, i) for i in range(len(df))]
+    atr = [generator._cek_atr_filter(df.iloc[i], fitur, i) for i in range(len(df))]
+    assert regime == [r[1] for r in referensi]
+    assert atr == [r[3] for r in referensi]
+    assert not all(regime) and not all(atr)
+
+
+def _divergence_lama(harga: np.ndarray, rsi: np.ndarray, i: int, jenis: str, window: int) -> bool:
+    """`_deteksi_divergence` + `_cari_pivot` + `_is_pivot_low/high` versi per bar (low/high tanpa NaN)."""
+    if i < 5:
+        return False
+    left, right = generator.PIVOT_DIVERGENCE
+    kandidat = []
+    for j in range(max(0, i - window), i, 1 if window <= 40 else 2):
+        if j - left < 0 or j + right >= len(harga):
+            continue
+        jendela = harga[j - left: j + right + 1]
+        if (jenis == "bullish" and harga[j] <= jendela.min()) or (jenis == "bearish" and harga[j] >= jendela.max()):
+            kandidat.append(j)
+    if len(kandidat) < 2:
+        return False
+    prev, now = kandidat[-2], kandidat[-1]
+    if jenis == "bullish":
+        return bool(harga[now] < harga[prev] and rsi[now] > rsi[prev])
+    return bool(harga[now] > harga[prev] and rsi[now] < rsi[prev])
+
+
+@pytest.mark.parametrize("window", [generator.DIVERGENCE_WINDOW, 40, 60])
+@pytest.mark.parametrize("pakai_kolom_pivot", [True, False])
+def test_divergence_sama_dengan_per_bar(window, pakai_kolom_pivot):
+    df = _frame_sintetis(700, seed=12)
+    # Harga dibulatkan -> low/high kembar (pivot berdampingan) sering muncul
+    df["low"] = np.floor(df["low"] * 4) / 4
+    df["high"] = np.ceil(df["high"] * 4) / 4
+    df = tambah_kolom_pivot(df)
+    df.loc[[50, 51, 400], "rsi_14"] = np.nan
+    if not pakai_kolom_pivot:
+        df = df.drop(columns=[nama for nama in df.columns if nama.startswith("pivot_")])
+    memo = {}
+    for kolom_rsi in ("rsi_6", "rsi_14"):
+        for jenis in ("bullish", "bearish"):
+            hasil = [
+                generator._deteksi_divergence(df, i, kolom_rsi, jenis, window=window, memo=memo)
+                for i in range(len(df))
+            ]
+            harga = df["low" if jenis == "bullish" else "high"].to_numpy()
+            rsi = df[kolom_rsi].to_numpy()
+            referensi = [_divergence_lama(harga, rsi, i, jenis, window) for i in range(len(df))]
+            assert hasil == referensi, (kolom_rsi, jenis)
+            assert any(hasil)
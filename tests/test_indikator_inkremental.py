@@ -0,0 +1,118 @@
+"""
+`IndikatorInkremental` dan `CacheIndikatorLive` dibandingkan dengan jalur
+batch `tambah_indikator_ke_df` pada frame yang sama.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.services.indikator_inkremental import CacheIndikatorLive, IndikatorInkremental
+from backend.services.praproses_data import tambah_indikator_ke_df
+
+RTOL = 1e-9
+ATOL = 1e-9
+
+
+def _ohlcv(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    tutup = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    buka = tutup * np.exp(rng.normal(0, 0.003, n))
+    return pd.DataFrame({
+        "open_time": pd.date_range("2024-01-01", periods=n, freq="min"),
+        "open": buka,
+        "high": np.maximum(buka, tutup) * np.exp(np.abs(rng.normal(0, 0.004, n))),
+        "low": np.minimum(buka, tutup) * np.exp(-np.abs(rng.normal(0, 0.004, n))),
+        "close": tutup,
+        "volume": rng.random(n) * 10,
+    })
+
+
+def _sama_dengan_batch(hasil: pd.DataFrame, df: pd.DataFrame) -> None:
+    referensi = tambah_indikator_ke_df(df.reset_index(drop=True))
+    kolom = [nama for nama in hasil.columns if nama not in df.columns]
+    assert kolom
+    for nama in kolom:
+        np.testing.assert_allclose(
+            hasil[nama].to_numpy(dtype=np.float64),
+            referensi[nama].to_numpy(dtype=np.float64),
+            rtol=RTOL, atol=ATOL, err_msg=nama,
+        )
+
+
+def _baris_ke_df(baris, df: pd.DataFrame) -> pd.DataFrame:
+    return pd.concat([df.reset_index(drop=True), pd.DataFrame(baris)], axis=1)
+
+
+@pytest.mark.parametrize("potong", [0, 1, 37, 250])
+def test_panaskan_lalu_tambah_bar_sama_dengan_batch(potong):
+    df = _ohlcv(300)
+    engine = IndikatorInkremental()
+    baris = engine.panaskan(df.iloc[:potong]) if potong else []
+    for bar in df.iloc[potong:].to_dict("records"):
+        baris.append(engine.tambah_bar(bar))
+    _sama_dengan_batch(_baris_ke_df(baris, df), df)
+
+
+def test_tambah_banyak_bar_sama_dengan_panaskan():
+    df = _ohlcv(200, seed=1)
+    per_bar = IndikatorInkremental().tambah_banyak_bar(df)
+    _sama_dengan_batch(_baris_ke_df(per_bar, df), df)
+    _sama_dengan_batch(_baris_ke_df(IndikatorInkremental().panaskan(df), df), df)
+
+
+def test_pratinjau_bar_tidak_mengubah_state():
+    df = _ohlcv(120, seed=2)
+    engine = IndikatorInkremental.dari_dataframe(df.iloc[:100])
+    pratinjau = engine.pratinjau_bar(df.iloc[100].to_dict())
+    assert engine.pratinjau_bar(df.iloc[100].to_dict()) == pratinjau
+    assert engine.tambah_bar(df.iloc[100].to_dict()) == pratinjau
+    baris = IndikatorInkremental().panaskan(df.iloc[:101])
+    assert baris[-1] == pytest.approx(pratinjau, rel=RTOL, abs=ATOL)
+
+
+def test_cache_live_sama_dengan_batch_antar_poll():
+    data = _ohlcv(700, seed=3)
+    cache = CacheIndikatorLive()
+
+    def poll(awal: int, akhir: int, close_berjalan: float = None) -> None:
+        df = data.iloc[awal:akhir].copy()
+        if close_berjalan is not None:
+            df.iloc[-1, df.columns.get_loc("close")] = close_berjalan
+        _sama_dengan_batch(cache.perbarui("BTCUSDT", "1m", df), df)
+
+    poll(0, 500)
+    # Bar yang sama, candle berjalan berubah
+    poll(0, 500, data["close"].iloc[499] * 1.01)
+    poll(0, 500)
+    # Bar baru close, awal frame sama
+    poll(0, 501)
+    poll(0, 520)
+    # Limit berubah: 100 bar terakhir setelah riwayat 520 bar
+    poll(420, 520)
+    # Jendela bergeser (limit tetap)
+    poll(421, 521)
+    poll(430, 530)
+    # Limit kembali besar
+    poll(30, 530)
+
+
+def test_cache_live_gap_dan_symbol_terpisah():
+    data = _ohlcv(400, seed=4)
+    cache = CacheIndikatorLive()
+    df = data.iloc[:300]
+    _sama_dengan_batch(cache.perbarui("BTCUSDT", "1m", df), df)
+    # Bar di tengah hilang: frame tidak lagi memuat riwayat cache sebagai awalan
+    bergap = data.drop(index=range(150, 160)).iloc[:320]
+    _sama_dengan_batch(cache.perbarui("BTCUSDT", "1m", bergap), bergap)
+    lain = _ohlcv(300, seed=5)
+    _sama_dengan_batch(cache.perbarui("ETHUSDT", "1m", lain), lain)
+    _sama_dengan_batch(cache.perbarui("BTCUSDT", "1m", bergap), bergap)
+
+
+def test_cache_live_melewati_batas_baris():
+    data = _ohlcv(80, seed=6)
+    cache = CacheIndikatorLive(maks_baris=50)
+    for akhir in (40, 60, 80):
+        df = data.iloc[:akhir]
+        _sama_dengan_batch(cache.perbarui("BTCUSDT", "1m", df), df)
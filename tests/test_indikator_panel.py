@@ -0,0 +1,129 @@
+"""
+Indikator mode panel dibandingkan dengan `tambah_indikator_ke_df` per simbol
+(bar hilang, simbol yang listing belakangan, dan bar OHLCV NaN), termasuk
+endpoint indikator pair favorit.
+"""
+
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.api import routes_signals
+from backend.models.database import Base, FavoritePair, MarketType
+from backend.services.indikator_panel import hitung_indikator_banyak, hitung_indikator_panel, susun_panel
+from backend.services.praproses_data import tambah_indikator_ke_df
+
+
+def _ohlcv(n: int, seed: int, mulai: str = "2024-01-01") -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    tutup = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    buka = tutup * np.exp(rng.normal(0, 0.003, n))
+    return pd.DataFrame({
+        "open_time": pd.date_range(mulai, periods=n, freq="min").astype("datetime64[ms]"),
+        "open": buka,
+        "high": np.maximum(buka, tutup) * np.exp(np.abs(rng.normal(0, 0.004, n))),
+        "low": np.minimum(buka, tutup) * np.exp(-np.abs(rng.normal(0, 0.004, n))),
+        "close": tutup,
+        "volume": rng.random(n) * 10,
+    })
+
+
+def _watchlist() -> dict:
+    rng = np.random.default_rng(9)
+    btc = _ohlcv(600, 0)
+    # Bar hilang acak + satu blok kosong
+    eth = _ohlcv(600, 1).drop(index=list(rng.choice(600, 40, replace=False)) + list(range(300, 330)))
+    # Listing belakangan dan berhenti lebih awal
+    sol = _ohlcv(350, 2, mulai="2024-01-01 03:20")
+    # Bar dengan OHLCV NaN dianggap bar hilang
+    bnb = _ohlcv(600, 3)
+    bnb.loc[[10, 11, 250, 599], "close"] = np.nan
+    bnb.loc[400, "volume"] = np.nan
+    return {"BTCUSDT": btc, "ETHUSDT": eth.reset_index(drop=True), "SOLUSDT": sol, "BNBUSDT": bnb}
+
+
+def _referensi(df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+    bersih = df.dropna(subset=["open", "high", "low", "close", "volume"]).reset_index(drop=True)
+    return tambah_indikator_ke_df(bersih, **kwargs)
+
+
+def _sama(hasil: pd.DataFrame, referensi: pd.DataFrame) -> None:
+    assert list(hasil.columns) == list(referensi.columns)
+    np.testing.assert_array_equal(hasil["open_time"].to_numpy(), referensi["open_time"].to_numpy())
+    for nama in referensi.columns[1:]:
+        if referensi[nama].dtype == bool:
+            np.testing.assert_array_equal(hasil[nama].to_numpy(), referensi[nama].to_numpy(), err_msg=nama)
+        else:
+            np.testing.assert_allclose(
+                hasil[nama].to_numpy(dtype=np.float64), referensi[nama].to_numpy(dtype=np.float64),
+                rtol=1e-9, atol=1e-9, err_msg=nama,
+            )
+
+
+def test_panel_sama_dengan_per_simbol():
+    frame = _watchlist()
+    hasil = hitung_indikator_banyak(frame)
+    assert list(hasil) == list(frame)
+    for simbol, df in frame.items():
+        _sama(hasil[simbol], _referensi(df))
+
+
+def test_panel_tanpa_bar_hilang_dan_periode_tambahan():
+    frame = {f"S{i}": _ohlcv(400, i) for i in range(5)}
+    hasil = hitung_indikator_panel(susun_panel(frame), periode_rsi_tambahan=(21,), periode_ema_tambahan=(100,))
+    assert hasil.valid.all()
+    for simbol, df in frame.items():
+        _sama(hasil.frame(simbol), _referensi(df, periode_rsi_tambahan=(21,), periode_ema_tambahan=(100,)))
+
+
+def test_kolom_simbol_di_luar_bar_valid():
+    frame = _watchlist()
+    hasil = hitung_indikator_panel(susun_panel(frame))
+    kolom = hasil.kolom_simbol("SOLUSDT")
+    valid = hasil.valid[hasil.indeks("SOLUSDT")]
+    assert kolom["rsi_14"].shape == hasil.waktu.shape
+    assert np.isnan(kolom["rsi_14"][~valid]).all()
+    assert not kolom["pivot_low_2_2"][~valid].any()
+    # View, bukan salinan
+    assert np.shares_memory(kolom["rsi_14"], hasil.kolom["rsi_14"])
+    with pytest.raises(KeyError):
+        hasil.frame("DOGEUSDT")
+
+
+def test_endpoint_indikator_favorit(monkeypatch):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    db.add_all([
+        FavoritePair(symbol="BTCUSDT", market_type=MarketType.FUTURES),
+        FavoritePair(symbol="ETHUSDT", market_type=MarketType.FUTURES),
+        FavoritePair(symbol="XRPUSDT", market_type=MarketType.FUTURES),
+        FavoritePair(symbol="SOLUSDT", market_type=MarketType.FUTURES, is_active=False),
+    ])
+    db.commit()
+
+    frame = {"BTCUSDT": _ohlcv(300, 0), "ETHUSDT": _ohlcv(300, 1, mulai="2024-01-01 01:00")}
+
+    async def _get_klines(symbol, interval, limit):
+        if symbol not in frame:
+            raise Exception("Binance API error: 400")
+        df = frame[symbol].tail(limit).copy()
+        df["open_time"] = df["open_time"].astype("int64")
+        return df.to_dict("records")
+
+    monkeypatch.setattr(routes_signals.binance_fetcher, "get_klines", _get_klines)
+    hasil = asyncio.run(routes_signals.get_favorites_indikator(interval="1m", limit=250, db=db))
+
+    assert hasil["jumlah"] == 2
+    assert list(hasil["gagal"]) == ["XRPUSDT"]
+    for simbol, df in frame.items():
+        referensi = _referensi(df.tail(250).reset_index(drop=True)).iloc[-1]
+        terkini = hasil["indikator"][simbol]
+        assert terkini["open_time"] == referensi["open_time"].isoformat()
+        for nama in routes_signals.KOLOM_INDIKATOR_FAVORIT:
+            assert terkini[nama] == round(float(referensi[nama]), 2), nama
+    db.close()
@@ -0,0 +1,186 @@
+"""
+Kernel NumPy (`kernel_indikator`) dibandingkan dengan referensi pandas
+`ewm(adjust=False)` / `rolling(min_periods=1)` yang dulu dipakai
+`tambah_indikator_ke_df`.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.services.kernel_indikator import atr_np, ema_np, hitung_rsi_ema_multi_np, rsi_np
+from backend.services.praproses_data import tambah_indikator_ke_df
+
+RTOL = 1e-9
+ATOL = 1e-9
+
+
+def _rsi_referensi(tutup: pd.Series, periode: int) -> pd.Series:
+    perubahan = tutup.diff()
+    rata_naik = perubahan.clip(lower=0).ewm(alpha=1 / periode, adjust=False).mean()
+    rata_turun = (-perubahan).clip(lower=0).ewm(alpha=1 / periode, adjust=False).mean()
+    rsi = 100 - (100 / (1 + rata_naik / rata_turun.replace(0, np.nan)))
+    return rsi.fillna(50.0)
+
+
+def _ema_referensi(tutup: pd.Series, periode: int) -> pd.Series:
+    return tutup.ewm(span=periode, adjust=False).mean()
+
+
+def _atr_referensi(df: pd.DataFrame, periode: int = 14) -> pd.Series:
+    tutup_sebelumnya = df["close"].shift(1).fillna(df["close"])
+    true_range = pd.concat(
+        [
+            df["high"] - df["low"],
+            (df["high"] - tutup_sebelumnya).abs(),
+            (df["low"] - tutup_sebelumnya).abs(),
+        ],
+        axis=1,
+    ).max(axis=1)
+    return true_range.ewm(span=periode, adjust=False).mean()
+
+
+def _ohlcv(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    tutup = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    buka = tutup * np.exp(rng.normal(0, 0.003, n))
+    return pd.DataFrame({
+        "open_time": pd.date_range("2024-01-01", periods=n, freq="min"),
+        "open": buka,
+        "high": np.maximum(buka, tutup) * np.exp(np.abs(rng.normal(0, 0.004, n))),
+        "low": np.minimum(buka, tutup) * np.exp(-np.abs(rng.normal(0, 0.004, n))),
+        "close": tutup,
+        "volume": rng.random(n) * 10,
+    })
+
+
+def _sama(hasil, referensi) -> None:
+    np.testing.assert_allclose(np.asarray(hasil), np.asarray(referensi, dtype=np.float64), rtol=RTOL, atol=ATOL)
+
+
+@pytest.mark.parametrize("periode", [6, 8, 10, 14, 21])
+def test_rsi_ema_atr_sama_dengan_pandas(periode):
+    df = _ohlcv(3000)
+    tutup = df["close"].to_numpy()
+    _sama(rsi_np(tutup, periode), _rsi_referensi(df["close"], periode))
+    _sama(ema_np(tutup, periode), _ema_referensi(df["close"], periode))
+    _sama(
+        atr_np(df["high"].to_numpy(), df["low"].to_numpy(), tutup, periode),
+        _atr_referensi(df, periode),
+    )
+
+
+def test_nan_di_awal_dilewati_seperti_pandas():
+    tutup = _ohlcv(500)["close"].copy()
+    tutup.iloc[:7] = np.nan
+    _sama(ema_np(tutup.to_numpy(), 20), _ema_referensi(tutup, 20))
+    _sama(rsi_np(tutup.to_numpy(), 14), _rsi_referensi(tutup, 14))
+
+
+def test_nan_di_awal_frame_tetap_sama_dengan_pandas():
+    # OHLCV dengan NaN tidak lewat kernel; hasilnya tetap referensi pandas
+    df = _ohlcv(400)
+    df.loc[:4, ["open", "high", "low", "close"]] = np.nan
+    hasil = tambah_indikator_ke_df(df)
+    for periode in (6, 14):
+        _sama(hasil[f"rsi_{periode}"], _rsi_referensi(df["close"], periode))
+    _sama(hasil["ema_20"], _ema_referensi(df["close"], 20).ffill().bfill())
+
+
+def test_deret_konstan():
+    n = 300
+    tutup = np.full(n, 42.5)
+    np.testing.assert_array_equal(rsi_np(tutup, 14), np.full(n, 50.0))
+    _sama(ema_np(tutup, 50), tutup)
+    np.testing.assert_array_equal(atr_np(tutup, tutup, tutup, 14), np.zeros(n))
+    kolom = hitung_rsi_ema_multi_np(tutup, (6, 14), (9, 200))
+    np.testing.assert_array_equal(kolom["rsi_6"], np.full(n, 50.0))
+    _sama(kolom["ema_200"], tutup)
+
+
+@pytest.mark.parametrize("n", [0, 1, 2, 5, 13])
+def test_deret_lebih_pendek_dari_periode(n):
+    df = _ohlcv(n, seed=3)
+    tutup = df["close"].to_numpy()
+    _sama(rsi_np(tutup, 14), _rsi_referensi(df["close"], 14))
+    _sama(ema_np(tutup, 200), _ema_referensi(df["close"], 200))
+    _sama(atr_np(df["high"].to_numpy(), df["low"].to_numpy(), tutup, 14), _atr_referensi(df, 14))
+    kolom = hitung_rsi_ema_multi_np(tutup, (14,), (200,))
+    _sama(kolom["rsi_14"], _rsi_referensi(df["close"], 14))
+    _sama(kolom["ema_200"], _ema_referensi(df["close"], 200))
+
+
+def test_multi_sama_dengan_kernel_tunggal_dan_pandas():
+    df = _ohlcv(2500, seed=1)
+    tutup = df["close"].to_numpy()
+    kolom = hitung_rsi_ema_multi_np(tutup, (6, 8, 14, 6), (9, 20, 200))
+    for periode in (6, 8, 14):
+        _sama(kolom[f"rsi_{periode}"], rsi_np(tutup, periode))
+        _sama(kolom[f"rsi_{periode}"], _rsi_referensi(df["close"], periode))
+    for periode in (9, 20, 200):
+        _sama(kolom[f"ema_{periode}"], _ema_referensi(df["close"], periode))
+
+
+def test_multi_dua_dimensi_sama_dengan_per_simbol():
+    panel = np.stack([_ohlcv(800, seed=s)["close"].to_numpy() for s in range(3)])
+    kolom = hitung_rsi_ema_multi_np(panel, (6, 14), (20,))
+    for i in range(panel.shape[0]):
+        _sama(kolom["rsi_14"][i], rsi_np(panel[i], 14))
+        _sama(kolom["ema_20"][i], ema_np(panel[i], 20))
+
+
+def test_multi_melanjutkan_deret():
+    tutup = _ohlcv(1000, seed=2)["close"].to_numpy()
+    penuh = hitung_rsi_ema_multi_np(tutup, (6, 14), (9, 50))
+    awal = hitung_rsi_ema_multi_np(tutup[:600], (6, 14), (9, 50), sertakan_rata=True)
+    state = {nama: float(nilai[-1]) for nama, nilai in awal.items() if not nama.startswith("rsi_")}
+    lanjutan = hitung_rsi_ema_multi_np(tutup[600:], (6, 14), (9, 50), tutup_sebelumnya=tutup[599], awal=state)
+    for nama in ("rsi_6", "rsi_14", "ema_9", "ema_50"):
+        _sama(lanjutan[nama], penuh[nama][600:])
+
+
+@pytest.mark.parametrize("potongan", [(1, 999), (2, 1, 997), (24,) * 41 + (16,), (300, 1, 1, 698)])
+def test_multi_melanjutkan_deret_berantai(potongan):
+    # State diteruskan lewat rata_* / ema_* keluaran potongan sebelumnya,
+    # termasuk potongan satu bar yang rata_*-nya masih NaN
+    df = _ohlcv(sum(potongan), seed=3)
+    tutup = df["close"].to_numpy()
+    periode_rsi, periode_ema = (6, 8, 14, 21), (9, 20, 200)
+    penuh = hitung_rsi_ema_multi_np(tutup, periode_rsi, periode_ema)
+    bagian = {nama: [] for nama in penuh}
+    state, sebelumnya, mulai = None, None, 0
+    for panjang in potongan:
+        hasil = hitung_rsi_ema_multi_np(
+            tutup[mulai:mulai + panjang], periode_rsi, periode_ema, sertakan_rata=True,
+            tutup_sebelumnya=sebelumnya, awal=state,
+        )
+        for nama in bagian:
+            bagian[nama].append(hasil[nama])
+        state = {nama: float(nilai[-1]) for nama, nilai in hasil.items() if not nama.startswith("rsi_")}
+        sebelumnya = tutup[mulai + panjang - 1]
+        mulai += panjang
+    for nama, nilai in penuh.items():
+        _sama(np.concatenate(bagian[nama]), nilai)
+    _sama(np.concatenate(bagian["rsi_21"]), _rsi_referensi(df["close"], 21))
+    _sama(np.concatenate(bagian["ema_200"]), _ema_referensi(df["close"], 200))
+
+
+def test_tambah_indikator_ke_df_sama_dengan_pandas():
+    df = _ohlcv(3000, seed=4)
+    hasil = tambah_indikator_ke_df(df, periode_rsi_tambahan=(21,), periode_ema_tambahan=(100,))
+    tutup = df["close"]
+    for periode in (6, 8, 10, 14, 21):
+        _sama(hasil[f"rsi_{periode}"], _rsi_referensi(tutup, periode))
+    for periode in (8, 10):
+        _sama(hasil[f"rsi_{periode}_ma3"], _rsi_referensi(tutup, periode).rolling(3, min_periods=1).mean())
+    for periode in (9, 20, 50, 200, 100):
+        _sama(hasil[f"ema_{periode}"], _ema_referensi(tutup, periode))
+    _sama(hasil["atr_14"], _atr_referensi(df, 14))
+
+    return_1 = tutup / tutup.shift(1).fillna(tutup) - 1.0
+    _sama(hasil["return_1"], return_1)
+    _sama(hasil["return_5"], tutup / tutup.shift(5).fillna(tutup) - 1.0)
+    _sama(hasil["volatility_5"], return_1.rolling(5, min_periods=1).std().fillna(0.0))
+    _sama(hasil["volume_anomaly"], df["volume"] / df["volume"].rolling(20, min_periods=1).mean())
+    _sama(hasil["distance_to_ema_20"], tutup - _ema_referensi(tutup, 20))
+    _sama(hasil["rsi_position"], _rsi_referensi(tutup, 14) / 100.0)
@@ -0,0 +1,153 @@
+"""
+`PemeriksaKualitas` (per chunk) dan `isi_bar_hilang` dibandingkan dengan
+versi per baris yang ditulis langsung dari definisinya.
+"""
+
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.services.kualitas_data import PemeriksaKualitas, isi_bar_hilang, periksa_kualitas
+
+INTERVAL_MS = 60_000
+
+
+def _data_kotor(n: int = 3000, seed: int = 0) -> pd.DataFrame:
+    """1m dengan gap, duplikat, baris mundur, open_time rusak, OHLC salah, dan rentetan volume nol."""
+    rng = np.random.default_rng(seed)
+    waktu = 1_700_000_000_000 + np.arange(n, dtype=np.int64) * INTERVAL_MS
+    tutup = 100 + np.cumsum(rng.normal(0, 0.1, n))
+    df = pd.DataFrame({
+        "open_time": waktu,
+        "open": tutup + rng.normal(0, 0.05, n),
+        "high": tutup + 0.3,
+        "low": tutup - 0.3,
+        "close": tutup,
+        "volume": np.where(rng.random(n) < 0.1, 0.0, rng.random(n)),
+        "close_time": waktu + INTERVAL_MS - 1,
+        "count": rng.integers(1, 50, n),
+    })
+    df.loc[500:540, "volume"] = 0.0
+    df.loc[1200:1260, "volume"] = 0.0
+    df = df.drop(index=sorted(set(rng.choice(n, 200, replace=False).tolist()) | set(range(900, 950))))
+    # Langkah 1.5 interval (tidak sejajar) dan baris mundur / duplikat
+    df.loc[df.index > 2000, ["open_time", "close_time"]] += 30_000
+    baris = df.index.to_numpy()
+    duplikat = df.loc[rng.choice(baris, 30, replace=False)]
+    df = pd.concat([df, duplikat]).sample(frac=1.0, random_state=1) if seed % 2 else pd.concat([df, duplikat])
+    df = df.reset_index(drop=True)
+    acak = rng.choice(len(df), 40, replace=False)
+    df.loc[acak[:10], "open_time"] = df.loc[acak[:10], "open_time"] - 5 * INTERVAL_MS
+    df.loc[acak[10:20], "high"] = df.loc[acak[10:20], "low"] - 1
+    df.loc[acak[20:25], "close"] = np.nan
+    df["open_time"] = df["open_time"].astype(object)
+    df.loc[acak[25:30], "open_time"] = "rusak"
+    return df
+
+
+def _laporan_referensi(df: pd.DataFrame, interval_ms: int) -> dict:
+    waktu = pd.to_numeric(df["open_time"], errors="coerce")
+    valid = waktu.dropna().astype(np.int64).tolist()
+    langkah = [b - a for a, b in zip(valid, valid[1:])]
+    hilang = [(s - 1) // interval_ms for s in langkah if s > interval_ms]
+    gap_terbesar = None
+    for i, s in enumerate(langkah):
+        # Gap terbesar pertama (gap berikutnya yang sama besar tidak menggantikan)
+        if s > interval_ms and (gap_terbesar is None or (s - 1) // interval_ms > gap_terbesar["bar_hilang"]):
+            gap_terbesar = {
+                "setelah": pd.Timestamp(valid[i], unit="ms").isoformat(),
+                "bar_hilang": (s - 1) // interval_ms,
+            }
+    salah = 0
+    for o, h, l, c in zip(df["open"], df["high"], df["low"], df["close"]):
+        if not all(np.isfinite([o, h, l, c])) or l <= 0 or h < max(o, c) or l > min(o, c):
+            salah += 1
+    nol = [v == 0 for v in df["volume"]]
+    rentetan = [len(list(grup)) for kunci, grup in itertools.groupby(nol) if kunci]
+    laporan = {
+        "jumlah_baris": len(df),
+        "interval_ms": interval_ms,
+        "waktu_tidak_valid": int(waktu.isna().sum()),
+        "duplikat": sum(s == 0 for s in langkah),
+        "tidak_urut": sum(s < 0 for s in langkah),
+        "jumlah_gap": len(hilang),
+        "bar_hilang": sum(hilang),
+        "gap_terbesar": gap_terbesar,
+        "ohlc_tidak_konsisten": salah,
+        "volume_nol": sum(nol),
+        "volume_nol_beruntun_maks": max(rentetan, default=0),
+    }
+    laporan["bersih"] = not (
+        laporan["waktu_tidak_valid"] or laporan["duplikat"] or laporan["tidak_urut"]
+        or laporan["bar_hilang"] or laporan["ohlc_tidak_konsisten"]
+    )
+    return laporan
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+@pytest.mark.parametrize("ukuran_chunk", [3, 41, 1000, 10_000])
+def test_pemeriksa_per_chunk_sama_dengan_per_baris(seed, ukuran_chunk):
+    df = _data_kotor(seed=seed)
+    pemeriksa = PemeriksaKualitas(INTERVAL_MS)
+    for mulai in range(0, len(df), ukuran_chunk):
+        pemeriksa.tambah(df.iloc[mulai:mulai + ukuran_chunk])
+    assert pemeriksa.laporan() == _laporan_referensi(df, INTERVAL_MS)
+
+
+@pytest.mark.parametrize("ukuran_chunk", [500, 1000])
+def test_interval_dideteksi_dari_chunk_pertama(ukuran_chunk):
+    df = _data_kotor()
+    pemeriksa = PemeriksaKualitas()
+    for mulai in range(0, len(df), ukuran_chunk):
+        pemeriksa.tambah(df.iloc[mulai:mulai + ukuran_chunk])
+    assert pemeriksa.interval_ms == INTERVAL_MS
+    assert pemeriksa.laporan() == periksa_kualitas(df) == _laporan_referensi(df, INTERVAL_MS)
+
+
+def _isi_referensi(df: pd.DataFrame, interval_ms: int) -> pd.DataFrame:
+    data = df.assign(_ms=pd.to_numeric(df["open_time"], errors="coerce")).dropna(subset=["_ms"])
+    data = data.sort_values("_ms", kind="stable").drop_duplicates("_ms", keep="last")
+    baris = []
+    sebelumnya = None
+    for rekaman in data.to_dict("records"):
+        if sebelumnya is not None:
+            waktu = sebelumnya["_ms"] + interval_ms
+            while waktu < rekaman["_ms"]:
+                isian = dict(sebelumnya)
+                isian.update(
+                    _ms=waktu, open=sebelumnya["close"], high=sebelumnya["close"], low=sebelumnya["close"],
+                    volume=0, count=0, close_time=waktu + interval_ms - 1,
+                )
+                baris.append(isian)
+                waktu += interval_ms
+        baris.append(rekaman)
+        sebelumnya = rekaman
+    hasil = pd.DataFrame(baris, columns=data.columns)
+    hasil["open_time"] = hasil.pop("_ms").astype(np.int64)
+    return hasil
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_isi_bar_hilang_sama_dengan_per_baris(seed):
+    df = _data_kotor(seed=seed)
+    df = df[pd.to_numeric(df["open_time"], errors="coerce").notna()].astype({"open_time": np.int64})
+    hasil, diisi = isi_bar_hilang(df, INTERVAL_MS)
+    referensi = _isi_referensi(df, INTERVAL_MS)
+    assert diisi == len(referensi) - df["open_time"].nunique() > 0
+    pd.testing.assert_frame_equal(hasil, referensi[list(df.columns)], check_dtype=False)
+    # Setelah diisi, data bersih dari gap / duplikat / baris mundur
+    laporan = periksa_kualitas(hasil, INTERVAL_MS)
+    assert laporan["bar_hilang"] == laporan["duplikat"] == laporan["tidak_urut"] == 0
+
+
+def test_isi_bar_hilang_mempertahankan_tipe_datetime():
+    df = _data_kotor()
+    df = df[pd.to_numeric(df["open_time"], errors="coerce").notna()].astype({"open_time": np.int64})
+    sebagai_datetime = df.assign(open_time=df["open_time"].astype("datetime64[ms]"))
+    hasil, diisi = isi_bar_hilang(sebagai_datetime, INTERVAL_MS)
+    referensi, diisi_ms = isi_bar_hilang(df, INTERVAL_MS)
+    assert diisi == diisi_ms
+    assert hasil["open_time"].dtype == "datetime64[ms]"
+    np.testing.assert_array_equal(hasil["open_time"].to_numpy().view(np.int64), referensi["open_time"].to_numpy())
@@ -0,0 +1,267 @@
+"""
+Invalidation cache pra-proses: `ManifestPraproses.periksa` / `catat`, hash
+rantai mode kontinu di `ManajerPraproses._jalankan_seri`, hasil mode kontinu
+dibandingkan dengan satu berkas gabungan, dan penolakan job kedua untuk folder
+tujuan yang sama.
+"""
+
+import asyncio
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.services import manifest_praproses
+from backend.services.manifest_praproses import ManifestPraproses, gabung_rantai, sidik_berkas
+from backend.services.penyimpanan_kolom import (
+    FORMAT_CSV,
+    FORMAT_KOLOM,
+    baca_hasil_preprocess,
+    hapus_hasil,
+    path_hasil,
+)
+from backend.services.pipeline_praproses import ManajerPraproses
+from backend.services.praproses_data import StateIndikator, praproses_berkas, tambah_kolom_pivot
+
+INTERVAL_MS = 3_600_000
+JUMLAH_BERKAS = 4
+
+
+def _tulis_sumber(path: Path, hari: int, seed: int = 0) -> Path:
+    n = 24
+    rng = np.random.default_rng(seed + hari)
+    tutup = 100 + np.cumsum(rng.normal(0, 0.5, n))
+    open_time = 1_704_067_200_000 + (hari * n + np.arange(n)) * INTERVAL_MS
+    pd.DataFrame({
+        "open_time": open_time,
+        "open": tutup,
+        "high": tutup + 0.5,
+        "low": tutup - 0.5,
+        "close": tutup,
+        "volume": rng.random(n),
+        "close_time": open_time + INTERVAL_MS - 1,
+    }).to_csv(path, index=False)
+    return path
+
+
+def _ubah_isi_ukuran_sama(path: Path) -> None:
+    """Ganti satu digit isi berkas (ukuran tetap, mtime diset sama seperti semula)."""
+    info = os.stat(path)
+    isi = path.read_bytes()
+    posisi = isi.rindex(b"1")
+    path.write_bytes(isi[:posisi] + b"2" + isi[posisi + 1:])
+    os.utime(path, ns=(info.st_atime_ns, info.st_mtime_ns))
+
+
+@pytest.fixture
+def tercatat(tmp_path):
+    """Satu berkas yang sudah diproses dan dicatat di manifest."""
+    sumber = _tulis_sumber(tmp_path / "BTCUSDT-1h-2024-01-01.csv", 0)
+    tujuan = tmp_path / "processed"
+    sidik = sidik_berkas(sumber)
+    hasil = praproses_berkas(sumber, tujuan, FORMAT_CSV)
+    manifest = ManifestPraproses(tujuan)
+    manifest.catat(sumber, sidik, hasil, FORMAT_CSV)
+    manifest.simpan()
+    return sumber, tujuan
+
+
+def test_berkas_tidak_berubah_valid_setelah_dimuat_ulang(tercatat):
+    sumber, tujuan = tercatat
+    entri = ManifestPraproses(tujuan).periksa(sumber, FORMAT_CSV)
+    assert entri is not None
+    assert entri["hash"] == sidik_berkas(sumber)["hash"]
+
+
+def test_ukuran_berubah(tercatat):
+    sumber, tujuan = tercatat
+    with open(sumber, "a") as berkas:
+        berkas.write("\n")
+    assert ManifestPraproses(tujuan).periksa(sumber, FORMAT_CSV) is None
+
+
+def test_mtime_berubah_isi_sama_tetap_valid(tercatat):
+    sumber, tujuan = tercatat
+    mtime_lama = os.stat(sumber).st_mtime_ns
+    os.utime(sumber, ns=(mtime_lama + 5_000_000_000, mtime_lama + 5_000_000_000))
+    manifest = ManifestPraproses(tujuan)
+    entri = manifest.periksa(sumber, FORMAT_CSV)
+    assert entri is not None
+    assert entri["mtime_ns"] == mtime_lama + 5_000_000_000
+
+
+def test_mtime_dan_hash_berubah(tercatat):
+    sumber, tujuan = tercatat
+    ukuran = os.stat(sumber).st_size
+    _ubah_isi_ukuran_sama(sumber)
+    os.utime(sumber)
+    assert os.stat(sumber).st_size == ukuran
+    assert ManifestPraproses(tujuan).periksa(sumber, FORMAT_CSV) is None
+
+
+def test_isi_berubah_tanpa_mtime_berubah_tidak_dibaca(tercatat):
+    # ATURAN: ukuran + mtime sama -> dianggap tidak berubah tanpa hash
+    sumber, tujuan = tercatat
+    _ubah_isi_ukuran_sama(sumber)
+    assert ManifestPraproses(tujuan).periksa(sumber, FORMAT_CSV) is not None
+
+
+def test_versi_konfig_indikator_berubah(tercatat, monkeypatch):
+    sumber, tujuan = tercatat
+    monkeypatch.setattr(manifest_praproses, "VERSI_KONFIG_INDIKATOR", "versi-lain")
+    assert ManifestPraproses(tujuan).periksa(sumber, FORMAT_CSV) is None
+
+
+def test_format_isi_gap_dan_kontinu_berubah(tercatat):
+    sumber, tujuan = tercatat
+    manifest = ManifestPraproses(tujuan)
+    assert manifest.periksa(sumber, FORMAT_KOLOM) is None
+    assert manifest.periksa(sumber, FORMAT_CSV, isi_gap=True) is None
+    assert manifest.periksa(sumber, FORMAT_CSV, kontinu=True) is None
+    assert manifest.periksa(sumber, FORMAT_CSV) is not None
+
+
+def test_berkas_hasil_hilang(tercatat):
+    sumber, tujuan = tercatat
+    hapus_hasil(path_hasil(tujuan, sumber.name, FORMAT_CSV))
+    assert ManifestPraproses(tujuan).periksa(sumber, FORMAT_CSV) is None
+
+
+def test_rantai_kontinu_dicek(tmp_path):
+    sumber = _tulis_sumber(tmp_path / "BTCUSDT-1h-2024-01-02.csv", 1)
+    tujuan = tmp_path / "processed"
+    sidik = sidik_berkas(sumber)
+    hasil = praproses_berkas(sumber, tujuan, FORMAT_CSV)
+    manifest = ManifestPraproses(tujuan)
+    rantai = gabung_rantai(None, "hash-berkas-pertama")
+    manifest.catat(sumber, sidik, hasil, FORMAT_CSV, kontinu=True, rantai_sebelumnya=rantai)
+    # Tanpa state akhir, entri kontinu tidak bisa dipakai untuk melanjutkan seri
+    assert manifest.periksa(sumber, FORMAT_CSV, kontinu=True, rantai_sebelumnya=rantai) is None
+    manifest.catat(sumber, sidik, hasil, FORMAT_CSV, True, rantai, StateIndikator())
+    assert manifest.periksa(sumber, FORMAT_CSV, kontinu=True, rantai_sebelumnya=rantai) is not None
+    assert manifest.periksa(sumber, FORMAT_CSV, kontinu=True, rantai_sebelumnya=None) is None
+    assert manifest.periksa(
+        sumber, FORMAT_CSV, kontinu=True, rantai_sebelumnya=gabung_rantai(None, "hash-lain")
+    ) is None
+
+
+@pytest.fixture
+def seri(tmp_path):
+    folder = tmp_path / "upload"
+    folder.mkdir()
+    daftar = [
+        _tulis_sumber(folder / f"BTCUSDT-1h-2024-01-0{hari + 1}.csv", hari) for hari in range(JUMLAH_BERKAS)
+    ]
+    manajer = ManajerPraproses(max_workers=1)
+    yield daftar, tmp_path / "processed", manajer
+    manajer.shutdown()
+
+
+def _jalankan(manajer: ManajerPraproses, daftar, tujuan, **parameter):
+    async def _job():
+        job = manajer.mulai_job("upload", daftar, tujuan, FORMAT_CSV, **parameter)
+        return await manajer.tunggu(job.job_id)
+
+    job = asyncio.run(_job())
+    assert not any("error" in hasil for hasil in job.ringkasan()), job.ringkasan()
+    return [bool(hasil.get("cache")) for hasil in job.ringkasan()]
+
+
+def test_kontinu_berkas_awal_berubah_membatalkan_semua_sesudahnya(seri):
+    daftar, tujuan, manajer = seri
+    assert _jalankan(manajer, daftar, tujuan, kontinu=True) == [False] * JUMLAH_BERKAS
+    assert _jalankan(manajer, daftar, tujuan, kontinu=True) == [True] * JUMLAH_BERKAS
+
+    _ubah_isi_ukuran_sama(daftar[1])
+    os.utime(daftar[1])
+    assert _jalankan(manajer, daftar, tujuan, kontinu=True) == [True, False, False, False]
+    assert _jalankan(manajer, daftar, tujuan, kontinu=True) == [True] * JUMLAH_BERKAS
+
+    # Hasil seri yang dilanjutkan dari cache sama dengan seri yang dihitung penuh
+    cache = [pd.read_csv(path_hasil(tujuan, path.name, FORMAT_CSV)) for path in daftar]
+    assert _jalankan(manajer, daftar, tujuan, kontinu=True, paksa=True) == [False] * JUMLAH_BERKAS
+    for lama, path in zip(cache, daftar):
+        pd.testing.assert_frame_equal(lama, pd.read_csv(path_hasil(tujuan, path.name, FORMAT_CSV)))
+
+
+@pytest.mark.parametrize("format_simpan", [FORMAT_CSV, FORMAT_KOLOM])
+def test_kontinu_sama_dengan_satu_berkas_gabungan(seri, tmp_path, format_simpan):
+    daftar, tujuan, manajer = seri
+    gabungan = tmp_path / "gabungan" / "BTCUSDT-1h.csv"
+    gabungan.parent.mkdir()
+    pd.concat([pd.read_csv(path) for path in daftar], ignore_index=True).to_csv(gabungan, index=False)
+    referensi = baca_hasil_preprocess(Path(praproses_berkas(gabungan, tmp_path / "ref", format_simpan)["lokasi_hasil"]))
+
+    async def _job():
+        job = manajer.mulai_job("upload", daftar, tujuan, format_simpan, kontinu=True)
+        return await manajer.tunggu(job.job_id)
+
+    asyncio.run(_job())
+    per_berkas = [baca_hasil_preprocess(path_hasil(tujuan, path.name, format_simpan)) for path in daftar]
+    hasil = pd.concat(per_berkas, ignore_index=True)
+    assert list(hasil.columns) == list(referensi.columns)
+    kolom_pivot = [nama for nama in referensi.columns if nama.startswith("pivot_")]
+    pd.testing.assert_frame_equal(
+        hasil.drop(columns=kolom_pivot), referensi.drop(columns=kolom_pivot), check_exact=False, rtol=1e-9, atol=1e-9
+    )
+    # Pivot tetap lokal per berkas (bar di tepi berkas False), seperti frame yang dipindai per berkas
+    for df in per_berkas:
+        lokal = tambah_kolom_pivot(df.drop(columns=kolom_pivot))
+        for nama in kolom_pivot:
+            np.testing.assert_array_equal(df[nama].to_numpy(), lokal[nama].to_numpy(), err_msg=nama)
+
+
+def test_non_kontinu_hanya_berkas_berubah_dihitung_ulang(seri):
+    daftar, tujuan, manajer = seri
+    assert _jalankan(manajer, daftar, tujuan) == [False] * JUMLAH_BERKAS
+    _ubah_isi_ukuran_sama(daftar[1])
+    os.utime(daftar[1])
+    hapus_hasil(path_hasil(tujuan, daftar[3].name, FORMAT_CSV))
+    assert _jalankan(manajer, daftar, tujuan) == [True, False, True, False]
+
+
+def test_konfigurasi_berubah_membatalkan_seri(seri, monkeypatch):
+    daftar, tujuan, manajer = seri
+    _jalankan(manajer, daftar, tujuan, kontinu=True)
+    assert _jalankan(manajer, daftar, tujuan, kontinu=True, isi_gap=True) == [False] * JUMLAH_BERKAS
+    monkeypatch.setattr(manifest_praproses, "VERSI_KONFIG_INDIKATOR", "versi-lain")
+    assert _jalankan(manajer, daftar, tujuan, kontinu=True, isi_gap=True) == [False] * JUMLAH_BERKAS
+    assert _jalankan(manajer, daftar, tujuan, kontinu=True, isi_gap=True) == [True] * JUMLAH_BERKAS
+
+
+def test_job_kedua_folder_tujuan_sama_ditolak_selama_berjalan(seri):
+    daftar, tujuan, manajer = seri
+
+    async def _job():
+        job = manajer.mulai_job("upload", daftar, tujuan, FORMAT_CSV)
+        assert manajer.job_aktif_untuk(tujuan) is job
+        with pytest.raises(ValueError):
+            manajer.mulai_job("upload", daftar, tujuan / ".." / tujuan.name, FORMAT_CSV)
+        # Folder tujuan lain tetap boleh berjalan bersamaan
+        lain = manajer.mulai_job("upload", daftar, tujuan.parent / "processed-lain", FORMAT_CSV)
+        await manajer.tunggu(job.job_id)
+        await manajer.tunggu(lain.job_id)
+        assert manajer.job_aktif_untuk(tujuan) is None
+        return manajer.mulai_job("upload", daftar, tujuan, FORMAT_CSV)
+
+    async def _jalankan_semua():
+        job = await _job()
+        return await manajer.tunggu(job.job_id)
+
+    job = asyncio.run(_jalankan_semua())
+    assert [hasil.get("cache") for hasil in job.ringkasan()] == [True] * JUMLAH_BERKAS
+
+
+def test_timeframe_berubah_membatalkan_cache(seri):
+    daftar, tujuan, manajer = seri
+    assert _jalankan(manajer, daftar, tujuan, timeframe="4h") == [False] * JUMLAH_BERKAS
+    assert _jalankan(manajer, daftar, tujuan, timeframe="4h") == [True] * JUMLAH_BERKAS
+    hasil = pd.read_csv(path_hasil(tujuan, daftar[0].name, FORMAT_CSV))
+    # 24 bar 1h per berkas -> 6 bar 4h
+    assert len(hasil) == 6
+    assert _jalankan(manajer, daftar, tujuan) == [False] * JUMLAH_BERKAS
+    assert len(pd.read_csv(path_hasil(tujuan, daftar[0].name, FORMAT_CSV))) == 24
+    assert _jalankan(manajer, daftar, tujuan, kontinu=True, timeframe="1d") == [False] * JUMLAH_BERKAS
+    assert _jalankan(manajer, daftar, tujuan, kontinu=True, timeframe="1d") == [True] * JUMLAH_BERKAS
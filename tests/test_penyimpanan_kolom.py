@@ -0,0 +1,66 @@
+"""
+Penulisan format kolom: `simpan_kolom` dan `PenulisKolomBertahap` memakai
+folder sementara unik dan mengganti hasil lama tanpa menghapusnya lebih dulu.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.services import penyimpanan_kolom
+from backend.services.penyimpanan_kolom import PenulisKolomBertahap, baca_kolom, simpan_kolom
+
+
+def _frame(n: int, nilai: float) -> pd.DataFrame:
+    return pd.DataFrame({
+        "open_time": pd.date_range("2024-01-01", periods=n, freq="min").astype("datetime64[ms]"),
+        "close": np.full(n, nilai),
+    })
+
+
+def _isi_folder(folder: Path):
+    return sorted(path.name for path in folder.iterdir())
+
+
+def test_simpan_kolom_mengganti_hasil_lama(tmp_path):
+    tujuan = tmp_path / "BTCUSDT-1h.processed.kolom"
+    simpan_kolom(_frame(5, 1.0), tujuan)
+    simpan_kolom(_frame(7, 2.0), tujuan)
+    pd.testing.assert_frame_equal(baca_kolom(tujuan, mmap=False), _frame(7, 2.0))
+    # Tidak ada folder sementara atau hasil lama yang tertinggal
+    assert _isi_folder(tmp_path) == [tujuan.name]
+
+
+def test_penulis_bertahap_berbagi_folder_tujuan(tmp_path):
+    tujuan = tmp_path / "BTCUSDT-1h.processed.kolom"
+    pertama, kedua = PenulisKolomBertahap(tujuan), PenulisKolomBertahap(tujuan)
+    assert pertama.path_sementara != kedua.path_sementara
+    pertama.tambah(_frame(3, 1.0))
+    kedua.tambah(_frame(4, 2.0))
+    pertama.selesai()
+    # Penulis kedua tidak kehilangan folder sementaranya
+    kedua.tambah(_frame(4, 2.0).iloc[:0])
+    kedua.selesai()
+    pd.testing.assert_frame_equal(baca_kolom(tujuan, mmap=False), _frame(4, 2.0))
+    assert _isi_folder(tmp_path) == [tujuan.name]
+
+
+def test_hasil_lama_dipertahankan_jika_rename_gagal(tmp_path, monkeypatch):
+    tujuan = tmp_path / "BTCUSDT-1h.processed.kolom"
+    simpan_kolom(_frame(5, 1.0), tujuan)
+    rename_asli = Path.rename
+
+    def _rename(self, target):
+        # Hasil lama boleh dipindah ke samping (dan kembali), hasil baru gagal dipasang
+        if Path(target) == tujuan and self.name != tujuan.name:
+            raise OSError("rename gagal")
+        return rename_asli(self, target)
+
+    monkeypatch.setattr(penyimpanan_kolom.Path, "rename", _rename)
+    with pytest.raises(OSError):
+        simpan_kolom(_frame(7, 2.0), tujuan)
+    monkeypatch.undo()
+    pd.testing.assert_frame_equal(baca_kolom(tujuan, mmap=False), _frame(5, 1.0))
+    assert _isi_folder(tmp_path) == [tujuan.name]
@@ -0,0 +1,102 @@
+"""
+Penggabungan sinyal per berkas (`gabung_sinyal`) dan hasil job
+`ManajerSinyal` dibandingkan dengan `generate_sinyal_dari_folder_honest`
+yang memindai berkas berurutan.
+"""
+
+import asyncio
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.services import generator_sinyal_unified as generator
+from backend.services.penyimpanan_kolom import FORMAT_CSV, daftar_hasil_preprocess
+from backend.services.pipeline_sinyal import STATUS_SELESAI, ManajerSinyal, gabung_sinyal
+from backend.services.praproses_data import simpan_hasil_preprocess, tambah_indikator_ke_df
+
+
+def _frame_sintetis(n: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    tutup = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    buka = tutup * np.exp(rng.normal(0, 0.003, n))
+    return tambah_indikator_ke_df(pd.DataFrame({
+        "open_time": pd.date_range("2024-01-01", periods=n, freq="h") + pd.Timedelta(hours=n * seed),
+        "open": buka,
+        "high": np.maximum(buka, tutup) * np.exp(np.abs(rng.normal(0, 0.004, n))),
+        "low": np.minimum(buka, tutup) * np.exp(-np.abs(rng.normal(0, 0.004, n))),
+        "close": tutup,
+        "volume": rng.random(n),
+    }))
+
+
+def _sinyal(timestamp: str, berkas: int, posisi: int) -> dict:
+    return {"timestamp": timestamp, "berkas": berkas, "posisi": posisi}
+
+
+def test_gabung_sinyal_urut_timestamp_lalu_berkas_lalu_posisi():
+    sinyal_per_berkas = {
+        2: {"aktif": [_sinyal("2024-01-01T01:00:00", 2, 0), _sinyal("2024-01-01T03:00:00", 2, 1)]},
+        0: {"aktif": [_sinyal("2024-01-01T02:00:00", 0, 0), _sinyal("2024-01-01T02:00:00", 0, 1)]},
+        1: {
+            "aktif": [_sinyal("2024-01-01T00:00:00", 1, 0), _sinyal("2024-01-01T02:00:00", 1, 1)],
+            "pasif": [_sinyal("2024-01-01T05:00:00", 1, 0)],
+        },
+    }
+    hasil = gabung_sinyal(sinyal_per_berkas, ["aktif", "pasif", "santai"])
+
+    # Referensi: urutan berkas, urutan dalam berkas, lalu timestamp (kembar tetap urutan itu)
+    referensi = sorted(
+        (s for i in sorted(sinyal_per_berkas) for s in sinyal_per_berkas[i]["aktif"]),
+        key=lambda s: (s["timestamp"], s["berkas"], s["posisi"]),
+    )
+    assert hasil["aktif"] == referensi
+    assert [(s["berkas"], s["posisi"]) for s in hasil["aktif"] if s["timestamp"] == "2024-01-01T02:00:00"] == [
+        (0, 0), (0, 1), (1, 1),
+    ]
+    assert hasil["pasif"] == sinyal_per_berkas[1]["pasif"]
+    assert hasil["santai"] == []
+
+
+def test_gabung_sinyal_tidak_bergantung_urutan_selesai():
+    rng = random.Random(0)
+    sinyal_per_berkas = {
+        i: {"aktif": [_sinyal(f"2024-01-01T0{rng.randrange(4)}:00:00", i, j) for j in range(5)]}
+        for i in range(6)
+    }
+    referensi = gabung_sinyal(sinyal_per_berkas, ["aktif"])
+    for _ in range(5):
+        urutan = list(sinyal_per_berkas)
+        rng.shuffle(urutan)
+        assert gabung_sinyal({i: sinyal_per_berkas[i] for i in urutan}, ["aktif"]) == referensi
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_job_sama_dengan_scan_folder_berurutan(tmp_path, max_workers):
+    # Berkas ketiga (nama paling awal) berisi waktu paling akhir; berkas 0 dan 1 tumpang tindih
+    for nama, n, seed in [("b-BTCUSDT", 600, 0), ("c-ETHUSDT", 400, 1), ("a-SOLUSDT", 300, 3)]:
+        simpan_hasil_preprocess(_frame_sintetis(n, seed), f"{nama}.csv", tmp_path, FORMAT_CSV)
+    daftar_berkas = daftar_hasil_preprocess(tmp_path)
+    daftar_mode = list(generator.TRADING_STYLES)
+
+    manajer = ManajerSinyal(max_workers=max_workers)
+    manajer._pool = ThreadPoolExecutor(max_workers=max_workers)
+
+    async def _jalankan():
+        job = manajer.mulai_job(str(tmp_path), daftar_berkas, daftar_mode, confidence_minimum=0.30)
+        return await manajer.tunggu(job.job_id)
+
+    try:
+        job = asyncio.run(_jalankan())
+    finally:
+        manajer.shutdown()
+
+    assert job.status == STATUS_SELESAI
+    for mode in daftar_mode:
+        berurutan = generator.generate_sinyal_dari_folder_honest(str(tmp_path), "BTCUSDT", mode, 0.30)
+        assert berurutan
+        assert job.sinyal[mode] == sorted(berurutan, key=lambda sinyal: sinyal["timestamp"])
+        assert job.jumlah_sinyal()[mode] == len(berurutan)
+    assert [h["nama_berkas"] for h in job.ringkasan()] == [path.name for path in daftar_berkas]
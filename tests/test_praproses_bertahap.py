@@ -0,0 +1,98 @@
+"""
+`praproses_berkas_bertahap` (per chunk, state & ekor pivot diteruskan antar
+chunk) harus menghasilkan berkas yang sama dengan `praproses_berkas`, juga
+dengan resample `timeframe`.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.services.penyimpanan_kolom import FORMAT_CSV, FORMAT_KOLOM, baca_hasil_preprocess
+from backend.services.kualitas_data import isi_bar_hilang
+from backend.services.praproses_data import praproses_berkas, praproses_berkas_bertahap, tambah_indikator_ke_df
+from backend.services.resample_timeframe import resample_ohlcv
+
+INTERVAL_MS = 60_000
+
+
+@pytest.fixture(scope="module")
+def berkas_sumber(tmp_path_factory):
+    """CSV 1m ala Binance Vision dengan gap (juga tepat di batas chunk 777)."""
+    n = 6000
+    rng = np.random.default_rng(0)
+    tutup = 100 + np.cumsum(rng.normal(0, 0.1, n))
+    buka = tutup + rng.normal(0, 0.05, n)
+    open_time = 1_600_000_000_000 + np.arange(n) * INTERVAL_MS
+    df = pd.DataFrame({
+        "open_time": open_time,
+        "open": buka,
+        "high": np.maximum(buka, tutup) + rng.random(n) * 0.3,
+        "low": np.minimum(buka, tutup) - rng.random(n) * 0.3,
+        "close": tutup,
+        "volume": rng.random(n) * 10,
+        "close_time": open_time + INTERVAL_MS - 1,
+    })
+    hilang = set(rng.choice(n, 150, replace=False).tolist())
+    hilang |= {776, 777, 1553, 1554, 1555, 3108}
+    hilang |= set(range(4000, 4012))
+    df = df.drop(index=sorted(hilang))
+    path = tmp_path_factory.mktemp("sumber") / "BTCUSDT-1m-2024-01.csv"
+    df.to_csv(path, index=False)
+    return path
+
+
+@pytest.mark.parametrize("format_simpan", [FORMAT_CSV, FORMAT_KOLOM])
+@pytest.mark.parametrize("isi_gap", [False, True])
+@pytest.mark.parametrize("ukuran_chunk", [777, 1000, 5999])
+def test_bertahap_sama_dengan_sekaligus(tmp_path, berkas_sumber, format_simpan, isi_gap, ukuran_chunk):
+    penuh = praproses_berkas(berkas_sumber, tmp_path / "penuh", format_simpan, isi_gap=isi_gap)
+    bertahap = praproses_berkas_bertahap(
+        berkas_sumber, tmp_path / "bertahap", format_simpan, ukuran_chunk=ukuran_chunk, isi_gap=isi_gap
+    )
+    assert bertahap["jumlah_baris"] == penuh["jumlah_baris"]
+    assert bertahap["kualitas"] == penuh["kualitas"]
+    if isi_gap:
+        assert bertahap["bar_diisi"] == penuh["bar_diisi"] > 0
+
+    referensi = baca_hasil_preprocess(Path(penuh["lokasi_hasil"]))
+    hasil = baca_hasil_preprocess(Path(bertahap["lokasi_hasil"]))
+    assert list(hasil.columns) == list(referensi.columns)
+    # Kolom pivot paling rapuh: dihitung ulang dari ekor chunk sebelumnya
+    for kolom in [nama for nama in referensi.columns if nama.startswith("pivot_")]:
+        np.testing.assert_array_equal(hasil[kolom].to_numpy(), referensi[kolom].to_numpy(), err_msg=kolom)
+    pd.testing.assert_frame_equal(hasil, referensi, check_exact=False, rtol=1e-9, atol=1e-9)
+
+
+@pytest.mark.parametrize("timeframe", ["5m", "1h"])
+@pytest.mark.parametrize("isi_gap", [False, True])
+@pytest.mark.parametrize("ukuran_chunk", [777, 5999])
+def test_bertahap_dengan_timeframe_sama_dengan_sekaligus(tmp_path, berkas_sumber, timeframe, isi_gap, ukuran_chunk):
+    penuh = praproses_berkas(berkas_sumber, tmp_path / "penuh", FORMAT_KOLOM, isi_gap=isi_gap, timeframe=timeframe)
+    bertahap = praproses_berkas_bertahap(
+        berkas_sumber, tmp_path / "bertahap", FORMAT_KOLOM,
+        ukuran_chunk=ukuran_chunk, timeframe=timeframe, isi_gap=isi_gap,
+    )
+    assert penuh["timeframe"] == bertahap["timeframe"] == timeframe
+    assert bertahap["jumlah_baris"] == penuh["jumlah_baris"]
+
+    referensi = baca_hasil_preprocess(Path(penuh["lokasi_hasil"]))
+    pd.testing.assert_frame_equal(
+        baca_hasil_preprocess(Path(bertahap["lokasi_hasil"])), referensi, check_exact=False, rtol=1e-9, atol=1e-9
+    )
+    # Sekaligus = resample sumber 1m lalu indikator
+    sumber = pd.read_csv(berkas_sumber)
+    sumber["open_time"] = pd.to_datetime(sumber["open_time"], unit="ms").astype("datetime64[ms]")
+    if isi_gap:
+        sumber, _ = isi_bar_hilang(sumber, INTERVAL_MS)
+    harapan = tambah_indikator_ke_df(resample_ohlcv(sumber, timeframe))
+    np.testing.assert_array_equal(referensi["open_time"].to_numpy(), harapan["open_time"].to_numpy())
+    for nama in ("open", "high", "low", "close", "volume", "rsi_14", "ema_50", "atr_14"):
+        np.testing.assert_allclose(referensi[nama], harapan[nama], rtol=1e-9, atol=1e-9, err_msg=nama)
+
+
+def test_timeframe_tidak_dikenal(tmp_path, berkas_sumber):
+    with pytest.raises(ValueError, match="Timeframe"):
+        praproses_berkas(berkas_sumber, tmp_path, FORMAT_CSV, timeframe="2h")
@@ -0,0 +1,93 @@
+"""
+`hitung_kolom` (hanya kolom yang diminta, memo di frame) dibandingkan dengan
+`tambah_indikator_ke_df` yang selalu menghitung semua kolom.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.services import registri_indikator
+from backend.services.praproses_data import tambah_indikator_ke_df
+from backend.services.registri_indikator import hitung_kolom, urutan_hitung
+
+
+def _ohlcv(n: int = 600, seed: int = 0, nan: bool = False) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    tutup = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    buka = tutup * np.exp(rng.normal(0, 0.003, n))
+    df = pd.DataFrame({
+        "open_time": pd.date_range("2024-01-01", periods=n, freq="min"),
+        "open": buka,
+        "high": np.maximum(buka, tutup) * np.exp(np.abs(rng.normal(0, 0.004, n))),
+        "low": np.minimum(buka, tutup) * np.exp(-np.abs(rng.normal(0, 0.004, n))),
+        "close": tutup,
+        # Volume nol berturut-turut -> volume_anomaly membagi dengan rata-rata 0
+        "volume": np.where(np.arange(n) % 97 < 25, 0.0, rng.random(n) * 10),
+    })
+    if nan:
+        df.loc[rng.random(n) < 0.02, ["close", "high"]] = np.nan
+    return df
+
+
+def _kolom_indikator(referensi: pd.DataFrame, df: pd.DataFrame):
+    return [nama for nama in referensi.columns if nama not in df.columns]
+
+
+def _sama(hasil: pd.Series, referensi: pd.Series) -> None:
+    if pd.api.types.is_bool_dtype(referensi):
+        np.testing.assert_array_equal(hasil.to_numpy(dtype=bool), referensi.to_numpy(dtype=bool), err_msg=referensi.name)
+    else:
+        np.testing.assert_allclose(
+            hasil.to_numpy(dtype=np.float64), referensi.to_numpy(dtype=np.float64),
+            rtol=1e-9, atol=1e-9, err_msg=referensi.name,
+        )
+
+
+@pytest.mark.parametrize("nan", [False, True])
+def test_setiap_kolom_sama_dengan_tambah_indikator(nan):
+    df = _ohlcv(nan=nan)
+    referensi = tambah_indikator_ke_df(df.copy())
+    for nama in _kolom_indikator(referensi, df):
+        hasil = hitung_kolom(df.copy(), [nama])
+        _sama(hasil[nama], referensi[nama])
+        # Hanya kolom yang diminta plus dependensinya yang ditambahkan
+        assert set(hasil.columns) - set(df.columns) == set(urutan_hitung([nama], df.columns))
+
+
+@pytest.mark.parametrize("nan", [False, True])
+def test_semua_kolom_sekaligus_dan_periode_tambahan(nan):
+    df = _ohlcv(seed=1, nan=nan)
+    referensi = tambah_indikator_ke_df(df.copy(), periode_rsi_tambahan=(21,), periode_ema_tambahan=(100,))
+    hasil = hitung_kolom(df.copy(), _kolom_indikator(referensi, df))
+    for nama in _kolom_indikator(referensi, df):
+        _sama(hasil[nama], referensi[nama])
+
+
+def test_kolom_yang_sudah_ada_tidak_dihitung_ulang(monkeypatch):
+    df = _ohlcv(seed=2)
+    referensi = tambah_indikator_ke_df(df.copy())
+    hitung_kolom(df, ["rsi_8_ma3", "ema_20"])
+    assert {"rsi_8", "rsi_8_ma3", "ema_20"} <= set(df.columns)
+
+    dipanggil = []
+    asli = registri_indikator.hitung_rsi_ema_multi_np
+
+    def _hitung(close, periode_rsi, periode_ema):
+        dipanggil.append((tuple(periode_rsi), tuple(periode_ema)))
+        return asli(close, periode_rsi, periode_ema)
+
+    monkeypatch.setattr(registri_indikator, "hitung_rsi_ema_multi_np", _hitung)
+    # Semua sudah ada: frame dikembalikan apa adanya
+    assert hitung_kolom(df, ["rsi_8_ma3", "ema_20"]) is df
+    assert dipanggil == []
+    # distance_to_ema_20 memakai ema_20 yang sudah ada; hanya ema_50 yang baru
+    hitung_kolom(df, ["distance_to_ema_20", "distance_to_ema_50"])
+    assert dipanggil == [((), (50,))]
+    for nama in ("rsi_8_ma3", "ema_20", "ema_50", "distance_to_ema_20", "distance_to_ema_50"):
+        _sama(df[nama], referensi[nama])
+
+
+def test_nama_tidak_dikenal():
+    with pytest.raises(ValueError, match="tidak dikenal"):
+        hitung_kolom(_ohlcv(50), ["macd_12_26"])
@@ -0,0 +1,151 @@
+"""
+`resample_ohlcv` / `ResamplerBertahap` dibandingkan dengan `DataFrame.resample`
+pandas, invalidation `CacheTimeframe`, dan `muat_timeframe` di preview.
+"""
+
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi import HTTPException
+
+from backend import app as app_modul
+from backend.services.penyimpanan_kolom import baca_hasil_preprocess, simpan_kolom
+from backend.services.praproses_data import muat_timeframe, tambah_indikator_ke_df
+from backend.services.resample_timeframe import TIMEFRAME_MS, CacheTimeframe, ResamplerBertahap, resample_ohlcv
+
+FREKUENSI_PANDAS = {
+    "1m": "1min",
+    "5m": "5min",
+    "15m": "15min",
+    "30m": "30min",
+    "1h": "1h",
+    "4h": "4h",
+    "1d": "1D",
+}
+
+
+def _resample_referensi(df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """`resample_ohlcv` versi lama: agg pandas + `.last()` per kolom lain."""
+    data = df.set_index("open_time")
+    hasil = data.resample(FREKUENSI_PANDAS[timeframe]).agg({
+        "open": "first",
+        "high": "max",
+        "low": "min",
+        "close": "last",
+        "volume": "sum",
+    })
+    for kolom in data.columns:
+        if kolom not in hasil.columns:
+            hasil[kolom] = data[kolom].resample(FREKUENSI_PANDAS[timeframe]).last()
+    hasil = hasil.dropna(subset=["open", "high", "low", "close"]).reset_index()
+    return hasil[list(df.columns)]
+
+
+def _data_1m(n: int = 6000, seed: int = 0) -> pd.DataFrame:
+    """1m dengan bar hilang (juga satu jam penuh), NaN di beberapa kolom, dan kolom non-OHLCV."""
+    rng = np.random.default_rng(seed)
+    tutup = 100 + np.cumsum(rng.normal(0, 0.1, n))
+    buka = tutup + rng.normal(0, 0.05, n)
+    df = pd.DataFrame({
+        "open_time": pd.date_range("2024-03-01 00:00", periods=n, freq="min").astype("datetime64[ms]"),
+        "open": buka,
+        "high": np.maximum(buka, tutup) + rng.random(n) * 0.2,
+        "low": np.minimum(buka, tutup) - rng.random(n) * 0.2,
+        "close": tutup,
+        "volume": rng.random(n) * 10,
+        "rsi_14": rng.random(n) * 100,
+        "count": rng.integers(1, 50, n),
+    })
+    hilang = set(rng.choice(n, 300, replace=False).tolist()) | set(range(120, 180))
+    df = df.drop(index=sorted(hilang)).reset_index(drop=True)
+    for kolom in ("open", "high", "volume", "rsi_14"):
+        df.loc[rng.random(len(df)) < 0.02, kolom] = np.nan
+    return df
+
+
+@pytest.mark.parametrize("timeframe", list(TIMEFRAME_MS))
+def test_resample_sama_dengan_pandas(timeframe):
+    df = _data_1m()
+    pd.testing.assert_frame_equal(
+        resample_ohlcv(df, timeframe), _resample_referensi(df, timeframe), check_dtype=False
+    )
+
+
+def test_resample_input_tidak_urut_dan_epoch():
+    df = _data_1m(1500, seed=1)
+    acak = df.sample(frac=1.0, random_state=0).reset_index(drop=True)
+    acak["open_time"] = acak["open_time"].astype("int64")
+    pd.testing.assert_frame_equal(resample_ohlcv(acak, "15m"), resample_ohlcv(df, "15m"))
+
+
+@pytest.mark.parametrize("timeframe", ["5m", "1h", "1d"])
+@pytest.mark.parametrize("ukuran_potongan", [1, 7, 500, 10_000])
+def test_resampler_bertahap_sama_dengan_sekaligus(timeframe, ukuran_potongan):
+    df = _data_1m(3000 if ukuran_potongan > 1 else 400)
+    resampler = ResamplerBertahap(timeframe)
+    bagian = [resampler.tambah(df.iloc[i:i + ukuran_potongan]) for i in range(0, len(df), ukuran_potongan)]
+    bagian.append(resampler.selesai())
+    hasil = pd.concat([b for b in bagian if not b.empty], ignore_index=True)
+    pd.testing.assert_frame_equal(hasil, resample_ohlcv(df, timeframe), check_dtype=False)
+
+
+def test_cache_timeframe_dibuang_jika_sidik_berubah():
+    cache = CacheTimeframe(maks_entri=3)
+    df_1h, df_4h = pd.DataFrame({"a": [1]}), pd.DataFrame({"a": [2]})
+    cache.simpan("btc", "v1", "1h", df_1h)
+    cache.simpan("btc", "v1", "4h", df_4h)
+    assert cache.ambil("btc", "v1", "4h") is df_4h
+    # Sidik baru membuang semua timeframe turunan sumber itu
+    assert cache.ambil("btc", "v2", "1h") is None
+    assert cache.ambil("btc", "v1", "4h") is None
+
+    cache.simpan("btc", "v2", "1h", df_1h)
+    cache.simpan("eth", "v1", "1h", df_1h)
+    cache.simpan("eth", "v1", "4h", df_4h)
+    cache.ambil("btc", "v2", "1h")
+    # LRU: entri yang paling lama tidak dipakai (eth 1h) dibuang lebih dulu
+    cache.simpan("eth", "v1", "1d", df_4h)
+    assert cache.ambil("eth", "v1", "1h") is None
+    assert cache.ambil("btc", "v2", "1h") is df_1h
+
+    cache.hapus("btc")
+    assert cache.ambil("btc", "v2", "1h") is None
+    assert cache.ambil("eth", "v1", "1d") is df_4h
+
+
+def test_muat_timeframe_mengikuti_perubahan_berkas(tmp_path):
+    path = tmp_path / "BTCUSDT-1m.processed.kolom"
+
+    def referensi() -> pd.DataFrame:
+        return tambah_indikator_ke_df(resample_ohlcv(baca_hasil_preprocess(path), "1h"))
+
+    simpan_kolom(tambah_indikator_ke_df(_data_1m(3000)), path)
+    pertama = muat_timeframe(path, "1h")
+    pd.testing.assert_frame_equal(pertama, referensi(), check_dtype=False)
+    # Hasil cache tidak ikut berubah jika salinan yang dikembalikan diubah
+    pertama.loc[0, "close"] = -1.0
+    pd.testing.assert_frame_equal(muat_timeframe(path, "1h"), referensi(), check_dtype=False)
+
+    simpan_kolom(tambah_indikator_ke_df(_data_1m(4000, seed=7)), path)
+    pd.testing.assert_frame_equal(muat_timeframe(path, "1h"), referensi(), check_dtype=False)
+
+
+def test_preview_dengan_timeframe(tmp_path, monkeypatch):
+    monkeypatch.setattr(app_modul, "FOLDER_DATA_BASE", tmp_path / "uploads")
+    monkeypatch.setattr(app_modul, "FOLDER_HASIL_BASE", tmp_path / "processed")
+    (tmp_path / "uploads" / "BTC").mkdir(parents=True)
+    simpan_kolom(
+        tambah_indikator_ke_df(_data_1m(3000)),
+        tmp_path / "processed" / "BTC" / "BTCUSDT-1m.processed.kolom",
+    )
+
+    hasil = asyncio.run(app_modul.preview_berkas("BTCUSDT-1m.csv", folder="BTC", timeframe="4h"))
+    assert hasil["sumber"] == "processed"
+    assert hasil["timeframe"] == "4h"
+    assert hasil["jumlah_baris"] == len(resample_ohlcv(_data_1m(3000), "4h"))
+
+    with pytest.raises(HTTPException) as err:
+        asyncio.run(app_modul.preview_berkas("BTCUSDT-1m.csv", folder="BTC", timeframe="2h"))
+    assert err.value.status_code == 400
@@ -0,0 +1,91 @@
+"""
+`ringkas_csv_bertahap` (CSV dibaca per chunk) dibandingkan dengan ringkasan
+dari CSV yang dibaca utuh seperti endpoint upload lama.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.services.praproses_data import konversi_waktu, normalisasi_csv_binance, ringkas_csv_bertahap
+
+INTERVAL_MS = 60_000
+
+
+def _ringkasan_referensi(path: Path) -> dict:
+    df = normalisasi_csv_binance(pd.read_csv(path))
+    waktu = konversi_waktu(df["open_time"])
+    return {
+        "jumlah_baris": len(df),
+        "kolom": list(df.columns),
+        "waktu_mulai": waktu.min(),
+        "waktu_selesai": waktu.max(),
+    }
+
+
+def _kline(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    tutup = 100 + np.cumsum(rng.normal(0, 0.1, n))
+    open_time = 1_700_000_000_000 + np.arange(n) * INTERVAL_MS
+    return pd.DataFrame({
+        "open_time": open_time,
+        "open": tutup,
+        "high": tutup + 0.2,
+        "low": tutup - 0.2,
+        "close": tutup,
+        "volume": rng.random(n),
+        "close_time": open_time + INTERVAL_MS - 1,
+        "quote_volume": rng.random(n),
+        "count": rng.integers(1, 100, n),
+        "taker_buy_volume": rng.random(n),
+        "taker_buy_quote_volume": rng.random(n),
+        "ignore": 0,
+    })
+
+
+def _tulis(tmp_path: Path, varian: str) -> Path:
+    df = _kline(1200)
+    header = True
+    if varian == "tanpa_header":
+        header = False
+    elif varian == "mikrodetik":
+        df["open_time"] *= 1000
+        df["close_time"] *= 1000
+    elif varian == "detik":
+        df["open_time"] //= 1000
+    elif varian == "iso":
+        df["open_time"] = pd.to_datetime(df["open_time"], unit="ms").dt.strftime("%Y-%m-%d %H:%M:%S")
+    elif varian == "acak_dan_kosong":
+        df = df.sample(frac=1.0, random_state=0).astype({"open_time": "float64"})
+        df.iloc[[0, 17, 999], 0] = np.nan
+    path = tmp_path / f"BTCUSDT-1m-{varian}.csv"
+    df.to_csv(path, index=False, header=header)
+    return path
+
+
+@pytest.mark.parametrize("varian", ["header", "tanpa_header", "mikrodetik", "detik", "iso", "acak_dan_kosong"])
+@pytest.mark.parametrize("ukuran_chunk", [3, 7, 1000, 200_000])
+def test_ringkasan_bertahap_sama_dengan_baca_utuh(tmp_path, varian, ukuran_chunk):
+    path = _tulis(tmp_path, varian)
+    hasil = ringkas_csv_bertahap(path, ukuran_chunk)
+    referensi = _ringkasan_referensi(path)
+    assert {kunci: hasil[kunci] for kunci in referensi} == referensi
+
+
+def test_berkas_tidak_valid(tmp_path):
+    kosong = tmp_path / "kosong.csv"
+    kosong.write_text("")
+    with pytest.raises(ValueError, match="kosong"):
+        ringkas_csv_bertahap(kosong)
+
+    tanpa_volume = tmp_path / "tanpa_volume.csv"
+    _kline(10).drop(columns=["volume"]).iloc[:, :6].to_csv(tanpa_volume, index=False)
+    with pytest.raises(ValueError, match="volume"):
+        ringkas_csv_bertahap(tanpa_volume)
+
+    waktu_rusak = tmp_path / "waktu_rusak.csv"
+    _kline(10).assign(open_time="bukan-waktu").to_csv(waktu_rusak, index=False)
+    with pytest.raises(ValueError, match="open_time"):
+        ringkas_csv_bertahap(waktu_rusak, ukuran_chunk=3)
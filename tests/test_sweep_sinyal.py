@@ -0,0 +1,101 @@
+"""
+Sweep parameter (`sweep_sinyal`) dibandingkan dengan `scan_sinyal_honest` +
+`backtest_signals_in_file` per kombinasi, dan penggabungan agregat per berkas
+di `ManajerSinyal.sweep`.
+"""
+
+import asyncio
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.services import generator_sinyal_unified as generator
+from backend.services import pipeline_sinyal, sweep_sinyal
+from backend.services.penyimpanan_kolom import FORMAT_CSV
+from backend.services.pipeline_sinyal import ManajerSinyal
+from backend.services.praproses_data import simpan_hasil_preprocess, tambah_indikator_ke_df
+
+
+def _frame_sintetis(n: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    tutup = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    buka = tutup * np.exp(rng.normal(0, 0.003, n))
+    return tambah_indikator_ke_df(pd.DataFrame({
+        "open_time": pd.date_range("2024-01-01", periods=n, freq="h") + pd.Timedelta(hours=n * seed),
+        "open": buka,
+        "high": np.maximum(buka, tutup) * np.exp(np.abs(rng.normal(0, 0.004, n))),
+        "low": np.minimum(buka, tutup) * np.exp(-np.abs(rng.normal(0, 0.004, n))),
+        "close": tutup,
+        "volume": rng.random(n),
+    }))
+
+
+def _agregat_referensi(df: pd.DataFrame, mode: str, kombinasi) -> dict:
+    """Agregat satu kombinasi dari scan + backtest per sinyal."""
+    oversold, overbought, rasio_rr, confidence = kombinasi
+    sinyal = generator.scan_sinyal_honest(df, "BTCUSDT", mode, confidence, oversold, overbought, rasio_rr)
+    agregat = sweep_sinyal.agregat_kosong()
+    for hasil in generator.backtest_signals_in_file(df, sinyal):
+        agregat["jumlah_sinyal"] += 1
+        agregat["jumlah_confidence"] += hasil["confidence"]
+        if hasil["backtest_result"] == "HIT_TP":
+            agregat["hit_tp"] += 1
+        elif hasil["backtest_result"] == "HIT_SL":
+            agregat["hit_sl"] += 1
+        else:
+            agregat["timeout"] += 1
+            continue
+        pnl = hasil["pnl_percent"]
+        agregat["jumlah_pnl"] += pnl
+        agregat["jumlah_durasi"] += hasil["bars_held"]
+        if pnl > 0:
+            agregat["jumlah_profit"] += pnl
+            agregat["jumlah_trade_profit"] += 1
+        elif pnl < 0:
+            agregat["jumlah_loss"] += pnl
+            agregat["jumlah_trade_loss"] += 1
+    return agregat
+
+
+@pytest.mark.parametrize("mode", ["aktif", "santai", "pasif"])
+def test_sweep_frame_sama_dengan_scan_dan_backtest(mode):
+    kombinasi = sweep_sinyal.daftar_kombinasi(
+        mode, [20, 30, 40, 55], [45, 60, 70, 80], [0.5, 1.5, 3.0], [0.0, 0.3, 0.65]
+    )
+    sampel = random.Random(mode).sample(kombinasi, 10)
+    for seed in (0, 1):
+        df = _frame_sintetis(1500, seed)
+        hasil = sweep_sinyal.sweep_frame(df, mode, kombinasi)
+        assert set(hasil) == set(kombinasi)
+        for kunci in sampel:
+            referensi = _agregat_referensi(df, mode, kunci)
+            for nama in sweep_sinyal.KUNCI_AGREGAT:
+                assert hasil[kunci][nama] == pytest.approx(referensi[nama], abs=1e-6), (kunci, nama)
+
+
+def test_sweep_melewati_berkas_yang_salah_satu_tasknya_gagal(tmp_path, monkeypatch):
+    daftar_berkas = [
+        simpan_hasil_preprocess(_frame_sintetis(600, seed), f"BTCUSDT-1h-{seed}.csv", tmp_path, FORMAT_CSV)
+        for seed in (0, 1)
+    ]
+    kombinasi = sweep_sinyal.daftar_kombinasi("aktif", [20, 30, 40], [60, 70, 80])
+
+    def _sweep_berkas(path, mode_trading, bagian):
+        # Task kedua berkas kedua gagal setelah task pertamanya berhasil
+        if path == daftar_berkas[1] and kombinasi[1] in bagian:
+            raise ValueError("berkas rusak")
+        return sweep_sinyal.sweep_berkas(path, mode_trading, bagian)
+
+    monkeypatch.setattr(pipeline_sinyal, "sweep_berkas", _sweep_berkas)
+    manajer = ManajerSinyal(max_workers=4)
+    manajer._pool = ThreadPoolExecutor(max_workers=4)
+    try:
+        hasil = asyncio.run(manajer.sweep(daftar_berkas, "aktif", kombinasi))
+    finally:
+        manajer.shutdown()
+
+    assert hasil["berkas_error"] == [{"nama_berkas": daftar_berkas[1].name, "error": "berkas rusak"}]
+    assert hasil["tabel"] == sweep_sinyal.sweep_parameter_folder(daftar_berkas[:1], "aktif", kombinasi)
@@ -0,0 +1,103 @@
+"""
+Deteksi format dan konversi `open_time` (s/ms/us/ns/iso) dibandingkan dengan
+`pd.to_datetime` per unit, termasuk nilai kosong dan rusak.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.services.waktu_epoch import (
+    FORMAT_DETIK,
+    FORMAT_ISO,
+    FORMAT_MS,
+    FORMAT_NS,
+    FORMAT_US,
+    NAT_INT64,
+    deteksi_format_waktu,
+    ke_epoch_ms,
+    ke_kolom_epoch_ms,
+    normalisasi_waktu,
+)
+
+PENGALI_DARI_MS = {FORMAT_DETIK: None, FORMAT_MS: 1, FORMAT_US: 1000, FORMAT_NS: 1_000_000}
+
+
+def _epoch_ms(n: int = 500) -> np.ndarray:
+    # 2017..2030, termasuk milidetik yang tidak bulat
+    rng = np.random.default_rng(0)
+    return rng.integers(1_483_228_800_000, 1_893_456_000_000, n)
+
+
+def _kolom(format_waktu: str, epoch_ms: np.ndarray) -> pd.Series:
+    if format_waktu == FORMAT_DETIK:
+        return pd.Series(epoch_ms // 1000)
+    if format_waktu == FORMAT_ISO:
+        return pd.Series(pd.to_datetime(epoch_ms, unit="ms").strftime("%Y-%m-%d %H:%M:%S.%f"))
+    return pd.Series(epoch_ms * PENGALI_DARI_MS[format_waktu])
+
+
+def _referensi(kolom: pd.Series, format_waktu: str) -> pd.Series:
+    if format_waktu == FORMAT_ISO:
+        waktu = pd.to_datetime(kolom, errors="coerce", utc=True).dt.tz_localize(None)
+    else:
+        waktu = pd.to_datetime(pd.to_numeric(kolom, errors="coerce"), unit=format_waktu, errors="coerce")
+    return waktu.astype("datetime64[ms]")
+
+
+@pytest.mark.parametrize("format_waktu", [FORMAT_DETIK, FORMAT_MS, FORMAT_US, FORMAT_NS, FORMAT_ISO])
+@pytest.mark.parametrize("varian", ["asli", "teks", "float_nan"])
+def test_deteksi_dan_konversi_sama_dengan_to_datetime(format_waktu, varian):
+    kolom = _kolom(format_waktu, _epoch_ms())
+    if varian == "teks":
+        kolom = kolom.astype(str)
+    elif varian == "float_nan":
+        if format_waktu in (FORMAT_US, FORMAT_NS):
+            # float64 tidak presisi untuk us/ns; NaN diuji lewat tipe object
+            kolom = kolom.astype(object)
+        elif format_waktu != FORMAT_ISO:
+            kolom = kolom.astype(np.float64)
+        kolom.iloc[[0, 3, 200]] = np.nan
+
+    assert deteksi_format_waktu(kolom) == format_waktu
+    hasil = normalisasi_waktu(kolom)
+    assert hasil.dtype == "datetime64[ms]"
+    pd.testing.assert_series_equal(hasil, _referensi(kolom, format_waktu), check_names=False)
+
+
+def test_nilai_rusak_di_kolom_epoch_hanya_baris_itu_yang_nat():
+    epoch_ms = _epoch_ms(200)
+    kolom = pd.Series(epoch_ms.astype(str), dtype=object)
+    kolom.iloc[[0, 5, 6, 100]] = ["open_time", "", "rusak", "2024-01-01"]
+    assert deteksi_format_waktu(kolom) == FORMAT_MS
+
+    hasil = ke_epoch_ms(kolom)
+    rusak = np.zeros(len(kolom), dtype=bool)
+    rusak[[0, 5, 6, 100]] = True
+    assert (hasil[rusak] == NAT_INT64).all()
+    np.testing.assert_array_equal(hasil[~rusak], epoch_ms[~rusak])
+    # Sama dengan konversi upload lama (`pd.to_datetime(unit="ms", errors="coerce")`)
+    pd.testing.assert_series_equal(normalisasi_waktu(kolom), _referensi(kolom, FORMAT_MS))
+
+
+def test_teks_iso_dengan_sedikit_angka_tetap_iso():
+    kolom = _kolom(FORMAT_ISO, _epoch_ms(100)).astype(object)
+    kolom.iloc[[1, 2]] = ["12345", "0"]
+    assert deteksi_format_waktu(kolom) == FORMAT_ISO
+
+
+def test_kolom_kosong_dan_datetime():
+    assert deteksi_format_waktu(pd.Series([np.nan, None], dtype=object)) == FORMAT_MS
+    epoch_ms = _epoch_ms(50)
+    naive = pd.Series(pd.to_datetime(epoch_ms, unit="ms"))
+    np.testing.assert_array_equal(ke_epoch_ms(naive), epoch_ms)
+    jakarta = naive.dt.tz_localize("UTC").dt.tz_convert("Asia/Jakarta")
+    np.testing.assert_array_equal(ke_epoch_ms(jakarta), epoch_ms)
+
+
+def test_kolom_epoch_untuk_csv():
+    kolom = pd.Series([1_700_000_000_000.0, np.nan, 1_700_000_060_000.0])
+    hasil = ke_kolom_epoch_ms(kolom)
+    assert str(hasil.dtype) == "Int64"
+    assert hasil.tolist() == [1_700_000_000_000, pd.NA, 1_700_000_060_000]
+    assert ke_kolom_epoch_ms(kolom.dropna()).dtype == np.int64